@@ -1,28 +1,50 @@
 import asyncio
+import sys
 import time
-from typing import List
+from typing import List, cast
 
 from alphapower.engine.simulation.task.scheduler import PriorityScheduler
-from alphapower.entity import SimulationTask
+from alphapower.entity import SimulationTask, SimulationTaskStatus
 
 
-async def benchmark_scheduler():
+class BenchmarkTask:
+    """
+    轻量的任务替身。
+
+    调度器只读写 id、priority、settings_group_key 和 status，构造百万个带字段
+    校验的 ORM 实体本身就要数分钟，会掩盖调度器的耗时。
+    """
+
+    __slots__ = ("id", "priority", "settings_group_key", "status")
+
+    def __init__(self, task_id: int, priority: int, settings_group_key: str) -> None:
+        self.id: int = task_id
+        self.priority: int = priority
+        self.settings_group_key: str = settings_group_key
+        self.status: SimulationTaskStatus = SimulationTaskStatus.PENDING
+
+
+async def benchmark_scheduler(num_tasks: int = 1_000_000):
     """
     基准测试 PriorityScheduler 在大任务量场景下的性能。
     """
     # 创建大量模拟任务
-    num_tasks = 100000
     tasks = [
-        SimulationTask(
-            id=i,
-            priority=i % 10,  # 模拟不同优先级
-            settings_group_key=f"group_{i % 5}",  # 模拟分组
+        cast(
+            SimulationTask,
+            BenchmarkTask(
+                task_id=i,
+                priority=i % 10,  # 模拟不同优先级
+                settings_group_key=f"group_{i % 5}",  # 模拟分组
+            ),
         )
         for i in range(num_tasks)
     ]
 
     # 初始化调度器
+    start_time = time.time()
     scheduler = PriorityScheduler(tasks=tasks)
+    print(f"初始化 {num_tasks} 个任务完成，耗时 {time.time() - start_time:.2f} 秒")
 
     # 开始基准测试
     batch_size = 10
@@ -38,6 +60,7 @@ async def benchmark_scheduler():
 
     # 验证调度结果
     validate_schedule_result(schedule_result)
+    assert sum(len(scheduled_tasks) for scheduled_tasks in schedule_result) == num_tasks
 
 
 def validate_schedule_result(schedule_result: List[List[SimulationTask]]):
@@ -47,12 +70,12 @@ def validate_schedule_result(schedule_result: List[List[SimulationTask]]):
     for scheduled_tasks in schedule_result:
         for i in range(1, len(scheduled_tasks)):
             assert scheduled_tasks[i].priority <= scheduled_tasks[i - 1].priority
-            for j in range(1, len(scheduled_tasks)):
-                assert scheduled_tasks[j].priority <= scheduled_tasks[j - 1].priority
 
-            for task in scheduled_tasks:
-                assert task.settings_group_key == scheduled_tasks[0].settings_group_key
+        for task in scheduled_tasks:
+            assert task.settings_group_key == scheduled_tasks[0].settings_group_key
 
 
 if __name__ == "__main__":
-    asyncio.run(benchmark_scheduler())
+    asyncio.run(
+        benchmark_scheduler(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+    )
@@ -33,9 +33,11 @@ __all__ = [
     "MultiSimulationPayload",
     "MultiSimulationResultView",
     "Operators",
+    "PollManager",
     "PyramidRefView",
     "RateLimit",
     "RateLimit",
+    "RateLimitStatistics",
     "RegularView",
     "ResearchPaperView",
     "SelfAlphaListQueryParams",
@@ -54,6 +56,8 @@ __all__ = [
     "TableView",
     "ThemeRefView",
     "WorldQuantClient",
+    "poll_manager",
+    "rate_limit_statistics",
     "wq_client",
 ]
 
@@ -107,3 +111,5 @@ from .models import (
     TableView,
     ThemeRefView,
 )
+from .poll_manager import PollManager, poll_manager
+from .utils import RateLimitStatistics, rate_limit_statistics
@@ -0,0 +1,281 @@
+"""
+平台异步任务的集中轮询管理器。
+
+模拟进度、相关性检查、业绩对比、提交检查和 PnL 记录集都需要反复请求进度地址，
+直到平台完成计算，两次请求之间等待响应头给出的 Retry-After。原先每个调用方都自己
+循环 `await asyncio.sleep(retry_after)`，每个在途的平台任务都占用一个协程。
+
+轮询管理器把所有待轮询的任务放进同一个按到期时间排序的堆，由一个调度协程按到期
+顺序发起轮询，并限制同时进行的轮询数量和两次轮询之间的最小间隔，使所有调用方
+公平地共享请求配额。每个调用方只需等待一个 future，直到任务完成、出错或超时。
+单次轮询请求的耗时同样受限，挂起的请求不会一直占用并发名额；超时的单次轮询重新
+入堆，只有调用方的总超时到期时才以 TimeoutError 结束。
+"""
+
+import asyncio
+import heapq
+import itertools
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from alphapower.internal.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 轮询函数返回 (是否完成, 下次轮询前等待的秒数, 完成时的结果)
+PollFunction = Callable[[], Awaitable[Tuple[bool, Optional[float], Any]]]
+
+
+class _PollJob:
+    """
+    堆中的一个待轮询任务，按 (到期时间, 入堆顺序) 排序。
+    """
+
+    __slots__ = ("due", "sequence", "poll", "future", "deadline", "key")
+
+    def __init__(
+        self,
+        due: float,
+        sequence: int,
+        poll: PollFunction,
+        future: "asyncio.Future[Any]",
+        deadline: Optional[float],
+        key: str,
+    ) -> None:
+        self.due: float = due
+        self.sequence: int = sequence
+        self.poll: PollFunction = poll
+        self.future: "asyncio.Future[Any]" = future
+        self.deadline: Optional[float] = deadline
+        self.key: str = key
+
+    def __lt__(self, other: "_PollJob") -> bool:
+        return (self.due, self.sequence) < (other.due, other.sequence)
+
+
+class PollManager:
+    """
+    以单个调度协程驱动所有 Retry-After 轮询的管理器。
+    """
+
+    def __init__(
+        self,
+        max_concurrent_polls: int = 16,
+        min_poll_interval: float = 0.0,
+        poll_timeout: Optional[float] = 60.0,
+    ) -> None:
+        """
+        初始化轮询管理器。
+
+        参数:
+        max_concurrent_polls (int): 同时进行的轮询请求数量上限。
+        min_poll_interval (float): 两次发起轮询之间的最小间隔（秒），为 0 时不限制。
+        poll_timeout (Optional[float]): 单次轮询的超时时间（秒），超时的轮询被取消后
+            重新入堆；为 None 时只受调用方的总超时限制。
+        """
+        self.max_concurrent_polls: int = max(max_concurrent_polls, 1)
+        self.min_poll_interval: float = max(min_poll_interval, 0.0)
+        self.poll_timeout: Optional[float] = poll_timeout
+        self.polls: int = 0  # 累计发起的轮询次数
+        self._heap: List[_PollJob] = []
+        self._sequence: Iterator[int] = itertools.count()
+        self._running: Set["asyncio.Task[None]"] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(self.max_concurrent_polls)
+        self._last_poll_started: float = float("-inf")
+
+    @property
+    def pending(self) -> int:
+        """
+        等待轮询的任务数量（包含已取消、尚未从堆中移除的任务）。
+        """
+        return len(self._heap)
+
+    async def poll(
+        self,
+        poll: Callable[[], Awaitable[Tuple[bool, Optional[float], T]]],
+        initial_delay: float = 0.0,
+        timeout: Optional[float] = None,
+        key: str = "",
+    ) -> T:
+        """
+        反复调用轮询函数直到平台任务完成，返回完成时的结果。
+
+        轮询函数返回 (finished, retry_after, value)：finished 为 True 时 value 作为结果
+        返回；否则在 retry_after 秒后再次轮询（为空或不大于 0 时尽快重试）。
+        调用方可以在轮询函数中返回 finished=True 提前结束轮询，也可以直接抛出异常。
+
+        参数:
+        poll: 无参数的异步轮询函数。
+        initial_delay (float): 第一次轮询前等待的秒数，通常是创建任务时返回的 Retry-After。
+        timeout (Optional[float]): 超时时间（秒），下次轮询会超过该时间或正在进行的轮询
+            超过该时间仍未返回时抛出 TimeoutError。单次轮询超时不会结束等待。
+        key (str): 用于日志的任务标识，例如进度 ID 或 Alpha ID。
+
+        返回:
+        T: 轮询函数在完成时返回的结果。
+        """
+        self._ensure_started()
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        now: float = loop.time()
+        job: _PollJob = _PollJob(
+            due=now + max(initial_delay, 0.0),
+            sequence=next(self._sequence),
+            poll=poll,
+            future=loop.create_future(),
+            deadline=now + timeout if timeout is not None else None,
+            key=key,
+        )
+        heapq.heappush(self._heap, job)
+        self._wakeup.set()
+        try:
+            return await job.future
+        finally:
+            # 调用方被取消时只标记 future，堆中的任务在出堆时惰性删除
+            if not job.future.done():
+                job.future.cancel()
+
+    def _ensure_started(self) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 同步原语与事件循环绑定，切换事件循环时重新创建
+            self._heap = []
+            self._running = set()
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_concurrent_polls)
+            self._loop = loop
+            self._dispatcher = None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            while self._heap and self._heap[0].future.done():
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay: float = self._heap[0].due - loop.time()
+            if delay > 0:
+                # 等待最早的任务到期，期间有新任务入堆时重新检查堆顶
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job: _PollJob = heapq.heappop(self._heap)
+            await self._slots.acquire()
+            interval_wait: float = (
+                self._last_poll_started + self.min_poll_interval - loop.time()
+            )
+            if interval_wait > 0:
+                await asyncio.sleep(interval_wait)
+            self._last_poll_started = loop.time()
+
+            task: "asyncio.Task[None]" = loop.create_task(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, job: _PollJob) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        poll_timeout: Optional[float] = self._poll_timeout(job)
+        retry_after: Optional[float]
+        try:
+            if job.future.done():
+                return
+            self.polls += 1
+            finished, retry_after, value = await asyncio.wait_for(
+                job.poll(), poll_timeout
+            )
+        except asyncio.TimeoutError:
+            # 挂起的轮询被取消并释放并发名额。单次轮询超时不代表平台任务失败（例如
+            # 客户端在轮询中等待限流重置），总超时未到时重新入堆，尽快再次轮询
+            if job.deadline is not None and loop.time() >= job.deadline:
+                await logger.aerror(
+                    "轮询请求超时", key=job.key, timeout=poll_timeout, emoji="⏰"
+                )
+                if not job.future.done():
+                    job.future.set_exception(TimeoutError(f"轮询 {job.key} 超时"))
+                return
+            await logger.awarning(
+                "单次轮询请求超时，重新排队", key=job.key, timeout=poll_timeout, emoji="⏳"
+            )
+            finished, retry_after, value = False, None, None
+        except asyncio.CancelledError:
+            if not job.future.done():
+                job.future.cancel()
+            raise
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        if job.future.done():
+            return
+        if finished:
+            job.future.set_result(value)
+            return
+
+        job.due = loop.time() + max(retry_after or 0.0, 0.0)
+        if job.deadline is not None and job.due > job.deadline:
+            await logger.aerror(
+                "轮询超时", key=job.key, retry_after=retry_after, emoji="⏰"
+            )
+            job.future.set_exception(TimeoutError(f"轮询 {job.key} 超时"))
+            return
+        job.sequence = next(self._sequence)
+        heapq.heappush(self._heap, job)
+        self._wakeup.set()
+
+    def _poll_timeout(self, job: _PollJob) -> Optional[float]:
+        """
+        单次轮询的超时时间，取单次轮询超时与任务剩余时间中较小的一个。
+        """
+        timeouts: List[float] = []
+        if self.poll_timeout is not None:
+            timeouts.append(self.poll_timeout)
+        if job.deadline is not None:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            timeouts.append(max(job.deadline - loop.time(), 0.0))
+        return min(timeouts) if timeouts else None
+
+    async def close(self) -> None:
+        """
+        停止调度协程，取消所有等待中的调用方。
+        """
+        tasks: List["asyncio.Task[None]"] = list(self._running)
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._heap:
+            if not job.future.done():
+                job.future.cancel()
+        self._heap = []
+        self._dispatcher = None
+        await logger.ainfo("轮询管理器已关闭", polls=self.polls, emoji="🛑")
+
+
+# 进程内共享的轮询管理器
+poll_manager: PollManager = PollManager()
@@ -7,6 +7,8 @@ from asyncio import Lock  # 替换为 asyncio.Lock
 from functools import wraps
 from typing import Any, Awaitable, Callable
 
+from aiohttp import ClientResponseError
+
 from alphapower.internal.logging import get_logger
 
 from .models import RateLimit
@@ -19,6 +21,43 @@ rate_limit_status: dict[str, RateLimit] = {}
 rate_limit_lock: Lock = Lock()  # 用于保护 rate_limit_status 的协程锁
 
 
+class RateLimitStatistics:
+    """
+    限流压力的累计统计，供自适应并发控制等调用方感知限流。
+
+    计数只增不减，调用方通过比较两次读取的差值得到一段时间内的限流次数。
+    """
+
+    def __init__(self) -> None:
+        self.waits: int = 0  # 因本地或服务端配额耗尽而等待的次数
+        self.wait_seconds: float = 0.0  # 累计等待时间（秒）
+        self.throttled_responses: int = 0  # 服务端返回 429 的次数
+
+    def record_wait(self, seconds: float) -> None:
+        """
+        记录一次限流等待。
+
+        参数:
+            seconds (float): 等待时间（秒）。
+        """
+        self.waits += 1
+        self.wait_seconds += seconds
+
+    def record_throttled_response(self) -> None:
+        """
+        记录一次服务端 429 响应。
+        """
+        self.throttled_responses += 1
+
+    @property
+    def events(self) -> int:
+        """限流事件总数（等待次数与 429 响应次数之和）。"""
+        return self.waits + self.throttled_responses
+
+
+rate_limit_statistics: RateLimitStatistics = RateLimitStatistics()
+
+
 def rate_limit_handler(
     func: Callable[..., Awaitable[Any]],
 ) -> Callable[..., Awaitable[Any]]:
@@ -55,6 +94,7 @@ def rate_limit_handler(
                             rate_limit.reset,
                             emoji="⏳",
                         )
+                        rate_limit_statistics.record_wait(rate_limit.reset)
                         await asyncio.sleep(rate_limit.reset)
                         retry_interval = min(retry_interval * 2, max_retry_interval)
                         # 等待结束就立刻尝试请求，目的是更新本地限流状态到最新值
@@ -92,6 +132,7 @@ def rate_limit_handler(
                             rate_limit.reset,
                             emoji="⏳",
                         )
+                        rate_limit_statistics.record_wait(rate_limit.reset)
                         await asyncio.sleep(rate_limit.reset)
                         retry_interval = min(retry_interval * 2, max_retry_interval)
                         async with rate_limit_lock:  # 使用 asyncio.Lock 确保协程安全
@@ -115,6 +156,17 @@ def rate_limit_handler(
                     )
                     await asyncio.sleep(interval)
                 return response
+            except ClientResponseError as e:
+                if e.status == 429:
+                    rate_limit_statistics.record_throttled_response()
+                log.error(
+                    "请求处理时发生异常",
+                    error=str(e),
+                    status=e.status,
+                    exc_info=True,
+                    emoji="❌",
+                )
+                raise
             except Exception as e:
                 log.error(
                     "请求处理时发生异常",
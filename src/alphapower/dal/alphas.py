@@ -3,16 +3,18 @@ Alpha数据访问层模块
 提供对Alpha模型及其相关实体的数据访问操作。
 """
 
-from typing import List, Optional, Type
+from typing import Any, List, Optional, Sequence, Type, cast
 
-from sqlalchemy import select
+from sqlalchemy import CursorResult, Executable, delete, insert, select, true
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import Select
 
 from alphapower.constants import Stage, Status
-from alphapower.dal.base import EntityDAL
+from alphapower.dal.base import EntityDAL, _chunks
 from alphapower.entity.alphas import (
     Alpha,
+    AlphaMetrics,
     Check,
     Classification,
     Competition,
@@ -399,3 +401,125 @@ class SampleCheckDAL(EntityDAL[Check]):
     """
 
     entity_class: Type[Check] = Check
+
+
+class AlphaMetricsDAL(EntityDAL[AlphaMetrics]):
+    """
+    AlphaMetrics 数据访问层类，根据 Alpha、Setting 和样本内 Sample 刷新筛选指标。
+
+    指标行完全由源表计算得出，因此刷新操作是幂等的：同步因子后按 alpha_id 增量刷新，
+    首次启用或数据修复时不指定 alpha_id 全量刷新。
+    """
+
+    entity_class: Type[AlphaMetrics] = AlphaMetrics
+
+    METRIC_COLUMNS: Sequence[str] = (
+        "id",
+        "alpha_id",
+        "type",
+        "stage",
+        "region",
+        "delay",
+        "sharpe",
+        "fitness",
+        "turnover",
+        "returns",
+        "date_created",
+    )
+
+    @staticmethod
+    def _build_source_query(alpha_ids: Optional[List[str]]) -> Select:
+        """
+        构建从源表计算指标行的查询，列顺序与 METRIC_COLUMNS 一致。
+
+        Args:
+            alpha_ids: 需要计算的 Alpha ID，为 None 时计算全部 Alpha。
+
+        Returns:
+            指标行查询。
+        """
+        query: Select = (
+            select(
+                Alpha.id,
+                Alpha.alpha_id,
+                Alpha.type,
+                Alpha.stage,
+                Setting.region,
+                Setting.delay,
+                Sample.sharpe,
+                Sample.fitness,
+                Sample.turnover,
+                Sample.returns,
+                Alpha.date_created,
+            )
+            .join(Setting, Setting.id == Alpha.settings_id)
+            .outerjoin(Sample, Sample.id == Alpha.in_sample_id)
+        )
+        # SQLite 解析 INSERT ... SELECT ... ON CONFLICT 时要求 SELECT 带有 WHERE 子句
+        return query.where(
+            Alpha.alpha_id.in_(alpha_ids) if alpha_ids is not None else true()
+        )
+
+    async def refresh(self, alpha_ids: Optional[List[str]] = None) -> int:
+        """
+        根据源表刷新 Alpha 的筛选指标，不存在的指标行会被创建。
+
+        会先 flush 当前会话，使尚未提交的 Alpha 变更参与计算；
+        刷新与 Alpha 的写入处于同一个事务中，由调用方提交。
+
+        Args:
+            alpha_ids: 需要刷新的 Alpha ID 列表，为 None 时全量刷新。
+
+        Returns:
+            刷新的指标行数 (驱动无法报告时按 0 计)。
+        """
+        await self.session.flush()
+
+        chunks: List[Optional[List[str]]] = (
+            [None] if alpha_ids is None else list(_chunks(alpha_ids))
+        )
+        dialect_name: str = self.session.get_bind().dialect.name
+        refreshed: int = 0
+        for chunk in chunks:
+            source: Select = self._build_source_query(chunk)
+            statement: Executable
+            if dialect_name in (sqlite.dialect.name, postgresql.dialect.name):
+                upsert = (
+                    sqlite.insert
+                    if dialect_name == sqlite.dialect.name
+                    else postgresql.insert
+                )
+                upsert_statement = upsert(self.entity_class).from_select(
+                    list(self.METRIC_COLUMNS), source
+                )
+                statement = upsert_statement.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={
+                        column: upsert_statement.excluded[column]
+                        for column in self.METRIC_COLUMNS
+                        if column != "id"
+                    },
+                )
+            else:
+                # 不支持原生 upsert 的方言先删除旧行再插入
+                await self.session.execute(
+                    delete(self.entity_class).where(
+                        self.entity_class.id.in_(
+                            source.with_only_columns(Alpha.id).scalar_subquery()
+                        )
+                    )
+                )
+                statement = insert(self.entity_class).from_select(
+                    list(self.METRIC_COLUMNS), source
+                )
+            result = await self.session.execute(statement)
+            refreshed += max(cast(CursorResult[Any], result).rowcount or 0, 0)
+
+        await self.log.adebug(
+            "🔄 刷新 Alpha 筛选指标完成",
+            requested=len(alpha_ids) if alpha_ids is not None else "all",
+            refreshed=refreshed,
+            dialect=dialect_name,
+            emoji="🔄",
+        )
+        return refreshed
@@ -9,8 +9,10 @@ from typing import (
     AsyncGenerator,
     Dict,
     Generic,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Type,
     TypeVar,
     Union,
@@ -28,6 +30,23 @@ from alphapower.internal.logging import get_logger
 
 # pylint: disable=E1102
 
+# 单条 IN 查询的最大参数数量，避免超过 SQLite 的变量数量限制
+IN_QUERY_CHUNK_SIZE: int = 500
+
+
+def _chunks(ids: Sequence[str]) -> Iterator[List[str]]:
+    """
+    将 ID 列表按 IN_QUERY_CHUNK_SIZE 切分为多个分块，用于分批执行 IN 查询。
+
+    Args:
+        ids: 待切分的 ID 序列。
+
+    Yields:
+        每个分块的 ID 列表。
+    """
+    for offset in range(0, len(ids), IN_QUERY_CHUNK_SIZE):
+        yield list(ids[offset : offset + IN_QUERY_CHUNK_SIZE])
+
 
 class HasEntity(Protocol):
     """
@@ -1,10 +1,19 @@
-from typing import List, Optional, Type
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, cast
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import CursorResult, and_, delete, func, inspect, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 
-from alphapower.constants import CheckRecordType
-from alphapower.dal.base import EntityDAL
-from alphapower.entity import CheckRecord, Correlation, EvaluateRecord, RecordSet
+from alphapower.constants import CheckRecordType, CorrelationCalcType, RecordSetType
+from alphapower.dal.base import EntityDAL, _chunks
+from alphapower.entity import (
+    CheckRecord,
+    Correlation,
+    CorrelationStatistics,
+    EvaluateLedger,
+    EvaluateRecord,
+    RecordSet,
+)
+from alphapower.internal.db_session import unique_column_sets
 
 
 class CorrelationDAL(EntityDAL[Correlation]):
@@ -16,6 +25,146 @@ class CorrelationDAL(EntityDAL[Correlation]):
 
     entity_class: Type[Correlation] = Correlation
 
+    # 单条多行 upsert 语句包含的最大行数，避免超过 SQLite 的变量数量限制
+    UPSERT_CHUNK_SIZE: int = 150
+    # 原生 upsert 的冲突键
+    CONFLICT_COLUMNS: Tuple[str, ...] = ("alpha_id_a", "alpha_id_b", "calc_type")
+
+    # 数据库中是否存在冲突键上的唯一索引，首次写入时检查
+    _has_conflict_index: Optional[bool] = None
+
+    async def upsert_many(
+        self,
+        rows: List[Tuple[str, str, float, CorrelationCalcType]],
+    ) -> int:
+        """
+        以数据库原生的多行 upsert 批量写入相关性记录。
+
+        冲突键为 alpha_pair + calc_type，冲突时更新相关性数值和创建时间。
+        不支持原生 upsert 的方言，以及旧库因存在重复行而缺少冲突键唯一索引时，
+        回退到逐行的 `bulk_upsert`。
+
+        Args:
+            rows: (alpha_id_a, alpha_id_b, correlation, calc_type) 列表，
+                alpha_id_a 必须是字典序较小的 ID，且不得包含重复的冲突键。
+
+        Returns:
+            写入的行数。
+        """
+        if not rows:
+            return 0
+
+        dialect_name: str = self.session.get_bind().dialect.name
+        if (
+            dialect_name
+            not in (
+                sqlite.dialect.name,
+                postgresql.dialect.name,
+            )
+            or not await self._check_conflict_index()
+        ):
+            await self.bulk_upsert(
+                [
+                    Correlation(
+                        alpha_id_a=alpha_id_a,
+                        alpha_id_b=alpha_id_b,
+                        correlation=correlation,
+                        calc_type=calc_type,
+                    )
+                    for alpha_id_a, alpha_id_b, correlation, calc_type in rows
+                ]
+            )
+            return len(rows)
+
+        insert = (
+            sqlite.insert if dialect_name == sqlite.dialect.name else postgresql.insert
+        )
+        for offset in range(0, len(rows), self.UPSERT_CHUNK_SIZE):
+            values: List[Dict[str, Any]] = [
+                {
+                    "alpha_id_a": alpha_id_a,
+                    "alpha_id_b": alpha_id_b,
+                    "correlation": correlation,
+                    "calc_type": calc_type,
+                }
+                for alpha_id_a, alpha_id_b, correlation, calc_type in rows[
+                    offset : offset + self.UPSERT_CHUNK_SIZE
+                ]
+            ]
+            statement = insert(self.entity_class).values(values)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(self.CONFLICT_COLUMNS),
+                set_={
+                    "correlation": statement.excluded.correlation,
+                    "created_at": func.now(),  # pylint: disable=E1102
+                },
+            )
+            await self.session.execute(statement)
+
+        await self.log.adebug(
+            "💾 批量 upsert 相关性记录完成",
+            rows=len(rows),
+            statements=(len(rows) - 1) // self.UPSERT_CHUNK_SIZE + 1,
+            dialect=dialect_name,
+            emoji="💾",
+        )
+        return len(rows)
+
+    async def _check_conflict_index(self) -> bool:
+        """
+        检查数据库中是否存在冲突键上的唯一索引，结果在 DAL 实例上缓存。
+
+        旧库存在重复行时启动阶段不会补齐唯一索引，此时原生 upsert 的冲突子句
+        无法匹配任何唯一约束，每次写入都会失败。
+
+        Returns:
+            唯一索引存在时为 True。
+        """
+        if self._has_conflict_index is None:
+            connection = await self.session.connection()
+            table_name: str = self.entity_class.__tablename__
+            self._has_conflict_index = self.CONFLICT_COLUMNS in (
+                await connection.run_sync(
+                    lambda sync_connection: unique_column_sets(
+                        inspect(sync_connection), table_name
+                    )
+                )
+            )
+            if not self._has_conflict_index:
+                await self.log.awarning(
+                    "相关性表缺少唯一索引，回退到逐行写入，请执行 sync correlation-dedup",
+                    table=table_name,
+                    columns=list(self.CONFLICT_COLUMNS),
+                    emoji="⚠️",
+                )
+        return self._has_conflict_index
+
+    async def delete_duplicate_pairs(self) -> int:
+        """
+        删除 alpha_pair + calc_type 重复的相关性记录，每组只保留 id 最大（最新写入）的一行。
+
+        早期版本没有唯一约束，旧库中可能残留重复行，清理后才能补齐唯一索引。
+
+        Returns:
+            删除的行数。
+        """
+        latest_ids = select(func.max(self.entity_class.id)).group_by(
+            self.entity_class.alpha_id_a,
+            self.entity_class.alpha_id_b,
+            self.entity_class.calc_type,
+        )
+        result = await self.session.execute(
+            delete(self.entity_class).where(self.entity_class.id.not_in(latest_ids))
+        )
+        deleted: int = cast(CursorResult[Any], result).rowcount or 0
+
+        await self.log.ainfo(
+            "🧹 删除重复的相关性记录",
+            deleted=deleted,
+            emoji="🧹",
+        )
+        return deleted
+
     async def bulk_upsert(self, entities: List[Correlation]) -> List[Correlation]:
         """
         批量插入或更新实体对象。
@@ -38,9 +187,10 @@ class CorrelationDAL(EntityDAL[Correlation]):
                 calc_type=entity.calc_type,
             )
             if exist_entity:
-                # 正确处理 merge 的返回值
-                merged_entity: Correlation = await self.session.merge(entity)
-                merged_entities.append(merged_entity)
+                # 新实体没有主键，merge 会插入新行，因此直接更新已有记录
+                exist_entity.correlation = entity.correlation
+                exist_entity.created_at = func.now()  # pylint: disable=E1102
+                merged_entities.append(exist_entity)
             else:
                 self.session.add(entity)
                 merged_entities.append(entity)  # 添加新创建的实体
@@ -95,6 +245,94 @@ class CorrelationDAL(EntityDAL[Correlation]):
         return latest_record
 
 
+class CorrelationStatisticsDAL(EntityDAL[CorrelationStatistics]):
+    """
+    CorrelationStatistics 数据访问层类，提供相关性充分统计量的批量查询。
+    """
+
+    entity_class: Type[CorrelationStatistics] = CorrelationStatistics
+
+    async def find_by_alpha(
+        self,
+        alpha_id: str,
+        other_alpha_ids: List[str],
+    ) -> Dict[str, CorrelationStatistics]:
+        """
+        批量查询指定 Alpha 与一组 Alpha 之间的充分统计量。
+
+        Args:
+            alpha_id: Alpha ID。
+            other_alpha_ids: 另一侧的 Alpha ID 列表。
+
+        Returns:
+            另一侧 Alpha ID 到充分统计量的映射，不存在记录的 Alpha ID 不会出现在结果中。
+        """
+        statistics: Dict[str, CorrelationStatistics] = {}
+        for chunk in _chunks(other_alpha_ids):
+            query = select(self.entity_class).where(
+                or_(
+                    and_(
+                        self.entity_class.alpha_id_a == alpha_id,
+                        self.entity_class.alpha_id_b.in_(chunk),
+                    ),
+                    and_(
+                        self.entity_class.alpha_id_b == alpha_id,
+                        self.entity_class.alpha_id_a.in_(chunk),
+                    ),
+                )
+            )
+            result = await self.session.execute(query)
+            for entity in result.scalars().all():
+                other_alpha_id: str = (
+                    entity.alpha_id_b
+                    if entity.alpha_id_a == alpha_id
+                    else entity.alpha_id_a
+                )
+                statistics[other_alpha_id] = entity
+
+        await self.log.adebug(
+            "🔍 批量查询相关性充分统计量完成",
+            alpha_id=alpha_id,
+            requested=len(other_alpha_ids),
+            found=len(statistics),
+            emoji="🔍",
+        )
+        return statistics
+
+    async def find_among(
+        self, alpha_ids: List[str]
+    ) -> Dict[Tuple[str, str], CorrelationStatistics]:
+        """
+        批量查询一组 Alpha 两两之间的充分统计量。
+
+        按 alpha_id_a 分块查询，另一侧不在该组内的记录在内存中过滤。
+
+        Args:
+            alpha_ids: Alpha ID 列表。
+
+        Returns:
+            (alpha_id_a, alpha_id_b) 到充分统计量的映射，alpha_id_a 为字典序较小的 ID。
+        """
+        alpha_id_set: Set[str] = set(alpha_ids)
+        statistics: Dict[Tuple[str, str], CorrelationStatistics] = {}
+        for chunk in _chunks(alpha_ids):
+            query = select(self.entity_class).where(
+                self.entity_class.alpha_id_a.in_(chunk)
+            )
+            result = await self.session.execute(query)
+            for entity in result.scalars().all():
+                if entity.alpha_id_b in alpha_id_set:
+                    statistics[(entity.alpha_id_a, entity.alpha_id_b)] = entity
+
+        await self.log.adebug(
+            "🔍 批量查询 Alpha 组内相关性充分统计量完成",
+            alphas=len(alpha_ids),
+            found=len(statistics),
+            emoji="🔍",
+        )
+        return statistics
+
+
 class CheckRecordDAL(EntityDAL[CheckRecord]):
     """
     Dataset 数据访问层类，提供对 Dataset 实体的特定操作。
@@ -104,6 +342,71 @@ class CheckRecordDAL(EntityDAL[CheckRecord]):
 
     entity_class: Type[CheckRecord] = CheckRecord
 
+    async def find_latest_by_alphas(
+        self,
+        alpha_ids: List[str],
+        record_types: List[CheckRecordType],
+    ) -> Dict[Tuple[str, CheckRecordType], CheckRecord]:
+        """
+        批量查询一组 Alpha 每种检查类型的最新检查记录。
+
+        使用窗口函数在数据库端按 (alpha_id, record_type) 分组取 created_at 最新的一条，
+        每批 Alpha 只需一次查询。
+
+        Args:
+            alpha_ids: Alpha ID 列表。
+            record_types: 检查记录类型列表。
+
+        Returns:
+            (Alpha ID, 检查记录类型) 到最新检查记录的映射，不存在记录的组合不会出现在结果中。
+        """
+        latest_records: Dict[Tuple[str, CheckRecordType], CheckRecord] = {}
+        if not record_types:
+            return latest_records
+
+        for chunk in _chunks(alpha_ids):
+            ranked = (
+                select(
+                    self.entity_class.id,
+                    func.row_number()  # pylint: disable=E1102
+                    .over(
+                        partition_by=(
+                            self.entity_class.alpha_id,
+                            self.entity_class.record_type,
+                        ),
+                        order_by=(
+                            self.entity_class.created_at.desc(),
+                            self.entity_class.id.desc(),
+                        ),
+                    )
+                    .label("row_number"),
+                )
+                .where(
+                    self.entity_class.alpha_id.in_(chunk),
+                    self.entity_class.record_type.in_(record_types),
+                )
+                .subquery()
+            )
+            query = select(self.entity_class).join(
+                ranked,
+                and_(
+                    self.entity_class.id == ranked.c.id,
+                    ranked.c.row_number == 1,
+                ),
+            )
+            result = await self.session.execute(query)
+            for record in result.scalars().all():
+                latest_records[(record.alpha_id, record.record_type)] = record
+
+        await self.log.adebug(
+            "🔍 批量查询最新检查记录完成",
+            requested=len(alpha_ids),
+            record_types=[record_type.value for record_type in record_types],
+            found=len(latest_records),
+            emoji="🔍",
+        )
+        return latest_records
+
 
 class RecordSetDAL(EntityDAL[RecordSet]):
     """
@@ -114,6 +417,43 @@ class RecordSetDAL(EntityDAL[RecordSet]):
 
     entity_class: Type[RecordSet] = RecordSet
 
+    async def find_content_hashes(
+        self,
+        alpha_ids: List[str],
+        set_type: RecordSetType,
+    ) -> Dict[str, Optional[str]]:
+        """
+        批量查询记录集的内容哈希，不加载 (也不解析) 记录集内容本身。
+
+        Args:
+            alpha_ids: Alpha ID 列表。
+            set_type: 记录集类型。
+
+        Returns:
+            Alpha ID 到内容哈希的映射；记录存在但尚未计算哈希时值为 None，
+            不存在记录的 Alpha ID 不会出现在结果中。
+        """
+        content_hashes: Dict[str, Optional[str]] = {}
+        for chunk in _chunks(alpha_ids):
+            query = select(
+                self.entity_class.alpha_id, self.entity_class.content_hash
+            ).where(
+                self.entity_class.alpha_id.in_(chunk),
+                self.entity_class.set_type == set_type,
+            )
+            result = await self.session.execute(query)
+            for alpha_id, content_hash in result.all():
+                content_hashes[alpha_id] = content_hash
+
+        await self.log.adebug(
+            "🔍 批量查询记录集内容哈希完成",
+            requested=len(alpha_ids),
+            found=len(content_hashes),
+            set_type=set_type.value,
+            emoji="🔍",
+        )
+        return content_hashes
+
 
 class EvaluateRecordDAL(EntityDAL[EvaluateRecord]):
     """
@@ -123,3 +463,108 @@ class EvaluateRecordDAL(EntityDAL[EvaluateRecord]):
     """
 
     entity_class: Type[EvaluateRecord] = EvaluateRecord
+
+
+class EvaluateLedgerDAL(EntityDAL[EvaluateLedger]):
+    """
+    评估台账数据访问层类，提供按 Alpha 批量查询指纹与批量写入评估结论的操作。
+    """
+
+    entity_class: Type[EvaluateLedger] = EvaluateLedger
+
+    # 单条多行 upsert 语句包含的最大行数，避免超过 SQLite 的变量数量限制
+    UPSERT_CHUNK_SIZE: int = 300
+
+    async def find_fingerprints(self, alpha_ids: List[str]) -> Dict[str, str]:
+        """
+        批量查询一组 Alpha 最近一次评估结论的输入指纹。
+
+        Args:
+            alpha_ids: Alpha ID 列表。
+
+        Returns:
+            Alpha ID 到指纹的映射，没有评估结论的 Alpha ID 不会出现在结果中。
+        """
+        fingerprints: Dict[str, str] = {}
+        for chunk in _chunks(alpha_ids):
+            query = select(
+                self.entity_class.alpha_id, self.entity_class.fingerprint
+            ).where(self.entity_class.alpha_id.in_(chunk))
+            result = await self.session.execute(query)
+            for alpha_id, fingerprint in result.all():
+                fingerprints[alpha_id] = fingerprint
+
+        await self.log.adebug(
+            "🔍 批量查询评估台账指纹完成",
+            requested=len(alpha_ids),
+            found=len(fingerprints),
+            emoji="🔍",
+        )
+        return fingerprints
+
+    async def upsert_many(self, rows: List[Tuple[str, str, bool]]) -> int:
+        """
+        批量写入评估结论，每个 Alpha 只保留最近一次的结论。
+
+        冲突键为 alpha_id，冲突时更新指纹、结论和评估时间。
+        不支持原生 upsert 的方言回退到逐条 merge。
+
+        Args:
+            rows: (alpha_id, fingerprint, passed) 列表，不得包含重复的 alpha_id。
+
+        Returns:
+            写入的行数。
+        """
+        if not rows:
+            return 0
+
+        dialect_name: str = self.session.get_bind().dialect.name
+        if dialect_name not in (sqlite.dialect.name, postgresql.dialect.name):
+            existing: Dict[str, EvaluateLedger] = {
+                entry.alpha_id: entry
+                for entry in await self.find_by(
+                    in_={"alpha_id": [alpha_id for alpha_id, _, _ in rows]}
+                )
+            }
+            for alpha_id, fingerprint, passed in rows:
+                entry: Optional[EvaluateLedger] = existing.get(alpha_id)
+                if entry is None:
+                    self.session.add(
+                        EvaluateLedger(
+                            alpha_id=alpha_id, fingerprint=fingerprint, passed=passed
+                        )
+                    )
+                else:
+                    entry.fingerprint = fingerprint
+                    entry.passed = passed
+            await self.session.flush()
+            return len(rows)
+
+        insert = (
+            sqlite.insert if dialect_name == sqlite.dialect.name else postgresql.insert
+        )
+        for offset in range(0, len(rows), self.UPSERT_CHUNK_SIZE):
+            values: List[Dict[str, Any]] = [
+                {"alpha_id": alpha_id, "fingerprint": fingerprint, "passed": passed}
+                for alpha_id, fingerprint, passed in rows[
+                    offset : offset + self.UPSERT_CHUNK_SIZE
+                ]
+            ]
+            statement = insert(self.entity_class).values(values)
+            statement = statement.on_conflict_do_update(
+                index_elements=["alpha_id"],
+                set_={
+                    "fingerprint": statement.excluded.fingerprint,
+                    "passed": statement.excluded.passed,
+                    "evaluated_at": func.now(),  # pylint: disable=E1102
+                },
+            )
+            await self.session.execute(statement)
+
+        await self.log.adebug(
+            "💾 批量写入评估台账完成",
+            rows=len(rows),
+            dialect=dialect_name,
+            emoji="💾",
+        )
+        return len(rows)
@@ -3,9 +3,11 @@
 提供对模拟任务及其状态的数据访问操作。
 """
 
-from typing import Any, Dict, List, Optional, Type
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Type, cast
 
-from sqlalchemy import select
+from sqlalchemy import CursorResult, Table, bindparam, select, update
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import Select
 
@@ -22,6 +24,23 @@ class SimulationTaskDAL(EntityDAL[SimulationTask]):
 
     entity_class: Type[SimulationTask] = SimulationTask
 
+    # 持有租约的任务状态，租约过期后会被回收
+    LEASED_STATUSES: Tuple[SimulationTaskStatus, ...] = (
+        SimulationTaskStatus.SCHEDULED,
+        SimulationTaskStatus.RUNNING,
+    )
+
+    # 工作者执行任务期间写回的字段
+    WORKER_FIELDS: Tuple[str, ...] = (
+        "status",
+        "result",
+        "alpha_id",
+        "parent_progress_id",
+        "child_progress_id",
+        "scheduled_at",
+        "completed_at",
+    )
+
     async def find_by_status(
         self, status: Any, session: Optional[AsyncSession] = None
     ) -> List[SimulationTask]:
@@ -278,3 +297,334 @@ class SimulationTaskDAL(EntityDAL[SimulationTask]):
             query = query.offset(offset)
         result = await actual_session.execute(query)
         return list(result.scalars().all())
+
+    @staticmethod
+    def _claim_candidates_query(count: int, priority: Optional[int]) -> Select:
+        """
+        构建认领候选任务 id 的查询，由 (status, priority DESC, id) 索引按序扫描。
+
+        Args:
+            count: 最多取出的任务数量。
+            priority: 可选的优先级过滤条件。
+
+        Returns:
+            按优先级降序、id 升序排列的候选任务 id 查询。
+        """
+        candidates: Select = select(SimulationTask.id).where(
+            SimulationTask.status == SimulationTaskStatus.PENDING
+        )
+        if priority is not None:
+            candidates = candidates.where(SimulationTask.priority == priority)
+        return candidates.order_by(
+            SimulationTask.priority.desc(), SimulationTask.id
+        ).limit(count)
+
+    async def claim_pending_tasks(
+        self,
+        owner: str,
+        count: int,
+        lease_seconds: float,
+        priority: Optional[int] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> List[SimulationTask]:
+        """
+        认领最多 count 个待处理任务。
+
+        以一条语句把任务标记为已调度，写入认领者与租约到期时间，并返回认领到的任务。
+        候选任务按 (优先级降序, id) 从索引头部取出，不使用 OFFSET，也不排除
+        进行中的任务，认领的代价与队列深度和进行中的任务数量无关。
+
+        - PostgreSQL: 候选子查询使用 FOR UPDATE SKIP LOCKED，并发的认领者互不等待；
+        - 支持 UPDATE ... RETURNING 的方言 (如 SQLite): 写操作串行执行，
+          UPDATE 条件中重新检查状态即可保证同一任务只被认领一次；
+        - 其他方言: 先按键集取出候选 id，再以状态条件更新，最后按认领者与
+          租约到期时间读回实际认领到的任务。
+
+        Args:
+            owner: 认领者标识。
+            count: 最多认领的任务数量。
+            lease_seconds: 租约时长 (秒)。
+            priority: 可选的优先级过滤条件。
+            session: 可选的会话对象，若提供则优先使用。
+
+        Returns:
+            认领到的任务列表，按优先级降序、id 升序排列。
+        """
+        if count <= 0:
+            return []
+
+        actual_session: AsyncSession = session or self.session
+        dialect = actual_session.get_bind().dialect
+        now: datetime = datetime.now()
+        lease_expires_at: datetime = now + timedelta(seconds=lease_seconds)
+
+        candidates: Select = self._claim_candidates_query(count, priority)
+        if dialect.name == postgresql.dialect.name:
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        values: Dict[str, Any] = {
+            "status": SimulationTaskStatus.SCHEDULED,
+            "scheduled_at": now,
+            "lease_owner": owner,
+            "lease_expires_at": lease_expires_at,
+        }
+
+        claimed: List[SimulationTask]
+        if dialect.update_returning:
+            statement = (
+                update(SimulationTask)
+                .where(
+                    SimulationTask.id.in_(candidates.scalar_subquery()),
+                    SimulationTask.status == SimulationTaskStatus.PENDING,
+                )
+                .values(**values)
+                .returning(SimulationTask)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            result = await actual_session.execute(statement)
+            claimed = sorted(
+                result.scalars().all(), key=lambda task: (-task.priority, task.id)
+            )
+        else:
+            candidate_ids: List[int] = list(
+                (await actual_session.execute(candidates)).scalars().all()
+            )
+            if not candidate_ids:
+                return []
+            await actual_session.execute(
+                update(SimulationTask)
+                .where(
+                    SimulationTask.id.in_(candidate_ids),
+                    SimulationTask.status == SimulationTaskStatus.PENDING,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            result = await actual_session.execute(
+                select(SimulationTask)
+                .where(
+                    SimulationTask.id.in_(candidate_ids),
+                    SimulationTask.lease_owner == owner,
+                    SimulationTask.lease_expires_at == lease_expires_at,
+                )
+                .order_by(SimulationTask.priority.desc(), SimulationTask.id)
+                .execution_options(populate_existing=True)
+            )
+            claimed = list(result.scalars().all())
+
+        await self.log.adebug(
+            "认领待处理任务",
+            owner=owner,
+            required_count=count,
+            claimed_count=len(claimed),
+            dialect=dialect.name,
+            emoji="📌",
+        )
+        return claimed
+
+    async def renew_leases(
+        self,
+        owner: str,
+        lease_expires_at: datetime,
+        session: Optional[AsyncSession] = None,
+    ) -> int:
+        """
+        续约认领者持有的已调度与运行中任务的租约。
+
+        Args:
+            owner: 认领者标识。
+            lease_expires_at: 新的租约到期时间。
+            session: 可选的会话对象，若提供则优先使用。
+
+        Returns:
+            续约的任务数量。
+        """
+        actual_session: AsyncSession = session or self.session
+        result = await actual_session.execute(
+            update(SimulationTask)
+            .where(
+                SimulationTask.lease_owner == owner,
+                SimulationTask.status.in_(self.LEASED_STATUSES),
+            )
+            .values(lease_expires_at=lease_expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        return cast(CursorResult[Any], result).rowcount
+
+    async def reclaim_expired_leases(
+        self,
+        now: Optional[datetime] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> int:
+        """
+        回收租约已过期的任务，放回待处理状态。
+
+        认领者所在的进程退出或失去响应后不再续约，它持有的已调度与运行中任务
+        在租约过期后由任意一个认领者回收，重新进入队列。
+
+        Args:
+            now: 当前时间，默认为 datetime.now()。
+            session: 可选的会话对象，若提供则优先使用。
+
+        Returns:
+            回收的任务数量。
+        """
+        actual_session: AsyncSession = session or self.session
+        result = await actual_session.execute(
+            update(SimulationTask)
+            .where(
+                SimulationTask.lease_expires_at < (now or datetime.now()),
+                SimulationTask.status.in_(self.LEASED_STATUSES),
+            )
+            .values(
+                status=SimulationTaskStatus.PENDING,
+                scheduled_at=None,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return cast(CursorResult[Any], result).rowcount
+
+    async def update_if_leased(
+        self,
+        task: SimulationTask,
+        session: Optional[AsyncSession] = None,
+    ) -> bool:
+        """
+        以租约为写屏障，写回工作者修改的任务状态与结果。
+
+        只有数据库中的任务仍由 task.lease_owner 持有时才写入 WORKER_FIELDS 中的字段，
+        不会合并过期的整行对象。租约已被回收或转交给其他认领者时不修改任何行。
+
+        Args:
+            task: 工作者持有的任务对象。
+            session: 可选的会话对象，若提供则优先使用。
+
+        Returns:
+            是否写入成功，False 表示租约已丢失。
+        """
+        actual_session: AsyncSession = session or self.session
+        owner_clause = (
+            SimulationTask.lease_owner.is_(None)
+            if task.lease_owner is None
+            else SimulationTask.lease_owner == task.lease_owner
+        )
+        result = await actual_session.execute(
+            update(SimulationTask)
+            .where(SimulationTask.id == task.id, owner_clause)
+            .values({field: getattr(task, field) for field in self.WORKER_FIELDS})
+            .execution_options(synchronize_session=False)
+        )
+        if cast(CursorResult[Any], result).rowcount == 0:
+            await self.log.adebug(
+                "任务租约已丢失，放弃写入",
+                task_id=task.id,
+                lease_owner=task.lease_owner,
+                status=task.status.value,
+                emoji="⛔",
+            )
+            return False
+        return True
+
+    async def update_all_if_leased(
+        self,
+        tasks: List[SimulationTask],
+        session: Optional[AsyncSession] = None,
+    ) -> List[SimulationTask]:
+        """
+        以租约为写屏障批量写回任务状态与结果。
+
+        所有任务以一条 executemany 的 UPDATE 写回。executemany 只报告总影响行数，
+        无法得知具体哪一行未被写入，因此总数不足（或方言不支持统计）时再查询一次
+        这些任务当前的持有者，持有者与任务对象不一致的即为失去租约的任务。
+
+        Args:
+            tasks: 工作者持有的任务对象列表。
+            session: 可选的会话对象，若提供则优先使用。
+
+        Returns:
+            租约已丢失、未被写入的任务列表。
+        """
+        if not tasks:
+            return []
+
+        actual_session: AsyncSession = session or self.session
+        table: Table = cast(Table, SimulationTask.__table__)
+        result: Any = await actual_session.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam("b_id"),
+                table.c.lease_owner.is_not_distinct_from(bindparam("b_lease_owner")),
+            )
+            .values({field: bindparam(f"b_{field}") for field in self.WORKER_FIELDS}),
+            [
+                {
+                    "b_id": task.id,
+                    "b_lease_owner": task.lease_owner,
+                    **{
+                        f"b_{field}": getattr(task, field)
+                        for field in self.WORKER_FIELDS
+                    },
+                }
+                for task in tasks
+            ],
+        )
+        if (
+            actual_session.bind.dialect.supports_sane_multi_rowcount
+            and cast(CursorResult[Any], result).rowcount == len(tasks)
+        ):
+            return []
+
+        owners: Dict[int, Optional[str]] = {
+            row.id: row.lease_owner
+            for row in await actual_session.execute(
+                select(SimulationTask.id, SimulationTask.lease_owner).where(
+                    SimulationTask.id.in_({task.id for task in tasks})
+                )
+            )
+        }
+        lost: List[SimulationTask] = [
+            task for task in tasks if owners.get(task.id) != task.lease_owner
+        ]
+        for task in lost:
+            await self.log.adebug(
+                "任务租约已丢失，放弃写入",
+                task_id=task.id,
+                lease_owner=task.lease_owner,
+                status=task.status.value,
+                emoji="⛔",
+            )
+        return lost
+
+    async def release_leases(
+        self,
+        owner: str,
+        session: Optional[AsyncSession] = None,
+    ) -> int:
+        """
+        释放认领者持有、尚未开始运行的任务，放回待处理状态。
+
+        Args:
+            owner: 认领者标识。
+            session: 可选的会话对象，若提供则优先使用。
+
+        Returns:
+            释放的任务数量。
+        """
+        actual_session: AsyncSession = session or self.session
+        result = await actual_session.execute(
+            update(SimulationTask)
+            .where(
+                SimulationTask.lease_owner == owner,
+                SimulationTask.status == SimulationTaskStatus.SCHEDULED,
+            )
+            .values(
+                status=SimulationTaskStatus.PENDING,
+                scheduled_at=None,
+                lease_owner=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return cast(CursorResult[Any], result).rowcount
@@ -9,15 +9,25 @@
 from __future__ import annotations  # 解决类型前向引用问题
 
 from datetime import datetime
-from typing import Any, AsyncGenerator, List, Optional, cast
-
-from sqlalchemy import ColumnExpressionArgument, Select, and_, case, func, select
-from sqlalchemy.orm import selectinload
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Sequence, cast
+
+from sqlalchemy import (
+    ColumnExpressionArgument,
+    Select,
+    and_,
+    exists,
+    func,
+    or_,
+    select,
+)
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.orm.strategy_options import _AbstractLoad
 
 from alphapower import constants  # 导入常量模块
 from alphapower.constants import AlphaType, Delay, Region, Stage
-from alphapower.dal.alphas import AlphaDAL, SampleDAL, SettingDAL
-from alphapower.entity import Alpha, Sample, Setting
+from alphapower.dal.alphas import AlphaDAL, AlphaMetricsDAL, SampleDAL, SettingDAL
+from alphapower.entity import Alpha, AlphaMetrics, Sample
 from alphapower.internal.logging import get_logger
 
 from .alpha_fetcher_abc import AbstractAlphaFetcher
@@ -38,6 +48,7 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
         alpha_dal: AlphaDAL,
         sample_dal: SampleDAL,
         setting_dal: SettingDAL,
+        page_size: int = 1000,
         **kwargs: Any,
     ):
         """初始化 BaseAlphaFetcher。
@@ -46,9 +57,12 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
             alpha_dal: Alpha 数据访问层对象。
             sample_dal: Sample 数据访问层对象。
             setting_dal: Setting 数据访问层对象。
+            page_size: 按 ID 分页获取 Alpha 时每页的数量。
         """
         super().__init__(alpha_dal, sample_dal, setting_dal)
         self._fetched_count: int = 0  # 追踪已获取的 Alpha 数量
+        self._alpha_metrics_checked: bool = False  # 是否已检查筛选指标表
+        self.page_size: int = max(page_size, 1)
 
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
@@ -58,6 +72,40 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
             for key, value in kwargs.items():
                 setattr(self, key, value)
 
+    async def _ensure_alpha_metrics(self) -> None:
+        """首次使用时检查筛选指标表，为缺少指标行的 Alpha 补齐指标。
+
+        alpha_metrics 表是后加的物化表，升级前同步的 Alpha，以及部分同步中断后
+        遗漏刷新的 Alpha 都没有指标行，直接连接查询会静默地筛选不到它们。
+        缺失的 Alpha 以反连接查出后按 alpha_id 增量刷新；补齐与查询处于同一个
+        事务中，由调用方提交。
+        """
+        if self._alpha_metrics_checked:
+            return
+        session = self.alpha_dal.session
+        missing_alpha_ids: List[str] = list(
+            (
+                await session.scalars(
+                    select(Alpha.alpha_id).where(
+                        ~exists().where(AlphaMetrics.id == Alpha.id)
+                    )
+                )
+            ).all()
+        )
+        if missing_alpha_ids:
+            await logger.awarning(
+                "⚠️ 部分 Alpha 缺少筛选指标行，按 alpha_id 补齐",
+                emoji="⚠️",
+                missing=len(missing_alpha_ids),
+            )
+            refreshed: int = await AlphaMetricsDAL(session).refresh(missing_alpha_ids)
+            await logger.ainfo(
+                "✅ 筛选指标补齐完成",
+                emoji="✅",
+                refreshed=refreshed,
+            )
+        self._alpha_metrics_checked = True
+
     async def _build_alpha_select_query(
         self,
         **kwargs: Any,
@@ -81,12 +129,13 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
             emoji="🏗️",
             filter_kwargs=kwargs,
         )
+        await self._ensure_alpha_metrics()
 
-        # 定义连接条件别名，提高可读性
+        # 筛选条件全部落在物化的 alpha_metrics 表上，由 (stage, delay, region, sharpe)
+        # 复合索引支撑，不再需要连接 settings 和 samples 表
         query: Select = (
             select(Alpha)
-            .join(Alpha.settings)  # 连接到 Alpha 的设置
-            .join(Alpha.in_sample)  # 连接到 Alpha 的样本内数据
+            .join(AlphaMetrics, AlphaMetrics.id == Alpha.id)
             .options(
                 selectinload(Alpha.settings),  # 预加载设置
                 selectinload(Alpha.in_sample).selectinload(
@@ -98,95 +147,65 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
         # 构建筛选条件列表
         # 注意：常量中的百分比值需要除以 100 转换为小数
         criteria: List[ColumnExpressionArgument] = [
-            Alpha.stage == Stage.IS,
+            AlphaMetrics.stage == Stage.IS,
             # Sample 相关条件 (通用)
-            Sample.turnover > (constants.CONSULTANT_TURNOVER_MIN_PERCENT / 100.0),
-            Sample.turnover < (constants.CONSULTANT_TURNOVER_MAX_PERCENT / 100.0),
-            # 区域和延迟相关的条件 (使用 case 语句)
-            case(
-                (
-                    Setting.region != Region.CHN,  # 非中国区域
-                    case(
-                        (
-                            Setting.delay == Delay.ZERO,  # 延迟为 0
-                            and_(
-                                Sample.sharpe
-                                > constants.CONSULTANT_SHARPE_THRESHOLD_DELAY_0,
-                                Sample.fitness
-                                > constants.CONSULTANT_FITNESS_THRESHOLD_DELAY_0,
-                            ),
-                        ),
-                        (
-                            Setting.delay == Delay.ONE,  # 延迟为 1
-                            and_(
-                                Sample.sharpe
-                                > constants.CONSULTANT_SHARPE_THRESHOLD_DELAY_1,
-                                Sample.fitness
-                                > constants.CONSULTANT_FITNESS_THRESHOLD_DELAY_1,
-                            ),
-                        ),
-                        else_=False,  # 如果 delay 不是 0 或 1，则不满足条件
-                    ),
+            AlphaMetrics.turnover > (constants.CONSULTANT_TURNOVER_MIN_PERCENT / 100.0),
+            AlphaMetrics.turnover < (constants.CONSULTANT_TURNOVER_MAX_PERCENT / 100.0),
+            # 区域和延迟相关的条件，每个 (区域, 延迟) 组合对应一组范围谓词
+            or_(
+                and_(
+                    AlphaMetrics.region != Region.CHN,  # 非中国区域
+                    AlphaMetrics.delay == Delay.ZERO,  # 延迟为 0
+                    AlphaMetrics.sharpe > constants.CONSULTANT_SHARPE_THRESHOLD_DELAY_0,
+                    AlphaMetrics.fitness
+                    > constants.CONSULTANT_FITNESS_THRESHOLD_DELAY_0,
+                ),
+                and_(
+                    AlphaMetrics.region != Region.CHN,  # 非中国区域
+                    AlphaMetrics.delay == Delay.ONE,  # 延迟为 1
+                    AlphaMetrics.sharpe > constants.CONSULTANT_SHARPE_THRESHOLD_DELAY_1,
+                    AlphaMetrics.fitness
+                    > constants.CONSULTANT_FITNESS_THRESHOLD_DELAY_1,
                 ),
-                # 中国区域 (else 分支)
-                else_=case(
-                    (
-                        Setting.delay == Delay.ZERO,  # 延迟为 0
-                        and_(
-                            Sample.sharpe
-                            > constants.CONSULTANT_CHN_SHARPE_THRESHOLD_DELAY_0,
-                            Sample.returns
-                            > (
-                                constants.CONSULTANT_CHN_RETURNS_MIN_PERCENT_DELAY_0
-                                / 100.0
-                            ),
-                            Sample.fitness
-                            >= constants.CONSULTANT_CHN_FITNESS_THRESHOLD_DELAY_0,
-                        ),
-                    ),
-                    (
-                        Setting.delay == Delay.ONE,  # 延迟为 1
-                        and_(
-                            Sample.sharpe
-                            > constants.CONSULTANT_CHN_SHARPE_THRESHOLD_DELAY_1,
-                            Sample.returns
-                            > (
-                                constants.CONSULTANT_CHN_RETURNS_MIN_PERCENT_DELAY_1
-                                / 100.0
-                            ),
-                            Sample.fitness
-                            >= constants.CONSULTANT_CHN_FITNESS_THRESHOLD_DELAY_1,
-                        ),
-                    ),
-                    else_=False,  # 如果 delay 不是 0 或 1，则不满足条件
+                and_(
+                    AlphaMetrics.region == Region.CHN,  # 中国区域
+                    AlphaMetrics.delay == Delay.ZERO,  # 延迟为 0
+                    AlphaMetrics.sharpe
+                    > constants.CONSULTANT_CHN_SHARPE_THRESHOLD_DELAY_0,
+                    AlphaMetrics.returns
+                    > (constants.CONSULTANT_CHN_RETURNS_MIN_PERCENT_DELAY_0 / 100.0),
+                    AlphaMetrics.fitness
+                    >= constants.CONSULTANT_CHN_FITNESS_THRESHOLD_DELAY_0,
+                ),
+                and_(
+                    AlphaMetrics.region == Region.CHN,  # 中国区域
+                    AlphaMetrics.delay == Delay.ONE,  # 延迟为 1
+                    AlphaMetrics.sharpe
+                    > constants.CONSULTANT_CHN_SHARPE_THRESHOLD_DELAY_1,
+                    AlphaMetrics.returns
+                    > (constants.CONSULTANT_CHN_RETURNS_MIN_PERCENT_DELAY_1 / 100.0),
+                    AlphaMetrics.fitness
+                    >= constants.CONSULTANT_CHN_FITNESS_THRESHOLD_DELAY_1,
                 ),
             ),
-            # 超级 Alpha (Superalphas) 的特殊换手率条件
-            case(
-                (
-                    Alpha.type == AlphaType.SUPER,  # 如果是超级 Alpha
-                    and_(
-                        Sample.turnover
-                        >= (
-                            constants.CONSULTANT_SUPERALPHA_TURNOVER_MIN_PERCENT / 100.0
-                        ),
-                        Sample.turnover
-                        < (
-                            constants.CONSULTANT_SUPERALPHA_TURNOVER_MAX_PERCENT / 100.0
-                        ),
-                    ),
+            # 超级 Alpha (Superalphas) 的特殊换手率条件，其他类型不应用额外过滤
+            or_(
+                AlphaMetrics.type != AlphaType.SUPER,
+                and_(
+                    AlphaMetrics.turnover
+                    >= (constants.CONSULTANT_SUPERALPHA_TURNOVER_MIN_PERCENT / 100.0),
+                    AlphaMetrics.turnover
+                    < (constants.CONSULTANT_SUPERALPHA_TURNOVER_MAX_PERCENT / 100.0),
                 ),
-                # 如果不是超级 Alpha，则此条件为 True (不应用额外过滤)
-                else_=True,
             ),
         ]
 
         if self.start_time:
             # 如果指定了开始时间，则添加时间范围条件
-            criteria.append(Alpha.date_created >= self.start_time)
+            criteria.append(AlphaMetrics.date_created >= self.start_time)
         if self.end_time:
             # 如果指定了结束时间，则添加时间范围条件
-            criteria.append(Alpha.date_created <= self.end_time)
+            criteria.append(AlphaMetrics.date_created <= self.end_time)
 
         # 应用筛选条件到查询
         final_query: Select = query.where(and_(*criteria))
@@ -204,13 +223,22 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
 
     async def fetch_alphas(
         self,
+        relationships: Optional[Iterable[str]] = None,
         **kwargs: Any,
     ) -> AsyncGenerator[Alpha, None]:
         """异步获取符合筛选条件的 Alpha 实体。
 
-        根据 `_build_alpha_select_query` 构建的查询，执行并异步产生 Alpha 对象。
+        未指定 `relationships` 时，流式执行 `_build_alpha_select_query` 构建的查询，
+        按 Alpha 映射的默认加载方式加载所有关联关系。
+
+        指定 `relationships` 时分两个阶段获取：先按主键做 keyset 分页，只查询
+        符合条件的 Alpha ID；再按页加载 Alpha 实体，只加载声明的关联关系，
+        其余关联关系被禁止隐式加载。内存占用与页大小成正比，第一页加载完成即可
+        产出结果，不需要在整张表上保持一个游标。
 
         Args:
+            relationships: 需要加载的关联关系路径，例如 `{"settings", "in_sample.checks"}`，
+                通常来自评估阶段链的 `required_relationships()`。
             **kwargs: 传递给 `self._build_alpha_select_query` 的参数字典。
 
         Yields:
@@ -230,7 +258,12 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
         )
 
         try:
-            async for alpha in self.alpha_dal.execute_stream_query(query):
+            alphas: AsyncGenerator[Alpha, None] = (
+                self.alpha_dal.execute_stream_query(query)
+                if relationships is None
+                else self._fetch_alphas_by_page(query, sorted(set(relationships)))
+            )
+            async for alpha in alphas:
                 self._fetched_count += 1
                 await logger.adebug(
                     "🔍 获取到 Alpha",
@@ -254,6 +287,102 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
             )
             raise  # 重新抛出异常，让上层处理
 
+    async def _fetch_alphas_by_page(
+        self,
+        query: Select,
+        relationships: List[str],
+    ) -> AsyncGenerator[Alpha, None]:
+        """按 ID 分页加载 Alpha 实体，每页只加载声明的关联关系。
+
+        Args:
+            query: `_build_alpha_select_query` 构建的筛选查询。
+            relationships: 需要加载的关联关系路径。
+
+        Yields:
+            按主键顺序逐个返回 `Alpha` 实体对象。
+        """
+        loader_options: List[LoaderOption] = [
+            self._relationship_loader(path) for path in relationships
+        ]
+        # 未声明的关联关系禁止隐式加载，避免每行都连接全部设置和样本表
+        loader_options.append(raiseload("*"))
+        await logger.adebug(
+            "按 ID 分页获取 Alpha",
+            emoji="📑",
+            page_size=self.page_size,
+            relationships=relationships,
+        )
+
+        async for alpha_ids in self._stream_alpha_ids(query):
+            result = await self.alpha_dal.session.execute(
+                select(Alpha).where(Alpha.id.in_(alpha_ids)).options(*loader_options)
+            )
+            alphas: Dict[int, Alpha] = {alpha.id: alpha for alpha in result.scalars()}
+            for alpha_id in alpha_ids:
+                if alpha_id in alphas:
+                    yield alphas[alpha_id]
+
+    async def _stream_alpha_ids(self, query: Select) -> AsyncGenerator[List[int], None]:
+        """以 keyset 分页逐页查询符合筛选条件的 Alpha ID。
+
+        每页以上一页最大的 ID 为起点，查询耗时不随页码增长，也不需要长时间
+        占用数据库游标。
+
+        Args:
+            query: `_build_alpha_select_query` 构建的筛选查询。
+
+        Yields:
+            每页按升序排列的 Alpha ID 列表。
+        """
+        id_query: Select = (
+            query.with_only_columns(Alpha.id)
+            .order_by(None)
+            .order_by(Alpha.id)
+            .limit(self.page_size)
+        )
+        last_id: Optional[int] = None
+        while True:
+            page_query: Select = (
+                id_query if last_id is None else id_query.where(Alpha.id > last_id)
+            )
+            result = await self.alpha_dal.session.execute(page_query)
+            alpha_ids: Sequence[int] = result.scalars().all()
+            if not alpha_ids:
+                return
+            yield list(alpha_ids)
+            if len(alpha_ids) < self.page_size:
+                return
+            last_id = alpha_ids[-1]
+
+    @staticmethod
+    def _relationship_loader(path: str) -> LoaderOption:
+        """将关联关系路径转换为 selectin 加载选项。
+
+        Args:
+            path: 以点号连接的关联关系路径，例如 "in_sample.checks"。
+
+        Returns:
+            对应的 SQLAlchemy 加载选项。
+
+        Raises:
+            ValueError: 路径中包含不存在的关联关系。
+        """
+        entity: Any = Alpha
+        loader: Optional[_AbstractLoad] = None
+        for name in path.split("."):
+            attribute: Any = getattr(entity, name, None)
+            if attribute is None or not hasattr(attribute.property, "mapper"):
+                raise ValueError(f"{entity.__name__} 没有关联关系 {name} ({path})")
+            loader = (
+                selectinload(attribute)
+                if loader is None
+                else loader.selectinload(attribute)
+            )
+            entity = attribute.property.mapper.class_
+        if loader is None:
+            raise ValueError(f"关联关系路径为空 ({path})")
+        return loader
+
     async def total_alpha_count(
         self,
         **kwargs: Any,
@@ -270,9 +399,9 @@ class BaseAlphaFetcher(AbstractAlphaFetcher):
         """
         await logger.ainfo("🔢 开始计算 Alpha 总数", emoji="🔢", **kwargs)
         query: Select = await self._build_alpha_select_query(**kwargs)
-        # 计算符合条件的 Alpha 实体总数
+        # 计算符合条件的 Alpha 实体总数，只投影 ID 列，计数可直接走索引
         count_query = select(func.count()).select_from(  # pylint: disable=E1102
-            query.subquery()
+            query.with_only_columns(Alpha.id).subquery()
         )
         await logger.adebug("构建的计数查询", query=str(count_query))
 
@@ -1,12 +1,14 @@
 import asyncio
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from alphapower.client import (
     BeforeAndAfterPerformanceView,
+    PollManager,
     SubmissionCheckResultView,
     TableView,
     WorldQuantClient,
 )
+from alphapower.client import poll_manager as shared_poll_manager
 from alphapower.constants import (
     CONSULTANT_MAX_PROD_CORRELATION,
     CONSULTANT_MAX_SELF_CORRELATION,
@@ -24,7 +26,10 @@ from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
 from alphapower.entity import Alpha, CheckRecord, EvaluateRecord
 from alphapower.internal.logging import get_logger
 
+from .check_record_cache import CheckRecordCache
+from .evaluate_write_buffer import EvaluateWriteBuffer
 from .correlation_calculator import CorrelationCalculator
+from .stage_statistics import StageStatistics
 
 log = get_logger(module_name=__name__)
 
@@ -56,6 +61,17 @@ class InSampleChecksEvaluateStage(AbstractEvaluateStage):
         super().__init__(next_stage)
         self._check_pass_result_map = check_pass_result_map
 
+    def _stage_config(self) -> Dict[str, Any]:
+        return {
+            "check_pass_result_map": {
+                check_type.name: sorted(result.name for result in results)
+                for check_type, results in self._check_pass_result_map.items()
+            }
+        }
+
+    def _stage_relationships(self) -> Set[str]:
+        return {"in_sample.checks"}
+
     async def _evaluate_stage(
         self,
         alpha: Alpha,
@@ -180,6 +196,31 @@ class InSampleChecksEvaluateStage(AbstractEvaluateStage):
         return True
 
 
+class _CorrelationBatch:
+    """
+    同一批 Alpha 的本地相关性预计算状态。
+    """
+
+    __slots__ = (
+        "alphas",
+        "pool_correlations",
+        "peer_correlations",
+        "passed_alpha_ids",
+        "computed",
+        "lock",
+    )
+
+    def __init__(self, alphas: List[Alpha]) -> None:
+        # 尚未结束评估的 Alpha，被上游阶段拒绝的 Alpha 会在计算前移除
+        self.alphas: Dict[str, Alpha] = {alpha.alpha_id: alpha for alpha in alphas}
+        self.pool_correlations: Dict[str, Dict[str, float]] = {}
+        self.peer_correlations: Dict[str, Dict[str, float]] = {}
+        # 本批次中已通过本阶段的 Alpha
+        self.passed_alpha_ids: Set[str] = set()
+        self.computed: bool = False
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+
 class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
     """
     本地相关性评估阶段，用于检查 Alpha 的自相关性。
@@ -189,6 +230,7 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
         self,
         next_stage: Optional[AbstractEvaluateStage],
         correlation_calculator: CorrelationCalculator,
+        reject_batch_duplicates: bool = True,
     ) -> None:
         """
         初始化本地相关性评估阶段。
@@ -196,9 +238,94 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
         Args:
             next_stage: 下一个评估阶段 (责任链中的下一个节点)。
             correlation_calculator: 相关性计算器实例。
+            reject_batch_duplicates: 是否拒绝与同批次中已通过本阶段的 Alpha
+                高度相关的 Alpha。
         """
         super().__init__(next_stage)
         self.correlation_calculator: CorrelationCalculator = correlation_calculator
+        self.reject_batch_duplicates: bool = reject_batch_duplicates
+        # 每个尚未结束评估的 Alpha 所属的批次，批次中的 Alpha 全部结束后即被释放
+        self._batches: Dict[str, _CorrelationBatch] = {}
+
+    def _stage_config(self) -> Dict[str, Any]:
+        return {
+            "max_correlation": CONSULTANT_MAX_SELF_CORRELATION,
+            "reject_batch_duplicates": self.reject_batch_duplicates,
+        }
+
+    def _stage_relationships(self) -> Set[str]:
+        # 相关性计算按 Alpha 的区域选择对比的因子池
+        return {"settings"}
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        登记同一批 Alpha，批量相关性在本批次第一个 Alpha 进入本阶段时才计算，
+        只计算尚未结束评估的 Alpha，跳过已被上游阶段拒绝的 Alpha。
+
+        Args:
+            alphas: 同一批次的待评估 Alpha 列表。
+            policy: 刷新策略 (未使用)。
+            kwargs: 其他参数。
+        """
+        batch: _CorrelationBatch = _CorrelationBatch(alphas)
+        for alpha_id in batch.alphas:
+            self._batches[alpha_id] = batch
+
+    async def _finish_alpha_stage(self, alpha: Alpha) -> None:
+        """
+        Alpha 结束评估后从所属批次中移除，批次中的 Alpha 全部结束后批次即被释放。
+
+        Args:
+            alpha: 已结束评估的 Alpha。
+        """
+        batch: Optional[_CorrelationBatch] = self._batches.pop(alpha.alpha_id, None)
+        if batch is None:
+            return
+        batch.alphas.pop(alpha.alpha_id, None)
+        batch.pool_correlations.pop(alpha.alpha_id, None)
+        batch.peer_correlations.pop(alpha.alpha_id, None)
+
+    async def _close_stage(self) -> None:
+        """
+        批量评估结束后释放批次状态，并关闭相关性计算器的进程池与共享矩阵文件。
+        """
+        self._batches = {}
+        await self.correlation_calculator.close()
+
+    async def _compute_batch(self, batch: _CorrelationBatch) -> None:
+        """
+        批量计算批次中尚未结束评估的 Alpha 与池中 Alpha 以及彼此之间的相关性。
+
+        Args:
+            batch: 待计算的批次。
+        """
+        async with batch.lock:
+            if batch.computed:
+                return
+            batch.computed = True
+            try:
+                pool_correlations, peer_correlations = (
+                    await self.correlation_calculator.calculate_correlation_many(
+                        list(batch.alphas.values())
+                    )
+                )
+            except Exception as e:
+                # 批量计算只是优化，失败时回退到逐个计算
+                await log.awarning(
+                    "批量计算自相关性失败，将回退到逐个计算",
+                    emoji="⚠️",
+                    batch_size=len(batch.alphas),
+                    error=str(e),
+                    exc_info=True,
+                )
+                return
+            batch.pool_correlations.update(pool_correlations)
+            batch.peer_correlations.update(peer_correlations)
 
     async def _evaluate_stage(
         self,
@@ -221,11 +348,22 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
             bool: 如果检查通过返回 True，否则返回 False。
         """
         try:
-            pairwise_correlation: Dict[str, float] = (
-                await self.correlation_calculator.calculate_correlation(
-                    alpha=alpha,
+            batch: Optional[_CorrelationBatch] = self._batches.get(alpha.alpha_id)
+            pairwise_correlation: Optional[Dict[str, float]] = None
+            peer_correlation: Dict[str, float] = {}
+            if batch is not None:
+                await self._compute_batch(batch)
+                pairwise_correlation = batch.pool_correlations.pop(alpha.alpha_id, None)
+                peer_correlation = batch.peer_correlations.pop(alpha.alpha_id, {})
+            from_batch: bool = pairwise_correlation is not None
+            max_is_exact: bool = True
+            if pairwise_correlation is None:
+                # 启用草图剪枝时只精确计算少量池中 Alpha，是否超过阈值的结论不受影响
+                pairwise_correlation, max_is_exact = (
+                    await self.correlation_calculator.calculate_correlation_pruned(
+                        alpha=alpha,
+                    )
                 )
-            )
 
             max_corr: float = max(pairwise_correlation.values(), default=0.0)
             min_corr: float = min(pairwise_correlation.values(), default=0.0)
@@ -237,6 +375,7 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
                 record_self_correlation=record.self_correlation,
                 max_corr=max_corr,
                 min_corr=min_corr,
+                max_is_exact=max_is_exact,
             )
 
             record.self_correlation = max(
@@ -252,6 +391,29 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
                 )
                 return False
 
+            if self.reject_batch_duplicates:
+                max_peer_corr: float = max(
+                    (
+                        corr
+                        for peer_alpha_id, corr in peer_correlation.items()
+                        if batch is not None and peer_alpha_id in batch.passed_alpha_ids
+                    ),
+                    default=0.0,
+                )
+                if max_peer_corr > CONSULTANT_MAX_SELF_CORRELATION:
+                    record.self_correlation = max(
+                        record.self_correlation, max_peer_corr
+                    )
+                    await log.awarning(
+                        "自相关性检查未通过，与同批次已通过的 Alpha 相关性超过阈值",
+                        emoji="❌",
+                        alpha_id=alpha.alpha_id,
+                        max_peer_corr=max_peer_corr,
+                    )
+                    return False
+
+            if from_batch and batch is not None:
+                batch.passed_alpha_ids.add(alpha.alpha_id)
             await log.ainfo(
                 "自相关性检查通过",
                 emoji="✅",
@@ -260,6 +422,7 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
             )
             return True
         except asyncio.TimeoutError as e:
+            self._report_error()
             # 分类处理网络超时异常
             await log.awarning(
                 "计算自相关性时发生超时异常，可能需要重试",
@@ -269,6 +432,7 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
             )
             return False
         except ValueError as e:
+            self._report_error()
             # 分类处理数据解析异常
             await log.aerror(
                 "计算自相关性时发生数据解析异常",
@@ -279,6 +443,7 @@ class CorrelationLocalEvaluateStage(AbstractEvaluateStage):
             )
             return False
         except Exception as e:
+            self._report_error()
             # 捕获其他异常并记录为 CRITICAL
             await log.acritical(
                 "💥 计算自相关性时发生未知异常，程序可能无法继续",
@@ -302,6 +467,9 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
         check_record_dal: CheckRecordDAL,
         correlation_dal: CorrelationDAL,
         client: WorldQuantClient,
+        check_record_cache: Optional[CheckRecordCache] = None,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
+        poll_manager: Optional[PollManager] = None,
     ) -> None:
         """
         初始化平台相关性评估阶段。
@@ -312,12 +480,50 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
             check_record_dal: 检查记录数据访问层实例。
             correlation_dal: 相关性数据访问层实例。
             client: 平台客户端实例。
+            check_record_cache: 检查记录查找缓存，多个阶段共享同一个缓存时
+                每批 Alpha 只需一次查询；为 None 时使用阶段私有的缓存。
+            write_buffer: 检查记录的写后缓冲区，多个阶段共享同一个缓冲区时
+                检查记录分组提交；为 None 时每条记录立即提交。
+            poll_manager: 平台异步检查的轮询管理器，为 None 时使用共享的轮询管理器。
         """
         super().__init__(next_stage)
         self.correlation_type: CorrelationType = correlation_type
         self.check_record_dal: CheckRecordDAL = check_record_dal
         self.correlation_dal: CorrelationDAL = correlation_dal
         self.client: WorldQuantClient = client
+        self.check_record_cache: CheckRecordCache = (
+            check_record_cache or CheckRecordCache(check_record_dal)
+        )
+        self.check_record_cache.register(self._record_type)
+        self.write_buffer: EvaluateWriteBuffer = write_buffer or EvaluateWriteBuffer(
+            check_record_dal.session, flush_size=1
+        )
+        self.poll_manager: PollManager = poll_manager or shared_poll_manager
+
+    def _stage_config(self) -> Dict[str, Any]:
+        return {
+            "correlation_type": self.correlation_type.name,
+            "max_correlation": CONSULTANT_MAX_SELF_CORRELATION,
+        }
+
+    @property
+    def _record_type(self) -> CheckRecordType:
+        return (
+            CheckRecordType.CORRELATION_SELF
+            if self.correlation_type == CorrelationType.SELF
+            else CheckRecordType.CORRELATION_PROD
+        )
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        批量预取整批 Alpha 的最新检查记录。
+        """
+        await self.check_record_cache.prefetch([alpha.alpha_id for alpha in alphas])
 
     async def _evaluate_stage(
         self,
@@ -338,11 +544,7 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
         Returns:
             bool: 如果检查通过返回 True，否则返回 False。
         """
-        record_type: CheckRecordType = (
-            CheckRecordType.CORRELATION_SELF
-            if self.correlation_type == CorrelationType.SELF
-            else CheckRecordType.CORRELATION_PROD
-        )
+        record_type: CheckRecordType = self._record_type
         check_type_name: str = (
             "自相关性"
             if self.correlation_type == CorrelationType.SELF
@@ -351,11 +553,7 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
 
         try:
             exist_check_record: Optional[CheckRecord] = (
-                await self.check_record_dal.find_one_by(
-                    alpha_id=alpha.alpha_id,
-                    record_type=record_type,
-                    order_by=CheckRecord.created_at.desc(),
-                )
+                await self.check_record_cache.get_latest(alpha.alpha_id, record_type)
             )
             await log.adebug(
                 f"查询现有{check_type_name}检查记录结果",
@@ -445,6 +643,7 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
                 )
                 return False
         except Exception as e:
+            self._report_error()
             await log.aerror(
                 f"检查 {check_type_name} 时发生异常",
                 emoji="💥",
@@ -474,7 +673,9 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
                 alpha_id=alpha.alpha_id,
                 max_retries=max_retries,
             )
-            while retry_count < max_retries:
+
+            async def poll() -> Tuple[bool, Optional[float], Optional[TableView]]:
+                nonlocal retry_count
                 finished: bool
                 retry_after: Optional[float]
                 api_result: Optional[TableView]
@@ -493,66 +694,69 @@ class CorrelationPlatformEvaluateStage(AbstractEvaluateStage):
                     api_result=bool(api_result),
                 )
                 if finished:
-                    if api_result:
-                        await log.ainfo(
-                            "相关性数据 API 获取成功",
-                            emoji="🎉",
-                            alpha_id=alpha.alpha_id,
-                            corr_type=self.correlation_type,
-                        )
-                        check_record: CheckRecord = CheckRecord(
-                            alpha_id=alpha.alpha_id,
-                            record_type=(
-                                CheckRecordType.CORRELATION_SELF
-                                if self.correlation_type == CorrelationType.SELF
-                                else CheckRecordType.CORRELATION_PROD
-                            ),
-                            content=api_result.model_dump(mode="python"),
-                        )
-                        await self.check_record_dal.create(check_record)
-                        # FIXME: 这里因为没有 commit 导致没有及时持久化数据
-                        await self.check_record_dal.session.commit()
-                        await log.adebug(
-                            "相关性数据已保存到数据库",
-                            emoji="💾",
-                            alpha_id=alpha.alpha_id,
-                            record_type=check_record.record_type,
-                        )
-                        return api_result
-                    else:
-                        await log.awarning(
-                            "相关性检查 API 声称完成，但未返回有效结果",
-                            emoji="❓",
-                            alpha_id=alpha.alpha_id,
-                            corr_type=self.correlation_type,
-                        )
-                        return None
-                elif retry_after and retry_after > 0:
+                    return True, None, api_result
+                if retry_after and retry_after > 0:
                     await log.adebug(
                         "API 请求未完成，等待重试",
                         emoji="⏳",
                         alpha_id=alpha.alpha_id,
                         retry_after=retry_after,
                     )
-                    await asyncio.sleep(retry_after)
-                else:
-                    retry_count += 1
-                    await log.awarning(
-                        "相关性检查 API 返回异常状态：未完成且无重试时间",
-                        emoji="⚠️",
-                        alpha_id=alpha.alpha_id,
-                        corr_type=self.correlation_type,
-                        retry_count=retry_count,
-                    )
-            await log.acritical(
-                "相关性检查 API 多次重试失败，程序可能无法继续",
-                emoji="💥",
+                    return False, retry_after, None
+                retry_count += 1
+                await log.awarning(
+                    "相关性检查 API 返回异常状态：未完成且无重试时间",
+                    emoji="⚠️",
+                    alpha_id=alpha.alpha_id,
+                    corr_type=self.correlation_type,
+                    retry_count=retry_count,
+                )
+                # 重试次数用尽时结束轮询，由调用方记录失败
+                return retry_count >= max_retries, None, None
+
+            api_result: Optional[TableView] = await self.poll_manager.poll(
+                poll, key=alpha.alpha_id
+            )
+            if retry_count >= max_retries:
+                await log.acritical(
+                    "相关性检查 API 多次重试失败，程序可能无法继续",
+                    emoji="💥",
+                    alpha_id=alpha.alpha_id,
+                    corr_type=self.correlation_type,
+                    max_retries=max_retries,
+                )
+                return None
+            if not api_result:
+                await log.awarning(
+                    "相关性检查 API 声称完成，但未返回有效结果",
+                    emoji="❓",
+                    alpha_id=alpha.alpha_id,
+                    corr_type=self.correlation_type,
+                )
+                return None
+
+            await log.ainfo(
+                "相关性数据 API 获取成功",
+                emoji="🎉",
                 alpha_id=alpha.alpha_id,
                 corr_type=self.correlation_type,
-                max_retries=max_retries,
             )
-            return None
+            check_record: CheckRecord = CheckRecord(
+                alpha_id=alpha.alpha_id,
+                record_type=self._record_type,
+                content=api_result.model_dump(mode="python"),
+            )
+            await self.write_buffer.add(check_record)
+            self.check_record_cache.put(check_record)
+            await log.adebug(
+                "相关性数据已保存到数据库",
+                emoji="💾",
+                alpha_id=alpha.alpha_id,
+                record_type=check_record.record_type,
+            )
+            return api_result
         except Exception as e:
+            self._report_error()
             await log.aerror(
                 "刷新相关性数据时发生异常",
                 emoji="💥",
@@ -575,17 +779,45 @@ class PerformanceDiffEvaluateStage(AbstractEvaluateStage):
         competition_id: Optional[str],
         check_record_dal: CheckRecordDAL,
         client: WorldQuantClient,
+        check_record_cache: Optional[CheckRecordCache] = None,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
+        poll_manager: Optional[PollManager] = None,
     ) -> None:
         """
         初始化业绩对比评估阶段。
 
         Args:
             competition_id: 如果提供，则执行竞赛专用业绩对比，否则执行普通业绩对比。
+            check_record_cache: 检查记录查找缓存，为 None 时使用阶段私有的缓存。
+            write_buffer: 检查记录的写后缓冲区，为 None 时每条记录立即提交。
+            poll_manager: 平台异步检查的轮询管理器，为 None 时使用共享的轮询管理器。
         """
         super().__init__(next_stage)
         self.competition_id = competition_id
         self.check_record_dal = check_record_dal
         self.client = client
+        self.check_record_cache: CheckRecordCache = (
+            check_record_cache or CheckRecordCache(check_record_dal)
+        )
+        self.check_record_cache.register(CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE)
+        self.write_buffer: EvaluateWriteBuffer = write_buffer or EvaluateWriteBuffer(
+            check_record_dal.session, flush_size=1
+        )
+        self.poll_manager: PollManager = poll_manager or shared_poll_manager
+
+    def _stage_config(self) -> Dict[str, Any]:
+        return {"competition_id": self.competition_id}
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        批量预取整批 Alpha 的最新检查记录。
+        """
+        await self.check_record_cache.prefetch([alpha.alpha_id for alpha in alphas])
 
     async def _evaluate_stage(
         self,
@@ -647,6 +879,7 @@ class PerformanceDiffEvaluateStage(AbstractEvaluateStage):
             return result
 
         except Exception as e:
+            self._report_error()
             await log.aerror(
                 f"{check_type_name}评估时发生异常",
                 emoji="💥",
@@ -676,14 +909,15 @@ class PerformanceDiffEvaluateStage(AbstractEvaluateStage):
         Returns:
             Optional[BeforeAndAfterPerformanceView]: 业绩对比数据。
         """
+        exist_check_record: Optional[CheckRecord] = (
+            await self.check_record_cache.get_latest(
+                alpha.alpha_id, CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE
+            )
+        )
         # 根据策略决定是否刷新数据
         action = await self._determine_check_action(
             policy=policy,
-            exist_check_record=await self.check_record_dal.find_one_by(
-                alpha_id=alpha.alpha_id,
-                record_type=CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE,
-                order_by=CheckRecord.created_at.desc(),
-            ),
+            exist_check_record=exist_check_record,
             alpha_id=alpha.alpha_id,
             check_type_name=check_type_name,
         )
@@ -691,13 +925,8 @@ class PerformanceDiffEvaluateStage(AbstractEvaluateStage):
         if action == AbstractEvaluateStage.CheckAction.REFRESH:
             return await self._refresh_alpha_pool_performance_diff(alpha)
         elif action == AbstractEvaluateStage.CheckAction.USE_EXISTING:
-            record = await self.check_record_dal.find_one_by(
-                alpha_id=alpha.alpha_id,
-                record_type=CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE,
-                order_by=CheckRecord.created_at.desc(),
-            )
-            if record:
-                return BeforeAndAfterPerformanceView(**record.content)
+            if exist_check_record:
+                return BeforeAndAfterPerformanceView(**exist_check_record.content)
         elif action in {
             AbstractEvaluateStage.CheckAction.SKIP,
             AbstractEvaluateStage.CheckAction.FAIL_MISSING,
@@ -725,45 +954,51 @@ class PerformanceDiffEvaluateStage(AbstractEvaluateStage):
             competition_id=self.competition_id,
         )
         try:
-            async with self.client:
-                finished: bool = False
-                while not finished:
-                    finished, retry_after, result = (
-                        await self.client.alpha_fetch_before_and_after_performance(
-                            alpha_id=alpha.alpha_id,
-                            competition_id=self.competition_id,
-                        )
+
+            async def poll() -> (
+                Tuple[bool, Optional[float], Optional[BeforeAndAfterPerformanceView]]
+            ):
+                finished, retry_after, result = (
+                    await self.client.alpha_fetch_before_and_after_performance(
+                        alpha_id=alpha.alpha_id,
+                        competition_id=self.competition_id,
                     )
-                    if finished and result:
-                        await self.check_record_dal.create(
-                            CheckRecord(
-                                alpha_id=alpha.alpha_id,
-                                record_type=CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE,
-                                content=result.model_dump(mode="json"),
-                            )
-                        )
-                        # FIXME: 这里因为没有 commit 导致没有及时持久化数据
-                        await self.check_record_dal.session.commit()
-                        return result
-                    elif retry_after and retry_after > 0:
-                        await log.adebug(
-                            "等待重试",
-                            emoji="⏳",
-                            alpha_id=alpha.alpha_id,
-                            competition_id=self.competition_id,
-                            retry_after=retry_after,
-                        )
-                        await asyncio.sleep(retry_after)
-                    else:
-                        await log.awarning(
-                            "刷新因子池绩效差异数据时发生异常",
-                            emoji="⚠️",
-                            alpha_id=alpha.alpha_id,
-                            competition_id=self.competition_id,
-                            retry_after=retry_after,
-                        )
-                        return None
+                )
+                if finished:
+                    return True, None, result
+                if retry_after and retry_after > 0:
+                    await log.adebug(
+                        "等待重试",
+                        emoji="⏳",
+                        alpha_id=alpha.alpha_id,
+                        competition_id=self.competition_id,
+                        retry_after=retry_after,
+                    )
+                    return False, retry_after, None
+                await log.awarning(
+                    "刷新因子池绩效差异数据时发生异常",
+                    emoji="⚠️",
+                    alpha_id=alpha.alpha_id,
+                    competition_id=self.competition_id,
+                    retry_after=retry_after,
+                )
+                return True, None, None
+
+            async with self.client:
+                result: Optional[BeforeAndAfterPerformanceView] = (
+                    await self.poll_manager.poll(poll, key=alpha.alpha_id)
+                )
+            if result:
+                check_record: CheckRecord = CheckRecord(
+                    alpha_id=alpha.alpha_id,
+                    record_type=CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE,
+                    content=result.model_dump(mode="json"),
+                )
+                await self.write_buffer.add(check_record)
+                self.check_record_cache.put(check_record)
+                return result
         except Exception as e:
+            self._report_error()
             await log.aerror(
                 "刷新因子池绩效差异数据时发生异常",
                 emoji="💥",
@@ -805,6 +1040,9 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
         next_stage: Optional[AbstractEvaluateStage],
         check_record_dal: CheckRecordDAL,
         client: WorldQuantClient,
+        check_record_cache: Optional[CheckRecordCache] = None,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
+        poll_manager: Optional[PollManager] = None,
     ) -> None:
         """
         初始化提交检查评估阶段。
@@ -813,10 +1051,32 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
             next_stage: 下一个评估阶段 (责任链中的下一个节点)。
             check_record_dal: 检查记录数据访问层实例。
             client: 平台客户端实例。
+            check_record_cache: 检查记录查找缓存，为 None 时使用阶段私有的缓存。
+            write_buffer: 检查记录的写后缓冲区，为 None 时每条记录立即提交。
+            poll_manager: 平台异步检查的轮询管理器，为 None 时使用共享的轮询管理器。
         """
         super().__init__(next_stage)
         self.check_record_dal = check_record_dal
         self.client = client
+        self.check_record_cache: CheckRecordCache = (
+            check_record_cache or CheckRecordCache(check_record_dal)
+        )
+        self.check_record_cache.register(CheckRecordType.SUBMISSION)
+        self.write_buffer: EvaluateWriteBuffer = write_buffer or EvaluateWriteBuffer(
+            check_record_dal.session, flush_size=1
+        )
+        self.poll_manager: PollManager = poll_manager or shared_poll_manager
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        批量预取整批 Alpha 的最新检查记录。
+        """
+        await self.check_record_cache.prefetch([alpha.alpha_id for alpha in alphas])
 
     async def _evaluate_stage(
         self,
@@ -851,11 +1111,7 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
         try:
             # 查找现有的检查记录
             exist_check_record: Optional[CheckRecord] = (
-                await self.check_record_dal.find_one_by(
-                    alpha_id=alpha.alpha_id,
-                    record_type=record_type,
-                    order_by=CheckRecord.created_at.desc(),
-                )
+                await self.check_record_cache.get_latest(alpha.alpha_id, record_type)
             )
             await log.adebug(
                 f"查询现有{check_type_name}检查记录结果",
@@ -892,6 +1148,7 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
                             **exist_check_record.content
                         )
                     except (TypeError, ValueError, KeyError) as parse_err:
+                        self._report_error()
                         await log.aerror(
                             f"解析现有{check_type_name}记录时出错",
                             emoji="❌",
@@ -939,6 +1196,7 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
             return False
 
         except Exception as e:
+            self._report_error()
             await log.aerror(
                 f"{check_type_name}评估时发生异常",
                 emoji="💥",
@@ -967,44 +1225,48 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
             alpha_id=alpha.alpha_id,
         )
         try:
-            async with self.client:
-                finished: bool = False
-                retry_after: Optional[float] = None
-                result: Optional[SubmissionCheckResultView] = None
-                while not finished:
-                    finished, retry_after, result, _ = (
-                        await self.client.alpha_fetch_submission_check_result(
-                            alpha_id=alpha.alpha_id,
-                        )
+
+            async def poll() -> (
+                Tuple[bool, Optional[float], Optional[SubmissionCheckResultView]]
+            ):
+                finished, retry_after, result, _ = (
+                    await self.client.alpha_fetch_submission_check_result(
+                        alpha_id=alpha.alpha_id,
                     )
-                    if finished and result:
-                        await self.check_record_dal.create(
-                            CheckRecord(
-                                alpha_id=alpha.alpha_id,
-                                record_type=CheckRecordType.SUBMISSION,
-                                content=result.model_dump(),
-                            )
-                        )
-                        # FIXME: 这里因为没有 commit 导致没有及时持久化数据
-                        await self.check_record_dal.session.commit()
-                        return result
-                    elif retry_after and retry_after > 0:
-                        await log.adebug(
-                            "等待重试",
-                            emoji="⏳",
-                            alpha_id=alpha.alpha_id,
-                            retry_after=retry_after,
-                        )
-                        await asyncio.sleep(retry_after)
-                    else:
-                        await log.awarning(
-                            "刷新提交检查数据时发生异常",
-                            emoji="⚠️",
-                            alpha_id=alpha.alpha_id,
-                            retry_after=retry_after,
-                        )
-                        return None
+                )
+                if finished:
+                    return True, None, result
+                if retry_after and retry_after > 0:
+                    await log.adebug(
+                        "等待重试",
+                        emoji="⏳",
+                        alpha_id=alpha.alpha_id,
+                        retry_after=retry_after,
+                    )
+                    return False, retry_after, None
+                await log.awarning(
+                    "刷新提交检查数据时发生异常",
+                    emoji="⚠️",
+                    alpha_id=alpha.alpha_id,
+                    retry_after=retry_after,
+                )
+                return True, None, None
+
+            async with self.client:
+                result: Optional[SubmissionCheckResultView] = (
+                    await self.poll_manager.poll(poll, key=alpha.alpha_id)
+                )
+            if result:
+                check_record: CheckRecord = CheckRecord(
+                    alpha_id=alpha.alpha_id,
+                    record_type=CheckRecordType.SUBMISSION,
+                    content=result.model_dump(),
+                )
+                await self.write_buffer.add(check_record)
+                self.check_record_cache.put(check_record)
+                return result
         except Exception as e:
+            self._report_error()
             await log.aerror(
                 "刷新提交检查数据时发生异常",
                 emoji="💥",
@@ -1040,3 +1302,264 @@ class SubmissionEvaluateStage(AbstractEvaluateStage):
                 return False
 
         return True
+
+
+class ParallelEvaluateStage(AbstractEvaluateStage):
+    """
+    并行评估阶段，在同一个评估记录上并发执行多个互不依赖的评估分支。
+
+    每个分支本身可以是一条责任链。所有分支都通过后才进入下一个阶段；任一分支
+    失败或抛出异常时立即取消其余仍在运行的分支，评估耗时约等于最慢的分支。
+    与串联的阶段组合使用即可表示由串行段和并行段组成的阶段图。
+    """
+
+    def __init__(
+        self,
+        next_stage: Optional[AbstractEvaluateStage],
+        branches: List[AbstractEvaluateStage],
+    ) -> None:
+        """
+        初始化并行评估阶段。
+
+        Args:
+            next_stage: 下一个评估阶段 (责任链中的下一个节点)。
+            branches: 并发执行的评估分支，各分支不应依赖彼此写入评估记录的字段。
+        """
+        super().__init__(next_stage)
+        self.branches: List[AbstractEvaluateStage] = branches
+
+    def _stage_config(self) -> Dict[str, Any]:
+        return {"branches": [branch.describe() for branch in self.branches]}
+
+    def _stage_relationships(self) -> Set[str]:
+        return set().union(
+            *(branch.required_relationships() for branch in self.branches)
+        )
+
+    def _sub_stages(self) -> List[AbstractEvaluateStage]:
+        return list(self.branches)
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        将批量预处理传递给每个分支。
+        """
+        for branch in self.branches:
+            await branch.prepare_batch(alphas, policy, **kwargs)
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        并发执行所有分支，任一分支失败时取消其余分支。
+
+        Args:
+            alpha: 待评估的 Alpha 对象。
+            policy: 刷新策略。
+            record: 当前评估的记录对象。
+            kwargs: 其他参数。
+
+        Returns:
+            bool: 所有分支都通过返回 True，否则返回 False。
+        """
+        branch_tasks: Dict["asyncio.Task[Any]", AbstractEvaluateStage] = {
+            asyncio.create_task(
+                branch.evaluate(alpha, policy, record, **kwargs),
+                name=f"{branch.__class__.__name__}-{alpha.alpha_id}",
+            ): branch
+            for branch in self.branches
+        }
+        pending: Set["asyncio.Task[Any]"] = set(branch_tasks)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    # 分支抛出的异常在此处重新抛出，由 finally 取消其余分支
+                    _, passed = task.result()
+                    if not passed:
+                        await log.ainfo(
+                            "并行分支评估失败，取消其余分支",
+                            emoji="🛑",
+                            alpha_id=alpha.alpha_id,
+                            failed_branch=branch_tasks[task].__class__.__name__,
+                            cancelled=len(pending),
+                        )
+                        return False
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        await log.adebug(
+            "并行分支评估全部通过",
+            emoji="✅",
+            alpha_id=alpha.alpha_id,
+            branches=len(self.branches),
+        )
+        return True
+
+
+class AdaptiveOrderEvaluateStage(AbstractEvaluateStage):
+    """
+    自适应排序评估阶段，根据运行统计动态调整一组可重排阶段的执行顺序。
+
+    对每个阶段记录通过率 p 与平均耗时 c，按 c / (1 - p) 从小到大依次执行，
+    即"代价最低的淘汰优先" (cheapest-rejection-first)，使被淘汰的 Alpha 尽早
+    停止评估，减少耗时的平台轮询调用。尚无样本的阶段耗时视为 0 而排在最前，
+    以便尽快获得统计。阶段之间的先后约束通过 `constraints` 声明。
+    """
+
+    def __init__(
+        self,
+        next_stage: Optional[AbstractEvaluateStage],
+        stages: List[AbstractEvaluateStage],
+        constraints: Optional[
+            List[Tuple[AbstractEvaluateStage, AbstractEvaluateStage]]
+        ] = None,
+    ) -> None:
+        """
+        初始化自适应排序评估阶段。
+
+        Args:
+            next_stage: 下一个评估阶段 (责任链中的下一个节点)。
+            stages: 可重排的评估阶段，每个阶段都不能再有 next_stage。
+            constraints: 先后约束列表，(a, b) 表示阶段 a 必须在阶段 b 之前执行。
+
+        Raises:
+            ValueError: 阶段带有 next_stage、约束引用了未知阶段或约束存在环。
+        """
+        super().__init__(next_stage)
+        for stage in stages:
+            if stage.next_stage is not None:
+                raise ValueError(
+                    f"可重排阶段 {stage.__class__.__name__} 不能设置 next_stage"
+                )
+        self.stages: List[AbstractEvaluateStage] = stages
+        self._predecessors: Dict[AbstractEvaluateStage, Set[AbstractEvaluateStage]] = {
+            stage: set() for stage in stages
+        }
+        for before, after in constraints or []:
+            if before not in self._predecessors or after not in self._predecessors:
+                raise ValueError("先后约束引用了不在 stages 中的阶段")
+            self._predecessors[after].add(before)
+        self.statistics: Dict[AbstractEvaluateStage, StageStatistics] = {
+            stage: StageStatistics() for stage in stages
+        }
+        # 构造时校验约束无环
+        self._order: List[AbstractEvaluateStage] = self.ordered_stages()
+
+    def _stage_config(self) -> Dict[str, Any]:
+        # 执行顺序只影响耗时，不影响结论，因此只描述阶段集合与先后约束
+        return {
+            "stages": [stage.describe() for stage in self.stages],
+            "constraints": sorted(
+                [self.stages.index(before), self.stages.index(after)]
+                for after, befores in self._predecessors.items()
+                for before in befores
+            ),
+        }
+
+    def _stage_relationships(self) -> Set[str]:
+        return set().union(*(stage.required_relationships() for stage in self.stages))
+
+    def _sub_stages(self) -> List[AbstractEvaluateStage]:
+        return list(self.stages)
+
+    def _rank(self, stage: AbstractEvaluateStage) -> float:
+        statistics: StageStatistics = self.statistics[stage]
+        return statistics.mean_latency / (1.0 - statistics.pass_rate)
+
+    def ordered_stages(self) -> List[AbstractEvaluateStage]:
+        """
+        在满足先后约束的前提下，按 c / (1 - p) 从小到大贪心排列阶段。
+
+        Returns:
+            List[AbstractEvaluateStage]: 执行顺序。
+
+        Raises:
+            ValueError: 先后约束存在环。
+        """
+        order: List[AbstractEvaluateStage] = []
+        placed: Set[AbstractEvaluateStage] = set()
+        while len(order) < len(self.stages):
+            ready: List[AbstractEvaluateStage] = [
+                stage
+                for stage in self.stages
+                if stage not in placed and self._predecessors[stage] <= placed
+            ]
+            if not ready:
+                raise ValueError("评估阶段的先后约束存在环")
+            # min 在并列时保留声明顺序
+            chosen: AbstractEvaluateStage = min(ready, key=self._rank)
+            order.append(chosen)
+            placed.add(chosen)
+        return order
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        将批量预处理传递给每个可重排阶段。
+        """
+        for stage in self.stages:
+            await stage.prepare_batch(alphas, policy, **kwargs)
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        按当前统计得到的顺序依次执行阶段，并记录每个阶段的结果与耗时。
+
+        Args:
+            alpha: 待评估的 Alpha 对象。
+            policy: 刷新策略。
+            record: 当前评估的记录对象。
+            kwargs: 其他参数。
+
+        Returns:
+            bool: 所有阶段都通过返回 True，否则返回 False。
+        """
+        order: List[AbstractEvaluateStage] = self.ordered_stages()
+        if order != self._order:
+            self._order = order
+            await log.ainfo(
+                "评估阶段执行顺序已调整",
+                emoji="🔀",
+                order=[stage.__class__.__name__ for stage in order],
+                statistics=[self.statistics[stage].summary() for stage in order],
+            )
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        for stage in order:
+            start_time: float = loop.time()
+            try:
+                _, passed = await stage.evaluate(alpha, policy, record, **kwargs)
+            except Exception:
+                # CancelledError 不是 Exception 的子类，被取消的评估不计入统计
+                self.statistics[stage].record(
+                    False, loop.time() - start_time, error=True
+                )
+                raise
+            self.statistics[stage].record(passed, loop.time() - start_time)
+            if not passed:
+                return False
+        return True
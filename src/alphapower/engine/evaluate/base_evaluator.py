@@ -1,10 +1,16 @@
 from __future__ import annotations  # 解决类型前向引用问题
 
 import asyncio
+import time
+from pathlib import Path
+from types import TracebackType
 from typing import (
     Any,
     AsyncGenerator,
+    AsyncIterable,
+    List,
     Optional,
+    Type,
 )
 
 import aiostream.stream as stream
@@ -13,12 +19,16 @@ from aiostream import Stream
 from alphapower.constants import (
     RefreshPolicy,
 )
-from alphapower.dal.evaluate import EvaluateRecordDAL
+from alphapower.dal.evaluate import EvaluateLedgerDAL, EvaluateRecordDAL
 from alphapower.entity import Alpha, EvaluateRecord
 from alphapower.internal.logging import get_logger
 
 from .alpha_fetcher_abc import AbstractAlphaFetcher
-from .evaluate_stage_abc import AbstractEvaluateStage
+from .concurrency_controller import AdaptiveConcurrencyController
+from .evaluate_ledger import EvaluateLedger
+from .evaluate_metrics import EvaluateMetrics, MetricsExporter
+from .evaluate_stage_abc import AbstractEvaluateStage, collect_stage_errors
+from .evaluate_write_buffer import EvaluateWriteBuffer
 from .evaluator_abc import AbstractEvaluator
 
 # 获取日志记录器 (logger)
@@ -32,8 +42,58 @@ class BaseEvaluator(AbstractEvaluator):
         fetcher: AbstractAlphaFetcher,
         evaluate_stage_chain: AbstractEvaluateStage,
         evaluate_record_dal: EvaluateRecordDAL,
+        batch_size: int = 1,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
+        ledger_dal: Optional[EvaluateLedgerDAL] = None,
+        concurrency_controller: Optional[AdaptiveConcurrencyController] = None,
+        metrics: Optional[EvaluateMetrics] = None,
+        metrics_export_interval: Optional[float] = None,
+        metrics_exporter: Optional[MetricsExporter] = None,
+        metrics_summary_path: Optional[str] = None,
     ):
+        """
+        初始化 BaseEvaluator。
+
+        Args:
+            fetcher: 用于获取 Alpha 的数据获取器实例。
+            evaluate_stage_chain: 评估阶段责任链的首个阶段。责任链由评估器持有，
+                多次 evaluate_many 之间保持可用，调用 close (或退出 async with)
+                时关闭整条责任链，释放各阶段持有的资源。
+            evaluate_record_dal: 评估记录数据访问层对象。
+            batch_size: 批量预处理的批次大小，大于 1 时先攒批调用各阶段的
+                prepare_batch，再逐个评估。
+            write_buffer: 评估结果的写后缓冲区，与各阶段共享时评估记录与检查记录
+                分组提交；为 None 时每条记录立即提交。每次批量评估结束 (包括取消) 时
+                写入缓冲区中剩余的记录，调用 close 时关闭缓冲区并报告写入失败的记录。
+            ledger_dal: 评估台账数据访问层对象，提供时启用增量评估：跳过输入指纹
+                未变化的 Alpha，中断的运行再次启动时从上次停下的位置继续。
+            concurrency_controller: 自适应并发控制器，提供时在途评估数量由控制器
+                按吞吐量与限流情况动态调整，evaluate_many 的 concurrency 作为上限。
+            metrics: 指标汇总，记录各阶段的耗时、结果与检查操作，挂载到整条评估
+                阶段链；为 None 时创建新的指标汇总。每次 evaluate_many 开始时清空。
+            metrics_export_interval: 定期导出指标汇总的间隔 (秒)，为 None 时只在
+                evaluate_many 结束时输出。
+            metrics_exporter: 定期导出指标汇总的函数，默认输出到日志。
+            metrics_summary_path: evaluate_many 结束时写入 JSON 指标汇总的文件路径。
+        """
         super().__init__(fetcher, evaluate_stage_chain, evaluate_record_dal)
+        self.batch_size: int = max(batch_size, 1)
+        self.write_buffer: EvaluateWriteBuffer = write_buffer or EvaluateWriteBuffer(
+            evaluate_record_dal.session, flush_size=1
+        )
+        self.ledger: Optional[EvaluateLedger] = (
+            EvaluateLedger(ledger_dal, evaluate_stage_chain, self.write_buffer)
+            if ledger_dal is not None
+            else None
+        )
+        self.concurrency_controller: Optional[AdaptiveConcurrencyController] = (
+            concurrency_controller
+        )
+        self.metrics: EvaluateMetrics = metrics or EvaluateMetrics()
+        self.metrics_export_interval: Optional[float] = metrics_export_interval
+        self.metrics_exporter: Optional[MetricsExporter] = metrics_exporter
+        self.metrics_summary_path: Optional[str] = metrics_summary_path
+        self.evaluate_stage_chain.attach_metrics(self.metrics)
         # 使用同步日志记录器，因为 __init__ 通常是同步的
         log.info("📊 BaseEvaluator 初始化完成", emoji="📊")
 
@@ -54,16 +114,38 @@ class BaseEvaluator(AbstractEvaluator):
         processed_count: int = 0
         passed_count: int = 0
         total_to_evaluate: int = await self._get_total_to_evaluate(**kwargs)
+        if self.concurrency_controller is not None:
+            self.concurrency_controller.set_max_limit(concurrency)
+        self.metrics.reset()
+        metrics_export_task: Optional["asyncio.Task[None]"] = (
+            asyncio.create_task(
+                self.metrics.export_periodically(
+                    self.metrics_export_interval, self.metrics_exporter
+                )
+            )
+            if self.metrics_export_interval
+            else None
+        )
 
         async def evaluate_wrapper(alpha: Alpha, *args: Any) -> Optional[Alpha]:
             """包装单个 Alpha 的评估逻辑，处理异常并记录日志"""
             nonlocal processed_count, passed_count
+            start_time: float = time.monotonic()
             try:
                 await self._log_start_alpha(alpha)
-                passed: bool = await self.evaluate_one(
-                    alpha=alpha, policy=policy, **kwargs
-                )
+                passed: bool
+                if self.concurrency_controller is None:
+                    passed = await self.evaluate_one(
+                        alpha=alpha, policy=policy, **kwargs
+                    )
+                else:
+                    async with self.concurrency_controller.slot():
+                        start_time = time.monotonic()
+                        passed = await self.evaluate_one(
+                            alpha=alpha, policy=policy, **kwargs
+                        )
                 processed_count += 1
+                self.metrics.record_evaluation(passed, time.monotonic() - start_time)
                 if passed:
                     passed_count += 1
                     await self._log_alpha_passed(alpha)
@@ -72,10 +154,14 @@ class BaseEvaluator(AbstractEvaluator):
                 return None
             except asyncio.CancelledError:
                 processed_count += 1
+                self.metrics.record_cancelled()
                 await self._log_alpha_cancelled(alpha)
                 return None
             except Exception as task_exc:
                 processed_count += 1
+                self.metrics.record_evaluation(
+                    False, time.monotonic() - start_time, error=True
+                )
                 await self._log_alpha_exception(alpha, task_exc)
                 return None
             finally:
@@ -85,7 +171,7 @@ class BaseEvaluator(AbstractEvaluator):
 
         try:
             async for passed_alpha in self._process_alphas(
-                evaluate_wrapper, concurrency, **kwargs
+                evaluate_wrapper, concurrency, policy=policy, **kwargs
             ):
                 yield passed_alpha
         except asyncio.CancelledError:
@@ -102,9 +188,38 @@ class BaseEvaluator(AbstractEvaluator):
             )
             raise
         finally:
+            if metrics_export_task is not None:
+                metrics_export_task.cancel()
+                await asyncio.gather(metrics_export_task, return_exceptions=True)
+            # 只写入剩余记录，缓冲区与责任链留给下一次 evaluate_many，由 close 释放
+            await asyncio.shield(self.write_buffer.flush())
             await self._log_final_statistics(
                 processed_count, passed_count, total_to_evaluate
             )
+            await self._dump_metrics_summary()
+
+    async def close(self) -> None:
+        """
+        关闭写后缓冲区并释放评估阶段责任链持有的资源，评估器不再使用时调用。
+
+        缓冲区报告写入失败的记录时，仍然先关闭责任链再向上抛出异常。
+        """
+        try:
+            await self.write_buffer.close()
+        finally:
+            await self.evaluate_stage_chain.close()
+
+    async def __aenter__(self) -> "BaseEvaluator":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        # 无论正常退出还是异常、取消，都写入剩余记录并关闭责任链
+        await self.close()
 
     async def _get_total_to_evaluate(self, **kwargs: Any) -> int:
         """获取待评估 Alpha 的总数"""
@@ -125,12 +240,20 @@ class BaseEvaluator(AbstractEvaluator):
         self,
         evaluate_wrapper: Any,
         concurrency: int,
+        policy: RefreshPolicy,
         **kwargs: Any,
     ) -> AsyncGenerator[Alpha, None]:
         """处理 Alpha 的异步生成器"""
-        alpha_source: Stream[Alpha] = stream.iterate(
-            self.fetcher.fetch_alphas(**kwargs)
+        # 只加载评估阶段链读取的关联关系
+        alphas: AsyncIterable[Alpha] = self.fetcher.fetch_alphas(
+            relationships=self.evaluate_stage_chain.required_relationships(),
+            **kwargs,
         )
+        if self.ledger is not None:
+            alphas = self.ledger.skip_settled(alphas, policy)
+        if self.batch_size > 1:
+            alphas = self._fetch_alphas_in_batches(alphas, policy, **kwargs)
+        alpha_source: Stream[Alpha] = stream.iterate(alphas)
         results_stream: Stream[Optional[Alpha]] = stream.map(
             alpha_source, evaluate_wrapper, task_limit=concurrency
         )
@@ -153,6 +276,44 @@ class BaseEvaluator(AbstractEvaluator):
             )
             raise
 
+    async def _fetch_alphas_in_batches(
+        self,
+        alphas: AsyncIterable[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Alpha, None]:
+        """攒够一批 Alpha 后先交给评估阶段链批量预处理，再逐个产出"""
+        batch: List[Alpha] = []
+        async for alpha in alphas:
+            batch.append(alpha)
+            if len(batch) < self.batch_size:
+                continue
+            await self._prepare_batch(batch, policy, **kwargs)
+            for prepared_alpha in batch:
+                yield prepared_alpha
+            batch = []
+
+        if batch:
+            await self._prepare_batch(batch, policy, **kwargs)
+            for prepared_alpha in batch:
+                yield prepared_alpha
+
+    async def _prepare_batch(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """调用评估阶段链的批量预处理逻辑"""
+        await log.adebug(
+            "📦 批量预处理 Alpha",
+            emoji="📦",
+            batch_size=len(alphas),
+        )
+        await self.evaluate_stage_chain.prepare_batch(
+            alphas=alphas, policy=policy, **kwargs
+        )
+
     async def _log_progress(
         self,
         processed_count: int,
@@ -170,6 +331,11 @@ class BaseEvaluator(AbstractEvaluator):
             passed=passed_count,
             total=total_to_evaluate,
             progress=f"{progress_percent:.2f}%",
+            **(
+                self.concurrency_controller.snapshot()
+                if self.concurrency_controller is not None
+                else {}
+            ),
         )
 
     async def _log_final_statistics(
@@ -190,6 +356,24 @@ class BaseEvaluator(AbstractEvaluator):
             total_expected=final_total_str,
         )
 
+    async def _dump_metrics_summary(self) -> None:
+        """输出 JSON 指标汇总，配置了文件路径时同时写入文件"""
+        summary: str = self.metrics.to_json()
+        await log.ainfo("📈 评估指标汇总", emoji="📈", metrics=summary)
+        if not self.metrics_summary_path:
+            return
+        try:
+            await asyncio.to_thread(
+                Path(self.metrics_summary_path).write_text, summary, "utf-8"
+            )
+        except OSError as e:
+            await log.awarning(
+                "⚠️ 写入评估指标汇总文件失败",
+                emoji="⚠️",
+                path=self.metrics_summary_path,
+                error=str(e),
+            )
+
     async def _log_start_alpha(self, alpha: Alpha) -> None:
         """记录单个 Alpha 开始评估的日志"""
         await log.adebug(
@@ -258,9 +442,10 @@ class BaseEvaluator(AbstractEvaluator):
             )
 
             # 调用评估阶段链的核心逻辑
-            evaluate_record, overall_result = await self._evaluate_alpha_stage(
-                alpha, policy, evaluate_record, **kwargs
-            )
+            with collect_stage_errors() as stage_errors:
+                evaluate_record, overall_result = await self._evaluate_alpha_stage(
+                    alpha, policy, evaluate_record, **kwargs
+                )
 
             # 根据评估结果处理 Alpha
             if overall_result:
@@ -268,6 +453,19 @@ class BaseEvaluator(AbstractEvaluator):
             else:
                 await self._handle_evaluate_failure(alpha, evaluate_record, **kwargs)
 
+            # 结论处理完成后才记入台账，被取消或出错的 Alpha 下次运行时重新评估。
+            # 阶段捕获异常后返回的失败不是评估结论，同样不记入台账
+            if self.ledger is not None:
+                if stage_errors:
+                    await log.ainfo(
+                        "🔁 评估阶段出错，不记入评估台账",
+                        emoji="🔁",
+                        alpha_id=alpha.alpha_id,
+                        stages=stage_errors,
+                    )
+                else:
+                    await self.ledger.record(alpha, policy, overall_result)
+
             await self._log_evaluation_complete(alpha, overall_result)
 
         except NotImplementedError as nie:
@@ -281,6 +479,9 @@ class BaseEvaluator(AbstractEvaluator):
             await self._log_unexpected_error(alpha, policy, e)
             overall_result = False  # 异常视为失败
             raise
+        finally:
+            # 无论在哪个阶段结束，都释放各阶段为该 Alpha 保留的批量预处理状态
+            await self.evaluate_stage_chain.finish_alpha(alpha)
 
         return overall_result
 
@@ -0,0 +1,141 @@
+"""评估过程中的检查记录查找缓存。
+
+各评估阶段都需要按 (alpha_id, record_type) 查询最新的 CheckRecord。逐个查询时
+评估 N 个 Alpha 约需 4N 次查询。缓存在批量预处理时以一次窗口查询加载整批 Alpha
+所有已登记类型的最新记录，之后各阶段直接从内存读取；未预取的组合回退到单条查询
+并缓存结果。阶段写入新的检查记录后通过 `put` 更新缓存，保证后续读取看到最新记录。
+并行评估阶段的分支共享同一个会话，数据库查询在会话锁内串行执行。
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from structlog.stdlib import BoundLogger
+
+from alphapower.constants import CheckRecordType
+from alphapower.dal.evaluate import CheckRecordDAL
+from alphapower.entity import CheckRecord
+from alphapower.internal.db_session import session_lock
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+
+class CheckRecordCache:
+    """
+    以 (alpha_id, record_type) 为键、按最近使用淘汰的最新检查记录缓存。
+    """
+
+    def __init__(
+        self,
+        check_record_dal: CheckRecordDAL,
+        max_entries: int = 20000,
+    ) -> None:
+        """
+        初始化检查记录缓存。
+
+        :param check_record_dal: 检查记录数据访问层实例
+        :param max_entries: 缓存的最大条目数，超过后淘汰最久未使用的条目
+        """
+        self.check_record_dal: CheckRecordDAL = check_record_dal
+        self.max_entries: int = max(max_entries, 1)
+        self.record_types: Set[CheckRecordType] = set()
+        # 值为 None 表示已确认数据库中不存在该组合的记录
+        self._entries: OrderedDict[
+            Tuple[str, CheckRecordType], Optional[CheckRecord]
+        ] = OrderedDict()
+
+    def register(self, record_type: CheckRecordType) -> None:
+        """
+        登记需要预取的检查记录类型。
+
+        :param record_type: 检查记录类型
+        """
+        self.record_types.add(record_type)
+
+    def _store(
+        self, key: Tuple[str, CheckRecordType], record: Optional[CheckRecord]
+    ) -> None:
+        self._entries[key] = record
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def prefetch(self, alpha_ids: List[str]) -> None:
+        """
+        以一次窗口查询加载一批 Alpha 所有已登记类型的最新检查记录。
+
+        已缓存全部已登记类型的 Alpha 会被跳过，多个阶段共享同一个缓存时
+        只有第一次调用会查询数据库。
+
+        :param alpha_ids: Alpha ID 列表
+        """
+        record_types: List[CheckRecordType] = sorted(
+            self.record_types, key=lambda record_type: record_type.value
+        )
+        missing_alpha_ids: List[str] = [
+            alpha_id
+            for alpha_id in dict.fromkeys(alpha_ids)
+            if any(
+                (alpha_id, record_type) not in self._entries
+                for record_type in record_types
+            )
+        ]
+        if not missing_alpha_ids or not record_types:
+            return
+
+        async with session_lock(self.check_record_dal.session):
+            latest_records: Dict[Tuple[str, CheckRecordType], CheckRecord] = (
+                await self.check_record_dal.find_latest_by_alphas(
+                    alpha_ids=missing_alpha_ids, record_types=record_types
+                )
+            )
+        for alpha_id in missing_alpha_ids:
+            for record_type in record_types:
+                key: Tuple[str, CheckRecordType] = (alpha_id, record_type)
+                self._store(key, latest_records.get(key))
+
+        await log.adebug(
+            event="批量预取检查记录完成",
+            alphas=len(missing_alpha_ids),
+            found=len(latest_records),
+            emoji="📦",
+        )
+
+    async def get_latest(
+        self, alpha_id: str, record_type: CheckRecordType
+    ) -> Optional[CheckRecord]:
+        """
+        获取 Alpha 指定类型的最新检查记录，未缓存时回退到数据库查询。
+
+        :param alpha_id: Alpha ID
+        :param record_type: 检查记录类型
+        :return: 最新检查记录，不存在时为 None
+        """
+        key: Tuple[str, CheckRecordType] = (alpha_id, record_type)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        async with session_lock(self.check_record_dal.session):
+            record: Optional[CheckRecord] = await self.check_record_dal.find_one_by(
+                alpha_id=alpha_id,
+                record_type=record_type,
+                order_by=CheckRecord.created_at.desc(),
+            )
+        self._store(key, record)
+        return record
+
+    def put(self, record: CheckRecord) -> None:
+        """
+        写入新创建的检查记录，使其成为该组合的最新记录。
+
+        :param record: 检查记录
+        """
+        self._store((record.alpha_id, record.record_type), record)
+
+    def clear(self) -> None:
+        """
+        清空缓存。
+        """
+        self._entries.clear()
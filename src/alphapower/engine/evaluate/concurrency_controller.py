@@ -0,0 +1,198 @@
+"""批量评估的自适应并发控制。
+
+`evaluate_many` 原先以固定的 `task_limit` 并发评估 Alpha：设置过低浪费吞吐，
+设置过高则共享的限流器频繁耗尽配额，大量协程堆积在限流等待中。控制器采用
+AIMD (加性增、乘性减) 策略，每完成一个窗口的评估调整一次在途评估数量的上限：
+
+- 窗口内出现限流等待或 429 响应时，上限乘以 `decrease_factor`；
+- 平均耗时明显高于基线时保持上限，等待排队消化；
+- 吞吐量没有下降且耗时平稳时，上限加 `increase_step`。
+
+当前上限与最近一次调整的原因通过 `snapshot` 输出到评估进度日志。
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+
+from structlog.stdlib import BoundLogger
+
+from alphapower.client import RateLimitStatistics, rate_limit_statistics
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+
+class AdaptiveConcurrencyController:
+    """
+    按 AIMD 策略动态调整在途评估数量上限的并发控制器。
+    """
+
+    # 调整原因
+    REASON_INITIAL: str = "initial"
+    REASON_RATE_LIMITED: str = "rate_limited"
+    REASON_LATENCY_RISING: str = "latency_rising"
+    REASON_THROUGHPUT_FALLING: str = "throughput_falling"
+    REASON_THROUGHPUT_RISING: str = "throughput_rising"
+    REASON_AT_MAX: str = "at_max"
+
+    # 吞吐量的比较容差，避免窗口之间的随机波动被视为下降
+    THROUGHPUT_TOLERANCE: float = 0.05
+    # 基线耗时每个窗口允许上浮的比例，使基线能跟随 Alpha 组成的变化
+    BASELINE_DRIFT: float = 0.05
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase_step: int = 1,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 1.5,
+        window: Optional[int] = None,
+        statistics: Optional[RateLimitStatistics] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        初始化并发控制器。
+
+        :param initial_limit: 初始在途评估数量上限
+        :param min_limit: 上限的最小值
+        :param max_limit: 上限的最大值
+        :param increase_step: 每次加性增加的数量
+        :param decrease_factor: 出现限流时上限乘以的系数，取值 (0, 1)
+        :param latency_tolerance: 平均耗时超过基线的多少倍时停止增加上限
+        :param window: 每完成多少次评估调整一次上限，默认等于当前上限
+        :param statistics: 限流统计，默认使用客户端的全局限流统计
+        :param clock: 单调时钟，返回秒
+        """
+        self.min_limit: int = max(min_limit, 1)
+        self.max_limit: int = max(max_limit, self.min_limit)
+        self.limit: int = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.increase_step: int = max(increase_step, 1)
+        self.decrease_factor: float = decrease_factor
+        self.latency_tolerance: float = latency_tolerance
+        self.window: Optional[int] = window
+        self.statistics: RateLimitStatistics = statistics or rate_limit_statistics
+        self.clock: Callable[[], float] = clock
+        self.in_flight: int = 0
+        self.reason: str = self.REASON_INITIAL
+        self.adjustments: int = 0
+
+        self._condition: asyncio.Condition = asyncio.Condition()
+        self._window_latencies: List[float] = []
+        self._window_started: float = self.clock()
+        self._last_throttle_events: int = self.statistics.events
+        self._last_throughput: Optional[float] = None
+        self._baseline_latency: Optional[float] = None
+
+    def set_max_limit(self, max_limit: int) -> None:
+        """
+        设置上限的最大值，当前上限超过时随之降低。
+
+        :param max_limit: 上限的最大值
+        """
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = min(self.limit, self.max_limit)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        当前并发状态，用于进度日志。
+        """
+        return {
+            "concurrency_limit": self.limit,
+            "in_flight": self.in_flight,
+            "concurrency_reason": self.reason,
+        }
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None, None]:
+        """
+        占用一个评估名额，在途评估数量达到上限时等待，退出时记录本次耗时。
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+        started: float = self.clock()
+        try:
+            yield
+        finally:
+            adjustment: Optional[Tuple[int, Dict[str, Any]]] = self._observe(
+                self.clock() - started
+            )
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+            if adjustment is not None:
+                previous_limit, details = adjustment
+                await log.ainfo(
+                    event="调整评估并发上限",
+                    previous_limit=previous_limit,
+                    limit=self.limit,
+                    reason=self.reason,
+                    **details,
+                    emoji="🎚️",
+                )
+
+    def _observe(self, latency: float) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        记录一次评估耗时，窗口结束时调整上限。
+
+        :param latency: 评估耗时 (秒)
+        :return: 上限发生变化时返回 (调整前的上限, 窗口统计)，否则为 None
+        """
+        self._window_latencies.append(latency)
+        if len(self._window_latencies) < max(self.window or self.limit, 1):
+            return None
+
+        now: float = self.clock()
+        throughput: float = len(self._window_latencies) / max(
+            now - self._window_started, 1e-9
+        )
+        mean_latency: float = sum(self._window_latencies) / len(self._window_latencies)
+        throttle_events: int = self.statistics.events
+        throttled: int = throttle_events - self._last_throttle_events
+        self._last_throttle_events = throttle_events
+        self._window_latencies = []
+        self._window_started = now
+
+        previous_limit: int = self.limit
+        baseline: Optional[float] = self._baseline_latency
+        if throttled > 0:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            self.reason = self.REASON_RATE_LIMITED
+            # 降低上限后吞吐量必然下降，不与降低前比较
+            reference_throughput: Optional[float] = None
+        elif baseline is not None and mean_latency > baseline * self.latency_tolerance:
+            self.reason = self.REASON_LATENCY_RISING
+            reference_throughput = throughput
+        elif self._last_throughput is not None and throughput < (
+            self._last_throughput * (1 - self.THROUGHPUT_TOLERANCE)
+        ):
+            self.reason = self.REASON_THROUGHPUT_FALLING
+            reference_throughput = throughput
+        elif self.limit >= self.max_limit:
+            self.reason = self.REASON_AT_MAX
+            reference_throughput = throughput
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase_step)
+            self.reason = self.REASON_THROUGHPUT_RISING
+            reference_throughput = throughput
+
+        self._last_throughput = reference_throughput
+        self._baseline_latency = (
+            mean_latency
+            if baseline is None
+            else min(mean_latency, baseline * (1 + self.BASELINE_DRIFT))
+        )
+
+        if self.limit == previous_limit:
+            return None
+        self.adjustments += 1
+        return previous_limit, {
+            "throughput": round(throughput, 3),
+            "mean_latency": round(mean_latency, 3),
+            "throttled": throttled,
+        }
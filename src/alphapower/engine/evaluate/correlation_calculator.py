@@ -1,24 +1,165 @@
 import asyncio
 from datetime import datetime
-from typing import AsyncGenerator, Dict, List, Optional  # 用于可选类型注解
+from pathlib import Path
+from types import TracebackType
+from typing import (  # 用于可选类型注解
+    AsyncGenerator,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
+import numpy as np
 import pandas as pd
 from structlog.stdlib import BoundLogger
 
 from alphapower.client import TableView, WorldQuantClient
 from alphapower.constants import (
+    CONSULTANT_MAX_SELF_CORRELATION,
     CorrelationCalcType,
     RecordSetType,
     Region,
     Stage,
 )
 from alphapower.dal.alphas import AlphaDAL
-from alphapower.dal.evaluate import CorrelationDAL, RecordSetDAL
-from alphapower.entity import Alpha, Correlation, RecordSet
+from alphapower.dal.evaluate import (
+    CorrelationDAL,
+    CorrelationStatisticsDAL,
+    RecordSetDAL,
+)
+from alphapower.entity import Alpha, RecordSet
+from alphapower.internal.db_session import session_lock
 from alphapower.internal.logging import get_logger
+from alphapower.settings import settings
+
+from .correlation_executor import (
+    CorrelationExecutor,
+    attach_shared_matrix,
+    take_aligned,
+)
+from .correlation_sketch import build_sketch, prune_pool_by_sketch
+from .correlation_statistics import CorrelationStatisticsUpdater
+from .correlation_write_buffer import CorrelationWriteBuffer
+from .evaluate_write_buffer import EvaluateWriteBuffer
+from .pnl_cache import PnLCache
+from .pnl_prefetcher import PnLPrefetcher
 
 log: BoundLogger = get_logger(__name__)
 
+# 自相关性计算使用的滚动窗口长度 (以每个 Alpha 的最新日期为终点)
+CORRELATION_WINDOW: pd.DateOffset = pd.DateOffset(years=4)
+
+
+def one_vs_all_pearson(x: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    一次性计算向量 x 与矩阵每一列的皮尔逊相关系数 (Pearson Correlation)。
+
+    缺失值按列成对剔除 (pairwise complete)，与 pandas 的 corrwith 行为一致。
+    有效样本数小于 2 或方差为 0 的列返回 NaN。
+
+    :param x: 候选 Alpha 的日收益序列，形状为 (n_days,)
+    :param matrix: 已按日期对齐的区域日收益矩阵，形状为 (n_days, n_alphas)
+    :return: 相关系数数组，形状为 (n_alphas,)
+    """
+    valid: np.ndarray = ~np.isnan(matrix) & ~np.isnan(x)[:, None]
+    counts: np.ndarray = valid.sum(axis=0)
+    x_b: np.ndarray = np.broadcast_to(x[:, None], matrix.shape)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x: np.ndarray = np.where(valid, x_b, 0.0).sum(axis=0) / counts
+        mean_y: np.ndarray = np.where(valid, matrix, 0.0).sum(axis=0) / counts
+        dev_x: np.ndarray = np.where(valid, x_b - mean_x, 0.0)
+        dev_y: np.ndarray = np.where(valid, matrix - mean_y, 0.0)
+        cov: np.ndarray = (dev_x * dev_y).sum(axis=0)
+        var_x: np.ndarray = (dev_x * dev_x).sum(axis=0)
+        var_y: np.ndarray = (dev_y * dev_y).sum(axis=0)
+        corr: np.ndarray = cov / np.sqrt(var_x * var_y)
+
+    corr[counts < 2] = np.nan
+    return corr
+
+
+def many_vs_all_pearson(candidates: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    以矩阵乘法一次性计算多个候选序列与矩阵每一列的皮尔逊相关系数。
+
+    缺失值按列对成对剔除 (pairwise complete)，语义与 one_vs_all_pearson 一致。
+    各列先减去自身有效样本均值再做累加，以降低单遍公式的数值误差。
+
+    :param candidates: 候选 Alpha 的日收益矩阵，形状为 (n_days, n_candidates)
+    :param matrix: 已按日期对齐的区域日收益矩阵，形状为 (n_days, n_alphas)
+    :return: 相关系数矩阵，形状为 (n_candidates, n_alphas)
+    """
+    x_mask: np.ndarray = ~np.isnan(candidates)
+    y_mask: np.ndarray = ~np.isnan(matrix)
+    x_valid: np.ndarray = x_mask.astype(np.float64)
+    y_valid: np.ndarray = y_mask.astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_center: np.ndarray = np.where(x_mask, candidates, 0.0).sum(
+            axis=0
+        ) / np.maximum(x_valid.sum(axis=0), 1.0)
+        y_center: np.ndarray = np.where(y_mask, matrix, 0.0).sum(axis=0) / np.maximum(
+            y_valid.sum(axis=0), 1.0
+        )
+        x: np.ndarray = np.where(x_mask, candidates - x_center, 0.0)
+        y: np.ndarray = np.where(y_mask, matrix - y_center, 0.0)
+
+        counts: np.ndarray = x_valid.T @ y_valid
+        sum_x: np.ndarray = x.T @ y_valid
+        sum_y: np.ndarray = x_valid.T @ y
+        sum_xx: np.ndarray = (x * x).T @ y_valid
+        sum_yy: np.ndarray = x_valid.T @ (y * y)
+        sum_xy: np.ndarray = x.T @ y
+
+        cov: np.ndarray = sum_xy - sum_x * sum_y / counts
+        var_x: np.ndarray = sum_xx - sum_x * sum_x / counts
+        var_y: np.ndarray = sum_yy - sum_y * sum_y / counts
+        corr: np.ndarray = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+
+    corr[counts < 2] = np.nan
+    return corr
+
+
+def one_vs_all_pearson_shared(
+    matrix_path: str,
+    x: np.ndarray,
+    row_positions: np.ndarray,
+    column_positions: np.ndarray,
+) -> np.ndarray:
+    """
+    在工作进程中计算候选 Alpha 与共享区域收益矩阵指定列的相关系数。
+
+    :param matrix_path: 共享区域收益矩阵的文件路径
+    :param x: 候选 Alpha 的日收益序列
+    :param row_positions: 候选 Alpha 每个日期在区域矩阵中的行下标，缺失为 -1
+    :param column_positions: 参与计算的池中 Alpha 的列下标
+    :return: 相关系数数组，形状为 (len(column_positions),)
+    """
+    matrix: np.ndarray = attach_shared_matrix(matrix_path)
+    return one_vs_all_pearson(x, take_aligned(matrix, row_positions, column_positions))
+
+
+def many_vs_all_pearson_shared(
+    matrix_path: str, candidates: np.ndarray, row_positions: np.ndarray
+) -> np.ndarray:
+    """
+    在工作进程中计算一组候选 Alpha 与共享区域收益矩阵所有列的相关系数。
+
+    :param matrix_path: 共享区域收益矩阵的文件路径
+    :param candidates: 候选 Alpha 日收益矩阵，形状为 (n_days, n_candidates)
+    :param row_positions: 候选矩阵每个日期在区域矩阵中的行下标，缺失为 -1
+    :return: 相关系数矩阵，形状为 (n_candidates, n_alphas)
+    """
+    matrix: np.ndarray = attach_shared_matrix(matrix_path)
+    return many_vs_all_pearson(
+        candidates,
+        take_aligned(matrix, row_positions, np.arange(matrix.shape[1])),
+    )
+
 
 class CorrelationCalculator:
     def __init__(
@@ -30,6 +171,13 @@ class CorrelationCalculator:
         alpha_dal: AlphaDAL,
         record_set_dal: RecordSetDAL,
         correlation_dal: CorrelationDAL,
+        pnl_cache: Optional[PnLCache] = None,
+        correlation_statistics_dal: Optional[CorrelationStatisticsDAL] = None,
+        sketch_dim: int = 0,
+        sketch_margin: float = 0.15,
+        sketch_top_k: int = 32,
+        process_workers: Optional[int] = None,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
     ) -> None:
         """
         初始化 CorrelationCalculator
@@ -39,56 +187,62 @@ class CorrelationCalculator:
         :param alpha_dal: Alpha 数据访问层实例
         :param record_set_dal: RecordSet 数据访问层实例
         :param correlation_dal: Correlation 数据访问层实例
+        :param pnl_cache: PnL 本地二进制缓存，默认使用配置中的缓存目录
+        :param correlation_statistics_dal: 相关性充分统计量数据访问层实例，
+            提供时才支持增量更新相关性
+        :param sketch_dim: 随机投影草图 (sketch) 的维度，为 0 时不启用剪枝模式
+        :param sketch_margin: 草图估计值距离自相关阈值多近时需要精确计算
+        :param sketch_top_k: 无论估计值高低，始终精确计算估计值最高的前 k 个 Alpha
+        :param process_workers: 相关系数计算使用的进程数，默认使用配置值，
+            为 0 时直接在事件循环中计算
+        :param write_buffer: 从平台拉取的 PnL 记录集的写后缓冲区，
+            为 None 时每条记录立即提交
         """
         self.client: WorldQuantClient = client
         self.alpha_stream: AsyncGenerator[Alpha, None] = alpha_stream  # 修改变量名
         self.alpha_dal: AlphaDAL = alpha_dal
         self.record_set_dal: RecordSetDAL = record_set_dal
         self.correlation_dal: CorrelationDAL = correlation_dal
+        # 本地相关性结果先进入缓冲区去重，计算结束时以多行 upsert 写入
+        self.correlation_buffer: CorrelationWriteBuffer = CorrelationWriteBuffer(
+            correlation_dal
+        )
         self._is_initialized: bool = (
             False  # 建议将 _initialized 改为 _is_initialized，更符合布尔变量的命名习惯
         )
         self._region_to_alpha_map: Dict[Region, List[str]] = (
             {}
         )  # 建议改为 _region_to_alpha_map，更清晰表达区域到 Alpha 的映射关系
-
-    async def _load_missing_pnl(self, alpha_id: str) -> None:
-        """
-        处理缺失的 pnl 数据。
-
-        :param alpha_id: Alpha 策略 ID
-        """
-        try:
-            await self._retrieve_pnl_from_platform(alpha_id)
-        except ValueError as ve:
-            await log.aerror(
-                event="加载 Alpha 策略的 pnl 数据失败 - 数据错误",
-                alpha_id=alpha_id,
-                error=str(ve),
-                emoji="❌",
-                module=__name__,
-                exc_info=True,
-            )
-            raise
-        except ConnectionError as ce:
-            await log.aerror(
-                event="加载 Alpha 策略的 pnl 数据失败 - 网络错误",
-                alpha_id=alpha_id,
-                error=str(ce),
-                emoji="❌",
-                module=__name__,
-                exc_info=True,
-            )
-        except Exception as e:
-            await log.acritical(
-                event="加载 Alpha 策略的 pnl 数据失败 - 未知错误",
-                alpha_id=alpha_id,
-                error=str(e),
-                emoji="💥",
-                module=__name__,
-                exc_info=True,
-            )
-            raise
+        # 区域 -> 按日期对齐的日收益矩阵 (行: 日期, 列: alpha_id)
+        self._region_return_matrix: Dict[Region, pd.DataFrame] = {}
+        if pnl_cache is None and settings.pnl_cache_dir:
+            pnl_cache = PnLCache(Path(settings.pnl_cache_dir))
+        self.pnl_cache: Optional[PnLCache] = pnl_cache
+        self.correlation_statistics_dal: Optional[CorrelationStatisticsDAL] = (
+            correlation_statistics_dal
+        )
+        # 剪枝模式：区域 -> (随机投影矩阵, 池中 Alpha 的草图)，行顺序与收益矩阵列一致
+        self.sketch_dim: int = max(sketch_dim, 0)
+        self.sketch_margin: float = sketch_margin
+        self.sketch_top_k: int = max(sketch_top_k, 1)
+        self._region_sketch: Dict[Region, Tuple[np.ndarray, np.ndarray]] = {}
+        # 进程池模式：区域收益矩阵以内存映射文件共享给工作进程，区域 -> 文件路径
+        if process_workers is None:
+            process_workers = settings.correlation_process_workers
+        self.correlation_executor: Optional[CorrelationExecutor] = (
+            CorrelationExecutor(max_workers=process_workers)
+            if process_workers > 0
+            else None
+        )
+        self._region_matrix_path: Dict[Region, str] = {}
+        self.pnl_prefetcher: PnLPrefetcher = PnLPrefetcher(
+            client=client,
+            record_set_dal=record_set_dal,
+            pnl_cache=pnl_cache,
+        )
+        self.write_buffer: EvaluateWriteBuffer = write_buffer or EvaluateWriteBuffer(
+            record_set_dal.session, flush_size=1
+        )
 
     async def _validate_pnl_dataframe(
         self, pnl_df: Optional[pd.DataFrame], alpha_id: str
@@ -145,20 +299,22 @@ class CorrelationCalculator:
 
             self._region_to_alpha_map.setdefault(region, []).append(alpha.alpha_id)
 
-            record_set: Optional[RecordSet] = await self.record_set_dal.find_one_by(
-                alpha_id=alpha.alpha_id,
+        all_alpha_ids: List[str] = [
+            alpha_id
+            for alpha_ids in self._region_to_alpha_map.values()
+            for alpha_id in alpha_ids
+        ]
+        existing_content_hashes: Dict[str, Optional[str]] = (
+            await self.record_set_dal.find_content_hashes(
+                alpha_ids=all_alpha_ids,
                 set_type=RecordSetType.PNL,
             )
-
-            if record_set is None or record_set.content is None:
-                missing_pnl_alpha_ids.append(alpha.alpha_id)
-                await log.awarning(
-                    event="Alpha 策略缺少或为空的 pnl 数据",
-                    alpha_id=alpha.alpha_id,
-                    emoji="⚠️",
-                    module=__name__,
-                )
-                continue
+        )
+        missing_pnl_alpha_ids = [
+            alpha_id
+            for alpha_id in all_alpha_ids
+            if alpha_id not in existing_content_hashes
+        ]
 
         if missing_pnl_alpha_ids:
             await log.awarning(
@@ -167,8 +323,15 @@ class CorrelationCalculator:
                 emoji="⚠️",
                 module=__name__,
             )
-            for alpha_id in missing_pnl_alpha_ids:
-                await self._load_missing_pnl(alpha_id)
+            await self.pnl_prefetcher.prefetch(missing_pnl_alpha_ids)
+            existing_content_hashes.update(
+                await self.record_set_dal.find_content_hashes(
+                    alpha_ids=missing_pnl_alpha_ids,
+                    set_type=RecordSetType.PNL,
+                )
+            )
+
+        await self._build_region_return_matrices(existing_content_hashes)
 
         self._is_initialized = True
         await log.ainfo(
@@ -183,44 +346,10 @@ class CorrelationCalculator:
         从平台加载指定 Alpha 的 pnl 数据。
         """
         try:
-            async with self.client as client:
-                pnl_table_view: Optional[TableView]
-                finished: bool = False
-                retry_after: float = 0.0
-                timeout: float = 30.0  # 设置超时时间为 30 秒
-                start_time: float = asyncio.get_event_loop().time()
-
-                while not finished:
-                    # 检查是否超时
-                    elapsed_time = asyncio.get_event_loop().time() - start_time
-                    if elapsed_time > timeout:
-                        await log.aerror(
-                            event="加载 Alpha 策略的 pnl 数据超时",
-                            alpha_id=alpha_id,
-                            timeout=timeout,
-                            emoji="⏰",
-                            module=__name__,
-                        )
-                        raise TimeoutError(
-                            f"加载 Alpha 策略 {alpha_id} 的 pnl 数据超时"
-                        )
-
-                    finished, pnl_table_view, retry_after, _ = (
-                        await client.alpha_fetch_record_set_pnl(alpha_id=alpha_id)
-                    )
-
-                    if not finished:
-                        await log.ainfo(
-                            event="Alpha 策略的 pnl 数据加载中, 等待重试",
-                            alpha_id=alpha_id,
-                            retry_after=retry_after,
-                            emoji="⏳",
-                            module=__name__,
-                        )
-                        await asyncio.sleep(retry_after)
-
-            if pnl_table_view is None:
-                raise ValueError("Alpha 的 pnl 数据为 None")
+            async with self.client:
+                pnl_table_view: TableView = await self.pnl_prefetcher.fetch_table_view(
+                    alpha_id
+                )
 
             record_set_pnl: RecordSet = RecordSet(
                 alpha_id=alpha_id,
@@ -228,27 +357,29 @@ class CorrelationCalculator:
                 content=pnl_table_view.model_dump(),
             )
 
-            existing_record_set: Optional[RecordSet] = (
-                await self.record_set_dal.find_one_by(
-                    alpha_id=alpha_id,
-                    set_type=RecordSetType.PNL,
+            async with session_lock(self.record_set_dal.session):
+                existing_record_set: Optional[RecordSet] = (
+                    await self.record_set_dal.find_one_by(
+                        alpha_id=alpha_id,
+                        set_type=RecordSetType.PNL,
+                    )
                 )
-            )
 
             if existing_record_set is None:
-                await self.record_set_dal.create(record_set_pnl)
+                await self.write_buffer.add(record_set_pnl)
             else:
                 record_set_pnl.id = existing_record_set.id
-                await self.record_set_dal.update(
-                    record_set_pnl,
-                )
-            # FIXME: 貌似因为没有 commit 导致数据没有保存到数据库
-            await self.record_set_dal.session.commit()
+                await self.write_buffer.merge(record_set_pnl)
 
             pnl_series_df: Optional[pd.DataFrame] = pnl_table_view.to_dataframe()
             if pnl_series_df is None:
                 raise ValueError("Alpha 的 pnl 数据转换为 DataFrame 失败")
 
+            if self.pnl_cache and record_set_pnl.content_hash:
+                await self.pnl_cache.put(
+                    alpha_id, record_set_pnl.content_hash, pnl_series_df
+                )
+
             await log.adebug(
                 event="成功从平台加载 Alpha 的 pnl 数据",
                 alpha_id=alpha_id,
@@ -288,11 +419,39 @@ class CorrelationCalculator:
             )
             raise
 
-    async def _retrieve_pnl_from_local(self, alpha_id: str) -> Optional[pd.DataFrame]:
-        pnl_record_set: Optional[RecordSet] = await self.record_set_dal.find_one_by(
-            alpha_id=alpha_id,
-            set_type=RecordSetType.PNL,
-        )
+    async def _retrieve_pnl_from_local(
+        self,
+        alpha_id: str,
+        content_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        从本地缓存或数据库加载指定 Alpha 的 pnl 数据。
+
+        :param alpha_id: Alpha ID
+        :param content_hashes: 已批量查询的记录集内容哈希，为 None 时单独查询
+        :return: pnl 数据，缺少记录时为 None
+        """
+        content_hash: Optional[str] = None
+        if self.pnl_cache:
+            if content_hashes is None:
+                async with session_lock(self.record_set_dal.session):
+                    content_hashes = await self.record_set_dal.find_content_hashes(
+                        alpha_ids=[alpha_id],
+                        set_type=RecordSetType.PNL,
+                    )
+            content_hash = content_hashes.get(alpha_id)
+            if content_hash:
+                cached_pnl_df: Optional[pd.DataFrame] = await self.pnl_cache.get(
+                    alpha_id, content_hash
+                )
+                if cached_pnl_df is not None:
+                    return cached_pnl_df
+
+        async with session_lock(self.record_set_dal.session):
+            pnl_record_set: Optional[RecordSet] = await self.record_set_dal.find_one_by(
+                alpha_id=alpha_id,
+                set_type=RecordSetType.PNL,
+            )
 
         if pnl_record_set is None:
             await log.awarning(
@@ -321,6 +480,16 @@ class CorrelationCalculator:
             )
             raise ValueError("Alpha 的 pnl 数据转换为 DataFrame 失败")
 
+        if self.pnl_cache:
+            if pnl_record_set.content_hash is None:
+                # 历史记录没有内容哈希，补齐后随会话一起提交
+                pnl_record_set.content_hash = RecordSet.compute_content_hash(
+                    pnl_record_set.content
+                )
+            await self.pnl_cache.put(
+                alpha_id, pnl_record_set.content_hash, pnl_series_df
+            )
+
         return pnl_series_df
 
     async def _get_pnl_dataframe(
@@ -375,7 +544,7 @@ class CorrelationCalculator:
             )
             raise ValueError("日期转换失败") from e
 
-        four_years_ago = pnl_df["date"].max() - pd.DateOffset(years=4)
+        four_years_ago = pnl_df["date"].max() - CORRELATION_WINDOW
         pnl_df = pnl_df[pnl_df["date"] >= four_years_ago]
         pnl_df = pnl_df.set_index("date").ffill()
         await log.adebug(
@@ -386,19 +555,83 @@ class CorrelationCalculator:
         )
         return pnl_df
 
-    async def calculate_correlation(self, alpha: Alpha) -> Dict[str, float]:
+    async def _to_daily_returns(self, pnl_df: pd.DataFrame, alpha_id: str) -> pd.Series:
         """
-        计算自相关性。
+        将 pnl 数据框转换为按日期索引的日收益序列。
 
-        :param alpha: Alpha 实例
-        :return: 自相关系数
+        :param pnl_df: 原始 pnl 数据框
+        :param alpha_id: Alpha 策略 ID，作为序列名称
+        :return: 日收益序列
         """
-        await log.ainfo(
-            event="开始计算 Alpha 的自相关性",
-            alpha_id=alpha.alpha_id,
-            emoji="🔄",
-        )
+        pnl_df = await self._prepare_pnl_dataframe(pnl_df)
+        pnl_diff_df: pd.DataFrame = (pnl_df - pnl_df.shift(1)).ffill()
+        daily_returns: pd.Series = pnl_diff_df.iloc[:, 0].astype(np.float64)
+        daily_returns = daily_returns[~daily_returns.index.duplicated(keep="last")]
+        daily_returns.name = alpha_id
+        return daily_returns
+
+    async def _build_region_return_matrices(
+        self, content_hashes: Dict[str, Optional[str]]
+    ) -> None:
+        """
+        为每个区域构建按日期对齐的日收益矩阵，供相关性计算一次性使用。
+
+        :param content_hashes: 池中 Alpha 的记录集内容哈希，缓存命中时无需逐个查询
+        """
+        self._region_return_matrix = {}
+        self._region_sketch = {}
+        self._region_matrix_path = {}
+        for region, alpha_ids in self._region_to_alpha_map.items():
+            region_returns: List[pd.Series] = []
+            for alpha_id in alpha_ids:
+                pnl_df: Optional[pd.DataFrame] = await self._retrieve_pnl_from_local(
+                    alpha_id=alpha_id, content_hashes=content_hashes
+                )
+                if pnl_df is None:
+                    await log.awarning(
+                        event="Alpha 策略缺少 pnl 数据, 不纳入区域收益矩阵",
+                        alpha_id=alpha_id,
+                        region=region,
+                        emoji="⚠️",
+                    )
+                    continue
+                region_returns.append(await self._to_daily_returns(pnl_df, alpha_id))
 
+            if not region_returns:
+                continue
+
+            return_matrix: pd.DataFrame = pd.concat(
+                region_returns, axis=1, join="outer"
+            ).sort_index()
+            return_matrix = return_matrix.loc[
+                :, ~return_matrix.columns.duplicated(keep="last")
+            ]
+            self._region_return_matrix[region] = return_matrix
+            await log.adebug(
+                event="区域日收益矩阵构建完成",
+                region=region,
+                days=return_matrix.shape[0],
+                alphas=return_matrix.shape[1],
+                emoji="🧮",
+            )
+            if self.sketch_dim > 0:
+                self._region_sketch[region] = build_sketch(
+                    return_matrix, self.sketch_dim
+                )
+            if self.correlation_executor is not None:
+                self._region_matrix_path[region] = self.correlation_executor.publish(
+                    region.value, return_matrix.to_numpy(dtype=np.float64)
+                )
+
+    async def _load_candidate_for_region(
+        self, alpha: Alpha
+    ) -> Optional[Tuple[Region, pd.DataFrame, pd.Series]]:
+        """
+        获取候选 Alpha 所在区域的收益矩阵与候选 Alpha 的日收益序列。
+
+        :param alpha: Alpha 实例
+        :return: (区域, 区域收益矩阵, 候选日收益序列)，区域内没有池中 Alpha 时返回 None
+        """
         if not self._is_initialized:
             await log.awarning(
                 event="SelfCorrelationCalculator 尚未初始化, 正在初始化",
@@ -406,8 +639,6 @@ class CorrelationCalculator:
             )
             await self.initialize()
 
-        start_time: datetime = datetime.now()
-
         try:
             region: Region = alpha.settings.region
         except AttributeError as e:
@@ -418,82 +649,528 @@ class CorrelationCalculator:
             )
             raise ValueError("Alpha 策略缺少 region 设置") from e
 
-        matched_region_alpha_ids: List[str] = self._region_to_alpha_map.get(region, [])
+        return_matrix: Optional[pd.DataFrame] = self._region_return_matrix.get(region)
 
-        if not matched_region_alpha_ids:
+        if return_matrix is None or return_matrix.empty:
             await log.awarning(
                 event="没有找到同区域匹配的 OS 阶段 Alpha 策略",
                 region=region,
                 alpha_id=alpha.alpha_id,
                 emoji="⚠️",
             )
+            return None
+
+        x_returns: pd.Series = await self._load_candidate_returns(alpha.alpha_id)
+        return region, return_matrix, x_returns
+
+    async def _calculate_exact(
+        self,
+        alpha_id: str,
+        region: Region,
+        return_matrix: pd.DataFrame,
+        x_returns: pd.Series,
+        pool_ids: List[str],
+    ) -> Dict[str, float]:
+        """
+        精确计算候选 Alpha 与指定池中 Alpha 的相关性，并写入相关性表。
+        """
+        correlations: np.ndarray = await self._correlate_with_pool(
+            region, return_matrix, x_returns, pool_ids
+        )
+        pairwise_correlation: Dict[str, float] = await self._record_correlations(
+            alpha_id, pool_ids, correlations
+        )
+        await self.correlation_buffer.flush()
+        return pairwise_correlation
+
+    async def _log_correlation_done(
+        self,
+        alpha_id: str,
+        pairwise_correlation: Dict[str, float],
+        start_time: datetime,
+    ) -> None:
+        """
+        记录自相关性计算完成的日志。
+        """
+        max_corr: float = max(pairwise_correlation.values(), default=-1.0)
+        min_corr: float = min(pairwise_correlation.values(), default=1.0)
+        elapsed_time: float = (datetime.now() - start_time).total_seconds()
+
+        await log.ainfo(
+            event="完成自相关性计算",
+            alpha_id=alpha_id,
+            max_corr=max_corr,
+            min_corr=min_corr,
+            elapsed_time="{:.2f} 秒".format(elapsed_time),
+            emoji="✅",
+        )
+
+    async def calculate_correlation(self, alpha: Alpha) -> Dict[str, float]:
+        """
+        计算自相关性，返回与同区域池中所有 Alpha 的精确相关系数。
+
+        :param alpha: Alpha 实例
+        :return: 自相关系数
+        """
+        await log.ainfo(
+            event="开始计算 Alpha 的自相关性",
+            alpha_id=alpha.alpha_id,
+            emoji="🔄",
+        )
+        start_time: datetime = datetime.now()
+
+        candidate: Optional[Tuple[Region, pd.DataFrame, pd.Series]] = (
+            await self._load_candidate_for_region(alpha)
+        )
+        if candidate is None:
             return {}
+        region, return_matrix, x_returns = candidate
+
+        # 剔除候选 Alpha 自身
+        pool_ids: List[str] = [
+            pool_id for pool_id in return_matrix.columns if pool_id != alpha.alpha_id
+        ]
+        pairwise_correlation: Dict[str, float] = await self._calculate_exact(
+            alpha.alpha_id, region, return_matrix, x_returns, pool_ids
+        )
+        await self._log_correlation_done(
+            alpha.alpha_id, pairwise_correlation, start_time
+        )
+        return pairwise_correlation
+
+    async def calculate_correlation_pruned(
+        self, alpha: Alpha
+    ) -> Tuple[Dict[str, float], bool]:
+        """
+        用草图剪枝计算自相关性，只精确计算可能接近阈值的少量池中 Alpha。
+
+        精确计算筛选出的 Alpha 后，用草图误差估计未被精确计算的 Alpha 的相关性上界：
+
+        - 筛选结果的精确最大值不低于上界时，最大自相关就是该精确值；
+        - 上界不超过自相关阈值时，是否超过阈值的结论不受剪枝影响，
+          但返回的最大值可能低于真实最大值；
+        - 其余情况回退到全量精确计算。
+
+        未启用草图 (sketch_dim 为 0) 时等同于 calculate_correlation。
 
-        x_pnl_series_df: pd.DataFrame = await self._get_pnl_dataframe(
+        :param alpha: Alpha 实例
+        :return: (相关系数映射, 映射中的最大值是否为真实的最大自相关)，
+            剪枝后的映射只包含被精确计算的池中 Alpha
+        """
+        if self.sketch_dim <= 0:
+            return await self.calculate_correlation(alpha), True
+
+        await log.ainfo(
+            event="开始剪枝计算 Alpha 的自相关性",
             alpha_id=alpha.alpha_id,
-            force_refresh=False,
+            emoji="🔄",
         )
-        x_pnl_series_df = await self._validate_pnl_dataframe(
-            x_pnl_series_df, alpha.alpha_id
+        start_time: datetime = datetime.now()
+
+        candidate: Optional[Tuple[Region, pd.DataFrame, pd.Series]] = (
+            await self._load_candidate_for_region(alpha)
+        )
+        if candidate is None:
+            return {}, True
+        region, return_matrix, x_returns = candidate
+
+        pool_ids: List[str] = [
+            pool_id for pool_id in return_matrix.columns if pool_id != alpha.alpha_id
+        ]
+        sketch: Optional[Tuple[np.ndarray, np.ndarray]] = self._region_sketch.get(
+            region
+        )
+        pruning: Optional[Tuple[List[str], float]] = (
+            None
+            if sketch is None
+            else await prune_pool_by_sketch(
+                alpha.alpha_id,
+                x_returns,
+                return_matrix,
+                sketch,
+                self.sketch_margin,
+                self.sketch_top_k,
+            )
         )
-        x_pnl_series_df = await self._prepare_pnl_dataframe(x_pnl_series_df)
-        x_pnl_diff_series: pd.DataFrame = (
-            x_pnl_series_df - x_pnl_series_df.shift(1)
-        ).ffill()
 
-        max_corr: float = -1.0
-        min_corr: float = 1.0
-        pairwise_correlation: Dict[str, float] = {}
+        pairwise_correlation: Dict[str, float]
+        max_is_exact: bool = True
+        if pruning is None:
+            pairwise_correlation = await self._calculate_exact(
+                alpha.alpha_id, region, return_matrix, x_returns, pool_ids
+            )
+        else:
+            selected_ids, pruned_upper_bound = pruning
+            pairwise_correlation = await self._calculate_exact(
+                alpha.alpha_id, region, return_matrix, x_returns, selected_ids
+            )
+            shortlist_max: float = max(pairwise_correlation.values(), default=-1.0)
+            if shortlist_max < pruned_upper_bound:
+                if pruned_upper_bound <= CONSULTANT_MAX_SELF_CORRELATION:
+                    max_is_exact = False
+                else:
+                    await log.adebug(
+                        event="剪枝结果无法确定自相关结论, 回退到精确计算",
+                        alpha_id=alpha.alpha_id,
+                        shortlist_max=shortlist_max,
+                        pruned_upper_bound=pruned_upper_bound,
+                        emoji="↩️",
+                    )
+                    selected_set: Set[str] = set(selected_ids)
+                    remaining_ids: List[str] = [
+                        pool_id for pool_id in pool_ids if pool_id not in selected_set
+                    ]
+                    pairwise_correlation.update(
+                        await self._calculate_exact(
+                            alpha.alpha_id,
+                            region,
+                            return_matrix,
+                            x_returns,
+                            remaining_ids,
+                        )
+                    )
 
-        for alpha_id in matched_region_alpha_ids:
-            if alpha_id == alpha.alpha_id:
-                continue
+        await self._log_correlation_done(
+            alpha.alpha_id, pairwise_correlation, start_time
+        )
+        return pairwise_correlation, max_is_exact
 
-            y_pnl_series_df: Optional[pd.DataFrame] = (
-                await self._retrieve_pnl_from_local(alpha_id=alpha_id)
+    async def _correlate_with_pool(
+        self,
+        region: Region,
+        return_matrix: pd.DataFrame,
+        x_returns: pd.Series,
+        pool_ids: List[str],
+    ) -> np.ndarray:
+        """
+        计算候选 Alpha 与池中指定 Alpha 的相关系数。
+
+        启用进程池时在工作进程中读取共享的区域矩阵计算，否则在当前进程计算。
+        两种方式都会将区域矩阵对齐到候选 Alpha 的日期索引。
+
+        :return: 与 pool_ids 一一对应的相关系数数组
+        """
+        x_values: np.ndarray = x_returns.to_numpy(dtype=np.float64)
+        matrix_path: Optional[str] = self._region_matrix_path.get(region)
+        if self.correlation_executor is not None and matrix_path is not None:
+            return await self.correlation_executor.run(
+                one_vs_all_pearson_shared,
+                matrix_path,
+                x_values,
+                return_matrix.index.get_indexer(x_returns.index),
+                return_matrix.columns.get_indexer(pool_ids),
             )
-            y_pnl_series_df = await self._validate_pnl_dataframe(
-                y_pnl_series_df, alpha_id
+
+        aligned_matrix: np.ndarray = (
+            return_matrix[pool_ids].reindex(x_returns.index).to_numpy(dtype=np.float64)
+        )
+        return one_vs_all_pearson(x_values, aligned_matrix)
+
+    async def _correlate_many_with_pool(
+        self,
+        region: Region,
+        return_matrix: pd.DataFrame,
+        candidate_matrix: pd.DataFrame,
+    ) -> np.ndarray:
+        """
+        计算一组候选 Alpha 与区域内所有池中 Alpha 的相关系数。
+
+        :return: 形状为 (n_candidates, n_alphas) 的相关系数矩阵，列顺序与区域矩阵一致
+        """
+        candidate_values: np.ndarray = candidate_matrix.to_numpy(dtype=np.float64)
+        matrix_path: Optional[str] = self._region_matrix_path.get(region)
+        if self.correlation_executor is not None and matrix_path is not None:
+            return await self.correlation_executor.run(
+                many_vs_all_pearson_shared,
+                matrix_path,
+                candidate_values,
+                return_matrix.index.get_indexer(candidate_matrix.index),
             )
-            y_pnl_series_df = await self._prepare_pnl_dataframe(y_pnl_series_df)
-            y_pnl_diff_series: pd.DataFrame = (
-                y_pnl_series_df - y_pnl_series_df.shift(1)
-            ).ffill()
 
-            corr: float = x_pnl_diff_series.corrwith(y_pnl_diff_series, axis=0).iloc[0]
+        aligned_matrix: np.ndarray = return_matrix.reindex(
+            candidate_matrix.index
+        ).to_numpy(dtype=np.float64)
+        return many_vs_all_pearson(candidate_values, aligned_matrix)
+
+    async def close(self) -> None:
+        """
+        释放计算资源 (进程池及共享矩阵文件)。
+        """
+        if self.correlation_executor is not None:
+            await self.correlation_executor.close()
+            self.correlation_executor = None
+            self._region_matrix_path = {}
+
+    async def __aenter__(self) -> "CorrelationCalculator":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        # 无论正常退出还是异常、取消，都关闭进程池并删除共享矩阵文件
+        await self.close()
+
+    async def _record_correlations(
+        self,
+        alpha_id: str,
+        other_alpha_ids: List[str],
+        correlations: np.ndarray,
+    ) -> Dict[str, float]:
+        """
+        过滤 NaN 结果，并将候选 Alpha 与池中 Alpha 的本地相关性加入写后缓冲区。
+
+        :param alpha_id: 候选 Alpha 策略 ID
+        :param other_alpha_ids: 与 correlations 一一对应的池中 Alpha ID
+        :param correlations: 相关系数数组
+        :return: 池中 Alpha ID 到相关系数的映射
+        """
+        pairwise_correlation: Dict[str, float] = {}
+
+        for other_alpha_id, corr in zip(other_alpha_ids, correlations.tolist()):
             if pd.isna(corr):
                 await log.awarning(
                     event="相关性计算结果为 NaN",
-                    alpha_id_a=alpha.alpha_id,
-                    alpha_id_b=alpha_id,
+                    alpha_id_a=alpha_id,
+                    alpha_id_b=other_alpha_id,
                     emoji="⚠️",
                 )
                 continue
 
-            self_correlation: Correlation = Correlation(
-                alpha_id_a=alpha.alpha_id,
-                alpha_id_b=alpha_id,
-                correlation=corr,
-                calc_type=CorrelationCalcType.LOCAL,
+            await self.correlation_buffer.add(
+                alpha_id, other_alpha_id, corr, CorrelationCalcType.LOCAL
             )
-            await self.correlation_dal.create(self_correlation)
-            pairwise_correlation[alpha_id] = corr
+            pairwise_correlation[other_alpha_id] = corr
 
-            max_corr = max(max_corr, corr)
-            min_corr = min(min_corr, corr)
+        return pairwise_correlation
 
-        end_time: datetime = datetime.now()
-        elapsed_time: float = (end_time - start_time).total_seconds()
+    async def _load_candidate_returns(self, alpha_id: str) -> pd.Series:
+        """
+        获取候选 Alpha 的日收益序列。
 
+        :param alpha_id: Alpha 策略 ID
+        :return: 日收益序列
+        """
+        pnl_df: pd.DataFrame = await self._get_pnl_dataframe(
+            alpha_id=alpha_id,
+            force_refresh=False,
+        )
+        pnl_df = await self._validate_pnl_dataframe(pnl_df, alpha_id)
+        return await self._to_daily_returns(pnl_df, alpha_id)
+
+    async def calculate_correlation_many(
+        self, alphas: List[Alpha]
+    ) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, float]]]:
+        """
+        批量计算一组候选 Alpha 的自相关性。
+
+        同区域的候选 Alpha 会被拼成一个日收益矩阵，与区域收益矩阵做一次矩阵乘法得到
+        候选 × 池的相关系数；同时计算候选 × 候选的相关系数，便于调用方剔除同批次内
+        高度相似的 Alpha。缺少 region 设置或 PnL 数据的候选会被跳过，不出现在结果中。
+
+        :param alphas: 候选 Alpha 列表
+        :return: (候选与池中 Alpha 的相关性, 候选之间的相关性)，均以 alpha_id 为键
+        """
         await log.ainfo(
-            event="完成自相关性计算",
-            alpha_id=alpha.alpha_id,
-            max_corr=max_corr,
-            min_corr=min_corr,
+            event="开始批量计算 Alpha 的自相关性",
+            count=len(alphas),
+            emoji="🔄",
+        )
+
+        if not self._is_initialized:
+            await log.awarning(
+                event="SelfCorrelationCalculator 尚未初始化, 正在初始化",
+                emoji="⚠️",
+            )
+            await self.initialize()
+
+        start_time: datetime = datetime.now()
+        pool_correlations: Dict[str, Dict[str, float]] = {}
+        batch_correlations: Dict[str, Dict[str, float]] = {}
+        region_to_returns: Dict[Region, List[pd.Series]] = {}
+
+        for alpha in alphas:
+            try:
+                region: Region = alpha.settings.region
+                x_returns: pd.Series = await self._load_candidate_returns(
+                    alpha.alpha_id
+                )
+            except (AttributeError, ValueError) as e:
+                await log.awarning(
+                    event="候选 Alpha 无法参与批量计算, 已跳过",
+                    alpha_id=alpha.alpha_id,
+                    error=str(e),
+                    emoji="⚠️",
+                )
+                continue
+            region_to_returns.setdefault(region, []).append(x_returns)
+
+        for region, returns in region_to_returns.items():
+            candidate_matrix: pd.DataFrame = pd.concat(returns, axis=1, join="outer")
+            candidate_matrix = candidate_matrix.loc[
+                :, ~candidate_matrix.columns.duplicated()
+            ].sort_index()
+            candidate_ids: List[str] = candidate_matrix.columns.tolist()
+            candidate_values: np.ndarray = candidate_matrix.to_numpy(dtype=np.float64)
+
+            # 候选 × 候选
+            intra: np.ndarray = (
+                await self.correlation_executor.run(
+                    many_vs_all_pearson, candidate_values, candidate_values
+                )
+                if self.correlation_executor is not None
+                else many_vs_all_pearson(candidate_values, candidate_values)
+            )
+            for row, alpha_id in enumerate(candidate_ids):
+                batch_correlations[alpha_id] = {
+                    other_alpha_id: corr
+                    for other_alpha_id, corr in zip(candidate_ids, intra[row].tolist())
+                    if other_alpha_id != alpha_id and not pd.isna(corr)
+                }
+
+            # 候选 × 池
+            return_matrix: Optional[pd.DataFrame] = self._region_return_matrix.get(
+                region
+            )
+            if return_matrix is None or return_matrix.empty:
+                await log.awarning(
+                    event="没有找到同区域匹配的 OS 阶段 Alpha 策略",
+                    region=region,
+                    alpha_ids=candidate_ids,
+                    emoji="⚠️",
+                )
+                for alpha_id in candidate_ids:
+                    pool_correlations[alpha_id] = {}
+                continue
+
+            pool_ids: List[str] = return_matrix.columns.tolist()
+            correlations: np.ndarray = await self._correlate_many_with_pool(
+                region, return_matrix, candidate_matrix
+            )
+
+            for row, alpha_id in enumerate(candidate_ids):
+                # 候选 Alpha 自身位于池中时不与自己比较
+                keep: np.ndarray = np.array(
+                    [pool_id != alpha_id for pool_id in pool_ids], dtype=bool
+                )
+                pool_correlations[alpha_id] = await self._record_correlations(
+                    alpha_id,
+                    [pool_id for pool_id in pool_ids if pool_id != alpha_id],
+                    correlations[row][keep],
+                )
+
+        await self.correlation_buffer.flush()
+        elapsed_time: float = (datetime.now() - start_time).total_seconds()
+        await log.ainfo(
+            event="完成批量自相关性计算",
+            count=len(pool_correlations),
+            skipped=len(alphas) - len(pool_correlations),
             elapsed_time="{:.2f} 秒".format(elapsed_time),
             emoji="✅",
         )
-        return pairwise_correlation
+        return pool_correlations, batch_correlations
+
+    async def _load_full_daily_returns(
+        self, alpha_id: str
+    ) -> Tuple[pd.Series, pd.Timestamp]:
+        """
+        获取 Alpha 不截断窗口的完整日收益序列，以及其滚动窗口内首个有效收益日期。
+
+        窗口截断后的首日收益在 `_to_daily_returns` 中为 NaN，因此有效起点为窗口内的第二天，
+        以保证增量统计与全量计算使用相同的样本。
+
+        :param alpha_id: Alpha 策略 ID
+        :return: (完整日收益序列, 窗口有效起始日期)
+        """
+        pnl_df: pd.DataFrame = await self._get_pnl_dataframe(
+            alpha_id=alpha_id,
+            force_refresh=False,
+        )
+        pnl_df = await self._validate_pnl_dataframe(pnl_df, alpha_id)
+        pnl_df = pnl_df.copy()
+        pnl_df["date"] = pd.to_datetime(pnl_df["date"])
+        pnl_df = pnl_df.set_index("date").sort_index().ffill()
+
+        returns: pd.Series = (
+            (pnl_df - pnl_df.shift(1)).ffill().iloc[:, 0].astype(np.float64)
+        )
+        returns = returns[~returns.index.duplicated(keep="last")]
+        returns.name = alpha_id
+
+        window_dates: pd.DatetimeIndex = returns.index[
+            returns.index >= returns.index.max() - CORRELATION_WINDOW
+        ]
+        if len(window_dates) < 2:
+            raise ValueError("Alpha 的 pnl 数据不足以计算日收益")
+        return returns, window_dates[1]
+
+    async def _statistics_updater(self) -> CorrelationStatisticsUpdater:
+        """
+        以当前配置的充分统计量数据访问层构建增量更新器。
+
+        :return: 充分统计量增量更新器
+        """
+        if self.correlation_statistics_dal is None:
+            await log.aerror(
+                event="未配置相关性充分统计量数据访问层, 无法增量更新",
+                emoji="❌",
+            )
+            raise RuntimeError("未配置 correlation_statistics_dal")
+        return CorrelationStatisticsUpdater(
+            self.correlation_statistics_dal,
+            self.correlation_buffer,
+            self._load_full_daily_returns,
+        )
+
+    async def update_correlation_statistics(
+        self,
+        alpha_id: str,
+        other_alpha_ids: List[str],
+        force_rebuild: bool = False,
+    ) -> Dict[str, float]:
+        """
+        基于持久化的充分统计量，增量更新一个 Alpha 与一组 Alpha 的相关性，
+        得到的相关系数同时写入相关性表。
+
+        :param alpha_id: Alpha 策略 ID
+        :param other_alpha_ids: 另一侧的 Alpha ID 列表
+        :param force_rebuild: 是否忽略已有统计量，对整个窗口重新累加
+        :return: 另一侧 Alpha ID 到相关系数的映射
+        """
+        updater: CorrelationStatisticsUpdater = await self._statistics_updater()
+        return await updater.update(alpha_id, other_alpha_ids, force_rebuild)
+
+    def pool_regions(self) -> List[Region]:
+        """
+        获取因子池中包含 Alpha 的区域，需要先调用 initialize。
+
+        :return: 区域列表
+        """
+        return list(self._region_to_alpha_map)
+
+    async def refresh_pool_statistics(
+        self, region: Region, force_rebuild: bool = False
+    ) -> int:
+        """
+        增量更新区域内所有 OS 阶段 Alpha 两两之间的充分统计量，适用于每日例行刷新，
+        得到的相关系数同时写入相关性表。
+
+        直接复用初始化时构建的区域收益矩阵。
+
+        :param region: 区域
+        :param force_rebuild: 是否忽略已有统计量，对整个窗口重新累加
+        :return: 得到有效相关系数的 Alpha 对数量
+        """
+        updater: CorrelationStatisticsUpdater = await self._statistics_updater()
+        if not self._is_initialized:
+            await self.initialize()
+
+        return_matrix: Optional[pd.DataFrame] = self._region_return_matrix.get(region)
+        if return_matrix is None:
+            return 0
+        return await updater.refresh(region, return_matrix, force_rebuild)
 
 
 if __name__ == "__main__":
@@ -533,34 +1210,34 @@ if __name__ == "__main__":
                                 emoji="❌",
                             )
 
-                    calculator = CorrelationCalculator(
+                    async with CorrelationCalculator(
                         client=client,
                         alpha_stream=alpha_generator(),
                         alpha_dal=alpha_dal,
                         record_set_dal=record_set_dal,
                         correlation_dal=correlation_dal,
-                    )
-                    await calculator.initialize()
+                    ) as calculator:
+                        await calculator.initialize()
 
-                    alpha: Optional[Alpha] = await alpha_dal.find_one_by(
-                        alpha_id="d1n2w6w",
-                    )
+                        alpha: Optional[Alpha] = await alpha_dal.find_one_by(
+                            alpha_id="d1n2w6w",
+                        )
 
-                    if alpha is None:
-                        await log.aerror(
-                            event="Alpha 策略不存在",
-                            alpha_id="alpha_id_example",
-                            emoji="❌",
+                        if alpha is None:
+                            await log.aerror(
+                                event="Alpha 策略不存在",
+                                alpha_id="alpha_id_example",
+                                emoji="❌",
+                            )
+                            return
+                        corr: Dict[str, float] = await calculator.calculate_correlation(
+                            alpha=alpha
+                        )
+                        await log.ainfo(
+                            event="计算完成",
+                            alpha_id=alpha.alpha_id,
+                            corr=corr,
+                            emoji="✅",
                         )
-                        return
-                    corr: Dict[str, float] = await calculator.calculate_correlation(
-                        alpha=alpha,
-                    )
-                    await log.ainfo(
-                        event="计算完成",
-                        alpha_id=alpha.alpha_id,
-                        corr=corr,
-                        emoji="✅",
-                    )
 
     asyncio.run(main())
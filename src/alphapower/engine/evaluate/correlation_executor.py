@@ -0,0 +1,151 @@
+"""自相关数值计算的进程池执行器。
+
+相关系数计算是纯 NumPy 运算，直接在事件循环中执行会阻塞心跳、限流请求以及
+`evaluate_many` 中并发的其他评估协程。执行器将这部分计算交给 `ProcessPoolExecutor`，
+事件循环只负责等待结果。
+
+区域收益矩阵通过 `publish` 写成临时目录下的 `.npy` 文件，工作进程以内存映射
+(memory-map) 方式打开并按路径缓存，多个进程共享操作系统的页缓存，矩阵不会在
+每次调用时被序列化 (pickle) 传输；每次调用只传输候选 Alpha 的收益序列和行列下标。
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import numpy as np
+from structlog.stdlib import BoundLogger
+
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 工作进程内已打开的内存映射矩阵，以文件路径为键
+_attached_matrices: Dict[str, np.ndarray] = {}
+
+
+def attach_shared_matrix(path: str) -> np.ndarray:
+    """
+    在工作进程中以只读内存映射方式打开已发布的矩阵。
+
+    发布时每个版本的矩阵都写入新的文件，因此按路径缓存不会读到旧数据。
+
+    :param path: `CorrelationExecutor.publish` 返回的文件路径
+    :return: 只读的内存映射矩阵
+    """
+    matrix: Optional[np.ndarray] = _attached_matrices.get(path)
+    if matrix is None:
+        # 顺便释放已被新版本替换 (文件已删除) 的旧映射
+        for stale_path in [p for p in _attached_matrices if not os.path.exists(p)]:
+            del _attached_matrices[stale_path]
+        matrix = np.load(path, mmap_mode="r")
+        _attached_matrices[path] = matrix
+    return matrix
+
+
+def take_aligned(
+    matrix: np.ndarray, row_positions: np.ndarray, column_positions: np.ndarray
+) -> np.ndarray:
+    """
+    按行列下标从矩阵中取出子矩阵，行下标为 -1 的行填充 NaN。
+
+    行下标通常来自 `DataFrame.index.get_indexer`，效果等价于 `reindex`。
+
+    :param matrix: 形状为 (n_days, n_alphas) 的矩阵
+    :param row_positions: 目标日期在矩阵中的行下标
+    :param column_positions: 目标 Alpha 在矩阵中的列下标
+    :return: 形状为 (len(row_positions), len(column_positions)) 的矩阵
+    """
+    aligned: np.ndarray = np.full(
+        (len(row_positions), len(column_positions)), np.nan, dtype=np.float64
+    )
+    found: np.ndarray = row_positions >= 0
+    aligned[found] = matrix[row_positions[found]][:, column_positions]
+    return aligned
+
+
+class CorrelationExecutor:
+    """
+    在进程池中执行相关系数计算，并通过内存映射文件向工作进程共享区域收益矩阵。
+    """
+
+    FILE_SUFFIX: str = ".npy"
+
+    def __init__(self, max_workers: int) -> None:
+        """
+        初始化执行器。
+
+        :param max_workers: 进程池的工作进程数
+        """
+        self.max_workers: int = max(max_workers, 1)
+        self._pool: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self.max_workers
+        )
+        self._shared_dir: Path = Path(tempfile.mkdtemp(prefix="alphapower-corr-"))
+        self._published: Dict[str, Path] = {}
+        self._version: int = 0
+        # 调用方忘记 close 时，在对象回收或解释器退出时兜底清理
+        self._finalizer: weakref.finalize = weakref.finalize(
+            self, CorrelationExecutor._cleanup, self._pool, self._shared_dir
+        )
+
+    @staticmethod
+    def _cleanup(pool: ProcessPoolExecutor, shared_dir: Path) -> None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    def publish(self, key: str, matrix: np.ndarray) -> str:
+        """
+        将矩阵写入内存映射文件供工作进程读取，同一个键的旧版本文件会被删除。
+
+        :param key: 矩阵的键，例如区域名称
+        :param matrix: 需要共享的矩阵
+        :return: 工作进程通过 `attach_shared_matrix` 打开矩阵所用的文件路径
+        """
+        self._version += 1
+        path: Path = self._shared_dir / f"{key}-{self._version}{self.FILE_SUFFIX}"
+        shared: np.memmap = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float64, shape=matrix.shape
+        )
+        shared[:] = matrix
+        shared.flush()
+        del shared
+
+        stale_path: Optional[Path] = self._published.get(key)
+        self._published[key] = path
+        if stale_path is not None:
+            # 工作进程已打开的映射在文件删除后仍然有效
+            stale_path.unlink(missing_ok=True)
+        return str(path)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        在进程池中执行函数并等待结果，不阻塞事件循环。
+
+        :param func: 模块级函数 (需可被序列化)
+        :param args: 函数参数
+        :return: 函数返回值
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, func, *args)
+
+    async def close(self) -> None:
+        """
+        关闭进程池并删除共享矩阵文件。
+        """
+        if not self._finalizer.alive:
+            return
+        self._finalizer()
+        self._published = {}
+        await log.adebug(
+            event="相关性计算进程池已关闭",
+            max_workers=self.max_workers,
+            emoji="🛑",
+        )
@@ -1,7 +1,10 @@
-from math import sqrt
+import asyncio
+import time
 from typing import AsyncGenerator, Dict, List, Optional
 
-from alphapower.constants import CorrelationType, Database, Stage
+import numpy as np
+
+from alphapower.constants import CorrelationCalcType, Database, Stage
 from alphapower.dal.alphas import AlphaDAL
 from alphapower.dal.evaluate import CorrelationDAL
 from alphapower.engine.evaluate.correlation_calculator import (
@@ -18,62 +21,130 @@ class CorrelationIndirectEstimator:
         self,
         alpha_dal: AlphaDAL,
         correlation_dal: CorrelationDAL,
-        prod_alpha_stream: AsyncGenerator[Alpha],
+        prod_alpha_stream: AsyncGenerator[Alpha, None],
         corr_calculator: CorrelationCalculator,
+        cache_ttl: float = 600.0,
     ) -> None:
         """
         初始化 CorrelationIndirectEstimator
 
         :param alpha_dal: Alpha 数据访问层实例
         :param correlation_dal: Correlation 数据访问层实例
-        :param self_corr_calculator: 自相关性计算器实例
+        :param prod_alpha_stream: 生产环境 Alpha 流，只会被读取一次
+        :param corr_calculator: 自相关性计算器实例
+        :param cache_ttl: 生产环境相关性映射的缓存有效期 (秒)，过期或调用
+            `invalidate` 后下一次预测会重新查询数据库
         """
         self.alpha_dal = alpha_dal
         self.correlation_dal = correlation_dal
         self.corr_calculator = corr_calculator
-        # 强制使用生产环境 Alpha 流计算相关性
         self.prod_alpha_stream = prod_alpha_stream
-        self.corr_calculator.alpha_stream = prod_alpha_stream
+        self.cache_ttl: float = cache_ttl
+        # 生产环境 Alpha 流只能迭代一次，读取后缓存在内存中供多次预测复用
+        self._prod_alphas: Optional[List[Alpha]] = None
+        self._prod_alphas_lock: asyncio.Lock = asyncio.Lock()
+        # 生产环境 Alpha ID 与其最大相关性，两个数组一一对应，用于向量化计算上界
+        self._prod_alpha_ids: List[str] = []
+        self._prod_max_correlations: np.ndarray = np.empty(0, dtype=np.float64)
+        self._prod_map: Optional[Dict[str, float]] = None
+        self._prod_map_loaded_at: float = 0.0
+        self._prod_map_lock: asyncio.Lock = asyncio.Lock()
+        # 强制使用生产环境 Alpha 流计算相关性，与本类共享同一份缓存
+        self.corr_calculator.alpha_stream = self._replay_prod_alphas()
 
-    async def get_prod_correlations(self) -> Dict[str, float]:
+    async def _load_prod_alphas(self) -> List[Alpha]:
+        """
+        读取并缓存生产环境 Alpha 列表。
+
+        :return: 生产环境 Alpha 列表
+        """
+        async with self._prod_alphas_lock:
+            if self._prod_alphas is None:
+                self._prod_alphas = [alpha async for alpha in self.prod_alpha_stream]
+                await log.ainfo(
+                    event="已加载生产环境 Alpha 列表",
+                    count=len(self._prod_alphas),
+                    emoji="📥",
+                )
+            return self._prod_alphas
+
+    async def _replay_prod_alphas(self) -> AsyncGenerator[Alpha, None]:
+        """
+        以流的形式重放已缓存的生产环境 Alpha，供相关性计算器初始化使用。
+        """
+        for alpha in await self._load_prod_alphas():
+            yield alpha
+
+    def invalidate(self) -> None:
         """
-        获取生产环境中所有 Alpha 的 PROD 属性。
+        使生产环境相关性映射缓存失效，下一次预测时重新查询数据库。
 
-        :return: Alpha ID 到其 PROD 属性的映射
+        生产环境相关性有新的记录写入 (例如平台相关性检查完成) 后调用。
         """
-        await log.ainfo(event="查询生产环境 Alpha 的 PROD 属性", emoji="🔍")
-        prod_alpha_ids: List[str] = [
-            alpha.alpha_id async for alpha in self.prod_alpha_stream
-        ]
+        self._prod_map = None
 
-        prod_correlations: List[Correlation] = await self.correlation_dal.find_by(
-            in_={
-                "alpha_id_a": prod_alpha_ids,
-            },
-            correlation_type=CorrelationType.PROD,
+    def _is_prod_map_fresh(self) -> bool:
+        return (
+            self._prod_map is not None
+            and time.monotonic() - self._prod_map_loaded_at < self.cache_ttl
         )
 
-        prod_correlations.extend(
-            await self.correlation_dal.find_by(
+    async def get_prod_correlations(self) -> Dict[str, float]:
+        """
+        获取生产环境中所有 Alpha 的最大相关性，结果在有效期内缓存复用。
+
+        :return: Alpha ID 到其最大相关性的映射
+        """
+        if self._is_prod_map_fresh() and self._prod_map is not None:
+            return self._prod_map
+
+        async with self._prod_map_lock:
+            # 等待锁期间可能已被其他协程刷新
+            if self._is_prod_map_fresh() and self._prod_map is not None:
+                return self._prod_map
+
+            await log.ainfo(event="查询生产环境 Alpha 的相关性", emoji="🔍")
+            prod_alpha_ids: List[str] = [
+                alpha.alpha_id for alpha in await self._load_prod_alphas()
+            ]
+
+            prod_correlations: List[Correlation] = await self.correlation_dal.find_by(
                 in_={
-                    "alpha_id_b": prod_alpha_ids,
+                    "alpha_id_a": prod_alpha_ids,
                 },
-                correlation_type=CorrelationType.PROD,
+                calc_type=CorrelationCalcType.PLATFORM,
             )
-        )
 
-        prod_map: Dict[str, float] = {}
-        for corr in prod_correlations:
-            prod_map[corr.alpha_id_a] = max(
-                prod_map.get(corr.alpha_id_a, 0.0), corr.correlation
+            prod_correlations.extend(
+                await self.correlation_dal.find_by(
+                    in_={
+                        "alpha_id_b": prod_alpha_ids,
+                    },
+                    calc_type=CorrelationCalcType.PLATFORM,
+                )
+            )
+
+            prod_alpha_id_set = set(prod_alpha_ids)
+            prod_map: Dict[str, float] = {}
+            for corr in prod_correlations:
+                for alpha_id in (corr.alpha_id_a, corr.alpha_id_b):
+                    if alpha_id in prod_alpha_id_set:
+                        prod_map[alpha_id] = max(
+                            prod_map.get(alpha_id, 0.0), corr.correlation
+                        )
+
+            self._prod_alpha_ids = list(prod_map.keys())
+            self._prod_max_correlations = np.fromiter(
+                prod_map.values(), dtype=np.float64, count=len(prod_map)
             )
-            prod_map[corr.alpha_id_b] = max(
-                prod_map.get(corr.alpha_id_b, 0.0), corr.correlation
+            self._prod_map = prod_map
+            self._prod_map_loaded_at = time.monotonic()
+            await log.ainfo(
+                event="完成生产环境 Alpha 的相关性查询",
+                count=len(prod_map),
+                emoji="✅",
             )
-        await log.ainfo(
-            event="完成生产环境 Alpha 的相关性查询", count=len(prod_map), emoji="✅"
-        )
-        return prod_map
+            return prod_map
 
     async def estimate_correlation(self, alpha: Alpha) -> Optional[float]:
         """
@@ -88,7 +159,7 @@ class CorrelationIndirectEstimator:
             emoji="🔄",
         )
 
-        # 获取生产环境中所有 Alpha 的 PROD 属性
+        # 获取生产环境中所有 Alpha 的最大相关性
         prod_map = await self.get_prod_correlations()
         if not prod_map:
             await log.awarning(
@@ -108,14 +179,28 @@ class CorrelationIndirectEstimator:
             )
             return None
 
-        # 使用严格上界公式估算目标 Alpha 的生产环境相关系数
-        estimated_prod_corr = max(
-            self._calculate_upper_bound(
-                pairwise_correlation.get(prod_alpha_id, 0.0),
-                prod_map[prod_alpha_id],
+        # 使用严格上界公式一次性估算目标 Alpha 与所有生产环境 Alpha 的相关系数上界
+        rho_ab: np.ndarray = np.fromiter(
+            (
+                pairwise_correlation.get(prod_alpha_id, np.nan)
+                for prod_alpha_id in self._prod_alpha_ids
+            ),
+            dtype=np.float64,
+            count=len(self._prod_alpha_ids),
+        )
+        matched: np.ndarray = ~np.isnan(rho_ab)
+        if not matched.any():
+            await log.awarning(
+                event="Alpha 与有相关性记录的生产环境 Alpha 没有交集",
+                alpha_id=alpha.alpha_id,
+                emoji="⚠️",
             )
-            for prod_alpha_id in prod_map.keys()
-            if prod_alpha_id in pairwise_correlation
+            return None
+
+        estimated_prod_corr = float(
+            self._calculate_upper_bound(
+                rho_ab[matched], self._prod_max_correlations[matched]
+            ).max()
         )
 
         await log.ainfo(
@@ -126,17 +211,21 @@ class CorrelationIndirectEstimator:
         )
         return estimated_prod_corr
 
-    def _calculate_upper_bound(self, rho_ab: float, rho_bc: float) -> float:
+    def _calculate_upper_bound(
+        self, rho_ab: np.ndarray, rho_bc: np.ndarray
+    ) -> np.ndarray:
         """
-        根据严格上界公式计算相关系数的上界。
+        根据严格上界公式逐元素计算相关系数的上界。
 
-        :param rho_ab: Alpha 与生产环境 Alpha 的相关系数
-        :param rho_bc: 生产环境 Alpha 的 PROD 属性
+        :param rho_ab: Alpha 与各生产环境 Alpha 的相关系数
+        :param rho_bc: 各生产环境 Alpha 的最大相关性
         :return: 相关系数的上界
         """
         # 上界公式：|rho_ac| <= sqrt((1 - rho_ab^2)(1 - rho_bc^2)) + |rho_ab * rho_bc|
-        upper_bound = sqrt((1 - rho_ab**2) * (1 - rho_bc**2)) + abs(rho_ab * rho_bc)
-        return upper_bound
+        # 浮点误差可能使 1 - rho^2 略小于 0，截断后再开方
+        return np.sqrt(
+            np.clip((1 - rho_ab**2) * (1 - rho_bc**2), 0.0, None)
+        ) + np.abs(rho_ab * rho_bc)
 
 
 if __name__ == "__main__":
@@ -176,7 +265,7 @@ if __name__ == "__main__":
                     correlation_dal = CorrelationDAL(evaluate_session)
                     record_set_dal = RecordSetDAL(evaluate_session)
 
-                    async def alpha_generator() -> AsyncGenerator[Alpha]:
+                    async def alpha_generator() -> AsyncGenerator[Alpha, None]:
                         for alpha in await alpha_dal.find_by_stage(
                             stage=Stage.OS,
                         ):
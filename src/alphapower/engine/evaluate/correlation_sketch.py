@@ -0,0 +1,157 @@
+"""自相关计算的随机投影草图 (sketch) 剪枝。
+
+池中 Alpha 的收益列标准化后乘以同一个随机投影矩阵，得到低维草图；
+候选 Alpha 的草图与池中草图的内积即为相关系数的无偏估计。只有估计值接近
+自相关阈值或排在前列的少量 Alpha 需要精确计算，其余 Alpha 的真实相关性
+以估计误差给出上界。
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from structlog.stdlib import BoundLogger
+
+from alphapower.constants import CONSULTANT_MAX_SELF_CORRELATION
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+# 剪枝模式参数：随机投影种子、候选日期与区域矩阵的最低重叠比例、
+# 需要精确计算的比例超过该值时直接回退到全量计算
+SKETCH_SEED: int = 20250401
+SKETCH_MIN_COVERAGE: float = 0.9
+SKETCH_MAX_SELECTED_RATIO: float = 0.25
+# 草图估计误差的置信倍数：估计值的标准差约为 sqrt((1 + ρ²) / sketch_dim)，
+# 未被精确计算的 Alpha 的真实相关性以估计值加该倍数的标准差作为上界
+SKETCH_ERROR_Z: float = 4.0
+
+
+def standardize_columns(matrix: np.ndarray) -> np.ndarray:
+    """
+    将矩阵的每一列中心化并缩放为单位范数，缺失值视为均值 (填 0)。
+
+    两列标准化后的内积即为它们在共同有效日期上的皮尔逊相关系数的近似值，
+    当两列的缺失日期相同时两者完全相等。方差为 0 的列返回全 0。
+
+    :param matrix: 形状为 (n_days, n_columns) 的矩阵
+    :return: 标准化后的矩阵，形状不变
+    """
+    valid: np.ndarray = ~np.isnan(matrix)
+    counts: np.ndarray = np.maximum(valid.sum(axis=0), 1)
+    mean: np.ndarray = np.where(valid, matrix, 0.0).sum(axis=0) / counts
+    centered: np.ndarray = np.where(valid, matrix - mean, 0.0)
+    norms: np.ndarray = np.sqrt((centered * centered).sum(axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(norms > 0, centered / norms, 0.0)
+
+
+def build_sketch(
+    return_matrix: pd.DataFrame, sketch_dim: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    为区域收益矩阵构建随机投影草图。
+
+    :param return_matrix: 区域日收益矩阵
+    :param sketch_dim: 草图维度
+    :return: (随机投影矩阵 (n_days, sketch_dim), 池中 Alpha 的草图 (n_alphas, sketch_dim))
+    """
+    rng: np.random.Generator = np.random.default_rng(SKETCH_SEED)
+    projection: np.ndarray = rng.standard_normal(
+        (return_matrix.shape[0], sketch_dim)
+    ) / np.sqrt(sketch_dim)
+    standardized: np.ndarray = standardize_columns(
+        return_matrix.to_numpy(dtype=np.float64)
+    )
+    return projection, (standardized.T @ projection).astype(np.float32)
+
+
+async def prune_pool_by_sketch(
+    alpha_id: str,
+    x_returns: pd.Series,
+    return_matrix: pd.DataFrame,
+    sketch: Tuple[np.ndarray, np.ndarray],
+    sketch_margin: float,
+    sketch_top_k: int,
+) -> Optional[Tuple[List[str], float]]:
+    """
+    用草图估计候选 Alpha 与池中每个 Alpha 的相关性，筛选出需要精确计算的 Alpha。
+
+    保留估计值不低于 (阈值 - margin) 的 Alpha 以及估计值最高的 top_k 个 Alpha。
+    候选 Alpha 的日期与区域矩阵重叠不足，或筛选结果过多时返回 None，
+    由调用方回退到全量精确计算。
+
+    :param alpha_id: 候选 Alpha 策略 ID
+    :param x_returns: 候选 Alpha 的日收益序列
+    :param return_matrix: 区域日收益矩阵
+    :param sketch: `build_sketch` 为该区域矩阵构建的 (随机投影矩阵, 池中 Alpha 的草图)
+    :param sketch_margin: 草图估计值距离自相关阈值多近时需要精确计算
+    :param sketch_top_k: 无论估计值高低，始终精确计算估计值最高的前 k 个 Alpha
+    :return: (需要精确计算的池中 Alpha ID 列表, 其余 Alpha 真实相关性的上界)，
+        None 表示回退到全量计算
+    """
+    projection, pool_sketch = sketch
+
+    aligned: np.ndarray = x_returns.reindex(return_matrix.index).to_numpy(
+        dtype=np.float64
+    )
+    coverage: float = int(np.count_nonzero(~np.isnan(aligned))) / max(
+        int(np.count_nonzero(~np.isnan(x_returns.to_numpy(dtype=np.float64)))),
+        1,
+    )
+    if coverage < SKETCH_MIN_COVERAGE:
+        await log.adebug(
+            event="候选 Alpha 与区域矩阵日期重叠不足, 回退到精确计算",
+            alpha_id=alpha_id,
+            coverage=coverage,
+            emoji="↩️",
+        )
+        return None
+
+    x_sketch: np.ndarray = standardize_columns(aligned[:, None])[:, 0] @ projection
+    estimates: np.ndarray = pool_sketch @ x_sketch.astype(np.float32)
+    pool_ids: List[str] = return_matrix.columns.tolist()
+    estimates[
+        [index for index, pool_id in enumerate(pool_ids) if pool_id == alpha_id]
+    ] = -np.inf
+
+    selected: np.ndarray = estimates >= CONSULTANT_MAX_SELF_CORRELATION - sketch_margin
+    top_k: int = min(sketch_top_k, len(pool_ids))
+    selected[np.argpartition(-estimates, top_k - 1)[:top_k]] = True
+    selected &= np.isfinite(estimates)
+
+    if selected.sum() > len(pool_ids) * SKETCH_MAX_SELECTED_RATIO:
+        await log.adebug(
+            event="草图筛选结果过多, 回退到精确计算",
+            alpha_id=alpha_id,
+            selected=int(selected.sum()),
+            pool=len(pool_ids),
+            emoji="↩️",
+        )
+        return None
+
+    pruned: np.ndarray = estimates[~selected & np.isfinite(estimates)].astype(
+        np.float64
+    )
+    pruned_upper_bound: float = float(
+        np.max(
+            pruned
+            + SKETCH_ERROR_Z * np.sqrt((1.0 + pruned * pruned) / projection.shape[1])
+        )
+        if pruned.size
+        else -np.inf
+    )
+
+    await log.adebug(
+        event="草图剪枝完成",
+        alpha_id=alpha_id,
+        selected=int(selected.sum()),
+        pool=len(pool_ids),
+        max_estimate=float(estimates.max()),
+        pruned_upper_bound=pruned_upper_bound,
+        emoji="✂️",
+    )
+    return (
+        [pool_id for pool_id, keep in zip(pool_ids, selected) if keep],
+        pruned_upper_bound,
+    )
@@ -0,0 +1,559 @@
+"""相关性充分统计量的增量维护。
+
+两个 Alpha 的皮尔逊相关系数可以由成对有效日期上的充分统计量
+(n, Σa, Σb, Σa², Σb², Σab) 直接得到。统计量持久化在 `correlation_statistics` 表中，
+滚动窗口每日向后滑动时只需加上新增日期、减去过期日期的样本，
+不必对整个窗口重新计算。
+"""
+
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from structlog.stdlib import BoundLogger
+
+from alphapower.constants import CorrelationCalcType, Region
+from alphapower.dal.evaluate import CorrelationStatisticsDAL
+from alphapower.entity import CorrelationStatistics
+from alphapower.internal.logging import get_logger
+
+from .correlation_write_buffer import CorrelationWriteBuffer
+
+log: BoundLogger = get_logger(__name__)
+
+
+def pair_sufficient_statistics(
+    x: np.ndarray, y: np.ndarray
+) -> Tuple[int, float, float, float, float, float]:
+    """
+    计算两条已对齐序列在成对有效日期上的充分统计量。
+
+    :param x: 第一条日收益序列
+    :param y: 第二条日收益序列，与 x 等长
+    :return: (n, Σx, Σy, Σx², Σy², Σxy)
+    """
+    valid: np.ndarray = ~np.isnan(x) & ~np.isnan(y)
+    x_valid: np.ndarray = x[valid]
+    y_valid: np.ndarray = y[valid]
+    return (
+        int(valid.sum()),
+        float(x_valid.sum()),
+        float(y_valid.sum()),
+        float((x_valid * x_valid).sum()),
+        float((y_valid * y_valid).sum()),
+        float((x_valid * y_valid).sum()),
+    )
+
+
+def correlation_from_statistics(statistics: CorrelationStatistics) -> float:
+    """
+    由充分统计量计算皮尔逊相关系数。
+
+    :param statistics: 相关性充分统计量
+    :return: 相关系数，样本数小于 2 或方差为 0 时返回 NaN
+    """
+    count: int = statistics.count
+    if count < 2:
+        return float("nan")
+
+    cov: float = statistics.sum_ab - statistics.sum_a * statistics.sum_b / count
+    var_a: float = statistics.sum_aa - statistics.sum_a * statistics.sum_a / count
+    var_b: float = statistics.sum_bb - statistics.sum_b * statistics.sum_b / count
+    if var_a <= 0.0 or var_b <= 0.0:
+        return float("nan")
+    return float(np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0))
+
+
+def interval_sufficient_statistics(
+    x: np.ndarray,
+    matrix: np.ndarray,
+    column_positions: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> np.ndarray:
+    """
+    计算一条序列与矩阵指定列在各自行区间内成对有效日期上的充分统计量。
+
+    只截取所有区间覆盖的行块参与计算，窗口每日滑动时行块只有几行。
+
+    :param x: 序列，与矩阵行对齐，形状为 (n_days,)
+    :param matrix: 形状为 (n_days, n_alphas) 的矩阵
+    :param column_positions: 参与计算的列下标
+    :param lower: 各列区间的起始行下标（含）
+    :param upper: 各列区间的结束行下标（含），小于起始下标表示空区间
+    :return: 形状为 (6, len(column_positions)) 的数组，
+        各行依次为 n, Σx, Σy, Σx², Σy², Σxy
+    """
+    sums: np.ndarray = np.zeros((6, len(column_positions)), dtype=np.float64)
+    non_empty: np.ndarray = upper >= lower
+    if not non_empty.any():
+        return sums
+
+    first: int = int(lower[non_empty].min())
+    last: int = int(upper[non_empty].max())
+    rows: np.ndarray = np.arange(first, last + 1)[:, None]
+    x_block: np.ndarray = x[first : last + 1, None]
+    y_block: np.ndarray = matrix[first : last + 1][:, column_positions]
+    weights: np.ndarray = (
+        (rows >= lower) & (rows <= upper) & ~np.isnan(x_block) & ~np.isnan(y_block)
+    )
+    x_valid: np.ndarray = np.where(weights, x_block, 0.0)
+    y_valid: np.ndarray = np.where(weights, y_block, 0.0)
+    sums[0] = weights.sum(axis=0)
+    sums[1] = x_valid.sum(axis=0)
+    sums[2] = y_valid.sum(axis=0)
+    sums[3] = (x_valid * x_valid).sum(axis=0)
+    sums[4] = (y_valid * y_valid).sum(axis=0)
+    sums[5] = (x_valid * y_valid).sum(axis=0)
+    return sums
+
+
+def correlations_from_sums(sums: np.ndarray) -> np.ndarray:
+    """
+    由一组充分统计量批量计算皮尔逊相关系数，与 `correlation_from_statistics` 一致。
+
+    :param sums: 形状为 (6, n_pairs) 的数组，各行依次为 n, Σa, Σb, Σa², Σb², Σab
+    :return: 相关系数数组，样本数小于 2 或方差为 0 时为 NaN
+    """
+    count, sum_a, sum_b, sum_aa, sum_bb, sum_ab = sums
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov: np.ndarray = sum_ab - sum_a * sum_b / count
+        var_a: np.ndarray = sum_aa - sum_a * sum_a / count
+        var_b: np.ndarray = sum_bb - sum_b * sum_b / count
+        correlations: np.ndarray = np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0)
+    return np.where((count >= 2) & (var_a > 0.0) & (var_b > 0.0), correlations, np.nan)
+
+
+class CorrelationStatisticsUpdater:
+    """
+    基于持久化充分统计量的相关性增量更新器。
+    """
+
+    def __init__(
+        self,
+        correlation_statistics_dal: CorrelationStatisticsDAL,
+        correlation_buffer: CorrelationWriteBuffer,
+        load_full_daily_returns: Callable[
+            [str], Awaitable[Tuple[pd.Series, pd.Timestamp]]
+        ],
+    ) -> None:
+        """
+        初始化增量更新器。
+
+        :param correlation_statistics_dal: 相关性充分统计量数据访问层实例
+        :param correlation_buffer: 相关性记录的写后缓冲区
+        :param load_full_daily_returns: 加载 Alpha 不截断窗口的完整日收益序列
+            及其窗口有效起始日期
+        """
+        self.correlation_statistics_dal: CorrelationStatisticsDAL = (
+            correlation_statistics_dal
+        )
+        self.correlation_buffer: CorrelationWriteBuffer = correlation_buffer
+        self.load_full_daily_returns: Callable[
+            [str], Awaitable[Tuple[pd.Series, pd.Timestamp]]
+        ] = load_full_daily_returns
+
+    @staticmethod
+    def _accumulate_statistics(
+        statistics: CorrelationStatistics,
+        returns_a: pd.Series,
+        returns_b: pd.Series,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        sign: int,
+    ) -> None:
+        """
+        将 [start, end] 日期区间内的样本加到 (sign=1) 或减出 (sign=-1) 充分统计量。
+        """
+        slice_a: pd.Series = returns_a.loc[start:end]
+        slice_b: pd.Series = returns_b.reindex(slice_a.index)
+        count, sum_a, sum_b, sum_aa, sum_bb, sum_ab = pair_sufficient_statistics(
+            slice_a.to_numpy(dtype=np.float64), slice_b.to_numpy(dtype=np.float64)
+        )
+        statistics.count += sign * count
+        statistics.sum_a += sign * sum_a
+        statistics.sum_b += sign * sum_b
+        statistics.sum_aa += sign * sum_aa
+        statistics.sum_bb += sign * sum_bb
+        statistics.sum_ab += sign * sum_ab
+
+    async def _update_statistics(
+        self,
+        alpha_id: str,
+        other_alpha_ids: List[str],
+        returns_map: Dict[str, Tuple[pd.Series, pd.Timestamp]],
+        force_rebuild: bool,
+    ) -> Dict[str, float]:
+        """
+        增量更新 alpha_id 与 other_alpha_ids 之间的充分统计量并返回相关系数。
+
+        窗口只向后滑动时，只对新增和过期的日期做加减；窗口回退、无重叠或
+        force_rebuild 时对整个窗口重新累加。
+        """
+        other_alpha_ids = [
+            other_alpha_id
+            for other_alpha_id in other_alpha_ids
+            if other_alpha_id != alpha_id and other_alpha_id in returns_map
+        ]
+        if alpha_id not in returns_map or not other_alpha_ids:
+            return {}
+
+        existing: Dict[str, CorrelationStatistics] = (
+            await self.correlation_statistics_dal.find_by_alpha(
+                alpha_id, other_alpha_ids
+            )
+        )
+        one_day: pd.Timedelta = pd.Timedelta(days=1)
+        x_returns, x_start = returns_map[alpha_id]
+        created: List[CorrelationStatistics] = []
+        updated: List[CorrelationStatistics] = []
+        correlations: Dict[str, float] = {}
+        rebuilt_count: int = 0
+
+        for other_alpha_id in other_alpha_ids:
+            y_returns, y_start = returns_map[other_alpha_id]
+            start: pd.Timestamp = max(x_start, y_start)
+            end: pd.Timestamp = min(x_returns.index.max(), y_returns.index.max())
+            if start > end:
+                continue
+
+            # 充分统计量中 a 侧总是字典序较小的 Alpha
+            returns_a, returns_b = (
+                (x_returns, y_returns)
+                if alpha_id < other_alpha_id
+                else (y_returns, x_returns)
+            )
+            statistics: Optional[CorrelationStatistics] = existing.get(other_alpha_id)
+
+            if statistics is None:
+                statistics = CorrelationStatistics(
+                    alpha_id_a=min(alpha_id, other_alpha_id),
+                    alpha_id_b=max(alpha_id, other_alpha_id),
+                    start_date=start.date(),
+                    end_date=end.date(),
+                )
+                self._accumulate_statistics(
+                    statistics, returns_a, returns_b, start, end, 1
+                )
+                created.append(statistics)
+                rebuilt_count += 1
+            else:
+                old_start: pd.Timestamp = pd.Timestamp(statistics.start_date)
+                old_end: pd.Timestamp = pd.Timestamp(statistics.end_date)
+                if (
+                    force_rebuild
+                    or start < old_start
+                    or end < old_end
+                    or start > old_end
+                ):
+                    statistics.count = 0
+                    statistics.sum_a = 0.0
+                    statistics.sum_b = 0.0
+                    statistics.sum_aa = 0.0
+                    statistics.sum_bb = 0.0
+                    statistics.sum_ab = 0.0
+                    self._accumulate_statistics(
+                        statistics, returns_a, returns_b, start, end, 1
+                    )
+                    rebuilt_count += 1
+                else:
+                    if start > old_start:
+                        self._accumulate_statistics(
+                            statistics,
+                            returns_a,
+                            returns_b,
+                            old_start,
+                            start - one_day,
+                            -1,
+                        )
+                    if end > old_end:
+                        self._accumulate_statistics(
+                            statistics, returns_a, returns_b, old_end + one_day, end, 1
+                        )
+                statistics.start_date = start.date()
+                statistics.end_date = end.date()
+                updated.append(statistics)
+
+            corr: float = correlation_from_statistics(statistics)
+            if not np.isnan(corr):
+                correlations[other_alpha_id] = corr
+                await self.correlation_buffer.add(
+                    alpha_id, other_alpha_id, corr, CorrelationCalcType.LOCAL
+                )
+
+        if created:
+            await self.correlation_statistics_dal.bulk_create(created)
+        if updated:
+            await self.correlation_statistics_dal.update_all(updated)
+
+        await log.adebug(
+            event="完成相关性充分统计量更新",
+            alpha_id=alpha_id,
+            pairs=len(created) + len(updated),
+            rebuilt=rebuilt_count,
+            emoji="🧮",
+        )
+        return correlations
+
+    async def update(
+        self,
+        alpha_id: str,
+        other_alpha_ids: List[str],
+        force_rebuild: bool = False,
+    ) -> Dict[str, float]:
+        """
+        增量更新一个 Alpha 与一组 Alpha 的充分统计量，得到的相关系数同时写入相关性表。
+
+        :param alpha_id: Alpha 策略 ID
+        :param other_alpha_ids: 另一侧的 Alpha ID 列表
+        :param force_rebuild: 是否忽略已有统计量，对整个窗口重新累加
+        :return: 另一侧 Alpha ID 到相关系数的映射
+        """
+        returns_map: Dict[str, Tuple[pd.Series, pd.Timestamp]] = (
+            await self.load_returns_map([alpha_id] + other_alpha_ids)
+        )
+        correlations: Dict[str, float] = await self._update_statistics(
+            alpha_id, other_alpha_ids, returns_map, force_rebuild
+        )
+        await self.correlation_buffer.flush()
+        return correlations
+
+    async def load_returns_map(
+        self, alpha_ids: List[str]
+    ) -> Dict[str, Tuple[pd.Series, pd.Timestamp]]:
+        """
+        批量加载完整日收益序列，无法加载的 Alpha 会被跳过。
+        """
+        returns_map: Dict[str, Tuple[pd.Series, pd.Timestamp]] = {}
+        for alpha_id in dict.fromkeys(alpha_ids):
+            try:
+                returns_map[alpha_id] = await self.load_full_daily_returns(alpha_id)
+            except ValueError as e:
+                await log.awarning(
+                    event="Alpha 策略缺少可用的 pnl 数据, 跳过增量更新",
+                    alpha_id=alpha_id,
+                    error=str(e),
+                    emoji="⚠️",
+                )
+        return returns_map
+
+    async def _load_expired_returns(
+        self,
+        return_matrix: pd.DataFrame,
+        statistics_map: Dict[Tuple[str, str], CorrelationStatistics],
+    ) -> pd.DataFrame:
+        """
+        将已移出滚动窗口、但已有统计量仍包含的日期的收益补入区域收益矩阵。
+
+        区域收益矩阵只保存每个 Alpha 当前窗口内的收益，窗口滑动后需要减去的过期日期
+        不在其中。只为存在过期日期的 Alpha 加载完整收益，并只取窗口之前的部分。
+
+        :param return_matrix: 区域日收益矩阵
+        :param statistics_map: (alpha_id_a, alpha_id_b) 到已有充分统计量的映射
+        :return: 补入过期日期收益后的矩阵，列顺序与区域收益矩阵一致
+        """
+        window_starts: pd.Series = return_matrix.apply(pd.Series.first_valid_index)
+        earliest_starts: Dict[str, pd.Timestamp] = {}
+        for (alpha_id_a, alpha_id_b), statistics in statistics_map.items():
+            old_start: pd.Timestamp = pd.Timestamp(statistics.start_date)
+            for alpha_id in (alpha_id_a, alpha_id_b):
+                if old_start < window_starts[alpha_id]:
+                    earliest_starts[alpha_id] = min(
+                        old_start, earliest_starts.get(alpha_id, old_start)
+                    )
+        if not earliest_starts:
+            return return_matrix
+
+        expired_returns: Dict[str, pd.Series] = {}
+        for alpha_id, earliest_start in earliest_starts.items():
+            try:
+                returns, _ = await self.load_full_daily_returns(alpha_id)
+            except ValueError as e:
+                await log.awarning(
+                    event="Alpha 策略缺少可用的 pnl 数据, 无法减去过期日期",
+                    alpha_id=alpha_id,
+                    error=str(e),
+                    emoji="⚠️",
+                )
+                continue
+            expired_returns[alpha_id] = returns[
+                (returns.index >= earliest_start)
+                & (returns.index < window_starts[alpha_id])
+            ]
+
+        await log.adebug(
+            event="补入过期日期收益",
+            alphas=len(expired_returns),
+            emoji="🧮",
+        )
+        return return_matrix.combine_first(pd.DataFrame(expired_returns))[
+            return_matrix.columns
+        ]
+
+    async def refresh(
+        self,
+        region: Region,
+        return_matrix: pd.DataFrame,
+        force_rebuild: bool = False,
+    ) -> int:
+        """
+        增量更新区域收益矩阵中所有 Alpha 两两之间的充分统计量，
+        得到的相关系数同时写入相关性表。
+
+        一次查询取出区域内的全部统计量，每个 Alpha 与排在其后的所有 Alpha 的
+        增减量以矩阵运算一次得到。
+
+        :param region: 区域
+        :param return_matrix: 区域日收益矩阵 (行: 日期, 列: alpha_id)
+        :param force_rebuild: 是否忽略已有统计量，对整个窗口重新累加
+        :return: 得到有效相关系数的 Alpha 对数量
+        """
+        start_time: datetime = datetime.now()
+        alpha_ids: List[str] = list(return_matrix.columns)
+        statistics_map: Dict[Tuple[str, str], CorrelationStatistics] = (
+            await self.correlation_statistics_dal.find_among(alpha_ids)
+        )
+
+        # 窗口起止位置以区域收益矩阵为准，补入的过期日期只用于减去旧样本
+        extended_matrix: pd.DataFrame = await self._load_expired_returns(
+            return_matrix, {} if force_rebuild else statistics_map
+        )
+        dates: np.ndarray = extended_matrix.index.to_numpy()
+        values: np.ndarray = extended_matrix.to_numpy(dtype=np.float64)
+        in_window: np.ndarray = (
+            return_matrix.reindex(extended_matrix.index).notna().to_numpy()
+        )
+        has_returns: np.ndarray = in_window.any(axis=0)
+        window_first: np.ndarray = np.where(has_returns, in_window.argmax(axis=0), 0)
+        window_last: np.ndarray = np.where(
+            has_returns, len(dates) - 1 - in_window[::-1].argmax(axis=0), -1
+        )
+
+        pair_count: int = 0
+        for index, alpha_id in enumerate(alpha_ids[:-1]):
+            others: np.ndarray = np.arange(index + 1, len(alpha_ids))
+            first: np.ndarray = np.maximum(window_first[index], window_first[others])
+            last: np.ndarray = np.minimum(window_last[index], window_last[others])
+
+            # 每个 Alpha 对需要加上和减去的行区间，空区间的结束下标小于起始下标
+            totals: np.ndarray = np.zeros((6, len(others)), dtype=np.float64)
+            add_lower: np.ndarray = first.copy()
+            add_upper: np.ndarray = last.copy()
+            remove_lower: np.ndarray = np.zeros(len(others), dtype=np.int64)
+            remove_upper: np.ndarray = np.full(len(others), -1, dtype=np.int64)
+            pairs: List[Tuple[int, str, Optional[CorrelationStatistics]]] = []
+            for position, other_index in enumerate(others):
+                if first[position] > last[position]:
+                    continue
+                other_alpha_id: str = alpha_ids[other_index]
+                statistics: Optional[CorrelationStatistics] = statistics_map.get(
+                    (min(alpha_id, other_alpha_id), max(alpha_id, other_alpha_id))
+                )
+                pairs.append((position, other_alpha_id, statistics))
+                if statistics is None:
+                    continue
+
+                old_first: int = int(
+                    np.searchsorted(dates, np.datetime64(statistics.start_date))
+                )
+                old_last: int = (
+                    int(
+                        np.searchsorted(
+                            dates, np.datetime64(statistics.end_date), side="right"
+                        )
+                    )
+                    - 1
+                )
+                # 窗口回退、无重叠或 force_rebuild 时对整个窗口重新累加
+                if (
+                    force_rebuild
+                    or first[position] < old_first
+                    or last[position] < old_last
+                    or first[position] > old_last
+                ):
+                    continue
+
+                stored: Tuple[float, ...] = (
+                    statistics.count,
+                    statistics.sum_a,
+                    statistics.sum_b,
+                    statistics.sum_aa,
+                    statistics.sum_bb,
+                    statistics.sum_ab,
+                )
+                # 统计量 a 侧为字典序较小的 Alpha，转换为以 alpha_id 为 x 侧
+                if alpha_id > other_alpha_id:
+                    stored = (
+                        stored[0],
+                        stored[2],
+                        stored[1],
+                        stored[4],
+                        stored[3],
+                        stored[5],
+                    )
+                totals[:, position] = stored
+                add_lower[position] = old_last + 1
+                remove_lower[position] = old_first
+                remove_upper[position] = first[position] - 1
+
+            if not pairs:
+                continue
+
+            totals += interval_sufficient_statistics(
+                values[:, index], values, others, add_lower, add_upper
+            )
+            totals -= interval_sufficient_statistics(
+                values[:, index], values, others, remove_lower, remove_upper
+            )
+            correlations: np.ndarray = correlations_from_sums(totals)
+
+            created: List[CorrelationStatistics] = []
+            updated: List[CorrelationStatistics] = []
+            for position, other_alpha_id, statistics in pairs:
+                if statistics is None:
+                    statistics = CorrelationStatistics(
+                        alpha_id_a=min(alpha_id, other_alpha_id),
+                        alpha_id_b=max(alpha_id, other_alpha_id),
+                        start_date=pd.Timestamp(dates[first[position]]).date(),
+                        end_date=pd.Timestamp(dates[last[position]]).date(),
+                    )
+                    created.append(statistics)
+                else:
+                    statistics.start_date = pd.Timestamp(dates[first[position]]).date()
+                    statistics.end_date = pd.Timestamp(dates[last[position]]).date()
+                    updated.append(statistics)
+
+                count, sum_x, sum_y, sum_xx, sum_yy, sum_xy = totals[:, position]
+                if alpha_id > other_alpha_id:
+                    sum_x, sum_y, sum_xx, sum_yy = sum_y, sum_x, sum_yy, sum_xx
+                statistics.count = int(round(count))
+                statistics.sum_a = float(sum_x)
+                statistics.sum_b = float(sum_y)
+                statistics.sum_aa = float(sum_xx)
+                statistics.sum_bb = float(sum_yy)
+                statistics.sum_ab = float(sum_xy)
+
+                corr: float = float(correlations[position])
+                if not np.isnan(corr):
+                    pair_count += 1
+                    await self.correlation_buffer.add(
+                        alpha_id, other_alpha_id, corr, CorrelationCalcType.LOCAL
+                    )
+
+            if created:
+                await self.correlation_statistics_dal.bulk_create(created)
+            if updated:
+                await self.correlation_statistics_dal.update_all(updated)
+        await self.correlation_buffer.flush()
+
+        elapsed_time: float = (datetime.now() - start_time).total_seconds()
+        await log.ainfo(
+            event="完成区域相关性充分统计量刷新",
+            region=region,
+            alphas=len(alpha_ids),
+            pairs=pair_count,
+            elapsed_time="{:.2f} 秒".format(elapsed_time),
+            emoji="✅",
+        )
+        return pair_count
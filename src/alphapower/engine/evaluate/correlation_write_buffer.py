@@ -0,0 +1,102 @@
+"""相关性记录的写后缓冲 (write-behind buffer)。
+
+本地相关性计算一次会产生成百上千个 Alpha 对。逐条 `create` 会产生同样数量的
+INSERT 和 flush，且重复评估时同一 Alpha 对会被重复插入。缓冲区按
+(alpha_id_a, alpha_id_b, calc_type) 去重累积记录，并通过 `CorrelationDAL.upsert_many`
+以少量多行 upsert 语句写入，写入在会话锁内与共享同一个会话的其他查询串行执行。
+"""
+
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from structlog.stdlib import BoundLogger
+
+from alphapower.constants import CorrelationCalcType
+from alphapower.dal.evaluate import CorrelationDAL
+from alphapower.internal.db_session import session_lock
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+
+class CorrelationWriteBuffer:
+    """
+    按冲突键去重的 Correlation 写后缓冲区。
+    """
+
+    def __init__(self, correlation_dal: CorrelationDAL, flush_size: int = 5000) -> None:
+        """
+        初始化写后缓冲区。
+
+        :param correlation_dal: Correlation 数据访问层实例
+        :param flush_size: 缓冲的记录数达到该值时自动写入
+        """
+        self.correlation_dal: CorrelationDAL = correlation_dal
+        self.flush_size: int = max(flush_size, 1)
+        self._pending: Dict[Tuple[str, str, CorrelationCalcType], float] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def add(
+        self,
+        alpha_id_a: str,
+        alpha_id_b: str,
+        correlation: float,
+        calc_type: CorrelationCalcType,
+    ) -> None:
+        """
+        加入一条相关性记录，同一 Alpha 对与计算类型只保留最后一次的数值。
+
+        :param alpha_id_a: 第一个 Alpha ID
+        :param alpha_id_b: 第二个 Alpha ID
+        :param correlation: 相关性数值
+        :param calc_type: 相关性计算类型
+        """
+        if alpha_id_a > alpha_id_b:
+            alpha_id_a, alpha_id_b = alpha_id_b, alpha_id_a
+        self._pending[(alpha_id_a, alpha_id_b, calc_type)] = correlation
+
+        if len(self._pending) >= self.flush_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        将缓冲的记录写入数据库。
+
+        :return: 写入的记录数
+        """
+        if not self._pending:
+            return 0
+
+        rows: List[Tuple[str, str, float, CorrelationCalcType]] = [
+            (alpha_id_a, alpha_id_b, correlation, calc_type)
+            for (
+                alpha_id_a,
+                alpha_id_b,
+                calc_type,
+            ), correlation in self._pending.items()
+        ]
+        self._pending = {}
+        async with session_lock(self.correlation_dal.session):
+            written: int = await self.correlation_dal.upsert_many(rows)
+
+        await log.adebug(
+            event="相关性记录缓冲区已写入",
+            rows=written,
+            emoji="💾",
+        )
+        return written
+
+    async def __aenter__(self) -> "CorrelationWriteBuffer":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        # 正常退出时写入剩余记录；出现异常时丢弃，交由调用方的事务回滚处理
+        if exc_type is None:
+            await self.flush()
@@ -0,0 +1,163 @@
+"""可续跑的增量评估台账。
+
+`BaseEvaluator.evaluate_many` 原先每次运行都会重新评估 fetcher 产出的所有 Alpha，
+进程中途退出时已完成的评估全部作废。台账为每个 Alpha 记录最近一次完成评估的结论
+和输入指纹，指纹由以下会影响结论的输入计算：
+
+- Alpha 的修改时间 (date_modified)；
+- 评估阶段链的配置 (`AbstractEvaluateStage.describe`)；
+- 刷新策略。
+
+再次运行时，指纹未变化的 Alpha 直接跳过，中断的运行因此从上次停下的位置继续，
+重新运行的耗时只与发生变化的 Alpha 数量成正比。评估结论与评估记录经同一个写后
+缓冲区在同一个事务中提交，不会出现有结论而没有评估记录的情况。
+
+强制刷新 (`RefreshPolicy.FORCE_REFRESH`) 的运行不跳过任何 Alpha；阶段因超时等
+异常返回的失败不是评估结论，不记入台账，下次运行时重新评估。
+"""
+
+import hashlib
+import json
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Optional, Tuple
+
+from structlog.stdlib import BoundLogger
+
+from alphapower.constants import RefreshPolicy
+from alphapower.dal.evaluate import EvaluateLedgerDAL
+from alphapower.entity import Alpha
+from alphapower.internal.logging import get_logger
+
+from .evaluate_stage_abc import AbstractEvaluateStage
+from .evaluate_write_buffer import EvaluateWriteBuffer
+
+log: BoundLogger = get_logger(__name__)
+
+
+class EvaluateLedger:
+    """
+    按 (alpha_id, 输入指纹) 判断评估结论是否仍然有效的评估台账。
+    """
+
+    def __init__(
+        self,
+        ledger_dal: EvaluateLedgerDAL,
+        evaluate_stage_chain: AbstractEvaluateStage,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
+        lookup_size: int = 500,
+    ) -> None:
+        """
+        初始化评估台账。
+
+        :param ledger_dal: 评估台账数据访问层实例
+        :param evaluate_stage_chain: 评估阶段责任链的首个阶段，其配置参与指纹计算
+        :param write_buffer: 评估结论的写后缓冲区，为 None 时每条结论立即提交
+        :param lookup_size: 每次查询台账的 Alpha 数量
+        """
+        self.ledger_dal: EvaluateLedgerDAL = ledger_dal
+        self.evaluate_stage_chain: AbstractEvaluateStage = evaluate_stage_chain
+        self.write_buffer: EvaluateWriteBuffer = write_buffer or EvaluateWriteBuffer(
+            ledger_dal.session, flush_size=1
+        )
+        self.lookup_size: int = max(lookup_size, 1)
+
+    def chain_digest(self) -> str:
+        """
+        计算评估阶段链配置的摘要。
+
+        阶段链可能在构造台账之后才连接完成，因此每次调用时重新计算。
+
+        :return: SHA-256 十六进制摘要
+        """
+        description: Dict[str, Any] = self.evaluate_stage_chain.describe()
+        return hashlib.sha256(
+            json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def fingerprint(alpha: Alpha, policy: RefreshPolicy, chain_digest: str) -> str:
+        """
+        计算 Alpha 评估输入的指纹。
+
+        :param alpha: Alpha 对象
+        :param policy: 刷新策略
+        :param chain_digest: 评估阶段链配置的摘要
+        :return: SHA-256 十六进制指纹
+        """
+        date_modified: str = (
+            alpha.date_modified.isoformat() if alpha.date_modified else ""
+        )
+        return hashlib.sha256(
+            "|".join([chain_digest, policy.name, date_modified]).encode("utf-8")
+        ).hexdigest()
+
+    async def skip_settled(
+        self,
+        alphas: AsyncIterable[Alpha],
+        policy: RefreshPolicy,
+    ) -> AsyncGenerator[Alpha, None]:
+        """
+        过滤掉评估结论仍然有效的 Alpha，逐个产出需要评估的 Alpha。
+
+        :param alphas: 待评估的 Alpha 流
+        :param policy: 刷新策略
+        """
+        if policy == RefreshPolicy.FORCE_REFRESH:
+            # 强制刷新要求重新评估所有 Alpha，台账只用于记录本次的结论
+            async for alpha in alphas:
+                yield alpha
+            return
+
+        chain_digest: str = self.chain_digest()
+        skipped_count: int = 0
+        chunk: List[Alpha] = []
+
+        async def pending_in(candidates: List[Alpha]) -> List[Alpha]:
+            nonlocal skipped_count
+            fingerprints: Dict[str, str] = await self.ledger_dal.find_fingerprints(
+                [alpha.alpha_id for alpha in candidates]
+            )
+            pending: List[Alpha] = [
+                alpha
+                for alpha in candidates
+                if fingerprints.get(alpha.alpha_id)
+                != self.fingerprint(alpha, policy, chain_digest)
+            ]
+            skipped_count += len(candidates) - len(pending)
+            return pending
+
+        async for alpha in alphas:
+            chunk.append(alpha)
+            if len(chunk) < self.lookup_size:
+                continue
+            for pending_alpha in await pending_in(chunk):
+                yield pending_alpha
+            chunk = []
+
+        if chunk:
+            for pending_alpha in await pending_in(chunk):
+                yield pending_alpha
+
+        await log.ainfo(
+            event="评估台账过滤完成",
+            skipped=skipped_count,
+            emoji="📒",
+        )
+
+    async def record(self, alpha: Alpha, policy: RefreshPolicy, passed: bool) -> None:
+        """
+        记录 Alpha 的评估结论，随写后缓冲区中的其他记录一起提交。
+
+        :param alpha: Alpha 对象
+        :param policy: 刷新策略
+        :param passed: 评估是否通过
+        """
+        row: Tuple[str, str, bool] = (
+            alpha.alpha_id,
+            self.fingerprint(alpha, policy, self.chain_digest()),
+            passed,
+        )
+
+        async def upsert() -> None:
+            await self.ledger_dal.upsert_many([row])
+
+        await self.write_buffer.call(upsert)
@@ -0,0 +1,170 @@
+"""评估运行的指标汇总。
+
+`BaseEvaluator` 原先只在进度日志和最终统计日志里输出处理数量与通过数量，
+要找出哪个阶段或哪类平台调用耗时最多只能翻查日志。指标汇总在进程内记录：
+
+- 每个评估阶段的耗时直方图、分位数以及通过、未通过、异常次数；
+- 每个阶段按检查操作 (CheckAction) 统计的次数，例如使用现有记录 (缓存命中)
+  与刷新数据的次数；
+- 单个 Alpha 整体评估的耗时与结果。
+
+汇总可以随时通过 `snapshot` 查询，`evaluate_many` 结束时以 JSON 输出，
+也可以按固定间隔定期导出，用于依据数据调整并发和阶段顺序。
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, Optional
+
+from structlog.stdlib import BoundLogger
+
+from alphapower.internal.logging import get_logger
+
+from .stage_statistics import StageStatistics
+
+log: BoundLogger = get_logger(__name__)
+
+# 指标导出函数，接收 `snapshot` 的结果
+MetricsExporter = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class EvaluateMetrics:
+    """
+    一次评估运行中各阶段的耗时、结果与检查操作统计。
+    """
+
+    def __init__(
+        self,
+        window: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        初始化指标汇总。
+
+        :param window: 每个阶段保留最近多少次耗时样本用于计算分位数
+        :param clock: 单调时钟，返回秒
+        """
+        self.window: int = window
+        self.clock: Callable[[], float] = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        清空所有统计，开始新一轮记录。
+        """
+        self.started: float = self.clock()
+        self.evaluations: StageStatistics = StageStatistics(self.window)
+        self.cancelled: int = 0
+        self.stages: Dict[str, StageStatistics] = {}
+        self.check_actions: DefaultDict[str, DefaultDict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+
+    def stage(self, name: str) -> StageStatistics:
+        """
+        获取阶段的统计，不存在时创建。
+
+        :param name: 阶段名称
+        """
+        statistics: Optional[StageStatistics] = self.stages.get(name)
+        if statistics is None:
+            statistics = StageStatistics(self.window)
+            self.stages[name] = statistics
+        return statistics
+
+    def record_stage(
+        self, name: str, passed: bool, latency: float, error: bool = False
+    ) -> None:
+        """
+        记录一次阶段评估的结果与耗时。
+
+        :param name: 阶段名称
+        :param passed: 是否通过
+        :param latency: 当前阶段自身的耗时 (秒)，不含后续阶段
+        :param error: 是否因异常结束
+        """
+        self.stage(name).record(passed, latency, error)
+
+    def record_check_action(self, name: str, action: str) -> None:
+        """
+        记录一次检查操作的决定。
+
+        :param name: 阶段名称
+        :param action: 检查操作名称，例如 "REFRESH" 或 "USE_EXISTING"
+        """
+        self.check_actions[name][action] += 1
+
+    def record_evaluation(
+        self, passed: bool, latency: float, error: bool = False
+    ) -> None:
+        """
+        记录单个 Alpha 整体评估的结果与耗时。
+
+        :param passed: 是否通过
+        :param latency: 耗时 (秒)
+        :param error: 是否因异常结束
+        """
+        self.evaluations.record(passed, latency, error)
+
+    def record_cancelled(self) -> None:
+        """
+        记录一次被取消的评估，被取消的评估不计入耗时统计。
+        """
+        self.cancelled += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        当前的指标汇总，可以被 JSON 序列化。
+        """
+        elapsed: float = self.clock() - self.started
+        return {
+            "elapsed": elapsed,
+            "throughput": self.evaluations.count / elapsed if elapsed > 0 else 0.0,
+            "evaluations": {
+                **self.evaluations.summary(),
+                "cancelled": self.cancelled,
+                "latency_histogram": self.evaluations.latency_histogram(),
+            },
+            "stages": {
+                name: {
+                    **statistics.summary(),
+                    "latency_histogram": statistics.latency_histogram(),
+                    "check_actions": dict(self.check_actions.get(name, {})),
+                }
+                for name, statistics in self.stages.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        """
+        以 JSON 字符串输出指标汇总。
+        """
+        return json.dumps(self.snapshot(), ensure_ascii=False, sort_keys=True)
+
+    async def export_periodically(
+        self, interval: float, exporter: Optional[MetricsExporter] = None
+    ) -> None:
+        """
+        每隔 interval 秒导出一次指标汇总，直到被取消。
+
+        :param interval: 导出间隔 (秒)
+        :param exporter: 导出函数，默认输出到日志
+        """
+        export: MetricsExporter = exporter or self._log_snapshot
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await export(self.snapshot())
+            except Exception as e:
+                # 导出失败不影响评估
+                await log.awarning(
+                    event="导出评估指标失败",
+                    error=str(e),
+                    exc_info=True,
+                    emoji="⚠️",
+                )
+
+    async def _log_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        await log.ainfo(event="评估指标", metrics=snapshot, emoji="📈")
@@ -1,6 +1,9 @@
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum, auto
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from structlog.stdlib import BoundLogger
 
@@ -8,8 +11,34 @@ from alphapower.constants import RefreshPolicy
 from alphapower.entity import Alpha, CheckRecord, EvaluateRecord
 from alphapower.internal.logging import get_logger
 
+from .evaluate_metrics import EvaluateMetrics
+
 log: BoundLogger = get_logger(module_name=__name__)
 
+# 当前评估中因异常 (而不是评估结论) 返回失败的阶段，由 collect_stage_errors 建立
+_stage_errors: ContextVar[Optional[List[str]]] = ContextVar(
+    "stage_errors", default=None
+)
+
+
+@contextmanager
+def collect_stage_errors() -> Iterator[List[str]]:
+    """
+    收集一次评估中捕获异常后返回失败的阶段名称。
+
+    阶段捕获超时等异常后返回 False 时，失败只代表这次评估出错，而不是 Alpha 被拒绝，
+    调用方据此区分两者，例如出错的评估不记入评估台账。
+
+    Yields:
+        因异常失败的阶段名称列表，评估结束后读取。
+    """
+    errors: List[str] = []
+    token = _stage_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _stage_errors.reset(token)
+
 
 class AbstractEvaluateStage(ABC):
     """
@@ -33,6 +62,7 @@ class AbstractEvaluateStage(ABC):
             next_stage: 下一个评估阶段 (责任链中的下一个节点)。
         """
         self._next_stage = next_stage
+        self.metrics: Optional[EvaluateMetrics] = None
 
     @property
     def next_stage(self) -> Optional["AbstractEvaluateStage"]:
@@ -75,7 +105,7 @@ class AbstractEvaluateStage(ABC):
         """
         try:
             # 调用当前阶段的评估逻辑
-            if not await self._evaluate_stage(alpha, policy, record, **kwargs):
+            if not await self._timed_evaluate_stage(alpha, policy, record, **kwargs):
                 # 如果当前阶段评估失败，记录失败信息
                 await log.aerror(
                     "评估阶段失败",
@@ -105,6 +135,200 @@ class AbstractEvaluateStage(ABC):
 
         return record, True
 
+    async def _timed_evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        执行当前阶段的评估逻辑，挂载了指标汇总时记录当前阶段自身的耗时与结果。
+        """
+        if self.metrics is None:
+            return await self._evaluate_stage(alpha, policy, record, **kwargs)
+
+        errors: Optional[List[str]] = _stage_errors.get()
+        error_count: int = len(errors) if errors is not None else 0
+        start_time: float = time.monotonic()
+        try:
+            passed: bool = await self._evaluate_stage(alpha, policy, record, **kwargs)
+        except Exception:
+            # CancelledError 不是 Exception 的子类，被取消的评估不计入统计
+            self.metrics.record_stage(
+                self.metrics_name, False, time.monotonic() - start_time, error=True
+            )
+            raise
+        self.metrics.record_stage(
+            self.metrics_name,
+            passed,
+            time.monotonic() - start_time,
+            error=errors is not None and self.metrics_name in errors[error_count:],
+        )
+        return passed
+
+    def _report_error(self) -> None:
+        """
+        标记当前阶段捕获了异常，随后返回的失败是评估出错而不是 Alpha 被拒绝。
+        """
+        errors: Optional[List[str]] = _stage_errors.get()
+        if errors is not None:
+            errors.append(self.metrics_name)
+
+    @property
+    def metrics_name(self) -> str:
+        """
+        当前阶段在指标汇总中的名称，默认为类名。
+        """
+        return type(self).__name__
+
+    def attach_metrics(self, metrics: Optional[EvaluateMetrics]) -> None:
+        """
+        为从当前阶段开始的责任链 (包括组合阶段的子阶段) 挂载指标汇总。
+
+        Args:
+            metrics: 指标汇总，为 None 时停止记录。
+        """
+        self.metrics = metrics
+        for stage in self._sub_stages():
+            stage.attach_metrics(metrics)
+        if self._next_stage:
+            self._next_stage.attach_metrics(metrics)
+
+    def _sub_stages(self) -> List["AbstractEvaluateStage"]:
+        """
+        组合阶段内部执行的子阶段，默认没有子阶段，组合阶段需要重写。
+
+        Returns:
+            子阶段列表。
+        """
+        return []
+
+    async def prepare_batch(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        在逐个评估之前，让责任链中的每个阶段对同一批 Alpha 做批量预处理。
+
+        Args:
+            alphas: 同一批次的待评估 Alpha 列表。
+            policy: 刷新策略。
+            kwargs: 其他参数。
+        """
+        try:
+            await self._prepare_batch_stage(alphas, policy, **kwargs)
+        except Exception as e:
+            # 批量预处理只是优化，失败时各阶段回退到逐个评估
+            await log.awarning(
+                "评估阶段批量预处理失败，将回退到逐个评估",
+                emoji="⚠️",
+                stage=self.__class__.__name__,
+                batch_size=len(alphas),
+                error=str(e),
+                exc_info=True,
+            )
+
+        if self._next_stage:
+            await self._next_stage.prepare_batch(alphas, policy, **kwargs)
+
+    async def _prepare_batch_stage(
+        self,
+        alphas: List[Alpha],
+        policy: RefreshPolicy,
+        **kwargs: Any,
+    ) -> None:
+        """
+        当前阶段的批量预处理逻辑，默认不做任何处理，子类可按需重写。
+
+        Args:
+            alphas: 同一批次的待评估 Alpha 列表。
+            policy: 刷新策略。
+            kwargs: 其他参数。
+        """
+
+    async def finish_alpha(self, alpha: Alpha) -> None:
+        """
+        Alpha 离开评估阶段链 (通过、被拒绝或出错) 后，通知责任链中的每个阶段
+        释放为它保留的批量预处理状态。
+
+        Args:
+            alpha: 已结束评估的 Alpha。
+        """
+        await self._finish_alpha_stage(alpha)
+        for stage in self._sub_stages():
+            await stage.finish_alpha(alpha)
+        if self._next_stage:
+            await self._next_stage.finish_alpha(alpha)
+
+    async def _finish_alpha_stage(self, alpha: Alpha) -> None:
+        """
+        当前阶段在 Alpha 结束评估后的清理逻辑，默认不做任何处理，子类可按需重写。
+
+        Args:
+            alpha: 已结束评估的 Alpha。
+        """
+
+    async def close(self) -> None:
+        """
+        批量评估结束 (包括取消与异常) 后，释放责任链中每个阶段持有的资源。
+        """
+        await self._close_stage()
+        for stage in self._sub_stages():
+            await stage.close()
+        if self._next_stage:
+            await self._next_stage.close()
+
+    async def _close_stage(self) -> None:
+        """
+        当前阶段释放资源的逻辑，默认不做任何处理，子类可按需重写。
+        """
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        描述从当前阶段开始的责任链配置，用于判断之前的评估结论是否仍然有效。
+
+        Returns:
+            包含阶段类名、阶段配置和下一个阶段描述的字典，可以被 JSON 序列化。
+        """
+        return {
+            "stage": f"{type(self).__module__}.{type(self).__qualname__}",
+            "config": self._stage_config(),
+            "next": self._next_stage.describe() if self._next_stage else None,
+        }
+
+    def _stage_config(self) -> Dict[str, Any]:
+        """
+        当前阶段影响评估结论的配置 (例如阈值)，默认没有配置，子类可按需重写。
+
+        Returns:
+            可以被 JSON 序列化的配置字典。
+        """
+        return {}
+
+    def required_relationships(self) -> Set[str]:
+        """
+        从当前阶段开始的责任链读取的 Alpha 关联关系，Fetcher 只加载这些关联关系。
+
+        Returns:
+            关联关系路径的集合，嵌套关系用点号连接，例如 "in_sample.checks"。
+        """
+        relationships: Set[str] = set(self._stage_relationships())
+        if self._next_stage:
+            relationships |= self._next_stage.required_relationships()
+        return relationships
+
+    def _stage_relationships(self) -> Set[str]:
+        """
+        当前阶段读取的 Alpha 关联关系，默认只读取 Alpha 自身的列，子类可按需重写。
+
+        Returns:
+            关联关系路径的集合。
+        """
+        return set()
+
     async def _determine_check_action(
         self,
         policy: RefreshPolicy,
@@ -197,6 +421,9 @@ class AbstractEvaluateStage(ABC):
             # 可以在这里抛出异常，或者让调用方处理 ERROR 状态
             # raise ValueError(f"不支持的 {check_type_name} 检查策略 '{policy}'")
 
+        if self.metrics is not None:
+            self.metrics.record_check_action(self.metrics_name, action.name)
+
         await log.adebug(
             f"结束判断 {check_type_name} 检查操作",
             emoji="🏁",
@@ -0,0 +1,222 @@
+"""评估结果的写后缓冲 (write-behind buffer)。
+
+评估阶段拉取到检查记录、PnL 记录集，评估器得到评估结果后，原先每条记录都会立即
+`session.commit()` 一次。SQLite 上每次提交都伴随一次 fsync，整个评估过程因此被
+串行化在磁盘同步上。缓冲区按顺序累积 CheckRecord、RecordSet、EvaluateRecord
+以及评估台账的写入操作，累积到 `flush_size` 条或距第一条待写操作超过
+`flush_interval` 秒时在一个事务中统一提交。
+
+缓冲区作为异步上下文管理器使用时，退出 (包括取消与异常) 时保证写入剩余记录。
+批量提交失败时回滚并逐条重试，只有仍然失败的操作被保留，在 `close` 时统一报告，
+不会由恰好触发提交的 `add` 调用方承担。
+提交在会话锁内进行，与共享同一个会话的其他查询串行执行；因此通过 `call` 加入的
+写入操作不能再获取会话锁。
+"""
+
+import asyncio
+from types import TracebackType
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Type
+
+from sqlalchemy import Executable
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from structlog.stdlib import BoundLogger
+
+from alphapower.internal.db_session import session_lock
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+
+class EvaluateWriteBuffer:
+    """
+    按写入顺序累积实体插入、合并与 DML 语句，并分组提交的写后缓冲区。
+    """
+
+    ADD: str = "add"
+    MERGE: str = "merge"
+    EXECUTE: str = "execute"
+    CALL: str = "call"
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        flush_size: int = 200,
+        flush_interval: float = 5.0,
+    ) -> None:
+        """
+        初始化写后缓冲区。
+
+        :param session: 提交写入所用的数据库会话
+        :param flush_size: 待写操作达到该数量时立即提交，为 1 时等价于逐条提交
+        :param flush_interval: 第一条待写操作最多等待多少秒后提交，不大于 0 时不按时间提交
+        """
+        self.session: AsyncSession = session
+        self.flush_size: int = max(flush_size, 1)
+        self.flush_interval: float = flush_interval
+        self._pending: List[Tuple[str, Any]] = []
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task[None]] = None
+        # 逐条重试后仍然失败的操作及其异常，在 close 时报告
+        self.failed_operations: List[Tuple[str, Any, Exception]] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def add(self, entity: Any) -> None:
+        """
+        排队插入一个新实体。
+
+        :param entity: ORM 实体
+        """
+        await self._enqueue(self.ADD, entity)
+
+    async def merge(self, entity: Any) -> None:
+        """
+        排队按主键合并 (更新) 一个实体。
+
+        :param entity: 已设置主键的 ORM 实体
+        """
+        await self._enqueue(self.MERGE, entity)
+
+    async def execute(self, statement: Executable) -> None:
+        """
+        排队执行一条 DML 语句 (例如按条件删除)，与前后的实体写入保持顺序。
+
+        :param statement: SQLAlchemy 可执行语句
+        """
+        await self._enqueue(self.EXECUTE, statement)
+
+    async def call(self, operation: Callable[[], Awaitable[Any]]) -> None:
+        """
+        排队一个在提交事务内执行的异步写入操作，例如数据访问层的批量 upsert。
+
+        :param operation: 无参数的异步可调用对象，应只使用缓冲区的会话写入
+        """
+        await self._enqueue(self.CALL, operation)
+
+    async def _enqueue(self, kind: str, payload: Any) -> None:
+        self._pending.append((kind, payload))
+        if len(self._pending) >= self.flush_size:
+            await self.flush()
+        elif self.flush_interval > 0 and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    async def _flush_after_interval(self) -> None:
+        try:
+            await asyncio.sleep(self.flush_interval)
+            self._timer = None
+            await self.flush()
+        except SQLAlchemyError as e:
+            # 定时提交失败时只记录日志，下一次写入或关闭时会再次尝试提交
+            await log.aerror(
+                event="评估结果定时提交失败",
+                error=str(e),
+                emoji="❌",
+                exc_info=True,
+            )
+
+    async def _apply(self, kind: str, payload: Any) -> None:
+        if kind == self.ADD:
+            self.session.add(payload)
+        elif kind == self.MERGE:
+            await self.session.merge(payload)
+        elif kind == self.EXECUTE:
+            await self.session.execute(payload)
+        else:
+            await payload()
+
+    async def _commit_each(self, operations: List[Tuple[str, Any]]) -> int:
+        """
+        逐条在独立事务中写入并提交，仍然失败的操作记入 `failed_operations`。
+
+        :param operations: 待写操作列表
+        :return: 提交成功的操作数
+        """
+        committed: int = 0
+        for kind, payload in operations:
+            try:
+                await self._apply(kind, payload)
+                await self.session.commit()
+                committed += 1
+            except SQLAlchemyError as e:
+                await self.session.rollback()
+                self.failed_operations.append((kind, payload, e))
+                await log.aerror(
+                    event="评估结果写入失败，已回滚并保留到关闭时报告",
+                    kind=kind,
+                    payload=repr(payload),
+                    error=str(e),
+                    emoji="❌",
+                )
+        return committed
+
+    async def flush(self) -> int:
+        """
+        在一个事务中写入并提交所有待写操作。
+
+        批量提交失败时回滚事务并逐条重试，隔离出失败的操作，其余操作照常提交。
+        数据库写入失败的操作不会向调用方抛出异常，而是保留在 `failed_operations` 中，
+        由 `close` 报告。
+
+        :return: 提交成功的操作数
+        """
+        async with self._lock, session_lock(self.session):
+            if not self._pending:
+                return 0
+
+            operations: List[Tuple[str, Any]] = self._pending
+            self._pending = []
+            try:
+                for kind, payload in operations:
+                    await self._apply(kind, payload)
+                await self.session.commit()
+                committed: int = len(operations)
+            except SQLAlchemyError as e:
+                await self.session.rollback()
+                await log.awarning(
+                    event="评估结果批量提交失败，已回滚并逐条重试",
+                    operations=len(operations),
+                    error=str(e),
+                    emoji="⚠️",
+                )
+                committed = await self._commit_each(operations)
+
+        await log.adebug(
+            event="评估结果缓冲区已提交",
+            operations=len(operations),
+            committed=committed,
+            emoji="💾",
+        )
+        return committed
+
+    async def close(self) -> None:
+        """
+        停止定时提交并写入剩余操作，取消当前任务也不会中断这次写入。
+
+        :raises RuntimeError: 存在逐条重试后仍然失败的写入操作时，异常链指向第一个失败原因
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await asyncio.shield(self.flush())
+
+        if self.failed_operations:
+            failed: List[Tuple[str, Any, Exception]] = self.failed_operations
+            self.failed_operations = []
+            raise RuntimeError(
+                f"{len(failed)} 条评估结果写入失败: "
+                + ", ".join(f"{kind} {payload!r}" for kind, payload, _ in failed)
+            ) from failed[0][2]
+
+    async def __aenter__(self) -> "EvaluateWriteBuffer":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        # 评估结果之间相互独立，出现异常或被取消时同样写入已完成的结果
+        await self.close()
@@ -0,0 +1,148 @@
+"""PnL 本地二进制缓存。
+
+将 RecordSet 中以 JSON 存储的 PnL 记录集转换为 NumPy 结构化数组 (structured array)
+落盘为 `.npy` 文件，并以内存映射 (memory-map) 方式读取。缓存以
+`alpha_id + 内容哈希` 作为键，记录集内容变化后哈希随之变化，旧文件自动失效并被清理。
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from structlog.stdlib import BoundLogger
+
+from alphapower.internal.logging import get_logger
+
+log: BoundLogger = get_logger(__name__)
+
+
+class PnLCache:
+    """
+    以 alpha_id + 内容哈希为键的 PnL 磁盘缓存。
+    """
+
+    DATE_COLUMN: str = "date"
+    FILE_SUFFIX: str = ".npy"
+
+    def __init__(self, cache_dir: Path) -> None:
+        """
+        初始化 PnL 缓存。
+
+        :param cache_dir: 缓存文件所在目录，不存在时自动创建
+        """
+        self.cache_dir: Path = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, alpha_id: str, content_hash: str) -> Path:
+        return self.cache_dir / f"{alpha_id}-{content_hash}{self.FILE_SUFFIX}"
+
+    def _stale_paths(self, alpha_id: str, content_hash: str) -> List[Path]:
+        current: Path = self._path(alpha_id, content_hash)
+        return [
+            path
+            for path in self.cache_dir.glob(f"{alpha_id}-*{self.FILE_SUFFIX}")
+            if path != current
+        ]
+
+    def _load(self, alpha_id: str, content_hash: str) -> Optional[pd.DataFrame]:
+        path: Path = self._path(alpha_id, content_hash)
+        if not path.exists():
+            return None
+
+        records: np.ndarray = np.load(path, mmap_mode="r")
+        names = records.dtype.names or ()
+        return pd.DataFrame({name: records[name] for name in names})
+
+    def _dump(self, alpha_id: str, content_hash: str, pnl_df: pd.DataFrame) -> None:
+        value_columns: List[str] = [
+            str(column) for column in pnl_df.columns if column != self.DATE_COLUMN
+        ]
+        records: np.ndarray = np.empty(
+            len(pnl_df),
+            dtype=[(self.DATE_COLUMN, "datetime64[D]")]
+            + [(column, np.float64) for column in value_columns],
+        )
+        records[self.DATE_COLUMN] = pd.to_datetime(pnl_df[self.DATE_COLUMN]).to_numpy(
+            dtype="datetime64[D]"
+        )
+        for column in value_columns:
+            records[column] = pd.to_numeric(pnl_df[column]).to_numpy(dtype=np.float64)
+
+        # 先写临时文件再原子替换，避免并发读到不完整的文件
+        path: Path = self._path(alpha_id, content_hash)
+        tmp_path: Path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as file:
+            np.save(file, records)
+        os.replace(tmp_path, path)
+
+        for stale_path in self._stale_paths(alpha_id, content_hash):
+            stale_path.unlink(missing_ok=True)
+
+    def contains(self, alpha_id: str, content_hash: str) -> bool:
+        """
+        判断缓存文件是否存在，不读取文件内容。
+
+        :param alpha_id: Alpha 策略 ID
+        :param content_hash: RecordSet 内容哈希
+        :return: 缓存文件存在时返回 True
+        """
+        return self._path(alpha_id, content_hash).exists()
+
+    async def get(self, alpha_id: str, content_hash: str) -> Optional[pd.DataFrame]:
+        """
+        读取缓存的 PnL 数据框。
+
+        :param alpha_id: Alpha 策略 ID
+        :param content_hash: RecordSet 内容哈希
+        :return: 命中时返回 PnL 数据框，未命中或缓存损坏时返回 None
+        """
+        try:
+            pnl_df: Optional[pd.DataFrame] = await asyncio.to_thread(
+                self._load, alpha_id, content_hash
+            )
+        except (OSError, ValueError) as e:
+            await log.awarning(
+                event="读取 PnL 缓存失败, 将回退到数据库",
+                alpha_id=alpha_id,
+                error=str(e),
+                emoji="⚠️",
+            )
+            return None
+
+        await log.adebug(
+            event="PnL 缓存命中" if pnl_df is not None else "PnL 缓存未命中",
+            alpha_id=alpha_id,
+            content_hash=content_hash,
+            emoji="🎯" if pnl_df is not None else "💨",
+        )
+        return pnl_df
+
+    async def put(self, alpha_id: str, content_hash: str, pnl_df: pd.DataFrame) -> None:
+        """
+        写入 PnL 数据框，并清理同一 Alpha 的过期缓存文件。
+
+        :param alpha_id: Alpha 策略 ID
+        :param content_hash: RecordSet 内容哈希
+        :param pnl_df: PnL 数据框，必须包含 date 列，其余列需为数值
+        """
+        try:
+            await asyncio.to_thread(self._dump, alpha_id, content_hash, pnl_df)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            await log.awarning(
+                event="写入 PnL 缓存失败, 忽略缓存",
+                alpha_id=alpha_id,
+                error=str(e),
+                emoji="⚠️",
+            )
+            return
+
+        await log.adebug(
+            event="PnL 缓存已写入",
+            alpha_id=alpha_id,
+            content_hash=content_hash,
+            rows=len(pnl_df),
+            emoji="💾",
+        )
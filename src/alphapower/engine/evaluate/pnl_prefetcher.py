@@ -0,0 +1,293 @@
+"""PnL 并发预取。
+
+从平台并发拉取一批 Alpha 的 PnL 记录集，按批写入 RecordSet 表并预热本地
+PnL 缓存。并发数由 `concurrency` 限制，单个请求的配额仍由客户端的
+`rate_limit_handler` 统一控制，因此提高并发不会绕过平台限流。
+"""
+
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiostream.stream as stream
+import pandas as pd
+from aiohttp import ClientError
+from aiostream import Stream
+from structlog.stdlib import BoundLogger
+
+from alphapower.client import PollManager, TableView, WorldQuantClient
+from alphapower.client import poll_manager as shared_poll_manager
+from alphapower.constants import RecordSetType
+from alphapower.dal.evaluate import RecordSetDAL
+from alphapower.entity import RecordSet
+from alphapower.internal.logging import get_logger
+from alphapower.settings import settings
+
+from .pnl_cache import PnLCache
+
+log: BoundLogger = get_logger(__name__)
+
+
+class PnLPrefetcher:
+    """
+    以有限并发从平台预取 PnL，并批量持久化。
+    """
+
+    def __init__(
+        self,
+        client: WorldQuantClient,
+        record_set_dal: RecordSetDAL,
+        pnl_cache: Optional[PnLCache] = None,
+        concurrency: Optional[int] = None,
+        flush_size: int = 50,
+        poll_timeout: float = 30.0,
+        poll_manager: Optional[PollManager] = None,
+    ) -> None:
+        """
+        初始化 PnL 预取器。
+
+        :param client: WorldQuant 客户端实例
+        :param record_set_dal: RecordSet 数据访问层实例
+        :param pnl_cache: PnL 本地二进制缓存，为 None 时只写数据库
+        :param concurrency: 同时轮询平台的 Alpha 数量上限，默认使用配置值
+        :param flush_size: 累积多少条 PnL 后写入一次数据库
+        :param poll_timeout: 单个 Alpha 轮询 PnL 的超时时间 (秒)
+        :param poll_manager: 轮询管理器，默认使用客户端共享的轮询管理器
+        """
+        self.client: WorldQuantClient = client
+        self.record_set_dal: RecordSetDAL = record_set_dal
+        self.pnl_cache: Optional[PnLCache] = pnl_cache
+        self.concurrency: int = max(
+            concurrency if concurrency else settings.pnl_prefetch_concurrency, 1
+        )
+        self.flush_size: int = max(flush_size, 1)
+        self.poll_timeout: float = poll_timeout
+        self.poll_manager: PollManager = poll_manager or shared_poll_manager
+
+    async def fetch_table_view(self, alpha_id: str) -> TableView:
+        """
+        轮询平台直到 PnL 记录集生成完毕。
+
+        调用方需处于 `async with client` 上下文中。
+
+        :param alpha_id: Alpha 策略 ID
+        :return: PnL 记录集
+        :raises TimeoutError: 超过 poll_timeout 仍未完成
+        :raises ValueError: 平台返回空的记录集
+        """
+
+        async def poll() -> Tuple[bool, Optional[float], Optional[TableView]]:
+            finished, pnl_table_view, retry_after, _ = (
+                await self.client.alpha_fetch_record_set_pnl(alpha_id=alpha_id)
+            )
+            if not finished:
+                await log.ainfo(
+                    event="Alpha 策略的 pnl 数据加载中, 等待重试",
+                    alpha_id=alpha_id,
+                    retry_after=retry_after,
+                    emoji="⏳",
+                    module=__name__,
+                )
+            return finished, retry_after, pnl_table_view
+
+        try:
+            pnl_table_view: Optional[TableView] = await self.poll_manager.poll(
+                poll, timeout=self.poll_timeout, key=alpha_id
+            )
+        except TimeoutError:
+            await log.aerror(
+                event="加载 Alpha 策略的 pnl 数据超时",
+                alpha_id=alpha_id,
+                timeout=self.poll_timeout,
+                emoji="⏰",
+                module=__name__,
+            )
+            raise TimeoutError(f"加载 Alpha 策略 {alpha_id} 的 pnl 数据超时") from None
+
+        if pnl_table_view is None:
+            raise ValueError("Alpha 的 pnl 数据为 None")
+        return pnl_table_view
+
+    async def _fetch_one(self, alpha_id: str) -> Tuple[str, Optional[TableView]]:
+        """
+        拉取单个 Alpha 的 PnL，失败时记录日志并返回 None，不中断整批预取。
+        """
+        try:
+            return alpha_id, await self.fetch_table_view(alpha_id)
+        except (ClientError, TimeoutError, ValueError) as e:
+            await log.aerror(
+                event="预取 Alpha 策略的 pnl 数据失败",
+                alpha_id=alpha_id,
+                error=str(e),
+                emoji="❌",
+                module=__name__,
+            )
+            return alpha_id, None
+
+    async def _flush(self, table_views: Dict[str, TableView]) -> None:
+        """
+        将一批 PnL 记录集写入数据库 (一次查询、一次提交)，并写入本地缓存。
+        """
+        if not table_views:
+            return
+
+        existing_record_sets: List[RecordSet] = await self.record_set_dal.find_by(
+            in_={"alpha_id": list(table_views.keys())},
+            set_type=RecordSetType.PNL,
+        )
+        existing_ids: Dict[str, int] = {
+            record_set.alpha_id: record_set.id for record_set in existing_record_sets
+        }
+
+        created: List[RecordSet] = []
+        updated: List[RecordSet] = []
+        for alpha_id, pnl_table_view in table_views.items():
+            record_set: RecordSet = RecordSet(
+                alpha_id=alpha_id,
+                set_type=RecordSetType.PNL,
+                content=pnl_table_view.model_dump(),
+            )
+            if alpha_id in existing_ids:
+                record_set.id = existing_ids[alpha_id]
+                updated.append(record_set)
+            else:
+                created.append(record_set)
+
+        if created:
+            await self.record_set_dal.bulk_create(created)
+        if updated:
+            await self.record_set_dal.update_all(updated)
+        await self.record_set_dal.session.commit()
+
+        if self.pnl_cache:
+            for record_set in created + updated:
+                pnl_df: Optional[pd.DataFrame] = table_views[
+                    record_set.alpha_id
+                ].to_dataframe()
+                if pnl_df is not None and record_set.content_hash:
+                    await self.pnl_cache.put(
+                        record_set.alpha_id, record_set.content_hash, pnl_df
+                    )
+
+        await log.adebug(
+            event="批量写入 pnl 数据完成",
+            created=len(created),
+            updated=len(updated),
+            emoji="💾",
+            module=__name__,
+        )
+
+    async def warm_cache(self, content_hashes: Dict[str, Optional[str]]) -> int:
+        """
+        为数据库中已存在、但本地缓存缺失的 PnL 记录集补写缓存。
+
+        :param content_hashes: Alpha ID 到 RecordSet 内容哈希的映射
+        :return: 补写的缓存数量
+        """
+        if self.pnl_cache is None:
+            return 0
+
+        uncached_alpha_ids: List[str] = [
+            alpha_id
+            for alpha_id, content_hash in content_hashes.items()
+            if not content_hash or not self.pnl_cache.contains(alpha_id, content_hash)
+        ]
+        warmed_count: int = 0
+        for offset in range(0, len(uncached_alpha_ids), self.flush_size):
+            record_sets: List[RecordSet] = await self.record_set_dal.find_by(
+                in_={"alpha_id": uncached_alpha_ids[offset : offset + self.flush_size]},
+                set_type=RecordSetType.PNL,
+            )
+            for record_set in record_sets:
+                if record_set.content_hash is None:
+                    record_set.content_hash = RecordSet.compute_content_hash(
+                        record_set.content
+                    )
+                pnl_df: Optional[pd.DataFrame] = TableView.model_validate(
+                    record_set.content
+                ).to_dataframe()
+                if pnl_df is None:
+                    continue
+                await self.pnl_cache.put(
+                    record_set.alpha_id, record_set.content_hash, pnl_df
+                )
+                warmed_count += 1
+            await self.record_set_dal.session.commit()
+
+        await log.ainfo(
+            event="pnl 本地缓存预热完成",
+            checked=len(content_hashes),
+            warmed=warmed_count,
+            emoji="🔥",
+            module=__name__,
+        )
+        return warmed_count
+
+    async def prefetch(self, alpha_ids: List[str]) -> List[str]:
+        """
+        并发预取一组 Alpha 的 PnL 并批量持久化。
+
+        :param alpha_ids: 需要预取的 Alpha ID 列表
+        :return: 成功预取的 Alpha ID 列表
+        """
+        alpha_ids = list(dict.fromkeys(alpha_ids))
+        total: int = len(alpha_ids)
+        if total == 0:
+            return []
+
+        await log.ainfo(
+            event="开始并发预取 pnl 数据",
+            total=total,
+            concurrency=self.concurrency,
+            emoji="🚀",
+            module=__name__,
+        )
+        start_time: datetime = datetime.now()
+        fetched_alpha_ids: List[str] = []
+        failed_count: int = 0
+        pending: Dict[str, TableView] = {}
+
+        # aiostream 的映射函数签名要求接受额外数据源的可变参数，这里只有单一数据源
+        fetch_one: Callable[..., Awaitable[Tuple[str, Optional[TableView]]]] = (
+            self._fetch_one
+        )
+        source: Stream[str] = stream.iterate(alpha_ids)
+        results: Stream[Tuple[str, Optional[TableView]]] = stream.map(
+            source, fetch_one, task_limit=self.concurrency
+        )
+        async with self.client:
+            async with results.stream() as streamer:  # pylint: disable=E1101
+                async for alpha_id, pnl_table_view in streamer:
+                    if pnl_table_view is None:
+                        failed_count += 1
+                    else:
+                        pending[alpha_id] = pnl_table_view
+                        fetched_alpha_ids.append(alpha_id)
+
+                    if len(pending) >= self.flush_size:
+                        await self._flush(pending)
+                        pending = {}
+
+                    completed: int = len(fetched_alpha_ids) + failed_count
+                    await log.ainfo(
+                        event="pnl 数据预取进度",
+                        completed=completed,
+                        failed=failed_count,
+                        total=total,
+                        progress=f"{completed / total * 100:.2f}%",
+                        emoji="📊",
+                        module=__name__,
+                    )
+
+        await self._flush(pending)
+
+        elapsed_time: float = (datetime.now() - start_time).total_seconds()
+        await log.ainfo(
+            event="pnl 数据预取完成",
+            fetched=len(fetched_alpha_ids),
+            failed=failed_count,
+            total=total,
+            elapsed_time="{:.2f} 秒".format(elapsed_time),
+            emoji="✅",
+            module=__name__,
+        )
+        return fetched_alpha_ids
@@ -0,0 +1,113 @@
+"""评估阶段的运行统计。
+
+记录每个评估阶段的通过率和耗时分布，供自适应排序等策略估计阶段的期望代价，
+也用于评估运行的指标汇总。
+"""
+
+import bisect
+from collections import deque
+from typing import Deque, Dict, List, Sequence
+
+import numpy as np
+
+
+class StageStatistics:
+    """
+    单个评估阶段的通过次数与最近若干次耗时的统计。
+    """
+
+    # 耗时直方图各桶的上界 (秒)，最后一个桶统计超过最大上界的样本
+    LATENCY_BUCKETS: Sequence[float] = (
+        0.01,
+        0.05,
+        0.1,
+        0.5,
+        1.0,
+        5.0,
+        10.0,
+        30.0,
+        60.0,
+    )
+
+    def __init__(self, window: int = 1000) -> None:
+        """
+        初始化统计。
+
+        :param window: 保留最近多少次耗时样本用于计算分位数
+        """
+        self.count: int = 0
+        self.passed: int = 0
+        self.errors: int = 0
+        self.total_latency: float = 0.0
+        self._latencies: Deque[float] = deque(maxlen=max(window, 1))
+        self._bucket_counts: List[int] = [0] * (len(self.LATENCY_BUCKETS) + 1)
+
+    def record(self, passed: bool, latency: float, error: bool = False) -> None:
+        """
+        记录一次评估结果。
+
+        :param passed: 是否通过
+        :param latency: 耗时 (秒)
+        :param error: 是否因异常结束，异常视为未通过
+        """
+        self.count += 1
+        self.passed += int(passed and not error)
+        self.errors += int(error)
+        self.total_latency += latency
+        self._latencies.append(latency)
+        self._bucket_counts[bisect.bisect_left(self.LATENCY_BUCKETS, latency)] += 1
+
+    @property
+    def failed(self) -> int:
+        """未通过且没有异常的次数。"""
+        return self.count - self.passed - self.errors
+
+    @property
+    def pass_rate(self) -> float:
+        """通过率，使用拉普拉斯平滑 (+1/+2)，没有样本时为 0.5。"""
+        return (self.passed + 1) / (self.count + 2)
+
+    @property
+    def mean_latency(self) -> float:
+        """平均耗时 (秒)，没有样本时为 0。"""
+        return self.total_latency / self.count if self.count else 0.0
+
+    def latency_percentile(self, percentile: float) -> float:
+        """
+        最近样本耗时的分位数。
+
+        :param percentile: 分位数，取值 0 到 100
+        :return: 耗时 (秒)，没有样本时为 0
+        """
+        if not self._latencies:
+            return 0.0
+        return float(np.percentile(np.fromiter(self._latencies, float), percentile))
+
+    def latency_histogram(self) -> Dict[str, int]:
+        """
+        全部样本的耗时直方图。
+
+        :return: 以桶上界 (如 "le_0.5"，最后一个桶为 "gt_60.0") 为键的样本数
+        """
+        histogram: Dict[str, int] = {
+            f"le_{bound}": count
+            for bound, count in zip(self.LATENCY_BUCKETS, self._bucket_counts)
+        }
+        histogram[f"gt_{self.LATENCY_BUCKETS[-1]}"] = self._bucket_counts[-1]
+        return histogram
+
+    def summary(self) -> Dict[str, float]:
+        """
+        汇总为便于日志输出的字典。
+        """
+        return {
+            "count": self.count,
+            "passed": self.passed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "pass_rate": self.pass_rate,
+            "mean_latency": self.mean_latency,
+            "p50_latency": self.latency_percentile(50),
+            "p95_latency": self.latency_percentile(95),
+            "p99_latency": self.latency_percentile(99),
+        }
@@ -4,16 +4,21 @@
 模块功能：
 - 定义任务提供者的抽象基类。
 - 提供从数据库中获取任务的具体实现。
+- 以租约标记任务的归属，多个进程或主机上的工作池可以共享同一个任务库。
 """
 
 import asyncio
-from typing import List, Optional, Set
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 from structlog.stdlib import BoundLogger
 
 from alphapower.constants import Database
 from alphapower.dal.simulation import SimulationTaskDAL
-from alphapower.entity import SimulationTask, SimulationTaskStatus
+from alphapower.entity import SimulationTask
 from alphapower.internal.db_session import get_db_session
 from alphapower.internal.logging import get_logger
 
@@ -22,48 +27,157 @@ from .provider_abc import AbstractTaskProvider
 logger: BoundLogger = get_logger(__name__)
 
 
+def default_lease_owner() -> str:
+    """
+    生成认领者标识，由主机名、进程号与随机后缀组成，同一进程内的多个提供者互不相同。
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
 class DatabaseTaskProvider(AbstractTaskProvider):
     """
     数据库任务提供者类。
 
     功能：
-    - 从数据库中获取仿真任务。
-    - 支持跳采样功能以优化任务获取效率。
+    - 以认领的方式从数据库中获取仿真任务：一条语句把待处理任务标记为已调度，
+      写入认领者与租约到期时间，并返回这些任务。
+    - 获取任务的代价与队列深度和进行中的任务数量无关。
+    - 启动后定期续约自己持有的任务，并回收其他认领者过期的租约；
+      进程退出后，它持有的任务在租约过期后回到队列。
     - 提供任务调度确认功能。
     """
 
-    def __init__(self, sample_rate: int = 1) -> None:
+    def __init__(
+        self,
+        owner: Optional[str] = None,
+        lease_seconds: float = 600.0,
+        heartbeat_interval: Optional[float] = None,
+    ) -> None:
         """
         初始化任务提供者。
 
         参数：
-        - sample_rate (int): 采样率，用于跳采样任务，默认为 1（不跳采样）。
+        - owner (Optional[str]): 认领者标识，默认由主机名与进程号生成。
+        - lease_seconds (float): 认领租约时长（秒），默认为 600。
+        - heartbeat_interval (Optional[float]): 续约间隔（秒），默认为租约时长的三分之一。
         """
-        self.cursor = 0
-        self.committing_scheduled_task_ids: Set[int] = set()
-        self._lock = asyncio.Lock()
-        self._sample_rate = sample_rate  # 新增采样率参数
+        self.owner: str = owner or default_lease_owner()
+        self.lease_seconds: float = lease_seconds
+        self.heartbeat_interval: float = heartbeat_interval or lease_seconds / 3
+        # 已认领且尚未结束的任务，续约时同步更新其租约到期时间，
+        # 避免工作者合并任务对象时把过期的租约写回数据库
+        self._leased_tasks: Dict[int, SimulationTask] = {}
+        self._heartbeat_task: Optional[asyncio.Task[None]] = None
         logger.info(
             event="初始化任务提供者",
-            sample_rate=sample_rate,
+            owner=self.owner,
+            lease_seconds=lease_seconds,
+            heartbeat_interval=self.heartbeat_interval,
             message="DatabaseTaskProvider 初始化完成",
             emoji="🚀",
         )
 
+    async def start(self) -> None:
+        """
+        启动租约心跳。
+        """
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            return
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        await logger.ainfo(
+            event="启动租约心跳",
+            owner=self.owner,
+            heartbeat_interval=self.heartbeat_interval,
+            emoji="💓",
+        )
+
+    async def stop(self) -> None:
+        """
+        停止租约心跳，并释放尚未开始运行的任务。
+
+        运行中的任务不释放，由租约过期后回收。
+        """
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+
+        async with get_db_session(Database.SIMULATION) as session:
+            released: int = await SimulationTaskDAL(session=session).release_leases(
+                owner=self.owner
+            )
+        self._leased_tasks.clear()
+        await logger.ainfo(
+            event="停止租约心跳",
+            owner=self.owner,
+            released_task_count=released,
+            emoji="🛑",
+        )
+
+    async def renew_leases(self) -> int:
+        """
+        续约自己持有的任务，并回收过期的租约。
+
+        返回：
+        - int: 续约的任务数量。
+        """
+        lease_expires_at: datetime = datetime.now() + timedelta(
+            seconds=self.lease_seconds
+        )
+        async with get_db_session(Database.SIMULATION) as session:
+            dal: SimulationTaskDAL = SimulationTaskDAL(session=session)
+            renewed: int = await dal.renew_leases(
+                owner=self.owner, lease_expires_at=lease_expires_at
+            )
+            reclaimed: int = await dal.reclaim_expired_leases()
+
+        for task_id, task in list(self._leased_tasks.items()):
+            if task.status in SimulationTaskDAL.LEASED_STATUSES:
+                task.lease_expires_at = lease_expires_at
+            else:
+                del self._leased_tasks[task_id]
+
+        await logger.adebug(
+            event="续约任务租约",
+            owner=self.owner,
+            renewed_task_count=renewed,
+            reclaimed_task_count=reclaimed,
+            emoji="💓",
+        )
+        return renewed
+
+    async def _heartbeat_loop(self) -> None:
+        """
+        每隔 heartbeat_interval 秒续约一次，直到被取消。
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.renew_leases()
+            except Exception as e:
+                # 续约失败时等待下一次心跳，租约时长应覆盖数次心跳
+                await logger.awarning(
+                    event="续约任务租约失败",
+                    owner=self.owner,
+                    error=str(e),
+                    exc_info=True,
+                    emoji="⚠️",
+                )
+
     async def fetch_tasks(
         self,
         count: int = 10,  # 设置默认值
         priority: Optional[int] = None,
     ) -> List[SimulationTask]:
         """
-        从数据库中获取任务，支持跳采样。
+        从数据库中认领任务。
 
         参数：
         - count (int): 需要获取的任务数量，默认为 10。
         - priority (Optional[int]): 任务优先级过滤条件，默认为 None。
 
         返回：
-        - List[SimulationTask]: 获取到的任务列表。
+        - List[SimulationTask]: 认领到的任务列表，状态已经是 SCHEDULED。
         """
         await logger.adebug(
             event="开始获取任务",
@@ -72,97 +186,52 @@ class DatabaseTaskProvider(AbstractTaskProvider):
             message="fetch_tasks 方法被调用",
             emoji="🔍",
         )
-        sampled_tasks: List[SimulationTask] = []
 
-        # TODO: 这里跳采样的逻辑还是有点复杂，可能需要进一步优化
         async with get_db_session(Database.SIMULATION) as session:
-            sampled_task_ids: List[int] = []
-            while len(sampled_task_ids) < count:
-                dal: SimulationTaskDAL = SimulationTaskDAL(session=session)
-                task_ids: List[int] = await dal.find_task_ids_by_filters(
-                    status=SimulationTaskStatus.PENDING,
-                    priority=priority,
-                    notin_={
-                        "id": list(self.committing_scheduled_task_ids)
-                        + sampled_task_ids,
-                    },
-                    limit=count * self._sample_rate,
-                    offset=self.cursor,
-                )
-
-                if not task_ids:  # 如果没有更多任务，提前退出
-                    pending_task_count: int = await dal.count(
-                        status=SimulationTaskStatus.PENDING,
-                        priority=priority,
-                        notin_={
-                            "id": list(self.committing_scheduled_task_ids)
-                            + sampled_task_ids,
-                        },
-                    )
-
-                    self.cursor = 0
-                    if pending_task_count > 0:
-                        # 如果还有待处理的任务，继续循环
-                        await logger.adebug(
-                            event="一轮跳采样未能获取到足够的任务，跳采样从头开始",
-                            required_task_count=count,
-                            sampled_task_count=len(sampled_task_ids),
-                            pending_task_count=pending_task_count,
-                            emoji="🔄",
-                        )
-                        continue
-                    await logger.awarning(
-                        event="无更多任务",
-                        message="数据库中没有更多待处理任务",
-                        required_task_count=count,
-                        sampled_task_count=len(sampled_task_ids),
-                        emoji="⚠️",
-                    )
-                    break
-
-                sampled_task_ids.extend(task_ids[:: self._sample_rate])
-                self.cursor += len(task_ids)
-
-            sampled_tasks = await dal.find_filtered(
-                status=SimulationTaskStatus.PENDING,
+            dal: SimulationTaskDAL = SimulationTaskDAL(session=session)
+            if self._heartbeat_task is None:
+                # 未启动心跳时，在获取任务前回收过期的租约
+                await dal.reclaim_expired_leases()
+            claimed_tasks: List[SimulationTask] = await dal.claim_pending_tasks(
+                owner=self.owner,
+                count=count,
+                lease_seconds=self.lease_seconds,
                 priority=priority,
-                in_={"id": sampled_task_ids},
-                not_in_={
-                    "id": list(self.committing_scheduled_task_ids),
-                },
-                limit=count,
             )
 
-            await logger.ainfo(
-                event="获取任务完成",
-                sampled_task_id_count=len(sampled_task_ids),
-                sampled_task_count=len(sampled_tasks),
+        if not claimed_tasks:
+            await logger.awarning(
+                event="无更多任务",
+                message="数据库中没有更多待处理任务",
                 required_task_count=count,
-                message="成功获取到任务",
-                emoji="✅",
+                emoji="⚠️",
             )
+            return []
 
-        return sampled_tasks[:count]  # 返回满足数量的任务
+        self._leased_tasks.update({task.id: task for task in claimed_tasks})
+        await logger.ainfo(
+            event="获取任务完成",
+            claimed_task_count=len(claimed_tasks),
+            required_task_count=count,
+            owner=self.owner,
+            message="成功认领到任务",
+            emoji="✅",
+        )
+        return claimed_tasks
 
     async def acknowledge_scheduled_tasks(self, task_ids: List[int]) -> None:
         """
         确认调度的任务。
 
+        认领时任务已经在数据库中标记为已调度，这里无需再维护待确认列表。
+
         参数：
         - task_ids (List[int]): 已调度任务的 ID 列表。
         """
         await logger.adebug(
-            event="确认调度任务开始",
+            event="确认调度任务",
             task_ids=task_ids,
+            owner=self.owner,
             message="acknowledge_scheduled_tasks 方法被调用",
             emoji="📋",
         )
-        async with self._lock:
-            # 提交成功后，从待确认列表中移除
-            self.committing_scheduled_task_ids.difference_update(task_ids)
-        await logger.ainfo(
-            event="确认调度任务完成",
-            task_ids=task_ids,
-            message="成功确认调度的任务",
-            emoji="✅",
-        )
@@ -28,3 +28,13 @@ class AbstractTaskProvider(ABC):
         确认调度的任务。
         :param task_ids: 任务的唯一标识符列表
         """
+
+    async def start(self) -> None:
+        """
+        启动任务提供者的后台工作，默认无操作。
+        """
+
+    async def stop(self) -> None:
+        """
+        停止任务提供者的后台工作并释放资源，默认无操作。
+        """
@@ -3,8 +3,9 @@
 """
 
 import asyncio
-from bisect import insort
-from typing import Dict, List, Optional
+import heapq
+import itertools
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from structlog.stdlib import BoundLogger
 
@@ -17,9 +18,41 @@ from .scheduler_abc import AbstractScheduler
 logger: BoundLogger = get_logger(__name__)
 
 
+class _TaskEntry:
+    """
+    分组堆中的一个任务，按 (虚拟截止时间, 入堆顺序) 排序，截止时间相同时先加入的任务先调度。
+
+    虚拟截止时间 = 入队时的虚拟时间 - 优先级 × 老化间隔，入队后不再变化；
+    调度后未执行、被放回的任务沿用原来的虚拟截止时间。
+    """
+
+    __slots__ = ("deadline", "sequence", "task", "group_key", "removed")
+
+    def __init__(
+        self, deadline: int, sequence: int, task: SimulationTask, group_key: str
+    ) -> None:
+        self.deadline: int = deadline
+        self.sequence: int = sequence
+        self.task: SimulationTask = task
+        self.group_key: str = group_key
+        self.removed: bool = False  # 已移除的任务在到达堆顶时惰性删除
+
+    def __lt__(self, other: "_TaskEntry") -> bool:
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+
 class PriorityScheduler(AbstractScheduler):
     """
     优先级调度器，根据任务的优先级调度任务。
+
+    每个 settings_group_key 维护一个任务堆，另有一个全局堆记录各分组的堆顶，
+    添加、移除和调度单个任务都是 O(log n)。移除的任务只做标记，到达堆顶时才
+    真正出堆；全局堆中过期的分组堆顶同样在出堆时丢弃。
+
+    防止饥饿采用虚拟时间老化：每次调度虚拟时间加 1，任务的有效优先级为
+    基础优先级 + 等待的虚拟时间 / 老化间隔。两个任务有效优先级的比较与当前
+    虚拟时间无关，只取决于入队时固定下来的虚拟截止时间，因此老化不需要修改
+    任何任务或重新排序，每次调度的额外代价为 O(1)。
     """
 
     def __init__(
@@ -27,31 +60,35 @@ class PriorityScheduler(AbstractScheduler):
         tasks: Optional[List[SimulationTask]] = None,
         task_provider: Optional[AbstractTaskProvider] = None,
         task_fetch_size: int = 1,
-        low_priority_threshold: int = 10,  # 新增低优先级任务阈值
+        low_priority_threshold: int = 10,
     ):
         """
         初始化调度器，接收任务列表或任务提供者。
         :param tasks: SimulationTask 的列表（可选）
         :param task_provider: 一个可调用对象，用于从数据库或其他数据源获取任务（可选）
+        :param task_fetch_size: 每次从任务提供者获取的任务数量
+        :param low_priority_threshold: 老化间隔，任务每等待这么多次调度，
+            有效优先级提升 1
         """
-        self.tasks: List[SimulationTask] = sorted(
-            tasks or [], key=lambda task: -int(task.priority)
-        )
         self.task_provider: Optional[AbstractTaskProvider] = task_provider
-        self.settings_group_map: Dict[str, List[SimulationTask]] = {}  # 新增映射关系
         self.task_fetch_size: int = task_fetch_size
-        self.low_priority_threshold: int = low_priority_threshold  # 保存阈值
-        self.low_priority_counter: Dict[str, int] = {}  # 记录低优先级任务的调度次数
+        self.low_priority_threshold: int = max(low_priority_threshold, 1)
+        self.virtual_time: int = 0  # 已完成的调度次数
+
+        self._sequence: Iterator[int] = itertools.count()
+        self._entries: Dict[int, _TaskEntry] = {}  # 以任务对象的 id() 为键
+        self._group_heaps: Dict[str, List[_TaskEntry]] = {}
+        # 全局堆中的 (虚拟截止时间, 入堆顺序, 分组)，与 _group_heads 不一致的元素已过期
+        self._heads: List[Tuple[int, int, str]] = []
+        self._group_heads: Dict[str, Tuple[int, int]] = {}
+        # 已调度任务的虚拟截止时间，以任务 ID 为键，任务被放回时沿用，执行结束后释放
+        self._scheduled_deadlines: Dict[int, int] = {}
 
         self._post_async_tasks: List[asyncio.Task] = []  # 保存后续异步任务
         self._post_async_tasks_lock: asyncio.Lock = asyncio.Lock()
 
-        # 初始化 settings_group_map 映射关系
-        for task in self.tasks:
-            group_key: str = str(task.settings_group_key)
-            if group_key not in self.settings_group_map:
-                self.settings_group_map[group_key] = []
-            self.settings_group_map[group_key].append(task)
+        if tasks:
+            self._build(tasks)
 
     def __del__(self) -> None:
         """
@@ -62,6 +99,91 @@ class PriorityScheduler(AbstractScheduler):
                 task.cancel()
         self._post_async_tasks.clear()
 
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def tasks(self) -> List[SimulationTask]:
+        """
+        按调度顺序排列的待调度任务快照，需要排序全部任务，只用于检查状态。
+        """
+        return [entry.task for entry in sorted(self._entries.values())]
+
+    @property
+    def settings_group_map(self) -> Dict[str, List[SimulationTask]]:
+        """
+        按 settings_group_key 分组、组内按调度顺序排列的待调度任务快照，只用于检查状态。
+        """
+        return {
+            group_key: [entry.task for entry in sorted(heap) if not entry.removed]
+            for group_key, heap in self._group_heaps.items()
+        }
+
+    def effective_priority(self, task: SimulationTask) -> float:
+        """
+        任务当前的有效优先级，即基础优先级加上等待带来的老化提升。
+        :raises ValueError: 任务不在调度器中
+        """
+        entry: Optional[_TaskEntry] = self._entries.get(id(task))
+        if entry is None:
+            raise ValueError(f"任务 {task.id} 不在调度器中")
+        return (self.virtual_time - entry.deadline) / self.low_priority_threshold
+
+    def _new_entry(
+        self, task: SimulationTask, deadline: Optional[int] = None
+    ) -> _TaskEntry:
+        entry: _TaskEntry = _TaskEntry(
+            (
+                deadline
+                if deadline is not None
+                else self.virtual_time
+                - int(task.priority) * self.low_priority_threshold
+            ),
+            next(self._sequence),
+            task,
+            str(task.settings_group_key),
+        )
+        self._entries[id(task)] = entry
+        return entry
+
+    def _build(self, tasks: List[SimulationTask]) -> None:
+        """
+        批量建堆，O(n)。
+        """
+        for task in tasks:
+            entry: _TaskEntry = self._new_entry(task)
+            self._group_heaps.setdefault(entry.group_key, []).append(entry)
+        for group_key, heap in self._group_heaps.items():
+            heapq.heapify(heap)
+            self._advertise(group_key)
+
+    def _advertise(self, group_key: str) -> None:
+        """
+        分组的堆顶发生变化时，将新的堆顶加入全局堆。
+        """
+        heap: Optional[List[_TaskEntry]] = self._group_heaps.get(group_key)
+        while heap and heap[0].removed:
+            heapq.heappop(heap)
+        if not heap:
+            self._group_heaps.pop(group_key, None)
+            self._group_heads.pop(group_key, None)
+            return
+        head: Tuple[int, int] = (heap[0].deadline, heap[0].sequence)
+        if self._group_heads.get(group_key) != head:
+            self._group_heads[group_key] = head
+            heapq.heappush(self._heads, (head[0], head[1], group_key))
+
+    def _peek_group(self) -> Optional[str]:
+        """
+        返回堆顶任务有效优先级最高的分组，丢弃全局堆中过期的元素。
+        """
+        while self._heads:
+            deadline, sequence, group_key = self._heads[0]
+            if self._group_heads.get(group_key) == (deadline, sequence):
+                return group_key
+            heapq.heappop(self._heads)
+        return None
+
     async def fetch_tasks_from_provider(self) -> None:
         """
         从任务提供者获取任务并添加到任务列表，同时更新映射关系。
@@ -81,37 +203,54 @@ class PriorityScheduler(AbstractScheduler):
 
     def add_tasks(self, tasks: List[SimulationTask]) -> None:
         """
-        批量添加新任务到调度器，并保持任务列表和分组任务的有序性。
+        批量添加新任务到调度器，每个任务 O(log n)。
+        :param tasks: SimulationTask 对象的列表
+        """
+        for task in tasks:
+            self._push(self._new_entry(task))
+
+    def requeue_tasks(self, tasks: List[SimulationTask]) -> None:
+        """
+        把已调度但未执行的任务放回调度器，沿用调度前的虚拟截止时间，
+        放回的任务不会失去等待期间积累的老化。每个任务 O(log n)。
+        :param tasks: SimulationTask 对象的列表
+        """
+        for task in tasks:
+            self._push(
+                self._new_entry(task, self._scheduled_deadlines.pop(task.id, None))
+            )
+
+    def release_tasks(self, tasks: List[SimulationTask]) -> None:
+        """
+        丢弃已执行结束的任务保留的虚拟截止时间。
         :param tasks: SimulationTask 对象的列表
         """
         for task in tasks:
-            insort(self.tasks, task, key=lambda t: -int(t.priority))  # 插入时保持有序
-            group_key: str = str(task.settings_group_key)
-            if group_key not in self.settings_group_map:
-                self.settings_group_map[group_key] = []
-            insort(
-                self.settings_group_map[group_key], task, key=lambda t: -int(t.priority)
-            )  # 插入时保持有序
+            self._scheduled_deadlines.pop(task.id, None)
+
+    def _push(self, entry: _TaskEntry) -> None:
+        heapq.heappush(self._group_heaps.setdefault(entry.group_key, []), entry)
+        self._advertise(entry.group_key)
 
     def remove_task(self, task: SimulationTask) -> None:
         """
-        从调度器中移除一个任务，并更新 settings_group_key 映射关系。
+        从调度器中移除一个任务，O(log n) 均摊。
+        :raises ValueError: 任务不在调度器中
         """
-        group_key: str = str(task.settings_group_key)
-        if group_key in self.settings_group_map:
-            self.settings_group_map[group_key].remove(task)
-            if not self.settings_group_map[group_key]:
-                del self.settings_group_map[group_key]
-        self.tasks.remove(task)
+        entry: Optional[_TaskEntry] = self._entries.pop(id(task), None)
+        if entry is None:
+            raise ValueError(f"任务 {task.id} 不在调度器中")
+        entry.removed = True
+        self._advertise(entry.group_key)
 
     async def has_tasks(self) -> bool:
         """
         检查是否还有任务待调度。
         :return: 如果有任务返回 True，否则返回 False
         """
-        if not self.tasks:
+        if not self._entries:
             await self.fetch_tasks_from_provider()
-        return len(self.tasks) > 0
+        return len(self._entries) > 0
 
     def set_task_provider(self, task_provider: AbstractTaskProvider) -> None:
         """
@@ -120,71 +259,39 @@ class PriorityScheduler(AbstractScheduler):
         """
         self.task_provider = task_provider
 
-    def promote_low_priority_tasks(self) -> None:
-        """
-        提升低优先级任务的优先级，防止饥饿。
-        """
-        for group_key, tasks in self.settings_group_map.items():
-            if group_key not in self.low_priority_counter:
-                self.low_priority_counter[group_key] = 0
-
-            # 如果低优先级任务的调度次数超过阈值，提升其优先级
-            if self.low_priority_counter[group_key] >= self.low_priority_threshold:
-                for task in tasks:
-                    task.priority += 1  # 提升优先级
-                self.settings_group_map[group_key] = sorted(
-                    tasks, key=lambda t: -int(t.priority)
-                )  # 重新排序
-                self.low_priority_counter[group_key] = 0  # 重置计数器
-                logger.info(
-                    event="提升低优先级任务",
-                    group_key=group_key,
-                    promoted_task_count=len(tasks),
-                    message="低优先级任务已提升优先级",
-                    emoji="⬆️",
-                )
-
     async def _do_schedule(self, batch_size: int) -> List[SimulationTask]:
         """
         调度任务，支持单个任务或批量任务。
         :param batch_size: 批量任务的大小
         :return: SimulationTask 对象的列表
         """
-        if not self.tasks:
+        # 有效优先级最高的任务所在的分组，批量调度时只取同一分组的任务
+        target_group_key: Optional[str] = self._peek_group()
+        if target_group_key is None:
             return []
 
-        if batch_size == 1:
-            # 返回单个任务
-            task: SimulationTask = self.tasks[0]
-            self.remove_task(task)  # 确保映射关系更新
-            return [task]
-
-        # 获取第一个任务的 settings_group_key
-        first_task: SimulationTask = self.tasks[0]
-        target_group_key: str = str(first_task.settings_group_key)
-
-        # 从映射关系中获取属于同一 settings_group_key 的任务
-        batch: List[SimulationTask] = self.settings_group_map[target_group_key][
-            :batch_size
-        ]
-        for task in batch:
-            self.remove_task(task)  # 使用 remove_task 确保映射关系更新
-
-        # 更新低优先级任务的调度计数
-        self.low_priority_counter[target_group_key] += 1
-
+        heap: List[_TaskEntry] = self._group_heaps[target_group_key]
+        batch: List[SimulationTask] = []
+        while heap and len(batch) < max(batch_size, 1):
+            entry: _TaskEntry = heapq.heappop(heap)
+            if entry.removed:
+                continue
+            del self._entries[id(entry.task)]
+            self._scheduled_deadlines[entry.task.id] = entry.deadline
+            batch.append(entry.task)
+        self._advertise(target_group_key)
+
+        # 推进虚拟时间，之后入队的任务相对已在等待的任务老化
+        self.virtual_time += 1
         return batch
 
     async def _before_schedule(self) -> None:
         """
         调度前的处理，用于检查是否有任务待调度。
         """
-        if not self.tasks:
+        if not self._entries:
             await self.fetch_tasks_from_provider()
 
-        # 调度前检查并提升低优先级任务
-        self.promote_low_priority_tasks()
-
     async def _post_schedule(
         self, scheduled_tasks: Optional[List[SimulationTask]]
     ) -> None:
@@ -194,7 +301,11 @@ class PriorityScheduler(AbstractScheduler):
         """
         if scheduled_tasks:
             for task in scheduled_tasks:
-                if task.status != SimulationTaskStatus.PENDING:
+                # 从数据库认领的任务已经是 SCHEDULED
+                if task.status not in (
+                    SimulationTaskStatus.PENDING,
+                    SimulationTaskStatus.SCHEDULED,
+                ):
                     raise ValueError(f"任务状态 {task.status} 错误，无法调度。")
                 task.status = SimulationTaskStatus.SCHEDULED
 
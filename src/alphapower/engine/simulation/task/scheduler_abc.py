@@ -30,6 +30,21 @@ class AbstractScheduler(ABC):
         :param tasks: SimulationTask 对象列表
         """
 
+    def requeue_tasks(self, tasks: List[SimulationTask]) -> None:
+        """
+        把已调度但未执行的任务放回调度器。
+        默认实现等同于 add_tasks，子类可以保留任务原有的排队位置。
+        :param tasks: SimulationTask 对象列表
+        """
+        self.add_tasks(tasks)
+
+    def release_tasks(self, tasks: List[SimulationTask]) -> None:
+        """
+        通知调度器已调度的任务执行结束，不会再被放回。
+        默认实现不做任何处理，子类可以释放为放回任务保留的状态。
+        :param tasks: SimulationTask 对象列表
+        """
+
     @abstractmethod
     async def has_tasks(self) -> bool:
         """
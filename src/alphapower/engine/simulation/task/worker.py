@@ -4,7 +4,7 @@
 发送模拟请求、监控任务进度并处理结果。支持单个和批量模拟任务处理。
 
 Typical usage example:
-  worker = Worker(client)
+  worker = Worker(client, concurrency=3)
   await worker.set_scheduler(scheduler)
   await worker.run()
 """
@@ -12,18 +12,20 @@ Typical usage example:
 import asyncio
 import random
 from datetime import datetime
-from typing import Awaitable, Callable, List, Optional, Union
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 from alphapower.client import (
     AlphaPropertiesPayload,
     MultiSimulationPayload,
     MultiSimulationResultView,
+    PollManager,
     SimulationProgressView,
     SimulationSettingsView,
     SingleSimulationPayload,
     SingleSimulationResultView,
     WorldQuantClient,
 )
+from alphapower.client import poll_manager as shared_poll_manager
 from alphapower.constants import (
     MAX_CONSULTANT_SIMULATION_SLOTS,
     ROLE_CONSULTANT,
@@ -103,6 +105,43 @@ def build_single_simulation_payload(task: SimulationTask) -> SingleSimulationPay
     return payload
 
 
+def build_multi_simulation_payload(
+    tasks: List[SimulationTask],
+) -> MultiSimulationPayload:
+    """获取多个模拟任务的负载数据。
+
+    Args:
+        tasks: 模拟任务列表
+
+    Returns:
+        MultiSimulationPayload: 由各任务的单个模拟负载数据组成的多个模拟负载数据
+    """
+    return MultiSimulationPayload(
+        root=[build_single_simulation_payload(task) for task in tasks]
+    )
+
+
+class _PreparedBatch:
+    """
+    已准备好的一批任务：已从调度器取出、在数据库中标记为已调度，并构建好负载数据。
+
+    槽位在当前批次轮询期间准备下一批，当前批次结束后直接提交，
+    调度器与数据库的往返不在提交路径上。
+    """
+
+    __slots__ = ("tasks", "single_payload", "multi_payload")
+
+    def __init__(
+        self,
+        tasks: List[SimulationTask],
+        single_payload: Optional[SingleSimulationPayload] = None,
+        multi_payload: Optional[MultiSimulationPayload] = None,
+    ) -> None:
+        self.tasks: List[SimulationTask] = tasks
+        self.single_payload: Optional[SingleSimulationPayload] = single_payload
+        self.multi_payload: Optional[MultiSimulationPayload] = multi_payload
+
+
 class Worker(AbstractWorker):
     """工作者类，用于执行模拟任务。
 
@@ -118,13 +157,27 @@ class Worker(AbstractWorker):
         _shutdown_flag: 工作者是否已关闭的标志
         _is_task_cancel_requested: 是否请求取消任务的标志
         _user_role: 用户角色，决定了工作者可以执行的任务类型
+        _poll_manager: 模拟进度的轮询管理器，多个工作者共享轮询配额
+        _concurrency: 同时在途的模拟数量 (槽位数)，每个槽位独立调度、创建并轮询
+            一个模拟 (单个或多个)，空出后立即补位
+        _current_tasks: 每个槽位当前处理的任务列表
     """
 
-    def __init__(self, client: WorldQuantClient, dry_run: bool = False) -> None:
+    def __init__(
+        self,
+        client: WorldQuantClient,
+        dry_run: bool = False,
+        poll_manager: Optional[PollManager] = None,
+        concurrency: int = 1,
+    ) -> None:
         """初始化工作者实例。
 
         Args:
             client: WorldQuant 客户端实例，用于与服务端通信
+            dry_run: 是否只模拟任务执行而不请求平台
+            poll_manager: 模拟进度的轮询管理器，为 None 时使用共享的轮询管理器
+            concurrency: 同时在途的模拟数量，多个槽位共享同一个客户端，
+                用于占满账户的并发上限而无需创建多个工作者
 
         Raises:
             ValueError: 当客户端不是WorldQuantClient实例、未授权或没有有效角色时
@@ -151,14 +204,42 @@ class Worker(AbstractWorker):
         self._run_lock: asyncio.Lock = asyncio.Lock()
         self._is_task_cancel_requested: bool = False
         self._dry_run: bool = dry_run
-        self._current_tasks: List[SimulationTask] = []
+        self._concurrency: int = max(1, concurrency)
+        self._current_tasks: Dict[int, List[SimulationTask]] = {}
         self._user_role: UserRole = UserRole.DEFAULT
+        self._poll_manager: PollManager = poll_manager or shared_poll_manager
 
         if not isinstance(self._client, WorldQuantClient):
             raise ValueError("Client must be an instance of WorldQuantClient.")
 
+    async def _write_back_tasks(
+        self, tasks: List[SimulationTask]
+    ) -> List[SimulationTask]:
+        """以租约为写屏障写回任务状态与结果。
+
+        任务的租约过期后可能已被其他工作者重新认领，此时放弃写入，
+        避免过期的任务对象覆盖其他工作者的状态与结果。
+
+        Args:
+            tasks: 需要写回的任务列表
+
+        Returns:
+            List[SimulationTask]: 租约已丢失、未被写入的任务列表
+        """
+        async with get_db_session(Database.SIMULATION) as session:
+            dal: SimulationTaskDAL = SimulationTaskDAL(session)
+            lost: List[SimulationTask] = await dal.update_all_if_leased(tasks)
+            await session.commit()
+        if lost:
+            await logger.awarning(
+                event="任务租约已丢失，结果不再写回",
+                emoji="⛔",
+                task_ids=[t.id for t in lost],
+            )
+        return lost
+
     async def _cancel_task_if_possible(
-        self, progress_id: str, tasks: List[SimulationTask]
+        self, progress_id: str, tasks: List[SimulationTask], force: bool = False
     ) -> bool:
         """尝试取消任务。
 
@@ -167,6 +248,8 @@ class Worker(AbstractWorker):
         Args:
             progress_id: 要取消的任务进度 ID
             tasks: 与此进度 ID 关联的任务列表
+            force: 为 True 时不论工作者是否关闭都取消，用于释放已失去租约的任务
+                占用的平台模拟名额
 
         Returns:
             bool: 如果成功取消则返回 True，否则返回 False
@@ -177,14 +260,16 @@ class Worker(AbstractWorker):
             progress_id=progress_id,
             shutdown=self._shutdown_flag,
             cancel_tasks=self._is_task_cancel_requested,
+            force=force,
             task_count=len(tasks),
         )
-        # 仅在工作者关闭且明确请求取消任务时执行取消操作
-        if self._shutdown_flag and self._is_task_cancel_requested:
+        # 仅在工作者关闭且明确请求取消任务，或强制取消时执行取消操作
+        if force or (self._shutdown_flag and self._is_task_cancel_requested):
             await logger.ainfo(
-                event="工作者已关闭，尝试取消任务",
+                event="尝试取消任务",
                 emoji="🚫",
                 progress_id=progress_id,
+                force=force,
                 task_count=len(tasks),
             )
 
@@ -198,12 +283,9 @@ class Worker(AbstractWorker):
                     progress_id=progress_id,
                 )
 
-                async with get_db_session(Database.SIMULATION) as session:
-                    dal: SimulationTaskDAL = SimulationTaskDAL(session)
-                    for task in tasks:
-                        task.status = SimulationTaskStatus.CANCELLED
-                    await dal.update_all(tasks)
-                    await session.commit()
+                for task in tasks:
+                    task.status = SimulationTaskStatus.CANCELLED
+                if not await self._write_back_tasks(tasks):
                     await logger.ainfo(
                         event="数据库中任务状态更新为已取消",
                         emoji="💾",
@@ -261,17 +343,16 @@ class Worker(AbstractWorker):
         if task.status == SimulationTaskStatus.COMPLETE:
             task.alpha_id = result.alpha
 
-        async with get_db_session(Database.SIMULATION) as session:
-            dal: SimulationTaskDAL = SimulationTaskDAL(session)
-            await dal.update(task)
-            await session.commit()
-            await logger.ainfo(
-                event="数据库中任务状态更新成功",
-                emoji="💾",
-                task_id=task.id,
-                new_status=task.status.value,
-            )
-            # 因为这里数据更新是个很低频的操作，每次都提交事务即可
+        # 因为这里数据更新是个很低频的操作，每次都提交事务即可
+        if await self._write_back_tasks([task]):
+            # 租约已丢失，任务会由新的持有者重新执行，不再处理结果
+            return
+        await logger.ainfo(
+            event="数据库中任务状态更新成功",
+            emoji="💾",
+            task_id=task.id,
+            new_status=task.status.value,
+        )
 
         # 更新完成的因子标签
         if task.status == SimulationTaskStatus.COMPLETE and task.alpha_id:
@@ -410,7 +491,11 @@ class Worker(AbstractWorker):
             task_name=self._heartbeat_task.get_name(),
         )
 
-    async def _process_single_simulation_task(self, task: SimulationTask) -> None:
+    async def _process_single_simulation_task(
+        self,
+        task: SimulationTask,
+        payload: Optional[SingleSimulationPayload] = None,
+    ) -> None:
         """处理单个模拟任务。
 
         创建并监控单个模拟任务的执行过程，包括创建任务、检查进度和处理结果。
@@ -418,6 +503,7 @@ class Worker(AbstractWorker):
 
         Args:
             task: 要处理的模拟任务对象
+            payload: 预先构建的负载数据，为 None 时根据任务构建
         """
         await logger.ainfo(
             event="开始处理单个模拟任务",
@@ -452,7 +538,8 @@ class Worker(AbstractWorker):
             return
 
         # 构建任务负载数据
-        payload = build_single_simulation_payload(task)
+        if payload is None:
+            payload = build_single_simulation_payload(task)
 
         async with self._client:
             progress_id: Optional[str] = None  # 初始化 progress_id
@@ -478,10 +565,7 @@ class Worker(AbstractWorker):
                     # 可以考虑更新任务状态为失败
                     task.status = SimulationTaskStatus.ERROR
                     task.completed_at = datetime.now()
-                    async with get_db_session(Database.SIMULATION) as session:
-                        dal: SimulationTaskDAL = SimulationTaskDAL(session)
-                        await dal.update(task)
-                        await session.commit()
+                    await self._write_back_tasks([task])
                     return
 
                 await logger.ainfo(
@@ -497,23 +581,33 @@ class Worker(AbstractWorker):
                 task.parent_progress_id = (
                     progress_id  # 单任务也用 parent_progress_id 存储
                 )
-                async with get_db_session(Database.SIMULATION) as session:
-                    dal = SimulationTaskDAL(session)
-                    await dal.update(task)
-                    await session.commit()
-                    await logger.ainfo(
-                        event="数据库中任务状态更新为运行中",
-                        emoji="💾",
+                if await self._write_back_tasks([task]):
+                    # 租约已被回收，任务由其他工作者持有，不再跟踪其进度与结果
+                    await logger.awarning(
+                        event="任务租约已丢失，取消平台模拟并停止处理",
+                        emoji="⛔",
                         task_id=task.id,
                         progress_id=progress_id,
                     )
+                    await self._cancel_task_if_possible(
+                        progress_id, tasks=[task], force=True
+                    )
+                    return
+                await logger.ainfo(
+                    event="数据库中任务状态更新为运行中",
+                    emoji="💾",
+                    task_id=task.id,
+                    progress_id=progress_id,
+                )
 
-                # 等待指定时间后开始检查进度
-                await asyncio.sleep(retry_after)
-
-                # 循环检查任务进度直到完成
+                # 由轮询管理器在等待指定时间后开始检查进度，直到任务完成或被取消
                 prev_progress: float = -1.0  # 初始化为-1，确保第一次进度会被记录
-                while True:
+
+                async def poll_progress() -> (
+                    Tuple[bool, Optional[float], Optional[SingleSimulationResultView]]
+                ):
+                    nonlocal prev_progress
+                    assert progress_id is not None
                     #! 4. 心跳检查
                     await self._heartbeat(name=f"single_task_poll_{task.id}")
                     await logger.adebug(
@@ -529,7 +623,7 @@ class Worker(AbstractWorker):
                             task_id=task.id,
                             progress_id=progress_id,
                         )
-                        break  # 任务已取消，退出循环
+                        return True, None, None  # 任务已取消，结束轮询
 
                     finished, progress_or_result, retry_after = (
                         await self._client.simulation_get_progress_single(
@@ -539,27 +633,19 @@ class Worker(AbstractWorker):
 
                     if finished:
                         if isinstance(progress_or_result, SingleSimulationResultView):
-                            await logger.ainfo(
-                                event="单个模拟任务完成",
-                                emoji="🏁",
-                                task_id=task.id,
-                                progress_id=progress_id,
-                                result_status=progress_or_result.status,
-                            )
-                            await self._handle_task_completion(task, progress_or_result)
-                        else:
-                            # finished 为 True 但结果类型不匹配，记录错误
-                            await logger.aerror(
-                                event="任务完成但结果类型不匹配",
-                                emoji="❓",
-                                task_id=task.id,
-                                progress_id=progress_id,
-                                expected_type="SingleSimulationResultView",
-                                received_type=type(progress_or_result).__name__,
-                                received_value=progress_or_result,
-                            )
-                            # 可以在这里将任务标记为错误状态
-                        break  # 任务完成，退出循环
+                            return True, None, progress_or_result
+                        # finished 为 True 但结果类型不匹配，记录错误
+                        await logger.aerror(
+                            event="任务完成但结果类型不匹配",
+                            emoji="❓",
+                            task_id=task.id,
+                            progress_id=progress_id,
+                            expected_type="SingleSimulationResultView",
+                            received_type=type(progress_or_result).__name__,
+                            received_value=progress_or_result,
+                        )
+                        # 可以在这里将任务标记为错误状态
+                        return True, None, None
                     elif isinstance(progress_or_result, SimulationProgressView):
                         progress: float = progress_or_result.progress
                         if abs(progress - prev_progress) > 1e-6:  # 比较浮点数
@@ -601,7 +687,22 @@ class Worker(AbstractWorker):
                         progress_id=progress_id,
                         retry_after=f"{retry_after}s",
                     )
-                    await asyncio.sleep(retry_after)
+                    return False, retry_after, None
+
+                result: Optional[SingleSimulationResultView] = (
+                    await self._poll_manager.poll(
+                        poll_progress, initial_delay=retry_after, key=progress_id
+                    )
+                )
+                if result is not None:
+                    await logger.ainfo(
+                        event="单个模拟任务完成",
+                        emoji="🏁",
+                        task_id=task.id,
+                        progress_id=progress_id,
+                        result_status=result.status,
+                    )
+                    await self._handle_task_completion(task, result)
             except Exception:
                 # 记录异常信息，确保异常不会中断工作者主循环
                 await logger.aexception(
@@ -613,10 +714,7 @@ class Worker(AbstractWorker):
                 # 可以在这里将任务标记为错误状态
                 task.status = SimulationTaskStatus.ERROR
                 task.completed_at = datetime.now()
-                async with get_db_session(Database.SIMULATION) as session:
-                    dal = SimulationTaskDAL(session)
-                    await dal.update(task)
-                    await session.commit()
+                await self._write_back_tasks([task])
             finally:
                 await logger.ainfo(
                     event="单个模拟任务处理结束",
@@ -626,7 +724,10 @@ class Worker(AbstractWorker):
                 )
 
     async def _handle_multi_task_completion(
-        self, tasks: List[SimulationTask], result: MultiSimulationResultView
+        self,
+        tasks: List[SimulationTask],
+        result: MultiSimulationResultView,
+        lost_tasks: Optional[List[SimulationTask]] = None,
     ) -> None:
         """处理完成多个模拟任务后的逻辑。
 
@@ -635,6 +736,7 @@ class Worker(AbstractWorker):
         Args:
             tasks: 模拟任务列表
             result: 多个模拟任务的结果，包含子任务ID信息
+            lost_tasks: 已失去租约的任务，与子任务一一对应但不处理其结果
         """
         parent_progress_id = tasks[0].parent_progress_id if tasks else None
         task_ids = [t.id for t in tasks]
@@ -705,10 +807,7 @@ class Worker(AbstractWorker):
                         # 标记任务为错误状态
                         task.status = SimulationTaskStatus.ERROR
                         task.completed_at = datetime.now()
-                        async with get_db_session(Database.SIMULATION) as session:
-                            dal: SimulationTaskDAL = SimulationTaskDAL(session)
-                            await dal.update(task)
-                            await session.commit()
+                        await self._write_back_tasks([task])
                         return
 
                     await logger.ainfo(
@@ -730,10 +829,7 @@ class Worker(AbstractWorker):
                     # 标记任务为错误状态
                     task.status = SimulationTaskStatus.ERROR
                     task.completed_at = datetime.now()
-                    async with get_db_session(Database.SIMULATION) as session:
-                        dal = SimulationTaskDAL(session)
-                        await dal.update(task)
-                        await session.commit()
+                    await self._write_back_tasks([task])
                 finally:
                     await logger.adebug(
                         event="单个子任务处理结束",
@@ -771,6 +867,7 @@ class Worker(AbstractWorker):
                 for task, child_id in zip(
                     tasks, result.children
                 )  # 使用 zip 保证一一对应
+                if not lost_tasks or task not in lost_tasks
             ]
             self._post_handler_futures.extend(new_futures)
             await logger.adebug(
@@ -781,7 +878,11 @@ class Worker(AbstractWorker):
                 total_future_count=len(self._post_handler_futures),
             )
 
-    async def _process_multi_simulation_task(self, tasks: List[SimulationTask]) -> None:
+    async def _process_multi_simulation_task(
+        self,
+        tasks: List[SimulationTask],
+        payload: Optional[MultiSimulationPayload] = None,
+    ) -> None:
         """处理多个模拟任务的方法。
 
         创建并监控多个模拟任务的集合，适用于顾问角色用户。该方法会验证用户权限、
@@ -789,6 +890,7 @@ class Worker(AbstractWorker):
 
         Args:
             tasks: 模拟任务列表
+            payload: 预先构建的负载数据，为 None 时根据任务构建
         """
         task_ids: List[int] = [task.id for task in tasks]
         await logger.ainfo(
@@ -848,12 +950,8 @@ class Worker(AbstractWorker):
             await self._handle_multi_task_completion(tasks, mock_result)
             return
 
-        single_simu_payloads: List[SingleSimulationPayload] = [
-            build_single_simulation_payload(task) for task in tasks
-        ]
-        payload: MultiSimulationPayload = MultiSimulationPayload(
-            root=single_simu_payloads
-        )
+        if payload is None:
+            payload = build_multi_simulation_payload(tasks)
 
         async with self._client:
             progress_id: Optional[str] = None
@@ -875,13 +973,10 @@ class Worker(AbstractWorker):
                         progress_id=progress_id,
                     )
                     # 标记任务失败
-                    async with get_db_session(Database.SIMULATION) as session:
-                        dal: SimulationTaskDAL = SimulationTaskDAL(session)
-                        for task in tasks:
-                            task.status = SimulationTaskStatus.ERROR
-                            task.completed_at = datetime.now()
-                        await dal.update_all(tasks)
-                        await session.commit()
+                    for task in tasks:
+                        task.status = SimulationTaskStatus.ERROR
+                        task.completed_at = datetime.now()
+                    await self._write_back_tasks(tasks)
                     return
 
                 await logger.ainfo(
@@ -893,24 +988,39 @@ class Worker(AbstractWorker):
                 )
 
                 # 更新任务状态为运行中，并保存父进度 ID
-                async with get_db_session(Database.SIMULATION) as session:
-                    dal = SimulationTaskDAL(session)
-                    for task in tasks:
-                        task.status = SimulationTaskStatus.RUNNING
-                        task.parent_progress_id = progress_id
-                    await dal.update_all(tasks)
-                    await session.commit()
-                    await logger.ainfo(
-                        event="数据库中多个任务状态更新为运行中",
-                        emoji="💾",
+                for task in tasks:
+                    task.status = SimulationTaskStatus.RUNNING
+                    task.parent_progress_id = progress_id
+                lost: List[SimulationTask] = await self._write_back_tasks(tasks)
+                if lost and len(lost) == len(tasks):
+                    # 全部任务的租约都已被回收，取消平台模拟释放名额
+                    await logger.awarning(
+                        event="多个任务租约均已丢失，取消平台模拟并停止处理",
+                        emoji="⛔",
                         task_ids=task_ids,
                         progress_id=progress_id,
                     )
-
-                await asyncio.sleep(retry_after)
+                    await self._cancel_task_if_possible(
+                        progress_id, tasks=tasks, force=True
+                    )
+                    return
+                await logger.ainfo(
+                    event="数据库中多个任务状态更新为运行中",
+                    emoji="💾",
+                    task_ids=[t.id for t in tasks if t not in lost],
+                    lost_task_ids=[t.id for t in lost],
+                    progress_id=progress_id,
+                )
 
                 prev_progress: float = -1.0
-                while True:
+                # 任务结果类型不匹配时需要将任务标记为失败
+                result_mismatch: bool = False
+
+                async def poll_progress() -> (
+                    Tuple[bool, Optional[float], Optional[MultiSimulationResultView]]
+                ):
+                    nonlocal prev_progress, result_mismatch
+                    assert progress_id is not None
                     #! 5. 心跳检查
                     await self._heartbeat(name=f"multi_task_poll_{progress_id}")
                     await logger.adebug(
@@ -926,7 +1036,7 @@ class Worker(AbstractWorker):
                             task_ids=task_ids,
                             progress_id=progress_id,
                         )
-                        break  # 任务已取消，退出循环
+                        return True, None, None  # 任务已取消，结束轮询
 
                     finished, progress_or_result, retry_after = (
                         await self._client.simulation_get_progress_multi(
@@ -936,35 +1046,18 @@ class Worker(AbstractWorker):
 
                     if finished:
                         if isinstance(progress_or_result, MultiSimulationResultView):
-                            await logger.ainfo(
-                                event="多个模拟任务集合完成",
-                                emoji="🏁",
-                                task_ids=task_ids,
-                                progress_id=progress_id,
-                                result_status=progress_or_result.status,
-                            )
-                            await self._handle_multi_task_completion(
-                                tasks, progress_or_result
-                            )
-                        else:
-                            await logger.aerror(
-                                event="多个任务完成但结果类型不匹配",
-                                emoji="❓",
-                                task_ids=task_ids,
-                                progress_id=progress_id,
-                                expected_type="MultiSimulationResultView",
-                                received_type=type(progress_or_result).__name__,
-                                received_value=progress_or_result,
-                            )
-                            # 标记任务失败
-                            async with get_db_session(Database.SIMULATION) as session:
-                                dal = SimulationTaskDAL(session)
-                                for task in tasks:
-                                    task.status = SimulationTaskStatus.ERROR
-                                    task.completed_at = datetime.now()
-                                await dal.update_all(tasks)
-                                await session.commit()
-                        break  # 任务完成，退出循环
+                            return True, None, progress_or_result
+                        await logger.aerror(
+                            event="多个任务完成但结果类型不匹配",
+                            emoji="❓",
+                            task_ids=task_ids,
+                            progress_id=progress_id,
+                            expected_type="MultiSimulationResultView",
+                            received_type=type(progress_or_result).__name__,
+                            received_value=progress_or_result,
+                        )
+                        result_mismatch = True
+                        return True, None, None
 
                     elif isinstance(progress_or_result, SimulationProgressView):
                         progress: float = progress_or_result.progress
@@ -1004,7 +1097,31 @@ class Worker(AbstractWorker):
                         progress_id=progress_id,
                         retry_after=f"{retry_after}s",
                     )
-                    await asyncio.sleep(retry_after)
+                    return False, retry_after, None
+
+                result: Optional[MultiSimulationResultView] = (
+                    await self._poll_manager.poll(
+                        poll_progress, initial_delay=retry_after, key=progress_id
+                    )
+                )
+                if result is not None:
+                    await logger.ainfo(
+                        event="多个模拟任务集合完成",
+                        emoji="🏁",
+                        task_ids=task_ids,
+                        progress_id=progress_id,
+                        result_status=result.status,
+                    )
+                    # 失去租约的任务仍占据子任务的位置，但不再处理其结果
+                    await self._handle_multi_task_completion(
+                        tasks, result, lost_tasks=lost
+                    )
+                elif result_mismatch:
+                    # 标记任务失败
+                    for task in tasks:
+                        task.status = SimulationTaskStatus.ERROR
+                        task.completed_at = datetime.now()
+                    await self._write_back_tasks(tasks)
             except Exception:
                 await logger.aexception(
                     event="处理多个模拟任务时发生异常",
@@ -1013,167 +1130,308 @@ class Worker(AbstractWorker):
                     progress_id=progress_id,
                 )
                 # 标记任务失败
-                async with get_db_session(Database.SIMULATION) as session:
-                    dal = SimulationTaskDAL(session)
-                    for task in tasks:
-                        task.status = SimulationTaskStatus.ERROR
-                        task.completed_at = datetime.now()
-                    await dal.update_all(tasks)
-                    await session.commit()
+                for task in tasks:
+                    task.status = SimulationTaskStatus.ERROR
+                    task.completed_at = datetime.now()
+                await self._write_back_tasks(tasks)
             finally:
-                final_statuses = {t.id: t.status.value for t in tasks}
                 await logger.ainfo(
                     event="多个模拟任务处理结束",
                     emoji="🔚",
                     task_ids=task_ids,
                     progress_id=progress_id,
-                    final_statuses=final_statuses,
+                    final_statuses={t.id: t.status.value for t in tasks},
                 )
 
     async def _do_work(self) -> None:
         """执行工作的主循环方法。
 
-        不断从调度器获取任务并根据用户角色执行单个或多个模拟任务，
-        直到工作者被关闭。
+        启动 concurrency 个槽位，每个槽位不断从调度器获取任务并根据用户角色
+        执行单个或多个模拟任务，直到工作者被关闭。任一槽位异常退出时取消其余槽位。
 
         Raises:
             Exception: 当调度器未设置时
             ValueError: 当遇到未知用户角色时
         """
-        await logger.ainfo(event="工作者开始执行工作循环", emoji="🔄")
+        await logger.ainfo(
+            event="工作者开始执行工作循环",
+            emoji="🔄",
+            concurrency=self._concurrency,
+        )
         #! 2. 心跳检查
         await self._heartbeat(name="_do_work_start")
-        while not self._shutdown_flag:
-            await logger.adebug(event="开始新的工作循环迭代", emoji="➡️")
-            # 验证调度器是否已设置
-            if self._scheduler is None:
-                await logger.acritical(
-                    event="调度器未设置，工作者无法继续执行",
-                    emoji="🚨",
+        slots: List[asyncio.Task[None]] = [
+            asyncio.create_task(self._work_slot(slot), name=f"worker-slot-{slot}")
+            for slot in range(self._concurrency)
+        ]
+        try:
+            await asyncio.gather(*slots)
+        finally:
+            for slot_task in slots:
+                if not slot_task.done():
+                    slot_task.cancel()
+            await asyncio.gather(*slots, return_exceptions=True)
+            self._current_tasks.clear()
+
+        await logger.ainfo(event="工作者工作循环正常结束", emoji="🚪")
+
+    async def _work_slot(self, slot: int) -> None:
+        """单个槽位的工作循环。
+
+        当前批次提交后立即在后台准备下一批任务，当前批次结束时直接提交已准备好的
+        批次补位，直到工作者被关闭。
+
+        Args:
+            slot: 槽位编号
+
+        Raises:
+            Exception: 当调度器未设置时
+            ValueError: 当遇到未知用户角色时
+        """
+        next_batch: Optional[asyncio.Task[Optional[_PreparedBatch]]] = None
+        try:
+            while not self._shutdown_flag:
+                await logger.adebug(event="开始新的工作循环迭代", emoji="➡️", slot=slot)
+                prefetched: bool = next_batch is not None
+                if next_batch is None:
+                    next_batch = asyncio.create_task(
+                        self._prepare_batch(slot), name=f"worker-prepare-{slot}"
+                    )
+                batch: Optional[_PreparedBatch] = await next_batch
+                next_batch = None
+
+                if batch is None:
+                    continue  # 获取任务失败，已等待，继续下一次循环
+
+                # 如果没有可用任务（包括预取时没有任务），等待后重试，避免调度器
+                # 持续返回空批次时空转
+                tasks: List[SimulationTask] = batch.tasks
+                if not tasks:
+                    await logger.ainfo(
+                        event="调度器未返回任务，等待重试",
+                        emoji="⏳",
+                        slot=slot,
+                        retry_delay=5,
+                    )
+                    self._current_tasks.pop(slot, None)  # 清空当前槽位的任务列表
+                    await asyncio.sleep(5)
+                    continue  # 继续下一次循环
+
+                self._current_tasks[slot] = tasks  # 保存当前槽位处理的任务列表
+                await logger.ainfo(
+                    event="开始处理调度到的任务",
+                    emoji="⚙️",
+                    slot=slot,
+                    prefetched=prefetched,
+                    task_count=len(tasks),
+                    task_ids=[t.id for t in tasks],
                 )
-                # 抛出异常会导致工作者停止，符合 CRITICAL 级别定义
-                raise Exception("调度器未设置，无法执行工作")
-
-            # 根据用户角色确定任务批量大小
-            scheduled_task_count: int = (
-                MAX_CONSULTANT_SIMULATION_SLOTS
-                if self._user_role == UserRole.CONSULTANT
-                else 1
+
+                #! 3. 心跳检查
+                await self._heartbeat(name=f"_do_work_before_process_{slot}")
+
+                # 当前批次执行期间准备下一批任务
+                if not self._shutdown_flag:
+                    next_batch = asyncio.create_task(
+                        self._prepare_batch(slot), name=f"worker-prepare-{slot}"
+                    )
+
+                # 根据用户角色执行不同的任务处理逻辑
+                try:
+                    if self._user_role == UserRole.USER:
+                        if len(tasks) != 1:
+                            await logger.aerror(
+                                event="用户角色调度到多个任务",
+                                emoji="❗",
+                                user_role=self._user_role.value,
+                                task_count=len(tasks),
+                                task_ids=[t.id for t in tasks],
+                            )
+                            # 处理第一个任务，或标记全部错误
+                        await self._process_single_simulation_task(
+                            tasks[0], batch.single_payload
+                        )
+                    elif self._user_role == UserRole.CONSULTANT:
+                        await self._process_multi_simulation_task(
+                            tasks, batch.multi_payload
+                        )
+                    else:
+                        # 这是一个严重错误，因为角色应该在启动时验证
+                        await logger.acritical(
+                            event="遇到未知用户角色，无法处理任务",
+                            emoji="🚨",
+                            user_role=self._user_role,
+                            task_ids=[t.id for t in tasks],
+                        )
+                        # 抛出异常停止工作者
+                        raise ValueError(
+                            f"未知用户角色 {self._user_role}，无法处理任务"
+                        )
+                except Exception:
+                    # 捕获任务处理过程中未被捕获的异常
+                    await logger.aexception(
+                        event="任务处理过程中发生未捕获异常",
+                        emoji="💥",
+                        user_role=self._user_role.value,
+                        task_ids=[t.id for t in tasks],
+                    )
+                    # 异常已记录，循环继续
+
+                self._release_tasks(tasks)
+                self._current_tasks.pop(slot, None)  # 清空当前槽位处理的任务列表
+                await logger.adebug(event="当前批次任务处理完成", emoji="🏁", slot=slot)
+        finally:
+            if next_batch is not None:
+                await self._return_prepared_batch(next_batch, slot)
+
+    async def _prepare_batch(self, slot: int) -> Optional[_PreparedBatch]:
+        """从调度器获取下一批任务，在数据库中标记为已调度，并构建负载数据。
+
+        Args:
+            slot: 槽位编号
+
+        Returns:
+            准备好的批次，调度器没有任务时批次为空；获取任务失败时等待后返回 None
+
+        Raises:
+            Exception: 当调度器未设置时
+        """
+        # 验证调度器是否已设置
+        if self._scheduler is None:
+            await logger.acritical(
+                event="调度器未设置，工作者无法继续执行",
+                emoji="🚨",
+            )
+            # 抛出异常会导致工作者停止，符合 CRITICAL 级别定义
+            raise Exception("调度器未设置，无法执行工作")
+
+        # 根据用户角色确定任务批量大小
+        scheduled_task_count: int = (
+            MAX_CONSULTANT_SIMULATION_SLOTS
+            if self._user_role == UserRole.CONSULTANT
+            else 1
+        )
+        await logger.adebug(
+            event="确定调度任务数量",
+            emoji="🔢",
+            user_role=self._user_role.value,
+            batch_size=scheduled_task_count,
+        )
+
+        # 从调度器获取任务
+        try:
+            await logger.adebug(event="尝试从调度器获取任务", emoji="📥")
+            tasks: List[SimulationTask] = await self._scheduler.schedule(
+                batch_size=scheduled_task_count
             )
             await logger.adebug(
-                event="确定调度任务数量",
-                emoji="🔢",
-                user_role=self._user_role.value,
+                event="从调度器获取任务成功",
+                emoji="✅",
+                slot=slot,
+                task_count=len(tasks),
+                task_ids=[t.id for t in tasks],
+            )
+        except Exception:
+            await logger.aexception(
+                event="从调度器获取任务时发生异常",
+                emoji="💥",
                 batch_size=scheduled_task_count,
             )
+            await asyncio.sleep(5)  # 发生异常时等待一段时间再重试
+            return None
 
-            # 从调度器获取任务
-            try:
-                await logger.adebug(event="尝试从调度器获取任务", emoji="📥")
-                tasks: List[SimulationTask] = await self._scheduler.schedule(
-                    batch_size=scheduled_task_count
-                )
-                self._current_tasks = tasks  # 保存当前处理的任务列表
-                await logger.adebug(
-                    event="从调度器获取任务成功",
-                    emoji="✅",
-                    task_count=len(tasks),
-                    task_ids=[t.id for t in tasks],
-                )
-            except Exception:
-                await logger.aexception(
-                    event="从调度器获取任务时发生异常",
-                    emoji="💥",
-                    batch_size=scheduled_task_count,
-                )
-                await asyncio.sleep(5)  # 发生异常时等待一段时间再重试
-                continue  # 继续下一次循环
+        if not tasks:
+            return _PreparedBatch(tasks)
 
-            # 如果没有可用任务，等待后重试
-            if not tasks:
-                await logger.ainfo(
-                    event="调度器未返回任务，等待重试",
-                    emoji="⏳",
-                    retry_delay=5,
-                )
-                self._current_tasks = []  # 清空当前任务列表
-                await asyncio.sleep(5)
-                continue  # 继续下一次循环
-
-            # 更新任务状态为已调度
+        # 通过租约认领的任务在认领时已标记为已调度，只为其余任务补写调度状态
+        unscheduled: List[SimulationTask] = [
+            task
+            for task in tasks
+            if task.status != SimulationTaskStatus.SCHEDULED or task.lease_owner is None
+        ]
+        if unscheduled:
             try:
-                async with get_db_session(Database.SIMULATION) as session:
-                    dal: SimulationTaskDAL = SimulationTaskDAL(session)
-                    now = datetime.now()
-                    for task in tasks:
-                        task.scheduled_at = now
-                        task.status = SimulationTaskStatus.SCHEDULED
-                    await dal.update_all(tasks)
-                    await session.commit()
+                now = datetime.now()
+                for task in unscheduled:
+                    task.scheduled_at = now
+                    task.status = SimulationTaskStatus.SCHEDULED
+                lost: List[SimulationTask] = await self._write_back_tasks(unscheduled)
                 await logger.ainfo(
                     event="数据库中任务状态更新为已调度",
                     emoji="💾",
-                    task_ids=[t.id for t in tasks],
+                    task_ids=[t.id for t in unscheduled if t not in lost],
                 )
+                # 失去租约的任务已由其他工作者持有，不再执行
+                tasks = [task for task in tasks if task not in lost]
+                self._release_tasks(lost)
             except Exception:
                 await logger.aexception(
                     event="更新任务状态为已调度时数据库操作失败",
                     emoji="❌",
-                    task_ids=[t.id for t in tasks],
+                    task_ids=[t.id for t in unscheduled],
                 )
                 # 数据库更新失败，可能需要重试或将任务放回队列
                 # 此处选择继续处理，但记录错误
                 # 可以考虑将任务状态回滚或标记为错误
+            if not tasks:
+                return _PreparedBatch(tasks)
 
-            await logger.ainfo(
-                event="开始处理调度到的任务",
-                emoji="⚙️",
-                task_count=len(tasks),
+        # 构建负载数据，dry-run 模式下不请求平台，无需构建
+        if self._dry_run:
+            return _PreparedBatch(tasks)
+        try:
+            if self._user_role == UserRole.USER:
+                return _PreparedBatch(
+                    tasks, single_payload=build_single_simulation_payload(tasks[0])
+                )
+            if self._user_role == UserRole.CONSULTANT:
+                return _PreparedBatch(
+                    tasks, multi_payload=build_multi_simulation_payload(tasks)
+                )
+        except Exception:
+            # 负载数据构建失败时留待处理任务时重新构建并记录错误
+            await logger.aexception(
+                event="预先构建负载数据失败",
+                emoji="❌",
                 task_ids=[t.id for t in tasks],
             )
+        return _PreparedBatch(tasks)
 
-            #! 3. 心跳检查
-            await self._heartbeat(name="_do_work_before_process")
+    def _release_tasks(self, tasks: List[SimulationTask]) -> None:
+        """通知调度器任务已执行结束或不再执行，不会再被放回。
 
-            # 根据用户角色执行不同的任务处理逻辑
-            try:
-                if self._user_role == UserRole.USER:
-                    if len(tasks) != 1:
-                        await logger.aerror(
-                            event="用户角色调度到多个任务",
-                            emoji="❗",
-                            user_role=self._user_role.value,
-                            task_count=len(tasks),
-                            task_ids=[t.id for t in tasks],
-                        )
-                        # 处理第一个任务，或标记全部错误
-                    await self._process_single_simulation_task(tasks[0])
-                elif self._user_role == UserRole.CONSULTANT:
-                    await self._process_multi_simulation_task(tasks)
-                else:
-                    # 这是一个严重错误，因为角色应该在启动时验证
-                    await logger.acritical(
-                        event="遇到未知用户角色，无法处理任务",
-                        emoji="🚨",
-                        user_role=self._user_role,
-                        task_ids=[t.id for t in tasks],
-                    )
-                    # 抛出异常停止工作者
-                    raise ValueError(f"未知用户角色 {self._user_role}，无法处理任务")
-            except Exception:
-                # 捕获任务处理过程中未被捕获的异常
-                await logger.aexception(
-                    event="任务处理过程中发生未捕获异常",
-                    emoji="💥",
-                    user_role=self._user_role.value,
-                    task_ids=[t.id for t in tasks],
-                )
-                # 异常已记录，循环继续
+        Args:
+            tasks: 执行结束的任务列表
+        """
+        if self._scheduler is not None and tasks:
+            self._scheduler.release_tasks(tasks)
 
-            self._current_tasks = []  # 清空当前处理的任务列表
-            await logger.adebug(event="当前批次任务处理完成", emoji="🏁")
+    async def _return_prepared_batch(
+        self, next_batch: asyncio.Task[Optional[_PreparedBatch]], slot: int
+    ) -> None:
+        """槽位退出时处理尚未提交的预取批次，把已取出的任务放回调度器。
 
-        await logger.ainfo(event="工作者工作循环正常结束", emoji="🚪")
+        准备中的批次可能已经从调度器取出任务，取消会丢失这些任务，因此等待其完成
+        而不是取消。放回的任务沿用调度前的排队位置，不会失去已积累的老化。
+
+        Args:
+            next_batch: 准备下一批任务的异步任务
+            slot: 槽位编号
+        """
+        results: Tuple[Union[Optional[_PreparedBatch], BaseException]] = (
+            await asyncio.gather(next_batch, return_exceptions=True)
+        )
+        batch: Union[Optional[_PreparedBatch], BaseException] = results[0]
+        if not isinstance(batch, _PreparedBatch) or not batch.tasks:
+            return
+        if self._scheduler is not None:
+            self._scheduler.requeue_tasks(batch.tasks)
+        await logger.ainfo(
+            event="预取的任务未处理，已放回调度器",
+            emoji="↩️",
+            slot=slot,
+            task_ids=[t.id for t in batch.tasks],
+        )
 
     async def set_scheduler(self, scheduler: AbstractScheduler) -> None:
         """设置任务调度器。
@@ -1435,10 +1693,10 @@ class Worker(AbstractWorker):
         await logger.adebug(
             event="获取当前正在处理的任务列表",
             emoji="📋",
-            task_count=len(self._current_tasks),
+            task_count=sum(len(tasks) for tasks in self._current_tasks.values()),
         )
-        # 返回列表的副本以防止外部修改内部状态
-        return list(self._current_tasks)
+        # 返回各槽位任务的合并副本以防止外部修改内部状态
+        return [task for tasks in self._current_tasks.values() for task in tasks]
 
     async def add_heartbeat_callback(
         self,
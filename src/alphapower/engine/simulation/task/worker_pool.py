@@ -68,6 +68,7 @@ class WorkerPool(AbstractWorkerPool):
         initial_workers: int = 1,
         dry_run: bool = False,
         worker_timeout: int = 300,  # 工作者健康检查超时时间（秒）
+        worker_concurrency: int = 1,
     ) -> None:
         """
         初始化工作池。
@@ -78,6 +79,7 @@ class WorkerPool(AbstractWorkerPool):
             initial_workers: 初始工作者数量，默认为1
             dry_run: 是否以仿真模式运行，默认为False
             worker_timeout: 工作者健康检查超时时间（秒）
+            worker_concurrency: 每个工作者同时在途的模拟数量，默认为1
         """
         self._scheduler: AbstractScheduler = scheduler
         self._workers: List[AbstractWorker] = []
@@ -89,6 +91,7 @@ class WorkerPool(AbstractWorkerPool):
         self._client_factory: ClientFactory = client_factory
         self._dry_run: bool = dry_run
         self._initial_workers: int = max(1, initial_workers)  # 确保至少有1个工作者
+        self._worker_concurrency: int = max(1, worker_concurrency)
 
         # 工作者健康检查配置
         self._worker_timeout: int = worker_timeout
@@ -117,7 +120,11 @@ class WorkerPool(AbstractWorkerPool):
         try:
             client: WorldQuantClient = self._client_factory()
             await asyncio.sleep(5)
-            worker: Worker = Worker(client, dry_run=self._dry_run)
+            worker: Worker = Worker(
+                client,
+                dry_run=self._dry_run,
+                concurrency=self._worker_concurrency,
+            )
             await worker.set_scheduler(self._scheduler)
             await worker.add_task_complete_callback(self._on_task_completed)
             await worker.add_heartbeat_callback(self._on_worker_heartbeat)
@@ -11,6 +11,7 @@
 __all__ = [
     "Alpha",
     "AlphaBase",
+    "AlphaMetrics",
     "alphas_classifications",
     "alphas_competitions",
     "Category",
@@ -20,10 +21,12 @@ __all__ = [
     "Classification",
     "Competition",
     "Correlation",
+    "CorrelationStatistics",
     "DataBase",
     "DataField",
     "dataset_research_papers",
     "Dataset",
+    "EvaluateLedger",
     "EvaluateRecord",
     "Pyramid",
     "RecordSet",
@@ -47,6 +50,7 @@ from alphapower.settings import settings
 # Alpha 策略相关实体
 from .alphas import (
     Alpha,
+    AlphaMetrics,
 )
 from .alphas import Base as AlphaBase
 from .alphas import (
@@ -72,7 +76,14 @@ from .data import (
     dataset_research_papers,
 )
 from .evaluate import Base as ChecksBase
-from .evaluate import CheckRecord, Correlation, EvaluateRecord, RecordSet
+from .evaluate import (
+    CheckRecord,
+    Correlation,
+    CorrelationStatistics,
+    EvaluateLedger,
+    EvaluateRecord,
+    RecordSet,
+)
 
 # 模拟相关实体
 from .simulation import Base as SimulationBase
@@ -17,6 +17,7 @@ alphas.py
 - Setting: Alpha 设置表。
 - Regular: Alpha 规则表。
 - Alpha: Alpha 主表。
+- AlphaMetrics: Alpha 筛选指标表。
 """
 
 from datetime import datetime
@@ -30,6 +31,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -727,6 +729,58 @@ class Alpha(Base):
             self.tags = current_tags  # type: ignore[method-assign]
 
 
+class AlphaMetrics(Base):
+    """Alpha 筛选指标表，按行存储筛选顾问因子所需的字段。
+
+    筛选条件原先在 Alpha、Setting 与样本内 Sample 三表连接后逐行计算嵌套的
+    CASE 表达式，无法使用索引。该表把这些字段冗余到一行中，由同步因子时的
+    upsert 增量维护，筛选时只需要在带索引的列上做等值和范围比较。
+
+    Attributes:
+        id (int): 主键ID，与 alphas.id 相同。
+        alpha_id (str): 唯一的 Alpha 标识符。
+        type (AlphaType): Alpha 类型。
+        stage (Stage): Alpha 阶段。
+        region (Region): Alpha 应用的市场区域。
+        delay (Delay): 信号延迟时间（单位：天）。
+        sharpe (Optional[float]): 样本内夏普比率。
+        fitness (Optional[float]): 样本内适应度。
+        turnover (Optional[float]): 样本内换手率。
+        returns (Optional[float]): 样本内收益。
+        date_created (datetime): Alpha 创建日期。
+    """
+
+    __tablename__ = "alpha_metrics"
+
+    id: MappedColumn[int] = mapped_column(
+        Integer, ForeignKey("alphas.id"), primary_key=True, autoincrement=False
+    )
+    alpha_id: MappedColumn[str] = mapped_column(
+        String(ALPHA_ID_LENGTH), nullable=False, unique=True
+    )
+    type: MappedColumn[AlphaType] = mapped_column(Enum(AlphaType), nullable=False)
+    stage: MappedColumn[Stage] = mapped_column(Enum(Stage), nullable=False)
+    region: MappedColumn[Region] = mapped_column(Enum(Region), nullable=False)
+    delay: MappedColumn[Delay] = mapped_column(Enum(Delay), nullable=False)
+    sharpe: MappedColumn[Optional[float]] = mapped_column(Float, nullable=True)
+    fitness: MappedColumn[Optional[float]] = mapped_column(Float, nullable=True)
+    turnover: MappedColumn[Optional[float]] = mapped_column(Float, nullable=True)
+    returns: MappedColumn[Optional[float]] = mapped_column(Float, nullable=True)
+    date_created: MappedColumn[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # 支撑按阶段、延迟、区域等值过滤后在夏普比率上做范围扫描
+        Index(
+            "ix_alpha_metrics_stage_delay_region_sharpe",
+            "stage",
+            "delay",
+            "region",
+            "sharpe",
+        ),
+        Index("ix_alpha_metrics_date_created", "date_created"),
+    )
+
+
 alphas_classifications = Table(
     "alpha_classification",
     Base.metadata,
@@ -4,7 +4,10 @@
 模块功能：
 - 定义基础 ORM 模型类 `Base`，提供异步属性访问功能。
 - 定义 `Correlation` 类，用于存储两个 Alpha 策略之间的相关性分析结果。
+- 定义 `CorrelationStatistics` 类，用于存储相关性的增量充分统计量。
 - 定义 `CheckRecord` 类，用于存储 Alpha 策略的检查记录。
+- 定义 `RecordSet` 类，用于存储 Alpha 策略的记录集 (如 PnL)，并维护内容哈希。
+- 定义 `EvaluateLedger` 类，用于记录 Alpha 最近一次评估结论及其输入指纹。
 
 注意事项：
 - 所有 ORM 模型类必须继承自 `Base` 类。
@@ -12,16 +15,22 @@
 - 数据库字段类型使用 SQLAlchemy 提供的类型映射，确保与数据库兼容。
 """
 
-from datetime import datetime
+import hashlib
+import json
+from datetime import date, datetime
 from typing import Any, Dict, Optional
 
 from sqlalchemy import (
     JSON,
+    Boolean,
+    Date,
     DateTime,
     Enum,
     Float,
+    Index,
     Integer,
     String,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.ext.asyncio import AsyncAttrs
@@ -31,6 +40,7 @@ from sqlalchemy.orm import (
     DeclarativeBase,
     MappedColumn,
     mapped_column,
+    validates,
 )
 
 from alphapower.constants import (
@@ -102,6 +112,15 @@ class Correlation(Base):
         comment="创建时间",  # 添加字段注释
     )
 
+    __table_args__ = (
+        UniqueConstraint(
+            "alpha_id_a",
+            "alpha_id_b",
+            "calc_type",
+            name="_correlation_alpha_pair_calc_type_uc",
+        ),
+    )
+
     def __init__(
         self,
         alpha_id_a: str,
@@ -135,6 +154,108 @@ class Correlation(Base):
         )
 
 
+class CorrelationStatistics(Base):
+    """两个 Alpha 策略日收益的相关性充分统计量 (sufficient statistics) 的 ORM 模型类。
+
+    保存两个 Alpha 在共同滚动窗口 [`start_date`, `end_date`] 内成对有效日期上的
+    样本数与累加和 (Σa, Σb, Σa², Σb², Σab)。窗口滑动时只需加上新增日期、减去过期日期，
+    即可在 O(变化天数) 内得到新的相关系数。与 `Correlation` 相同，
+    `alpha_id_a` 总是存储字典序较小的 ID，`sum_a`/`sum_aa` 对应 `alpha_id_a`。
+
+    属性：
+        id (int): 主键，自增。
+        alpha_id_a (str): 第一个 Alpha 策略的唯一标识符（字典序较小者）。
+        alpha_id_b (str): 第二个 Alpha 策略的唯一标识符（字典序较大者）。
+        start_date (date): 统计窗口起始日期（含）。
+        end_date (date): 统计窗口结束日期（含）。
+        count (int): 窗口内两者均有效的样本数。
+        sum_a, sum_b, sum_aa, sum_bb, sum_ab (float): 对应的累加和。
+        updated_at (datetime): 最后更新时间。
+    """
+
+    __tablename__ = "correlation_statistics"
+
+    id: MappedColumn[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    alpha_id_a: MappedColumn[str] = mapped_column(
+        String(ALPHA_ID_LENGTH),
+        nullable=False,
+        comment="第一个 Alpha ID (字典序较小)",
+    )
+    alpha_id_b: MappedColumn[str] = mapped_column(
+        String(ALPHA_ID_LENGTH),
+        nullable=False,
+        comment="第二个 Alpha ID (字典序较大)",
+    )
+    start_date: MappedColumn[date] = mapped_column(
+        Date, nullable=False, comment="统计窗口起始日期"
+    )
+    end_date: MappedColumn[date] = mapped_column(
+        Date, nullable=False, comment="统计窗口结束日期"
+    )
+    count: MappedColumn[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="成对有效样本数"
+    )
+    sum_a: MappedColumn[float] = mapped_column(
+        Float, nullable=False, default=0.0, comment="Σa"
+    )
+    sum_b: MappedColumn[float] = mapped_column(
+        Float, nullable=False, default=0.0, comment="Σb"
+    )
+    sum_aa: MappedColumn[float] = mapped_column(
+        Float, nullable=False, default=0.0, comment="Σa²"
+    )
+    sum_bb: MappedColumn[float] = mapped_column(
+        Float, nullable=False, default=0.0, comment="Σb²"
+    )
+    sum_ab: MappedColumn[float] = mapped_column(
+        Float, nullable=False, default=0.0, comment="Σab"
+    )
+    updated_at: MappedColumn[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        insert_default=func.now(),  # pylint: disable=E1102
+        onupdate=func.now(),  # pylint: disable=E1102
+        comment="更新时间",
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "alpha_id_a",
+            "alpha_id_b",
+            name="_correlation_statistics_alpha_pair_uc",
+        ),
+    )
+
+    def __init__(
+        self,
+        alpha_id_a: str,
+        alpha_id_b: str,
+        start_date: date,
+        end_date: date,
+        **kw: Any,
+    ):
+        """初始化 CorrelationStatistics 对象并确保 alpha_id 排序。
+
+        累加和默认为 0，由调用方按 `alpha_id_a`/`alpha_id_b` 的顺序填充。
+        """
+        if alpha_id_a > alpha_id_b:
+            alpha_id_a, alpha_id_b = alpha_id_b, alpha_id_a
+
+        super().__init__(
+            alpha_id_a=alpha_id_a,
+            alpha_id_b=alpha_id_b,
+            start_date=start_date,
+            end_date=end_date,
+            count=0,
+            sum_a=0.0,
+            sum_b=0.0,
+            sum_aa=0.0,
+            sum_bb=0.0,
+            sum_ab=0.0,
+            **kw,
+        )
+
+
 class CheckRecord(Base):
     """Alpha 策略检查记录的 ORM 模型类。
 
@@ -178,6 +299,16 @@ class CheckRecord(Base):
         comment="创建时间",  # 添加字段注释
     )
 
+    __table_args__ = (
+        # 支撑按 Alpha 与检查类型查询最新记录
+        Index(
+            "ix_check_records_alpha_type_created",
+            "alpha_id",
+            "record_type",
+            "created_at",
+        ),
+    )
+
 
 class RecordSet(Base):
     __tablename__ = "record_sets"
@@ -198,6 +329,11 @@ class RecordSet(Base):
         nullable=False,
         comment="记录集内容 (JSON)",  # 添加字段注释
     )
+    content_hash: MappedColumn[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="记录集内容的 SHA-256 哈希，用于本地缓存失效判断",  # 添加字段注释
+    )
     created_at: MappedColumn[datetime] = mapped_column(
         DateTime,
         nullable=False,
@@ -205,6 +341,37 @@ class RecordSet(Base):
         comment="创建时间",  # 添加字段注释
     )
 
+    @staticmethod
+    def compute_content_hash(content: Any) -> str:
+        """计算记录集内容的稳定哈希值。
+
+        Args:
+            content: 记录集内容 (可 JSON 序列化的对象)。
+
+        Returns:
+            str: 内容的 SHA-256 十六进制摘要。
+        """
+        serialized: str = json.dumps(
+            content, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @validates("content")
+    def validate_content(self, key: str, value: Any) -> Any:
+        """内容变更时同步更新内容哈希，确保本地缓存能够感知记录变化。
+
+        Args:
+            key: 字段名称
+            value: 新的记录集内容
+
+        Returns:
+            Any: 原样返回的记录集内容
+        """
+        self.content_hash = (
+            RecordSet.compute_content_hash(value) if value is not None else None
+        )
+        return value
+
 
 class EvaluateRecord(Base):
     __tablename__ = "evaluate_records"
@@ -298,3 +465,46 @@ class EvaluateRecord(Base):
         insert_default=func.now(),  # pylint: disable=E1102
         comment="创建时间",  # 添加字段注释
     )
+
+
+class EvaluateLedger(Base):
+    """Alpha 评估台账的 ORM 模型类。
+
+    每个 Alpha 一行，记录最近一次完成评估的结论和当时的输入指纹。
+    指纹由 Alpha 的修改时间、评估阶段链配置和刷新策略计算得出，
+    指纹未变化时之前的结论仍然有效，重新运行评估时可以直接跳过该 Alpha。
+
+    属性：
+        id (int): 主键，自增。
+        alpha_id (str): Alpha 策略的唯一标识符。
+        fingerprint (str): 评估输入的指纹 (SHA-256 十六进制)。
+        passed (bool): 评估是否通过。
+        evaluated_at (datetime): 最近一次完成评估的时间。
+    """
+
+    __tablename__ = "evaluate_ledger"
+
+    id: MappedColumn[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    alpha_id: MappedColumn[str] = mapped_column(
+        String(ALPHA_ID_LENGTH),
+        nullable=False,
+        unique=True,
+        comment="Alpha ID",
+    )
+    fingerprint: MappedColumn[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="评估输入指纹",
+    )
+    passed: MappedColumn[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        comment="评估是否通过",
+    )
+    evaluated_at: MappedColumn[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        insert_default=func.now(),  # pylint: disable=E1102
+        onupdate=func.now(),  # pylint: disable=E1102
+        comment="评估完成时间",
+    )
@@ -32,8 +32,10 @@ from sqlalchemy import (
     DateTime,
     Enum,
     Float,
+    Index,
     Integer,
     String,
+    desc,
     event,
     func,
 )
@@ -125,6 +127,8 @@ class SimulationTask(Base):
         tags (str, optional): 与任务关联的标签，用于分类和筛选。
         dependencies (dict, optional): JSON 字段，描述任务的依赖关系。
         completed_at (datetime, optional): 任务完成的时间。
+        lease_owner (str, optional): 认领任务的任务提供者标识，未被认领时为空。
+        lease_expires_at (datetime, optional): 认领租约的到期时间。
         instrument_type (InstrumentType): 使用的金融工具类型，定义了任务处理的金融产品类别。
         region (Region): Alpha 应用的市场区域，指定了任务所针对的地理市场范围。
         universe (Universe): Alpha 选用的股票范围，确定了模拟中包含的证券集合。
@@ -137,6 +141,22 @@ class SimulationTask(Base):
     """
 
     __tablename__ = "simulation_tasks"
+    __table_args__ = (
+        # 支撑按状态、优先级降序认领任务时的有序扫描，避免深度 OFFSET；
+        # 列的排序方向必须与认领查询的 (priority DESC, id) 一致，否则每次认领
+        # 都要对同一优先级的全部待处理任务额外排序
+        Index(
+            "ix_simulation_tasks_status_priority_desc_id",
+            "status",
+            desc("priority"),
+            "id",
+        ),
+        # 支撑续约与回收过期租约
+        Index("ix_simulation_tasks_lease_owner_status", "lease_owner", "status"),
+        Index("ix_simulation_tasks_lease_expires_at", "lease_expires_at"),
+        # 已被上面的降序索引取代，upgrade_schema 会在已存在的库中删除
+        {"info": {"obsolete_indexes": ("ix_simulation_tasks_status_priority_id",)}},
+    )
 
     # 标识符字段
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -216,6 +236,12 @@ class SimulationTask(Base):
     deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
+    # 认领租约字段
+    lease_owner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
+
     def __init__(self, **kwargs: Any) -> None:
         """初始化模拟任务对象，处理特殊属性。
 
@@ -1,6 +1,8 @@
 from __future__ import annotations  # 解决类型前向引用问题
 
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional, Set
+
+from sqlalchemy import delete
 
 from alphapower.client import BeforeAndAfterPerformanceView, WorldQuantClient
 from alphapower.constants import (
@@ -13,7 +15,9 @@ from alphapower.constants import (
 )
 from alphapower.engine.evaluate.base_evaluate_stages import PerformanceDiffEvaluateStage
 from alphapower.engine.evaluate.base_evaluator import BaseEvaluator
+from alphapower.engine.evaluate.check_record_cache import CheckRecordCache
 from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
+from alphapower.engine.evaluate.evaluate_write_buffer import EvaluateWriteBuffer
 from alphapower.entity import Alpha, EvaluateRecord
 from alphapower.internal.logging import get_logger
 
@@ -64,18 +68,16 @@ class PPAC2025Evaluator(BaseEvaluator):
             record (EvaluateRecord): 评估记录对象。
         """
         try:
-            await self.evaluate_record_dal.create(record)
-            # FIXME: 这里由于没有 commit 操作，所以可能会导致数据不一致
-            await self.evaluate_record_dal.session.commit()
+            await self.write_buffer.add(record)
             await log.ainfo(
-                event="因子评估记录创建成功",
-                record_id=record.id,
+                event="因子评估记录已加入写入缓冲区",
+                alpha_id=record.alpha_id,
                 emoji="📄",
             )
         except Exception as e:
             await log.aerror(
                 event="因子评估记录创建失败",
-                record_id=record.id,
+                alpha_id=record.alpha_id,
                 error=str(e),
                 emoji="❌",
             )
@@ -92,8 +94,10 @@ class PPAC2025Evaluator(BaseEvaluator):
             record (EvaluateRecord): 评估记录对象。
             kwargs (Any): 额外参数。
         """
-        await self.evaluate_record_dal.delete_by_filter(alpha_id=alpha.alpha_id)
-        await self.evaluate_record_dal.session.commit()
+        # 删除语句与其他写入一起排队，保持与之前评估记录写入的先后顺序
+        await self.write_buffer.execute(
+            delete(EvaluateRecord).where(EvaluateRecord.alpha_id == alpha.alpha_id)
+        )
 
         await log.ainfo(
             event="因子评估失败，评估记录已删除",
@@ -110,6 +114,8 @@ class PPAC2025PerfDiffEvaluateStage(PerformanceDiffEvaluateStage):
         next_stage: Optional[AbstractEvaluateStage],
         check_record_dal: CheckRecordDAL,
         client: WorldQuantClient,
+        check_record_cache: Optional[CheckRecordCache] = None,
+        write_buffer: Optional[EvaluateWriteBuffer] = None,
     ) -> None:
         """
         初始化 PPAC2025 评估阶段。
@@ -119,9 +125,21 @@ class PPAC2025PerfDiffEvaluateStage(PerformanceDiffEvaluateStage):
             competition_id (Optional[str]): 竞赛 ID。
             check_record_dal (CheckRecordDAL): 检查记录数据访问层。
             client (WorldQuantClient): WorldQuant 客户端。
+            check_record_cache (Optional[CheckRecordCache]): 检查记录查找缓存。
+            write_buffer (Optional[EvaluateWriteBuffer]): 检查记录的写后缓冲区。
         """
         competition_id = "PPAC2025"
-        super().__init__(next_stage, competition_id, check_record_dal, client)
+        super().__init__(
+            next_stage,
+            competition_id,
+            check_record_dal,
+            client,
+            check_record_cache,
+            write_buffer,
+        )
+
+    def _stage_relationships(self) -> Set[str]:
+        return {"regular", "settings"}
 
     async def _determine_performance_diff_pass_status(
         self,
@@ -205,7 +223,7 @@ class PPAC2025PerfDiffEvaluateStage(PerformanceDiffEvaluateStage):
 if __name__ == "__main__":
     # 运行测试
     from datetime import datetime
-    from typing import Dict, Set
+    from typing import Dict
 
     from alphapower.client import wq_client
     from alphapower.constants import SampleCheckResult, SampleCheckType
@@ -213,6 +231,7 @@ if __name__ == "__main__":
     from alphapower.dal.evaluate import (
         CheckRecordDAL,
         CorrelationDAL,
+        EvaluateLedgerDAL,
         EvaluateRecordDAL,
         RecordSetDAL,
     )
@@ -242,6 +261,7 @@ if __name__ == "__main__":
                     check_record_dal = CheckRecordDAL(evaluate_session)
                     record_set_dal = RecordSetDAL(evaluate_session)
                     evaluate_record_dal = EvaluateRecordDAL(evaluate_session)
+                    evaluate_ledger_dal = EvaluateLedgerDAL(evaluate_session)
 
                     async def alpha_generator() -> AsyncGenerator[Alpha, None]:
                         for alpha in await alpha_dal.find_by_stage(
@@ -267,79 +287,93 @@ if __name__ == "__main__":
                                 emoji="❌",
                             )
 
-                    correlation_calculator = CorrelationCalculator(
+                    # 检查记录、PnL 记录集与评估记录共享写后缓冲区，分组提交
+                    write_buffer = EvaluateWriteBuffer(evaluate_session)
+
+                    # 计算器持有进程池与共享矩阵文件，退出时 (包括异常) 释放
+                    async with CorrelationCalculator(
                         client=client,
                         alpha_stream=alpha_generator(),
                         alpha_dal=alpha_dal,
                         record_set_dal=record_set_dal,
                         correlation_dal=correlation_dal,
-                    )
+                        write_buffer=write_buffer,
+                    ) as correlation_calculator:
+                        fetcher = BaseAlphaFetcher(
+                            alpha_dal=alpha_dal,
+                            setting_dal=setting_dal,
+                            sample_dal=sample_dal,
+                            start_time=datetime(2025, 4, 15),
+                            end_time=datetime(2025, 4, 22, 23, 59, 59),
+                        )
 
-                    fetcher = BaseAlphaFetcher(
-                        alpha_dal=alpha_dal,
-                        setting_dal=setting_dal,
-                        sample_dal=sample_dal,
-                        start_time=datetime(2025, 4, 15),
-                        end_time=datetime(2025, 4, 22, 23, 59, 59),
-                    )
-
-                    check_pass_result_map: Dict[
-                        SampleCheckType, Set[SampleCheckResult]
-                    ] = {
-                        SampleCheckType.MATCHES_COMPETITION: {
-                            SampleCheckResult.PASS,
-                            SampleCheckResult.PENDING,
-                        },
-                        SampleCheckType.CONCENTRATED_WEIGHT: {
-                            SampleCheckResult.PASS,
-                            SampleCheckResult.PENDING,
-                        },
-                    }
-
-                    in_sample_stage: AbstractEvaluateStage = (
-                        InSampleChecksEvaluateStage(
-                            next_stage=None,
-                            check_pass_result_map=check_pass_result_map,
+                        check_pass_result_map: Dict[
+                            SampleCheckType, Set[SampleCheckResult]
+                        ] = {
+                            SampleCheckType.MATCHES_COMPETITION: {
+                                SampleCheckResult.PASS,
+                                SampleCheckResult.PENDING,
+                            },
+                            SampleCheckType.CONCENTRATED_WEIGHT: {
+                                SampleCheckResult.PASS,
+                                SampleCheckResult.PENDING,
+                            },
+                        }
+
+                        in_sample_stage: AbstractEvaluateStage = (
+                            InSampleChecksEvaluateStage(
+                                next_stage=None,
+                                check_pass_result_map=check_pass_result_map,
+                            )
                         )
-                    )
 
-                    local_correlation_stage: AbstractEvaluateStage = (
-                        CorrelationLocalEvaluateStage(
-                            next_stage=None,
-                            correlation_calculator=correlation_calculator,
+                        # 各阶段共享检查记录缓存，每批 Alpha 只需一次检查记录查询
+                        check_record_cache = CheckRecordCache(check_record_dal)
+
+                        local_correlation_stage: AbstractEvaluateStage = (
+                            CorrelationLocalEvaluateStage(
+                                next_stage=None,
+                                correlation_calculator=correlation_calculator,
+                            )
                         )
-                    )
-                    platform_self_correlation_stage: AbstractEvaluateStage = (
-                        CorrelationPlatformEvaluateStage(
-                            next_stage=None,
-                            correlation_type=CorrelationType.SELF,
-                            check_record_dal=check_record_dal,
-                            correlation_dal=correlation_dal,
-                            client=client,
+                        platform_self_correlation_stage: AbstractEvaluateStage = (
+                            CorrelationPlatformEvaluateStage(
+                                next_stage=None,
+                                correlation_type=CorrelationType.SELF,
+                                check_record_dal=check_record_dal,
+                                correlation_dal=correlation_dal,
+                                client=client,
+                                check_record_cache=check_record_cache,
+                                write_buffer=write_buffer,
+                            )
                         )
-                    )
-                    perf_diff_stage: AbstractEvaluateStage = (
-                        PPAC2025PerfDiffEvaluateStage(
-                            next_stage=None,
-                            check_record_dal=check_record_dal,
-                            client=client,
+                        perf_diff_stage: AbstractEvaluateStage = (
+                            PPAC2025PerfDiffEvaluateStage(
+                                next_stage=None,
+                                check_record_dal=check_record_dal,
+                                client=client,
+                                check_record_cache=check_record_cache,
+                                write_buffer=write_buffer,
+                            )
                         )
-                    )
-
-                    in_sample_stage.next_stage = local_correlation_stage
-                    local_correlation_stage.next_stage = perf_diff_stage  # TODO: 自相关性计算直接用本地的数据，否则太慢了
-                    platform_self_correlation_stage.next_stage = perf_diff_stage
-
-                    evaluator = PPAC2025Evaluator(
-                        fetcher=fetcher,
-                        evaluate_stage_chain=in_sample_stage,
-                        evaluate_record_dal=evaluate_record_dal,
-                    )
-
-                    async for alpha in evaluator.evaluate_many(
-                        policy=RefreshPolicy.FORCE_REFRESH, concurrency=1
-                    ):
-                        print(alpha)
+
+                        in_sample_stage.next_stage = local_correlation_stage
+                        local_correlation_stage.next_stage = perf_diff_stage  # TODO: 自相关性计算直接用本地的数据，否则太慢了
+                        platform_self_correlation_stage.next_stage = perf_diff_stage
+
+                        # 评估器持有责任链与写后缓冲区，退出时 (包括异常) 关闭
+                        async with PPAC2025Evaluator(
+                            fetcher=fetcher,
+                            evaluate_stage_chain=in_sample_stage,
+                            evaluate_record_dal=evaluate_record_dal,
+                            write_buffer=write_buffer,
+                            # 中断后重新运行时跳过结论仍然有效的 Alpha
+                            ledger_dal=evaluate_ledger_dal,
+                        ) as evaluator:
+                            async for alpha in evaluator.evaluate_many(
+                                policy=RefreshPolicy.FORCE_REFRESH, concurrency=1
+                            ):
+                                print(alpha)
 
     # 运行异步测试函数
     import asyncio
@@ -8,6 +8,8 @@
     - 注册和管理多个数据库引擎
     - 提供异步会话上下文管理器
     - 自动处理事务提交和回滚
+    - 为已存在的表补齐新增的列、索引和唯一约束
+    - 为并发共享的会话提供串行化访问的锁
     - 资源释放功能
 
 典型用法:
@@ -20,10 +22,12 @@
 """
 
 import asyncio
+import weakref
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, List, Tuple, Type
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, Type
 
-from sqlalchemy import text
+from sqlalchemy import MetaData, Table, UniqueConstraint, inspect, text
+from sqlalchemy.engine import Connection, Inspector
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -45,6 +49,222 @@ async_session_factories: Dict[Database, async_sessionmaker[AsyncSession]] = {}
 # 添加锁来保护全局字典的访问
 _db_lock: asyncio.Lock = asyncio.Lock()
 
+# 按会话分配的锁，会话被回收后对应的锁随之释放
+_session_locks: "weakref.WeakKeyDictionary[AsyncSession, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def session_lock(session: AsyncSession) -> asyncio.Lock:
+    """
+    获取与会话绑定的锁。
+
+    AsyncSession 不允许并发操作，同一个会话被多个协程共享时 (例如并行评估阶段的
+    各个分支)，所有访问数据库的调用都应在持有该锁时进行。锁不可重入，持有锁时
+    不能再调用同样会获取该锁的方法。
+
+    Args:
+        session: 异步数据库会话
+
+    Returns:
+        asyncio.Lock: 该会话专属的锁，同一个会话每次返回同一把锁
+    """
+    lock: asyncio.Lock | None = _session_locks.get(session)
+    if lock is None:
+        lock = asyncio.Lock()
+        _session_locks[session] = lock
+    return lock
+
+
+def upgrade_schema(connection: Connection, metadata: MetaData) -> List[str]:
+    """
+    为已存在的表补齐模型中新增的列、索引和唯一约束。
+
+    create_all 只创建不存在的表，不会修改已存在的表。此函数对每个已存在的表
+    以 ALTER TABLE ... ADD COLUMN 添加缺失的列，并创建缺失的索引，可以重复执行。
+    新增的列必须可为空或带有服务端默认值，否则无法为已有行填充，直接报错。
+
+    缺失的唯一约束以同名唯一索引补齐。旧数据中存在违反约束的重复行时不会删除
+    任何数据，只记录警告并跳过该索引，由对应的去重命令显式清理后再次补齐。
+
+    表的 info 中以 obsolete_indexes 列出已被取代的索引名，存在时删除。
+
+    Args:
+        connection: 同步数据库连接，通过 AsyncConnection.run_sync 调用。
+        metadata: 模型的元数据。
+
+    Returns:
+        执行的变更描述列表。
+
+    Raises:
+        ValueError: 缺失的列不可为空且没有服务端默认值时。
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    preparer = connection.dialect.identifier_preparer
+    applied: List[str] = []
+
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise ValueError(
+                    f"无法为表 {table.name} 添加不可为空且没有默认值的列 {column.name}"
+                )
+            column_type: str = column.type.compile(dialect=connection.dialect)
+            statement: str = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            )
+            if column.server_default is not None:
+                default = column.server_default.arg  # type: ignore[attr-defined]
+                default_sql: str = (
+                    str(default.compile(dialect=connection.dialect))
+                    if hasattr(default, "compile")
+                    else f"'{default}'"
+                )
+                statement += f" DEFAULT {default_sql}"
+            connection.execute(text(statement))
+            applied.append(f"添加列 {table.name}.{column.name}")
+
+        existing_indexes = {
+            index["name"] for index in inspector.get_indexes(table.name)
+        }
+        applied.extend(_drop_obsolete_indexes(connection, table, existing_indexes))
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            index.create(connection)
+            applied.append(f"创建索引 {index.name}")
+
+        existing_unique_columns = unique_column_sets(inspector, table.name)
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+            column_names = tuple(column.name for column in constraint.columns)
+            if column_names in existing_unique_columns:
+                continue
+            applied.extend(
+                _add_unique_index(connection, table, constraint.name, column_names)
+            )
+
+    return applied
+
+
+def unique_column_sets(
+    inspector: Inspector, table_name: str
+) -> Set[Tuple[Optional[str], ...]]:
+    """
+    查询数据库中表已有的唯一约束与唯一索引覆盖的列组合。
+
+    Args:
+        inspector: 数据库结构检查器。
+        table_name: 表名。
+
+    Returns:
+        列名元组的集合，列顺序与约束或索引定义一致，表达式索引的列名为 None。
+    """
+    return {
+        tuple(constraint["column_names"])
+        for constraint in inspector.get_unique_constraints(table_name)
+    } | {
+        tuple(index["column_names"])
+        for index in inspector.get_indexes(table_name)
+        if index["unique"]
+    }
+
+
+def _drop_obsolete_indexes(
+    connection: Connection,
+    table: Table,
+    existing_indexes: Set[Any],
+) -> List[str]:
+    """
+    删除表 info 中 obsolete_indexes 列出、且仍存在于数据库中的索引。
+
+    Args:
+        connection: 同步数据库连接。
+        table: 模型中的表。
+        existing_indexes: 数据库中该表已有的索引名。
+
+    Returns:
+        执行的变更描述列表。
+    """
+    preparer = connection.dialect.identifier_preparer
+    applied: List[str] = []
+    for name in table.info.get("obsolete_indexes", ()):
+        if name not in existing_indexes:
+            continue
+        connection.execute(text(f"DROP INDEX {preparer.quote(name)}"))
+        applied.append(f"删除索引 {name}")
+    return applied
+
+
+def _add_unique_index(
+    connection: Connection,
+    table: Table,
+    name: Any,
+    column_names: Tuple[str, ...],
+) -> List[str]:
+    """
+    为已存在的表创建唯一索引，存在重复行时记录警告并跳过。
+
+    约束列含 NULL 的行不违反唯一索引，不计入重复行。
+
+    Args:
+        connection: 同步数据库连接。
+        table: 模型对应的表对象。
+        name: 约束名称，作为唯一索引的名称。
+        column_names: 约束包含的列名。
+
+    Returns:
+        执行的变更描述列表，跳过时为空。
+
+    Raises:
+        ValueError: 约束未命名时。
+    """
+    if not isinstance(name, str):
+        raise ValueError(f"无法为表 {table.name} 补齐未命名的唯一约束 {column_names}")
+
+    preparer = connection.dialect.identifier_preparer
+    table_sql: str = preparer.format_table(table)
+    columns_sql: str = ", ".join(preparer.quote(column) for column in column_names)
+    not_null_sql: str = " AND ".join(
+        f"{preparer.quote(column)} IS NOT NULL" for column in column_names
+    )
+
+    duplicate_groups: int = connection.execute(
+        text(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {table_sql} WHERE {not_null_sql} "
+            f"GROUP BY {columns_sql} HAVING COUNT(*) > 1) AS duplicates"
+        )
+    ).scalar_one()
+    if duplicate_groups:
+        logger.warning(
+            "表中存在违反唯一约束的重复行，未创建唯一索引，请先执行对应的去重命令",
+            table=table.name,
+            index=name,
+            columns=list(column_names),
+            duplicate_groups=duplicate_groups,
+            emoji="⚠️",
+        )
+        return []
+
+    connection.execute(
+        text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {preparer.quote(name)} "
+            f"ON {table_sql} ({columns_sql})"
+        )
+    )
+    return [f"创建唯一索引 {name}"]
+
 
 async def register_db(
     base: Type[DeclarativeBase],
@@ -197,6 +417,15 @@ async def register_db(
                     db=db.value,
                     emoji="👍",
                 )
+                # 已存在的表不会被 create_all 修改，补齐新增的列和索引
+                applied: List[str] = await conn.run_sync(upgrade_schema, base.metadata)
+                if applied:
+                    await logger.ainfo(
+                        "已升级现有表结构",
+                        db=db.value,
+                        changes=applied,
+                        emoji="🔧",
+                    )
         except Exception as e:
             await logger.aerror(
                 "创建数据库表失败",
@@ -15,13 +15,18 @@ from typing import Optional
 
 import asyncclick as click  # 替换为 asyncclick
 
-from alphapower.constants import Status
+from alphapower.constants import Region, Stage, Status
 from alphapower.internal.logging import get_logger
 from alphapower.internal.storage import close_resources
 from alphapower.internal.utils import safe_async_run
 from alphapower.services.sync_alphas import AlphaSyncService
+from alphapower.services.sync_correlation import (
+    deduplicate_correlations,
+    sync_correlation_statistics,
+)
 from alphapower.services.sync_datafields import sync_datafields
 from alphapower.services.sync_datasets import sync_datasets
+from alphapower.services.sync_pnl import sync_pnl
 from alphapower.services.task_worker_pool import (
     task_start_worker_pool,
 )
@@ -214,6 +219,16 @@ async def alphas(
     await logger.ainfo("因子同步完成。", emoji="✅")
 
 
+@sync.command()
+async def alpha_metrics() -> None:
+    """
+    根据已同步的因子全量重建筛选指标表。
+    """
+    alpha_sync_service: AlphaSyncService = AlphaSyncService()
+    refreshed: int = await alpha_sync_service.rebuild_alpha_metrics()
+    await logger.ainfo(f"因子筛选指标重建完成，共 {refreshed} 条。", emoji="✅")
+
+
 @sync.command()
 @click.option("--instrument_type", default="EQUITY", help="工具类型")
 @click.option("--dataset_id", default=None, help="数据集ID")
@@ -248,12 +263,122 @@ async def datafields(
     await logger.ainfo("数据字段同步完成。", emoji="✅")
 
 
+@sync.command()
+@click.option(
+    "--stage",
+    default=Stage.OS.name,
+    type=click.Choice(list(Stage.__members__.keys())),
+    help="阶段 默认为 OS",
+)
+@click.option(
+    "--region",
+    default=None,
+    type=click.Choice(list(Region.__members__.keys())),
+    help="区域 默认为全部区域",
+)
+@click.option("--concurrency", default=None, type=int, help="并发数 默认使用配置值")
+@click.option(
+    "--force-refresh", is_flag=True, default=False, help="重新拉取已存在的 PnL"
+)
+async def pnl(
+    stage: str,
+    region: Optional[str],
+    concurrency: Optional[int],
+    force_refresh: bool,
+) -> None:
+    """
+    同步 Alpha 的 PnL 数据并预热本地缓存。
+
+    Args:
+        stage (str): Alpha 阶段。
+        region (Optional[str]): 区域。
+        concurrency (Optional[int]): 并发数。
+        force_refresh (bool): 是否重新拉取已存在的 PnL。
+
+    Returns:
+        None
+
+    Raises:
+        Exception: 如果同步过程中发生错误。
+    """
+    await logger.ainfo(
+        f"开始同步 PnL，参数: stage={stage}, region={region}, "
+        f"concurrency={concurrency}, force_refresh={force_refresh}",
+        emoji="📈",
+    )
+    await sync_pnl(
+        stage=Stage[stage],
+        region=Region[region] if region else None,
+        concurrency=concurrency,
+        force_refresh=force_refresh,
+    )
+    await logger.ainfo("PnL 同步完成。", emoji="✅")
+
+
+@sync.command()
+@click.option(
+    "--stage",
+    default=Stage.OS.name,
+    type=click.Choice(list(Stage.__members__.keys())),
+    help="因子池阶段 默认为 OS",
+)
+@click.option(
+    "--region",
+    default=None,
+    type=click.Choice(list(Region.__members__.keys())),
+    help="区域 默认为全部区域",
+)
+@click.option(
+    "--force-rebuild", is_flag=True, default=False, help="忽略已有统计量重新累加"
+)
+async def correlation_statistics(
+    stage: str,
+    region: Optional[str],
+    force_rebuild: bool,
+) -> None:
+    """
+    增量刷新因子池相关性的充分统计量，并将相关系数写入相关性表。
+
+    Args:
+        stage (str): 因子池阶段。
+        region (Optional[str]): 区域。
+        force_rebuild (bool): 是否忽略已有统计量重新累加。
+
+    Returns:
+        None
+
+    Raises:
+        Exception: 如果刷新过程中发生错误。
+    """
+    await logger.ainfo(
+        f"开始刷新相关性统计量，参数: stage={stage}, region={region}, "
+        f"force_rebuild={force_rebuild}",
+        emoji="🧮",
+    )
+    pairs: int = await sync_correlation_statistics(
+        stage=Stage[stage],
+        region=Region[region] if region else None,
+        force_rebuild=force_rebuild,
+    )
+    await logger.ainfo(f"相关性统计量刷新完成，共 {pairs} 对。", emoji="✅")
+
+
+@sync.command()
+async def correlation_dedup() -> None:
+    """
+    删除相关性表中重复的 Alpha 对记录，并补齐唯一索引。
+    """
+    deleted: int = await deduplicate_correlations()
+    await logger.ainfo(f"相关性表去重完成，共删除 {deleted} 条。", emoji="✅")
+
+
 @simulation.command()
 @click.option("--initial-workers", default=1, help="初始工作者数量")
 @click.option("--dry-run", is_flag=True, help="以仿真模式运行，不实际执行任务")
 @click.option("--worker-timeout", default=300, help="工作者健康检查超时时间（秒）")
 @click.option("--task-fetch-size", default=10, help="每次从任务提供者获取的任务数量")
-@click.option("--sample-rate", default=1, help="任务跳采样率")
+@click.option("--lease-seconds", default=600.0, help="认领任务的租约时长（秒）")
+@click.option("--worker-concurrency", default=1, help="每个工作者同时在途的模拟数量")
 @click.option("--low-priority-threshold", default=10, help="低优先级任务提升阈值")
 async def start_worker_pool(
     initial_workers: int,
@@ -261,7 +386,8 @@ async def start_worker_pool(
     worker_timeout: int,
     task_fetch_size: int,
     low_priority_threshold: int,
-    sample_rate: int,
+    lease_seconds: float,
+    worker_concurrency: int,
 ) -> None:
     """
     启动工作池以执行模拟任务。
@@ -272,6 +398,8 @@ async def start_worker_pool(
         worker_timeout (int): 工作者健康检查超时时间（秒）。
         task_fetch_size (int): 每次从任务提供者获取的任务数量。
         low_priority_threshold (int): 低优先级任务提升阈值。
+        lease_seconds (float): 认领任务的租约时长（秒）。
+        worker_concurrency (int): 每个工作者同时在途的模拟数量。
 
     Returns:
         None
@@ -291,7 +419,8 @@ async def start_worker_pool(
         worker_timeout=worker_timeout,
         task_fetch_size=task_fetch_size,
         low_priority_threshold=low_priority_threshold,
-        sample_rate=sample_rate,
+        lease_seconds=lease_seconds,
+        worker_concurrency=worker_concurrency,
     )
 
 
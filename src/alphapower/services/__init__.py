@@ -1,5 +1,14 @@
-__all__ = ["AlphaSyncService", "sync_datafields", "sync_datasets"]
+__all__ = [
+    "AlphaSyncService",
+    "deduplicate_correlations",
+    "sync_correlation_statistics",
+    "sync_datafields",
+    "sync_datasets",
+    "sync_pnl",
+]
 
 from .sync_alphas import AlphaSyncService
+from .sync_correlation import deduplicate_correlations, sync_correlation_statistics
 from .sync_datafields import sync_datafields
 from .sync_datasets import sync_datasets
+from .sync_pnl import sync_pnl
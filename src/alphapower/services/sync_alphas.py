@@ -37,6 +37,7 @@ from alphapower.client import (
 from alphapower.constants import Color, Database, Grade, Status
 from alphapower.dal.alphas import (
     AlphaDAL,
+    AlphaMetricsDAL,
     ClassificationDAL,
     CompetitionDAL,
 )
@@ -481,6 +482,7 @@ class AlphaSyncService:
 
                     async with get_db_session(Database.ALPHAS) as session:
                         alpha_dal: AlphaDAL = AlphaDAL(session)
+                        alpha_metrics_dal: AlphaMetricsDAL = AlphaMetricsDAL(session)
                         competition_dal: CompetitionDAL = DALFactory.create_dal(
                             CompetitionDAL, session
                         )
@@ -549,6 +551,10 @@ class AlphaSyncService:
                                 await alpha_dal.bulk_upsert_by_unique_key(
                                     uncommitted_alphas, unique_key="alpha_id"
                                 )
+                                # 筛选指标与因子在同一事务中刷新，保证二者一致
+                                await alpha_metrics_dal.refresh(
+                                    [alpha.alpha_id for alpha in uncommitted_alphas]
+                                )
                                 await alpha_dal.session.commit()
 
                                 await self.log.ainfo(
@@ -567,6 +573,7 @@ class AlphaSyncService:
                     del tasks
                     del alphas_data_result
                     del alpha_dal
+                    del alpha_metrics_dal
                     del competition_dal
                     del classification_dal
                     gc.collect()
@@ -679,6 +686,21 @@ class AlphaSyncService:
 
         return uncommited_alphas, fetched_alphas, inserted_alphas, updated_alphas
 
+    async def rebuild_alpha_metrics(self) -> int:
+        """
+        根据现有因子全量重建筛选指标表，用于首次启用或数据修复。
+
+        返回:
+            刷新的指标行数。
+        """
+        await self.log.ainfo("开始重建因子筛选指标", emoji="🛠️")
+        async with get_db_session(Database.ALPHAS) as session:
+            alpha_metrics_dal: AlphaMetricsDAL = AlphaMetricsDAL(session)
+            refreshed: int = await alpha_metrics_dal.refresh()
+            await session.commit()
+        await self.log.ainfo("因子筛选指标重建完成", refreshed=refreshed, emoji="✅")
+        return refreshed
+
     async def sync_alphas(
         self,
         start_time: Optional[datetime] = None,
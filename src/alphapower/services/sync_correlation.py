@@ -0,0 +1,107 @@
+"""
+@file sync_correlation.py
+
+基于持久化的充分统计量，例行刷新因子池中 Alpha 两两之间的本地相关性，
+并提供显式的相关性表去重命令。
+"""
+
+from typing import AsyncGenerator, List, Optional
+
+from alphapower.client import wq_client
+from alphapower.constants import Database, Region, Stage
+from alphapower.dal.alphas import AlphaDAL
+from alphapower.dal.evaluate import (
+    CorrelationDAL,
+    CorrelationStatisticsDAL,
+    RecordSetDAL,
+)
+from alphapower.engine.evaluate.correlation_calculator import CorrelationCalculator
+from alphapower.entity import Alpha, Correlation
+from alphapower.internal.db_session import get_db_session, upgrade_schema
+from alphapower.internal.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+async def sync_correlation_statistics(
+    stage: Stage = Stage.OS,
+    region: Optional[Region] = None,
+    force_rebuild: bool = False,
+) -> int:
+    """
+    增量刷新因子池中 Alpha 两两之间的相关性充分统计量，并写入相关性表。
+
+    Args:
+        stage: 因子池中 Alpha 的阶段，默认为 OS。
+        region: 仅刷新指定区域，为 None 时刷新全部区域。
+        force_rebuild: 是否忽略已有统计量，对整个窗口重新累加。
+
+    Returns:
+        得到有效相关系数的 Alpha 对数量。
+    """
+    async with get_db_session(Database.ALPHAS) as alpha_session:
+        alpha_dal: AlphaDAL = AlphaDAL(session=alpha_session)
+        alphas: List[Alpha] = await alpha_dal.find_by_stage(stage=stage)
+
+    async def alpha_generator() -> AsyncGenerator[Alpha, None]:
+        for alpha in alphas:
+            if region is None or alpha.settings.region == region:
+                yield alpha
+
+    pair_count: int = 0
+    async with get_db_session(Database.EVALUATE) as evaluate_session:
+        calculator: CorrelationCalculator = CorrelationCalculator(
+            client=wq_client,
+            alpha_stream=alpha_generator(),
+            alpha_dal=alpha_dal,
+            record_set_dal=RecordSetDAL(session=evaluate_session),
+            correlation_dal=CorrelationDAL(session=evaluate_session),
+            correlation_statistics_dal=CorrelationStatisticsDAL(
+                session=evaluate_session
+            ),
+        )
+        try:
+            await calculator.initialize()
+            for pool_region in calculator.pool_regions():
+                pair_count += await calculator.refresh_pool_statistics(
+                    pool_region, force_rebuild=force_rebuild
+                )
+        finally:
+            await calculator.close()
+
+    await logger.ainfo(
+        "相关性充分统计量刷新完成",
+        stage=stage.value,
+        region=region.value if region else None,
+        pairs=pair_count,
+        emoji="✅",
+    )
+    return pair_count
+
+
+async def deduplicate_correlations() -> int:
+    """
+    删除相关性表中 alpha_pair + calc_type 重复的旧记录，并补齐对应的唯一索引。
+
+    数据库启动时的结构升级遇到重复行只会告警并跳过唯一索引，
+    需要通过该命令显式清理，清理后立即补齐索引。
+
+    Returns:
+        删除的行数。
+    """
+    async with get_db_session(Database.EVALUATE) as evaluate_session:
+        deleted: int = await CorrelationDAL(
+            session=evaluate_session
+        ).delete_duplicate_pairs()
+        connection = await evaluate_session.connection()
+        applied: List[str] = await connection.run_sync(
+            upgrade_schema, Correlation.metadata
+        )
+
+    await logger.ainfo(
+        "相关性表去重完成",
+        deleted=deleted,
+        applied=applied,
+        emoji="✅",
+    )
+    return deleted
@@ -0,0 +1,90 @@
+"""
+@file sync_pnl.py
+
+预先同步 Alpha 的 PnL 记录集并预热本地 PnL 缓存，避免评估启动时逐个拉取。
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from alphapower.client import wq_client
+from alphapower.constants import Database, RecordSetType, Region, Stage
+from alphapower.dal.alphas import AlphaDAL
+from alphapower.dal.evaluate import RecordSetDAL
+from alphapower.engine.evaluate.pnl_cache import PnLCache
+from alphapower.engine.evaluate.pnl_prefetcher import PnLPrefetcher
+from alphapower.entity import Alpha
+from alphapower.internal.db_session import get_db_session
+from alphapower.internal.logging import get_logger
+from alphapower.settings import settings
+
+logger = get_logger(__name__)
+
+
+async def sync_pnl(
+    stage: Stage = Stage.OS,
+    region: Optional[Region] = None,
+    concurrency: Optional[int] = None,
+    force_refresh: bool = False,
+) -> None:
+    """
+    同步指定阶段 Alpha 的 PnL 记录集。
+
+    Args:
+        stage: Alpha 阶段，默认为 OS。
+        region: 仅同步指定区域的 Alpha，为 None 时同步全部区域。
+        concurrency: 并发拉取的 Alpha 数量上限，为 None 时使用配置值。
+        force_refresh: 是否重新拉取数据库中已存在的 PnL。
+    """
+    async with get_db_session(Database.ALPHAS) as alpha_session:
+        alphas: List[Alpha] = await AlphaDAL(session=alpha_session).find_by_stage(
+            stage=stage
+        )
+        alpha_ids: List[str] = [
+            alpha.alpha_id
+            for alpha in alphas
+            if region is None or alpha.settings.region == region
+        ]
+
+    await logger.ainfo(
+        "开始同步 PnL",
+        stage=stage.value,
+        region=region.value if region else None,
+        alphas=len(alpha_ids),
+        force_refresh=force_refresh,
+        emoji="📈",
+    )
+
+    async with get_db_session(Database.EVALUATE) as evaluate_session:
+        record_set_dal: RecordSetDAL = RecordSetDAL(session=evaluate_session)
+        prefetcher: PnLPrefetcher = PnLPrefetcher(
+            client=wq_client,
+            record_set_dal=record_set_dal,
+            pnl_cache=(
+                PnLCache(Path(settings.pnl_cache_dir))
+                if settings.pnl_cache_dir
+                else None
+            ),
+            concurrency=concurrency,
+        )
+
+        to_fetch_alpha_ids: List[str] = alpha_ids
+        if not force_refresh:
+            content_hashes: Dict[str, Optional[str]] = (
+                await record_set_dal.find_content_hashes(
+                    alpha_ids=alpha_ids, set_type=RecordSetType.PNL
+                )
+            )
+            await prefetcher.warm_cache(content_hashes)
+            to_fetch_alpha_ids = [
+                alpha_id for alpha_id in alpha_ids if alpha_id not in content_hashes
+            ]
+
+        fetched_alpha_ids: List[str] = await prefetcher.prefetch(to_fetch_alpha_ids)
+
+    await logger.ainfo(
+        "PnL 同步完成",
+        requested=len(to_fetch_alpha_ids),
+        fetched=len(fetched_alpha_ids),
+        emoji="✅",
+    )
@@ -22,7 +22,8 @@ async def task_start_worker_pool(
     worker_timeout: int = 300,
     task_fetch_size: int = 10,
     low_priority_threshold: int = 10,
-    sample_rate: int = 1,
+    lease_seconds: float = 600.0,
+    worker_concurrency: int = 1,
 ) -> None:
     """
     启动工作池以执行模拟任务。
@@ -33,6 +34,8 @@ async def task_start_worker_pool(
         worker_timeout (int): 工作者健康检查超时时间（秒）。
         task_fetch_size (int): 每次从任务提供者获取的任务数量。
         low_priority_threshold (int): 低优先级任务提升阈值。
+        lease_seconds (float): 认领任务的租约时长（秒）。
+        worker_concurrency (int): 每个工作者同时在途的模拟数量。
 
     # TODO(Ball Chang): 新增定时主动垃圾回收机制，提高长时间运行的稳定性
     # TODO(Ball Chang): 优化日志格式，输出内容紧凑高效，日志级别配置合理
@@ -41,6 +44,7 @@ async def task_start_worker_pool(
     # 创建一个事件来控制优雅关闭
     shutdown_event = asyncio.Event()
     worker_pool = None
+    provider: Optional[DatabaseTaskProvider] = None
 
     # 定义信号处理函数
     def handle_signal(sig: int, _: Optional[types.FrameType]) -> None:
@@ -53,7 +57,9 @@ async def task_start_worker_pool(
 
     try:
         # 初始化任务提供者
-        provider = DatabaseTaskProvider(sample_rate=sample_rate)
+        provider = DatabaseTaskProvider(lease_seconds=lease_seconds)
+        # 启动租约心跳，多个工作池进程可以共享同一个任务库
+        await provider.start()
 
         # 初始化调度器
         scheduler = PriorityScheduler(
@@ -77,6 +83,7 @@ async def task_start_worker_pool(
             initial_workers=initial_workers,
             dry_run=dry_run,
             worker_timeout=worker_timeout,
+            worker_concurrency=worker_concurrency,
         )
 
         # 启动工作池
@@ -107,4 +114,11 @@ async def task_start_worker_pool(
             except Exception as e:
                 logger.error(f"停止工作池时发生错误: {e}")
 
+        # 工作者停止后再释放租约，未开始运行的任务回到队列
+        if provider:
+            try:
+                await provider.stop()
+            except Exception as e:
+                logger.error(f"释放任务租约时发生错误: {e}")
+
         logger.info("工作池已停止，程序退出。")
@@ -63,6 +63,9 @@ class AppConfig(BaseSettings):
     log_dir: str = "./logs"
     log_file_max_bytes: int = 32 * 1024 * 1024  # 5 MB
     log_file_backup_count: int = 3
+    pnl_cache_dir: str = "./cache/pnl"  # 本地 PnL 二进制缓存目录，为空则禁用
+    pnl_prefetch_concurrency: int = 8  # 并发预取 PnL 的 Alpha 数量上限
+    correlation_process_workers: int = 0  # 自相关计算的进程数，为 0 时在事件循环中计算
     sql_echo: bool = False
     environment: str = Environment.PROD.value
     credential: CredentialConfig = CredentialConfig()
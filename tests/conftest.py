@@ -2,10 +2,14 @@
 Mock WQB Server for Testing
 """
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 import pytest
 from pytest_httpserver import HTTPServer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from alphapower.constants import Database
+from alphapower.internal.db_session import get_db_session
 
 
 @pytest.fixture(scope="session")
@@ -13,3 +17,20 @@ def mock_server() -> Generator[HTTPServer, None, None]:
     """会话级别的 mock server fixture"""
     with HTTPServer() as server:
         yield server
+
+
+@pytest.fixture(name="alphas_session")
+async def fixture_alphas_session() -> AsyncGenerator[AsyncSession, None]:
+    """创建 Alpha 数据库会话用于测试。
+
+    会话在上下文管理器结束时自动回滚未提交的更改，测试数据只 flush 不提交。
+    """
+    async with get_db_session(Database.ALPHAS) as alphas_session:
+        yield alphas_session
+
+
+@pytest.fixture(name="evaluate_session")
+async def fixture_evaluate_session() -> AsyncGenerator[AsyncSession, None]:
+    """创建 Evaluate 数据库会话用于测试。"""
+    async with get_db_session(Database.EVALUATE) as evaluate_session:
+        yield evaluate_session
@@ -0,0 +1,52 @@
+"""
+@file: mock_evaluate_stage.py
+@brief: 评估阶段与评估器的测试替身
+@details:
+    该模块定义了多个评估测试共用的评估器替身与阶段执行辅助函数。
+"""
+
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, List
+from unittest.mock import AsyncMock, MagicMock
+
+from alphapower.constants import RefreshPolicy
+from alphapower.engine.evaluate.base_evaluator import BaseEvaluator
+from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
+from alphapower.entity import Alpha, EvaluateRecord
+
+# pylint: disable=W0613
+
+
+class NoopEvaluator(BaseEvaluator):
+    """结论处理为空操作的评估器。"""
+
+    async def _handle_evaluate_success(
+        self, alpha: Alpha, record: EvaluateRecord, **kwargs: Any
+    ) -> None:
+        pass
+
+    async def _handle_evaluate_failure(
+        self, alpha: Alpha, record: EvaluateRecord, **kwargs: Any
+    ) -> None:
+        pass
+
+
+def mock_alpha_fetcher(alphas: List[Alpha]) -> MagicMock:
+    """构造按顺序产出给定 Alpha 的数据获取器替身。"""
+
+    async def fetch_alphas(**kwargs: Any) -> AsyncGenerator[Alpha, None]:
+        for alpha in alphas:
+            yield alpha
+
+    fetcher = MagicMock()
+    fetcher.fetch_alphas = fetch_alphas
+    fetcher.total_alpha_count = AsyncMock(return_value=len(alphas))
+    return fetcher
+
+
+async def run_stage(stage: AbstractEvaluateStage) -> bool:
+    """以替身 Alpha 与评估记录执行阶段，返回是否通过。"""
+    alpha: Any = SimpleNamespace(alpha_id="ALPHA001")
+    record: Any = SimpleNamespace()
+    _, passed = await stage.evaluate(alpha, RefreshPolicy.USE_EXISTING, record)
+    return passed
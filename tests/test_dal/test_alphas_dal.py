@@ -10,10 +10,10 @@
 - CompetitionDAL: 比赛数据访问层
 - SampleDAL: 样本数据访问层
 - SampleCheckDAL: 样本检查数据访问层
+- AlphaMetricsDAL: Alpha 筛选指标数据访问层
 """
 
 from datetime import datetime
-from typing import AsyncGenerator
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,7 +24,6 @@ from alphapower.constants import (
     Color,
     CompetitionScoring,
     CompetitionStatus,
-    Database,
     Delay,
     Grade,
     InstrumentType,
@@ -39,6 +38,7 @@ from alphapower.constants import (
 )
 from alphapower.dal.alphas import (
     AlphaDAL,
+    AlphaMetricsDAL,
     ClassificationDAL,
     CompetitionDAL,
     RegularDAL,
@@ -53,27 +53,10 @@ from alphapower.entity import (
     Sample,
     Setting,
 )
-from alphapower.internal.db_session import get_db_session
 
 # pylint: disable=too-many-lines
 
 
-@pytest.fixture(name="alphas_session")
-async def fixture_alphas_session() -> AsyncGenerator[AsyncSession, None]:
-    """创建Alpha数据库会话用于测试。
-
-    创建与真实数据库的连接会话，用于测试Alpha相关的数据访问层的操作。
-    测试完成后会自动清理会话。
-
-    Yields:
-        AsyncSession: SQLAlchemy 异步会话对象。
-    """
-    async with get_db_session(Database.ALPHAS) as alphas_session:
-        yield alphas_session
-        # 注意：在生产环境测试中可能需要更复杂的数据清理策略
-        # 当前会话在上下文管理器结束时会自动回滚未提交的更改
-
-
 @pytest.fixture(name="test_setting")
 async def fixture_test_setting(alphas_session: AsyncSession) -> Setting:
     """创建一个用于测试的 Setting 对象。
@@ -748,3 +731,83 @@ class TestSampleCheckDAL:
 
         # 验证删除结果
         assert await sample_check_dal.get_by_id(sample_check.id) is None
+
+
+class TestAlphaMetricsDAL:
+    """测试 AlphaMetricsDAL 类的各项功能。"""
+
+    async def test_refresh_upserts_metrics(
+        self,
+        alphas_session: AsyncSession,
+        test_setting: Setting,
+        test_regular: Regular,
+    ) -> None:
+        """测试按 alpha_id 刷新筛选指标，重复刷新时更新已有的指标行。
+
+        Args:
+            alphas_session: 数据库会话对象。
+            test_setting: 测试用的 Setting 对象。
+            test_regular: 测试用的 Regular 对象。
+        """
+        # 创建 DAL 实例
+        alpha_metrics_dal = AlphaMetricsDAL(alphas_session)
+
+        # 创建测试数据，其中一个 Alpha 没有样本内数据
+        alphas = [
+            Alpha(
+                alpha_id=f"METRICS_TEST_{i}".ljust(ALPHA_ID_LENGTH),
+                type=AlphaType.REGULAR,
+                author="tester",
+                settings_id=test_setting.id,
+                regular_id=test_regular.id,
+                in_sample=(
+                    Sample(
+                        start_date=datetime.now(),
+                        sharpe=1.5,
+                        fitness=1.1,
+                        turnover=0.2,
+                        returns=0.1,
+                    )
+                    if i == 0
+                    else None
+                ),
+                date_created=datetime.now(),
+                favorite=False,
+                hidden=False,
+                color=Color.NONE,
+                grade=Grade.DEFAULT,
+                stage=Stage.IS,
+                status=Status.UNSUBMITTED,
+            )
+            for i in range(2)
+        ]
+        alphas_session.add_all(alphas)
+
+        # 刷新前会自动 flush 尚未写入的 Alpha
+        await alpha_metrics_dal.refresh([alpha.alpha_id for alpha in alphas])
+        alpha_ids = [alpha.alpha_id for alpha in alphas]
+        ids = [alpha.id for alpha in alphas]
+
+        metrics = await alpha_metrics_dal.get_by_id(ids[0])
+        assert metrics is not None
+        assert metrics.alpha_id == alpha_ids[0]
+        assert metrics.region == Region.USA
+        assert metrics.delay == Delay.ONE
+        assert metrics.sharpe == 1.5
+        assert metrics.turnover == 0.2
+
+        missing_sample = await alpha_metrics_dal.get_by_id(ids[1])
+        assert missing_sample is not None
+        assert missing_sample.sharpe is None
+
+        # 修改源数据后再次刷新，指标行被更新而不是重复插入
+        alphas[0].in_sample.sharpe = 2.5
+        alphas[0].stage = Stage.OS
+        await alpha_metrics_dal.refresh(alpha_ids[:1])
+        alphas_session.expire_all()
+
+        metrics = await alpha_metrics_dal.get_by_id(ids[0])
+        assert metrics is not None
+        assert metrics.sharpe == 2.5
+        assert metrics.stage == Stage.OS
+        assert await alpha_metrics_dal.count(in_={"alpha_id": alpha_ids}) == 2
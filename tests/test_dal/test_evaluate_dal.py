@@ -0,0 +1,231 @@
+"""
+测试 evaluate 数据库相关 DAL 类的批量读写方法。
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from alphapower.constants import CheckRecordType, CorrelationCalcType
+from alphapower.dal.evaluate import CheckRecordDAL, CorrelationDAL, EvaluateLedgerDAL
+from alphapower.entity import CheckRecord, Correlation, EvaluateLedger
+from alphapower.internal.db_session import upgrade_schema
+
+
+class TestCorrelationDAL:
+    """测试 CorrelationDAL 类的批量 upsert。"""
+
+    async def test_upsert_many_inserts_and_updates(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """重复写入同一 Alpha 对时应更新数值而不是插入新行。
+
+        Args:
+            evaluate_session: 数据库会话对象。
+        """
+        correlation_dal = CorrelationDAL(evaluate_session)
+        pool_ids: List[str] = [f"UPSERT_POOL_{i:03d}" for i in range(200)]
+
+        written = await correlation_dal.upsert_many(
+            [
+                ("UPSERT_CAND", pool_id, 0.1, CorrelationCalcType.LOCAL)
+                for pool_id in pool_ids
+            ]
+        )
+        await correlation_dal.upsert_many(
+            [
+                ("UPSERT_CAND", pool_ids[0], 0.9, CorrelationCalcType.LOCAL),
+                ("UPSERT_CAND", pool_ids[0], 0.5, CorrelationCalcType.PLATFORM),
+            ]
+        )
+
+        count = await evaluate_session.scalar(
+            select(func.count()).where(  # pylint: disable=E1102
+                Correlation.alpha_id_a == "UPSERT_CAND"
+            )
+        )
+        updated = await correlation_dal.find_one_by(
+            alpha_id_a="UPSERT_CAND",
+            alpha_id_b=pool_ids[0],
+            calc_type=CorrelationCalcType.LOCAL,
+        )
+
+        assert written == 200
+        assert count == 201
+        assert updated is not None
+        assert updated.correlation == pytest.approx(0.9)
+
+    async def test_delete_duplicate_pairs_keeps_latest(self) -> None:
+        """旧库中重复的 Alpha 对只保留最新一行，清理后可以补齐唯一索引。"""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            # 早期版本的相关性表没有唯一约束
+            await connection.execute(
+                text(
+                    "CREATE TABLE correlations (id INTEGER PRIMARY KEY, "
+                    "alpha_id_a VARCHAR NOT NULL, alpha_id_b VARCHAR NOT NULL, "
+                    "correlation FLOAT NOT NULL, calc_type VARCHAR NOT NULL, "
+                    "created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO correlations "
+                    "(alpha_id_a, alpha_id_b, correlation, calc_type) VALUES "
+                    "('A', 'B', 0.1, 'LOCAL'), ('A', 'B', 0.2, 'PLATFORM'), "
+                    "('A', 'B', 0.3, 'LOCAL'), ('A', 'C', 0.4, 'LOCAL')"
+                )
+            )
+            # 存在重复行时结构升级不补齐唯一索引
+            assert not await connection.run_sync(upgrade_schema, Correlation.metadata)
+
+        async with AsyncSession(engine) as session:
+            deleted = await CorrelationDAL(session).delete_duplicate_pairs()
+            await session.commit()
+            rows = (
+                await session.execute(
+                    select(Correlation.alpha_id_b, Correlation.correlation).order_by(
+                        Correlation.id
+                    )
+                )
+            ).all()
+
+        async with engine.begin() as connection:
+            applied = await connection.run_sync(upgrade_schema, Correlation.metadata)
+            indexes = await connection.run_sync(
+                lambda sync_connection: inspect(sync_connection).get_indexes(
+                    "correlations"
+                )
+            )
+        await engine.dispose()
+
+        assert deleted == 1
+        assert rows == [("B", 0.2), ("B", 0.3), ("C", 0.4)]
+        assert "创建唯一索引 _correlation_alpha_pair_calc_type_uc" in applied
+        assert "_correlation_alpha_pair_calc_type_uc" in {
+            index["name"] for index in indexes
+        }
+
+    async def test_upsert_many_without_unique_index_falls_back(self) -> None:
+        """旧库因重复行缺少唯一索引时，批量写入回退到逐行写入而不是报错。"""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.execute(
+                text(
+                    "CREATE TABLE correlations (id INTEGER PRIMARY KEY, "
+                    "alpha_id_a VARCHAR NOT NULL, alpha_id_b VARCHAR NOT NULL, "
+                    "correlation FLOAT NOT NULL, calc_type VARCHAR NOT NULL, "
+                    "created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                )
+            )
+            await connection.execute(
+                text(
+                    "INSERT INTO correlations "
+                    "(alpha_id_a, alpha_id_b, correlation, calc_type) VALUES "
+                    "('A', 'B', 0.1, 'LOCAL'), ('A', 'B', 0.2, 'LOCAL')"
+                )
+            )
+            assert not await connection.run_sync(upgrade_schema, Correlation.metadata)
+
+        async with AsyncSession(engine) as session:
+            written = await CorrelationDAL(session).upsert_many(
+                [
+                    ("A", "C", 0.5, CorrelationCalcType.LOCAL),
+                    ("A", "C", 0.6, CorrelationCalcType.LOCAL),
+                ]
+            )
+            await session.commit()
+            rows = (
+                await session.execute(
+                    select(Correlation.alpha_id_b, Correlation.correlation).order_by(
+                        Correlation.id
+                    )
+                )
+            ).all()
+        await engine.dispose()
+
+        assert written == 2
+        assert rows == [("B", 0.1), ("B", 0.2), ("C", 0.6)]
+
+
+class TestCheckRecordDAL:
+    """测试 CheckRecordDAL 类的批量查询最新检查记录。"""
+
+    async def test_find_latest_by_alphas_returns_newest_per_type(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """每个 (Alpha, 检查类型) 只返回 created_at 最新的一条记录。
+
+        Args:
+            evaluate_session: 数据库会话对象。
+        """
+        check_record_dal = CheckRecordDAL(evaluate_session)
+        created_at = datetime(2025, 1, 1)
+        await check_record_dal.bulk_create(
+            [
+                CheckRecord(
+                    alpha_id=alpha_id,
+                    record_type=record_type,
+                    content={"version": version},
+                    created_at=created_at + timedelta(days=version),
+                )
+                for alpha_id in ["LATEST_A", "LATEST_B"]
+                for record_type in [
+                    CheckRecordType.CORRELATION_SELF,
+                    CheckRecordType.SUBMISSION,
+                ]
+                for version in range(3)
+            ]
+        )
+
+        latest = await check_record_dal.find_latest_by_alphas(
+            alpha_ids=["LATEST_A", "LATEST_B", "LATEST_MISSING"],
+            record_types=[CheckRecordType.CORRELATION_SELF],
+        )
+
+        assert set(latest) == {
+            ("LATEST_A", CheckRecordType.CORRELATION_SELF),
+            ("LATEST_B", CheckRecordType.CORRELATION_SELF),
+        }
+        assert all(record.content == {"version": 2} for record in latest.values())
+
+
+class TestEvaluateLedgerDAL:
+    """测试 EvaluateLedgerDAL 类的批量查询与 upsert。"""
+
+    async def test_upsert_many_keeps_latest_verdict(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """同一 Alpha 重复写入时更新指纹与结论，每个 Alpha 只有一行。
+
+        Args:
+            evaluate_session: 数据库会话对象。
+        """
+        ledger_dal = EvaluateLedgerDAL(evaluate_session)
+        # 测试数据库跨运行保留数据，使用随机前缀避免与之前的结论冲突
+        prefix: str = f"LEDGER_{uuid4().hex[:8]}"
+        alpha_ids: List[str] = [f"{prefix}_{i}" for i in range(3)]
+
+        await ledger_dal.upsert_many(
+            [(alpha_id, "fingerprint_v1", False) for alpha_id in alpha_ids]
+        )
+        await ledger_dal.upsert_many([(alpha_ids[0], "fingerprint_v2", True)])
+
+        fingerprints = await ledger_dal.find_fingerprints(
+            alpha_ids + [f"{prefix}_MISSING"]
+        )
+        assert fingerprints == {
+            alpha_ids[0]: "fingerprint_v2",
+            alpha_ids[1]: "fingerprint_v1",
+            alpha_ids[2]: "fingerprint_v1",
+        }
+        count = await evaluate_session.scalar(
+            select(func.count()).where(  # pylint: disable=E1102
+                EvaluateLedger.alpha_id.in_(alpha_ids)
+            )
+        )
+        assert count == 3
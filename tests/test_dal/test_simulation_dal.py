@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import AsyncGenerator
 
 import pytest
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from alphapower.constants import (
@@ -531,3 +532,221 @@ class TestSimulationTaskDAL:
         for task in results:
             task_date = task.created_at.strftime("%Y-%m-%d")
             assert yesterday < task_date <= tomorrow
+
+    async def test_claim_pending_tasks(self, simulation_session: AsyncSession) -> None:
+        """测试认领待处理任务的方法。
+
+        认领的任务标记为已调度并写入租约，同一任务不会被重复认领。
+
+        Args:
+            simulation_session: 数据库会话对象。
+        """
+        # 创建 DAL 实例
+        task_dal = SimulationTaskDAL(simulation_session)
+
+        # 使用独立的优先级，避免与其他测试的数据混淆
+        claim_priority: int = 7777
+        statuses = [SimulationTaskStatus.PENDING] * 3 + [SimulationTaskStatus.RUNNING]
+        tasks = [
+            SimulationTask(
+                alpha_id=f"CLAIM_ALPHA_{i}",
+                signature=f"CLAIM_SIG_{i}",
+                settings_group_key="CLAIM_GROUP",
+                status=status,
+                type=AlphaType.REGULAR,
+                priority=claim_priority,
+                created_at=datetime.now(),
+                regular="test_regular",
+                instrument_type=InstrumentType.EQUITY,
+                region=Region.GLB,
+                universe=Universe.TOP3000,
+                delay=Delay.ONE,
+                neutralization=Neutralization.MARKET,
+                pasteurization=Switch.OFF,
+                unit_handling=UnitHandling.VERIFY,
+                max_trade=Switch.OFF,
+                language=RegularLanguage.PYTHON,
+                visualization=False,
+            )
+            for i, status in enumerate(statuses)
+        ]
+        simulation_session.add_all(tasks)
+        await simulation_session.flush()
+        pending_ids = [task.id for task in tasks[:3]]
+
+        # 第一次认领两个任务，按 id 顺序取出
+        first = await task_dal.claim_pending_tasks(
+            owner="pool-a", count=2, lease_seconds=60, priority=claim_priority
+        )
+        assert [task.id for task in first] == pending_ids[:2]
+        for task in first:
+            assert task.status == SimulationTaskStatus.SCHEDULED
+            assert task.lease_owner == "pool-a"
+            assert task.lease_expires_at is not None
+            assert task.lease_expires_at > datetime.now()
+            assert task.scheduled_at is not None
+
+        # 第二次认领只能拿到剩余的待处理任务，运行中的任务不会被认领
+        second = await task_dal.claim_pending_tasks(
+            owner="pool-b", count=5, lease_seconds=60, priority=claim_priority
+        )
+        assert [task.id for task in second] == pending_ids[2:]
+        assert second[0].lease_owner == "pool-b"
+
+        assert not await task_dal.claim_pending_tasks(
+            owner="pool-a", count=5, lease_seconds=60, priority=claim_priority
+        )
+
+    async def test_claim_candidates_use_ordered_index(
+        self, simulation_session: AsyncSession
+    ) -> None:
+        """认领候选任务按索引顺序扫描，不需要对待处理任务额外排序。
+
+        Args:
+            simulation_session: 数据库会话对象。
+        """
+        for priority in (None, 7777):
+            query = SimulationTaskDAL._claim_candidates_query(5, priority)
+            compiled = query.compile(
+                dialect=simulation_session.get_bind().dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+            result = await simulation_session.execute(
+                text(f"EXPLAIN QUERY PLAN {compiled}")
+            )
+            plan: str = " ".join(str(row[-1]) for row in result.all())
+
+            assert "ix_simulation_tasks_status_priority_desc_id" in plan
+            assert "TEMP B-TREE" not in plan
+
+    async def test_task_leases(self, simulation_session: AsyncSession) -> None:
+        """测试任务租约的续约、回收与释放。
+
+        Args:
+            simulation_session: 数据库会话对象。
+        """
+        # 创建 DAL 实例
+        task_dal = SimulationTaskDAL(simulation_session)
+
+        lease_priority: int = 8888
+        tasks = [
+            SimulationTask(
+                alpha_id=f"LEASE_ALPHA_{i}",
+                signature=f"LEASE_SIG_{i}",
+                settings_group_key="LEASE_GROUP",
+                status=SimulationTaskStatus.PENDING,
+                type=AlphaType.REGULAR,
+                priority=lease_priority,
+                created_at=datetime.now(),
+                regular="test_regular",
+                instrument_type=InstrumentType.EQUITY,
+                region=Region.GLB,
+                universe=Universe.TOP3000,
+                delay=Delay.ONE,
+                neutralization=Neutralization.MARKET,
+                pasteurization=Switch.OFF,
+                unit_handling=UnitHandling.VERIFY,
+                max_trade=Switch.OFF,
+                language=RegularLanguage.PYTHON,
+                visualization=False,
+            )
+            for i in range(3)
+        ]
+        simulation_session.add_all(tasks)
+        await simulation_session.flush()
+
+        # 已退出的认领者：租约立即过期
+        dead = await task_dal.claim_pending_tasks(
+            owner="pool-dead", count=1, lease_seconds=-1, priority=lease_priority
+        )
+        # 存活的认领者：一个任务已开始运行，一个仍是已调度
+        alive = await task_dal.claim_pending_tasks(
+            owner="pool-alive", count=2, lease_seconds=-1, priority=lease_priority
+        )
+        alive[0].status = SimulationTaskStatus.RUNNING
+        await simulation_session.flush()
+
+        renewed_until = datetime.now() + timedelta(minutes=5)
+        assert await task_dal.renew_leases("pool-alive", renewed_until) == 2
+        assert await task_dal.reclaim_expired_leases() >= 1
+
+        reclaimed = await task_dal.get_by_id(dead[0].id)
+        await simulation_session.refresh(reclaimed)
+        assert reclaimed.status == SimulationTaskStatus.PENDING
+        assert reclaimed.lease_owner is None
+        assert reclaimed.lease_expires_at is None
+
+        # 释放只放回尚未开始运行的任务
+        assert await task_dal.release_leases("pool-alive") == 1
+        for task, status in zip(
+            alive, [SimulationTaskStatus.RUNNING, SimulationTaskStatus.PENDING]
+        ):
+            await simulation_session.refresh(task)
+            assert task.status == status
+        assert alive[0].lease_owner == "pool-alive"
+        assert alive[0].lease_expires_at == renewed_until
+
+    async def test_update_if_leased(self, simulation_session: AsyncSession) -> None:
+        """测试租约作为写屏障，失去租约的任务对象不会覆盖新持有者的状态。
+
+        Args:
+            simulation_session: 数据库会话对象。
+        """
+        # 创建 DAL 实例
+        task_dal = SimulationTaskDAL(simulation_session)
+
+        fence_priority: int = 6666
+        simulation_session.add(
+            SimulationTask(
+                alpha_id="FENCE_ALPHA",
+                signature="FENCE_SIG",
+                settings_group_key="FENCE_GROUP",
+                status=SimulationTaskStatus.PENDING,
+                type=AlphaType.REGULAR,
+                priority=fence_priority,
+                created_at=datetime.now(),
+                regular="test_regular",
+                instrument_type=InstrumentType.EQUITY,
+                region=Region.GLB,
+                universe=Universe.TOP3000,
+                delay=Delay.ONE,
+                neutralization=Neutralization.MARKET,
+                pasteurization=Switch.OFF,
+                unit_handling=UnitHandling.VERIFY,
+                max_trade=Switch.OFF,
+                language=RegularLanguage.PYTHON,
+                visualization=False,
+            )
+        )
+        await simulation_session.flush()
+
+        # 旧的持有者认领后失去响应，工作者手中只剩脱离会话的任务对象
+        (stale,) = await task_dal.claim_pending_tasks(
+            owner="pool-stale", count=1, lease_seconds=-1, priority=fence_priority
+        )
+        simulation_session.expunge(stale)
+        assert await task_dal.reclaim_expired_leases() >= 1
+        (current,) = await task_dal.claim_pending_tasks(
+            owner="pool-current", count=1, lease_seconds=600, priority=fence_priority
+        )
+        assert current.id == stale.id
+
+        # 旧的持有者写回结果时租约已丢失，不修改任何行
+        stale.status = SimulationTaskStatus.COMPLETE
+        stale.result = {"status": "COMPLETE"}
+        assert not await task_dal.update_if_leased(stale)
+
+        await simulation_session.refresh(current)
+        assert current.status == SimulationTaskStatus.SCHEDULED
+        assert current.lease_owner == "pool-current"
+        assert current.result is None
+
+        # 新的持有者正常写回，批量写回只返回失去租约的任务
+        current.status = SimulationTaskStatus.RUNNING
+        current.parent_progress_id = "FENCE_PROGRESS"
+        assert await task_dal.update_all_if_leased([current, stale]) == [stale]
+
+        await simulation_session.refresh(current)
+        assert current.status == SimulationTaskStatus.RUNNING
+        assert current.parent_progress_id == "FENCE_PROGRESS"
+        assert current.lease_owner == "pool-current"
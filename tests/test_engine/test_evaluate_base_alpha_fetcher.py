@@ -1,15 +1,33 @@
-from typing import AsyncGenerator
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, List, Optional
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
-from sqlalchemy import Select, select
+from sqlalchemy import Select, delete, select
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import compiler
 
-from alphapower.constants import AlphaType
-from alphapower.dal.alphas import AlphaDAL, SampleDAL, SettingDAL
+from alphapower.constants import (
+    AlphaType,
+    Color,
+    Delay,
+    Grade,
+    InstrumentType,
+    Neutralization,
+    Region,
+    RegularLanguage,
+    Stage,
+    Status,
+    Switch,
+    UnitHandling,
+    Universe,
+)
+from alphapower.dal.alphas import AlphaDAL, AlphaMetricsDAL, SampleDAL, SettingDAL
 from alphapower.engine.evaluate.base_alpha_fetcher import BaseAlphaFetcher
-from alphapower.entity import Alpha
+from alphapower.entity import Alpha, AlphaMetrics, Regular, Sample, Setting
 
 """测试 Alpha 数据获取器基础实现 `BaseAlphaFetcher`。"""
 
@@ -291,3 +309,234 @@ class TestBaseAlphaFetcher:
             mock_total.assert_awaited_once()
             # 验证 fetched_alpha_count 被调用
             mock_fetched.assert_awaited_once()
+
+
+class AuthorAlphaFetcher(BaseAlphaFetcher):
+    """只按作者筛选 Alpha 的获取器，隔离测试数据库中的其他数据。"""
+
+    async def _build_alpha_select_query(self, **kwargs: Any) -> Select:
+        return (
+            select(Alpha)
+            .join(Alpha.settings)
+            .where(Alpha.author == self.author)  # type: ignore[attr-defined]
+        )
+
+
+async def create_alphas(
+    session: AsyncSession,
+    author: str,
+    count: int,
+    date_created: Optional[datetime] = None,
+    **sample_fields: float,
+) -> List[int]:
+    """创建一组带设置、规则和样本内数据的 Alpha，返回按创建顺序排列的主键。"""
+    sample_fields.setdefault("sharpe", 1.0)
+    alphas: List[Alpha] = []
+    for index in range(count):
+        alphas.append(
+            Alpha(
+                alpha_id=f"{author}_{index}",
+                type=AlphaType.REGULAR,
+                author=author,
+                settings=Setting(
+                    language=RegularLanguage.PYTHON,
+                    decay=10,
+                    truncation=0.01,
+                    visualization=False,
+                    instrument_type=InstrumentType.EQUITY,
+                    region=Region.USA,
+                    universe=Universe.TOP3000,
+                    delay=Delay.ONE,
+                    neutralization=Neutralization.MARKET,
+                    pasteurization=Switch.OFF,
+                    unit_handling=UnitHandling.VERIFY,
+                    nan_handling=Switch.OFF,
+                ),
+                regular=Regular(code="rank(close)", operator_count=1),
+                in_sample=Sample(start_date=datetime.now(), **sample_fields),
+                date_created=date_created or datetime.now(),
+                favorite=False,
+                hidden=False,
+                color=Color.NONE,
+                grade=Grade.DEFAULT,
+                stage=Stage.IS,
+                status=Status.UNSUBMITTED,
+            )
+        )
+    session.add_all(alphas)
+    await session.flush()
+    ids: List[int] = [alpha.id for alpha in alphas]
+    # 清空标识映射，使获取器重新从数据库加载实体
+    session.expunge_all()
+    return ids
+
+
+class TestBaseAlphaFetcherPaging:
+    """测试按 ID 分页、按需加载关联关系的两阶段获取。"""
+
+    async def test_ids_are_paged_by_keyset(self, alphas_session: AsyncSession) -> None:
+        """ID 按主键升序分页查询，每页不超过 page_size。"""
+        author: str = f"PAGING_{uuid4().hex[:8]}"
+        ids = await create_alphas(alphas_session, author, 5)
+        fetcher = AuthorAlphaFetcher(
+            AlphaDAL(alphas_session),
+            MagicMock(spec=SampleDAL),
+            MagicMock(spec=SettingDAL),
+            page_size=2,
+            author=author,
+        )
+
+        query: Select = await fetcher._build_alpha_select_query()
+        pages = [page async for page in fetcher._stream_alpha_ids(query)]
+
+        assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+
+    async def test_only_declared_relationships_are_loaded(
+        self, alphas_session: AsyncSession
+    ) -> None:
+        """只加载声明的关联关系，访问未声明的关联关系时报错而不是隐式查询。"""
+        author: str = f"PAGING_{uuid4().hex[:8]}"
+        ids = await create_alphas(alphas_session, author, 3)
+        fetcher = AuthorAlphaFetcher(
+            AlphaDAL(alphas_session),
+            MagicMock(spec=SampleDAL),
+            MagicMock(spec=SettingDAL),
+            page_size=2,
+            author=author,
+        )
+
+        alphas: List[Alpha] = [
+            alpha async for alpha in fetcher.fetch_alphas(relationships={"settings"})
+        ]
+
+        assert [alpha.id for alpha in alphas] == ids
+        assert all(alpha.settings.region == Region.USA for alpha in alphas)
+        with pytest.raises(InvalidRequestError):
+            _ = alphas[0].regular
+        assert await fetcher.fetched_alpha_count() == 3
+
+    def test_unknown_relationship_rejected(self) -> None:
+        """声明不存在的关联关系时报错。"""
+        with pytest.raises(ValueError):
+            BaseAlphaFetcher._relationship_loader("in_sample.unknown")
+
+
+class TestBaseAlphaFetcherMetrics:
+    """测试基于物化筛选指标表的顾问因子筛选。"""
+
+    async def test_filters_on_materialized_metrics(
+        self, alphas_session: AsyncSession
+    ) -> None:
+        """筛选和计数只依赖 alpha_metrics 表，指标刷新后才参与筛选。"""
+        author: str = f"METRICS_{uuid4().hex[:8]}"
+        date_created: datetime = datetime(2099, 1, 1)
+        fetcher = BaseAlphaFetcher(
+            AlphaDAL(alphas_session),
+            MagicMock(spec=SampleDAL),
+            MagicMock(spec=SettingDAL),
+            start_time=date_created - timedelta(minutes=1),
+            end_time=date_created + timedelta(minutes=1),
+        )
+        # 首次使用时完成筛选指标表的检查，之后创建的 Alpha 需要显式刷新指标
+        await fetcher.total_alpha_count()
+        passing = await create_alphas(
+            alphas_session,
+            author,
+            2,
+            date_created=date_created,
+            sharpe=2.0,
+            fitness=1.2,
+            turnover=0.1,
+        )
+        await create_alphas(
+            alphas_session,
+            f"{author}_LOW",
+            1,
+            date_created=date_created,
+            sharpe=1.0,
+            fitness=1.2,
+            turnover=0.1,
+        )
+        assert await fetcher.total_alpha_count() == 0
+
+        await AlphaMetricsDAL(alphas_session).refresh(
+            [f"{author}_{index}" for index in range(2)] + [f"{author}_LOW_0"]
+        )
+
+        assert await fetcher.total_alpha_count() == 2
+        alphas: List[Alpha] = [
+            alpha async for alpha in fetcher.fetch_alphas(relationships={"settings"})
+        ]
+        assert [alpha.id for alpha in alphas] == passing
+
+    async def test_empty_metrics_are_rebuilt_on_first_use(
+        self, alphas_session: AsyncSession
+    ) -> None:
+        """筛选指标表为空而 Alpha 表不为空时，首次使用前全量重建指标。"""
+        author: str = f"BACKFILL_{uuid4().hex[:8]}"
+        date_created: datetime = datetime(2098, 1, 1)
+        passing = await create_alphas(
+            alphas_session,
+            author,
+            2,
+            date_created=date_created,
+            sharpe=2.0,
+            fitness=1.2,
+            turnover=0.1,
+        )
+        await alphas_session.execute(delete(AlphaMetrics))
+        fetcher = BaseAlphaFetcher(
+            AlphaDAL(alphas_session),
+            MagicMock(spec=SampleDAL),
+            MagicMock(spec=SettingDAL),
+            start_time=date_created - timedelta(minutes=1),
+            end_time=date_created + timedelta(minutes=1),
+        )
+
+        assert await fetcher.total_alpha_count() == 2
+        alphas: List[Alpha] = [
+            alpha async for alpha in fetcher.fetch_alphas(relationships={"settings"})
+        ]
+        assert [alpha.id for alpha in alphas] == passing
+
+    async def test_missing_metrics_are_backfilled_on_first_use(
+        self, alphas_session: AsyncSession
+    ) -> None:
+        """指标表不为空但部分 Alpha 缺少指标行时，首次使用前补齐这些 Alpha 的指标。"""
+        author: str = f"PARTIAL_{uuid4().hex[:8]}"
+        date_created: datetime = datetime(2097, 1, 1)
+        synced = await create_alphas(
+            alphas_session,
+            author,
+            2,
+            date_created=date_created,
+            sharpe=2.0,
+            fitness=1.2,
+            turnover=0.1,
+        )
+        await AlphaMetricsDAL(alphas_session).refresh(
+            [f"{author}_{index}" for index in range(2)]
+        )
+        # 部分同步中断：后同步的 Alpha 没有刷新指标
+        missing = await create_alphas(
+            alphas_session,
+            f"{author}_LATE",
+            2,
+            date_created=date_created,
+            sharpe=2.0,
+            fitness=1.2,
+            turnover=0.1,
+        )
+        fetcher = BaseAlphaFetcher(
+            AlphaDAL(alphas_session),
+            MagicMock(spec=SampleDAL),
+            MagicMock(spec=SettingDAL),
+            start_time=date_created - timedelta(minutes=1),
+            end_time=date_created + timedelta(minutes=1),
+        )
+
+        assert await fetcher.total_alpha_count() == 4
+        alphas: List[Alpha] = [
+            alpha async for alpha in fetcher.fetch_alphas(relationships={"settings"})
+        ]
+        assert [alpha.id for alpha in alphas] == synced + missing
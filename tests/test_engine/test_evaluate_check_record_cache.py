@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from alphapower.constants import CheckRecordType, CorrelationType, RefreshPolicy
+from alphapower.engine.evaluate.base_evaluate_stages import (
+    CorrelationPlatformEvaluateStage,
+    SubmissionEvaluateStage,
+)
+from alphapower.engine.evaluate.check_record_cache import CheckRecordCache
+from alphapower.entity import CheckRecord
+
+# mypy: disable-error-code="attr-defined"
+
+
+@pytest.fixture(name="check_record_dal")
+def fixture_check_record_dal() -> MagicMock:
+    """提供只有 ALPHA001 存在检查记录的模拟数据访问层。"""
+    records: Dict[Tuple[str, CheckRecordType], CheckRecord] = {
+        ("ALPHA001", record_type): CheckRecord(
+            alpha_id="ALPHA001", record_type=record_type, content={}
+        )
+        for record_type in CheckRecordType
+    }
+
+    async def find_latest_by_alphas(
+        alpha_ids: List[str], record_types: List[CheckRecordType]
+    ) -> Dict[Tuple[str, CheckRecordType], CheckRecord]:
+        return {
+            key: record
+            for key, record in records.items()
+            if key[0] in alpha_ids and key[1] in record_types
+        }
+
+    check_record_dal = MagicMock()
+    check_record_dal.find_latest_by_alphas = AsyncMock(
+        side_effect=find_latest_by_alphas
+    )
+    check_record_dal.find_one_by = AsyncMock(return_value=None)
+    return check_record_dal
+
+
+class TestCheckRecordCache:
+    """测试检查记录查找缓存。"""
+
+    async def test_shared_cache_prefetches_once_per_batch(
+        self, check_record_dal: MagicMock
+    ) -> None:
+        """多个阶段共享缓存时，一批 Alpha 只查询一次所有已登记类型。"""
+        cache = CheckRecordCache(check_record_dal)
+        stages: List[Any] = [
+            CorrelationPlatformEvaluateStage(
+                next_stage=None,
+                correlation_type=CorrelationType.SELF,
+                check_record_dal=check_record_dal,
+                correlation_dal=MagicMock(),
+                client=MagicMock(),
+                check_record_cache=cache,
+            ),
+            SubmissionEvaluateStage(
+                next_stage=None,
+                check_record_dal=check_record_dal,
+                client=MagicMock(),
+                check_record_cache=cache,
+            ),
+        ]
+        stages[0].next_stage = stages[1]
+        alphas = [SimpleNamespace(alpha_id=f"ALPHA00{index}") for index in (1, 2)]
+
+        await stages[0].prepare_batch(alphas, RefreshPolicy.USE_EXISTING)
+
+        check_record_dal.find_latest_by_alphas.assert_awaited_once()
+        assert set(
+            check_record_dal.find_latest_by_alphas.await_args.kwargs["record_types"]
+        ) == {CheckRecordType.CORRELATION_SELF, CheckRecordType.SUBMISSION}
+        assert (
+            await cache.get_latest("ALPHA001", CheckRecordType.SUBMISSION)
+        ) is not None
+        assert (await cache.get_latest("ALPHA002", CheckRecordType.SUBMISSION)) is None
+        check_record_dal.find_one_by.assert_not_awaited()
+
+    async def test_miss_falls_back_and_put_overrides(
+        self, check_record_dal: MagicMock
+    ) -> None:
+        """未预取的组合回退到单条查询并缓存，新写入的记录覆盖缓存。"""
+        cache = CheckRecordCache(check_record_dal)
+
+        assert (
+            await cache.get_latest("ALPHA003", CheckRecordType.CORRELATION_PROD)
+        ) is None
+        assert (
+            await cache.get_latest("ALPHA003", CheckRecordType.CORRELATION_PROD)
+        ) is None
+        check_record_dal.find_one_by.assert_awaited_once()
+
+        record = CheckRecord(
+            alpha_id="ALPHA003",
+            record_type=CheckRecordType.CORRELATION_PROD,
+            content={"max": 0.1},
+        )
+        cache.put(record)
+
+        assert (
+            await cache.get_latest("ALPHA003", CheckRecordType.CORRELATION_PROD)
+        ) is record
+
+    async def test_evicts_least_recently_used(
+        self, check_record_dal: MagicMock
+    ) -> None:
+        """超过容量时淘汰最久未使用的条目，之后重新查询数据库。"""
+        cache = CheckRecordCache(check_record_dal, max_entries=2)
+
+        for alpha_id in ["ALPHA004", "ALPHA005", "ALPHA006"]:
+            await cache.get_latest(alpha_id, CheckRecordType.SUBMISSION)
+        await cache.get_latest("ALPHA004", CheckRecordType.SUBMISSION)
+
+        assert check_record_dal.find_one_by.await_count == 4
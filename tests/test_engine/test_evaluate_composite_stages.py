@@ -0,0 +1,300 @@
+"""测试组合评估阶段 (并行执行与自适应排序)。"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List, Optional, Set
+from uuid import uuid4
+
+import pytest
+
+from alphapower.constants import CheckRecordType, Database, RefreshPolicy
+from alphapower.dal.evaluate import CheckRecordDAL
+from alphapower.engine.evaluate.base_evaluate_stages import (
+    AdaptiveOrderEvaluateStage,
+    ParallelEvaluateStage,
+)
+from alphapower.engine.evaluate.check_record_cache import CheckRecordCache
+from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
+from alphapower.engine.evaluate.evaluate_write_buffer import EvaluateWriteBuffer
+from alphapower.entity import Alpha, CheckRecord, EvaluateRecord
+from alphapower.internal.db_session import get_db_session
+from tests.mocks.mock_evaluate_stage import run_stage
+
+# pylint: disable=W0212, W0613
+
+
+class SleepStage(AbstractEvaluateStage):
+    """等待指定时间后返回固定结果的评估阶段。"""
+
+    def __init__(
+        self,
+        delay: float,
+        passed: bool = True,
+        error: Optional[Exception] = None,
+        next_stage: Optional[AbstractEvaluateStage] = None,
+    ) -> None:
+        super().__init__(next_stage)
+        self.delay: float = delay
+        self.passed: bool = passed
+        self.error: Optional[Exception] = error
+        self.started: bool = False
+        self.finished: bool = False
+        self.cancelled: bool = False
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        self.started = True
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        self.finished = True
+        if self.error:
+            raise self.error
+        return self.passed
+
+
+class RelationshipStage(SleepStage):
+    """声明读取指定关联关系的评估阶段。"""
+
+    def __init__(
+        self,
+        relationships: Set[str],
+        next_stage: Optional[AbstractEvaluateStage] = None,
+    ) -> None:
+        super().__init__(0.0, next_stage=next_stage)
+        self.relationships: Set[str] = relationships
+
+    def _stage_relationships(self) -> Set[str]:
+        return self.relationships
+
+
+class CheckRecordStage(AbstractEvaluateStage):
+    """查找最新检查记录后写入一条新记录的评估阶段，与平台检查阶段的数据库访问一致。"""
+
+    def __init__(
+        self,
+        record_type: CheckRecordType,
+        check_record_cache: CheckRecordCache,
+        write_buffer: EvaluateWriteBuffer,
+    ) -> None:
+        super().__init__(None)
+        self.record_type: CheckRecordType = record_type
+        self.check_record_cache: CheckRecordCache = check_record_cache
+        self.write_buffer: EvaluateWriteBuffer = write_buffer
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        existing: Optional[CheckRecord] = await self.check_record_cache.get_latest(
+            alpha.alpha_id, self.record_type
+        )
+        check_record: CheckRecord = CheckRecord(
+            alpha_id=alpha.alpha_id,
+            record_type=self.record_type,
+            content={"previous": existing.id if existing else None},
+        )
+        await self.write_buffer.add(check_record)
+        self.check_record_cache.put(check_record)
+        return True
+
+
+class TestParallelEvaluateStage:
+    """测试并行评估阶段。"""
+
+    async def test_branches_run_concurrently_then_next_stage(self) -> None:
+        """所有分支并发执行，全部通过后进入下一个阶段。"""
+        branches: List[SleepStage] = [SleepStage(0.2) for _ in range(3)]
+        next_stage = SleepStage(0.0)
+        stage = ParallelEvaluateStage(next_stage=next_stage, branches=list(branches))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        passed = await run_stage(stage)
+        elapsed = loop.time() - start
+
+        assert passed
+        assert all(branch.finished for branch in branches)
+        assert next_stage.finished
+        assert elapsed < 0.5
+
+    def test_required_relationships_cover_branches_and_next_stage(self) -> None:
+        """阶段链需要的关联关系包含所有分支与后续阶段声明的关联关系。"""
+        stage = RelationshipStage(
+            {"in_sample.checks"},
+            next_stage=ParallelEvaluateStage(
+                next_stage=RelationshipStage({"regular"}),
+                branches=[
+                    RelationshipStage({"settings"}),
+                    RelationshipStage(
+                        set(), next_stage=RelationshipStage({"settings"})
+                    ),
+                ],
+            ),
+        )
+
+        assert stage.required_relationships() == {
+            "in_sample.checks",
+            "regular",
+            "settings",
+        }
+
+    async def test_failed_branch_cancels_siblings(self) -> None:
+        """任一分支失败时取消其余分支，且不进入下一个阶段。"""
+        slow = SleepStage(5.0)
+        failing = SleepStage(0.05, passed=False)
+        next_stage = SleepStage(0.0)
+        stage = ParallelEvaluateStage(next_stage=next_stage, branches=[slow, failing])
+
+        passed = await asyncio.wait_for(run_stage(stage), timeout=2.0)
+
+        assert not passed
+        assert slow.cancelled
+        assert not next_stage.started
+
+    async def test_branch_exception_cancels_siblings_and_propagates(self) -> None:
+        """分支抛出异常时取消其余分支并向上抛出。"""
+        slow = SleepStage(5.0)
+        broken = SleepStage(0.05, error=RuntimeError("boom"))
+        stage = ParallelEvaluateStage(next_stage=None, branches=[slow, broken])
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await asyncio.wait_for(run_stage(stage), timeout=2.0)
+
+        assert slow.cancelled
+
+    async def test_branch_can_be_a_chain(self) -> None:
+        """分支本身是一条责任链时，链上后续阶段失败也视为分支失败。"""
+        chain_tail = SleepStage(0.05, passed=False)
+        chain_head = SleepStage(0.0, next_stage=chain_tail)
+        sibling = SleepStage(5.0)
+        stage = ParallelEvaluateStage(next_stage=None, branches=[chain_head, sibling])
+
+        passed = await asyncio.wait_for(run_stage(stage), timeout=2.0)
+
+        assert not passed
+        assert chain_tail.finished
+        assert sibling.cancelled
+
+    async def test_branches_share_one_session(self) -> None:
+        """共享同一个数据库会话的分支并发查找、写入检查记录时不会相互干扰。"""
+        record_types: List[CheckRecordType] = [
+            CheckRecordType.CORRELATION_SELF,
+            CheckRecordType.CORRELATION_PROD,
+            CheckRecordType.BEFORE_AND_AFTER_PERFORMANCE,
+            CheckRecordType.SUBMISSION,
+        ]
+        alpha_ids: List[str] = [
+            f"PARALLEL_{uuid4().hex[:8]}_{index}" for index in range(5)
+        ]
+        async with get_db_session(Database.EVALUATE) as session:
+            check_record_dal: CheckRecordDAL = CheckRecordDAL(session)
+            write_buffer: EvaluateWriteBuffer = EvaluateWriteBuffer(
+                session, flush_size=1
+            )
+            stage = ParallelEvaluateStage(
+                next_stage=None,
+                branches=[
+                    CheckRecordStage(
+                        record_type, CheckRecordCache(check_record_dal), write_buffer
+                    )
+                    for record_type in record_types
+                ],
+            )
+            record: Any = SimpleNamespace()
+            results = await asyncio.gather(
+                *(
+                    stage.evaluate(
+                        SimpleNamespace(alpha_id=alpha_id),  # type: ignore[arg-type]
+                        RefreshPolicy.USE_EXISTING,
+                        record,
+                    )
+                    for alpha_id in alpha_ids
+                )
+            )
+            await write_buffer.close()
+
+            assert all(passed for _, passed in results)
+            for alpha_id in alpha_ids:
+                records = await check_record_dal.find_by(alpha_id=alpha_id)
+                assert {record.record_type for record in records} == set(record_types)
+                assert len(records) == len(record_types)
+
+
+class CountingStage(AbstractEvaluateStage):
+    """以固定耗时和固定结果评估，并记录被调用次数的阶段。"""
+
+    def __init__(self, delay: float, passed: bool) -> None:
+        super().__init__(None)
+        self.delay: float = delay
+        self.passed: bool = passed
+        self.calls: int = 0
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.passed
+
+
+class TestAdaptiveOrderEvaluateStage:
+    """测试自适应排序评估阶段。"""
+
+    async def test_cheap_rejecting_stage_moves_first(self) -> None:
+        """廉价且经常淘汰的阶段应被调整到昂贵阶段之前。"""
+        expensive = CountingStage(0.02, passed=True)
+        cheap_reject = CountingStage(0.0, passed=False)
+        stage = AdaptiveOrderEvaluateStage(
+            next_stage=None, stages=[expensive, cheap_reject]
+        )
+
+        results = [await run_stage(stage) for _ in range(10)]
+
+        assert not any(results)
+        assert stage.ordered_stages() == [cheap_reject, expensive]
+        assert cheap_reject.calls == 10
+        assert expensive.calls <= 2
+        assert stage.statistics[cheap_reject].pass_rate < 0.5
+
+    async def test_constraints_are_respected(self) -> None:
+        """声明的先后约束优先于统计得到的顺序。"""
+        expensive = CountingStage(0.02, passed=True)
+        cheap_reject = CountingStage(0.0, passed=False)
+        stage = AdaptiveOrderEvaluateStage(
+            next_stage=None,
+            stages=[expensive, cheap_reject],
+            constraints=[(expensive, cheap_reject)],
+        )
+
+        for _ in range(5):
+            await run_stage(stage)
+
+        assert stage.ordered_stages() == [expensive, cheap_reject]
+        assert expensive.calls == 5
+
+    def test_cyclic_constraints_rejected(self) -> None:
+        """先后约束存在环时构造失败。"""
+        first = CountingStage(0.0, passed=True)
+        second = CountingStage(0.0, passed=True)
+
+        with pytest.raises(ValueError):
+            AdaptiveOrderEvaluateStage(
+                next_stage=None,
+                stages=[first, second],
+                constraints=[(first, second), (second, first)],
+            )
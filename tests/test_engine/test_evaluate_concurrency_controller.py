@@ -0,0 +1,134 @@
+import asyncio
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import ClientResponseError
+
+from alphapower.client import RateLimitStatistics
+from alphapower.client.utils import rate_limit_handler, rate_limit_statistics
+from alphapower.engine.evaluate.concurrency_controller import (
+    AdaptiveConcurrencyController,
+)
+
+
+class FakeClock:
+    """手动推进的时钟。"""
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def build_controller(
+    clock: FakeClock, statistics: RateLimitStatistics, **kwargs: int
+) -> AdaptiveConcurrencyController:
+    """构造每两次评估调整一次上限的控制器。"""
+    return AdaptiveConcurrencyController(
+        initial_limit=kwargs.get("initial_limit", 2),
+        max_limit=kwargs.get("max_limit", 4),
+        window=2,
+        statistics=statistics,
+        clock=clock,
+    )
+
+
+def complete_window(
+    controller: AdaptiveConcurrencyController,
+    clock: FakeClock,
+    latency: float,
+    interval: float = 0.5,
+) -> None:
+    """模拟完成一个窗口的评估，每次完成间隔 interval 秒。"""
+    for _ in range(2):
+        clock.now += interval
+        controller._observe(latency)  # pylint: disable=W0212
+
+
+class TestAdaptiveConcurrencyController:
+    """测试 AIMD 并发控制器。"""
+
+    def test_additive_increase_and_multiplicative_decrease(self) -> None:
+        """吞吐平稳时逐步增加上限，出现限流等待时减半。"""
+        clock = FakeClock()
+        statistics = RateLimitStatistics()
+        controller = build_controller(clock, statistics)
+
+        limits: List[int] = []
+        for _ in range(3):
+            complete_window(controller, clock, latency=1.0)
+            limits.append(controller.limit)
+
+        assert limits == [3, 4, 4]
+        assert controller.reason == controller.REASON_AT_MAX
+
+        statistics.record_wait(5.0)
+        complete_window(controller, clock, latency=1.0)
+
+        assert controller.limit == 2
+        assert controller.snapshot() == {
+            "concurrency_limit": 2,
+            "in_flight": 0,
+            "concurrency_reason": controller.REASON_RATE_LIMITED,
+        }
+
+    def test_holds_when_latency_or_throughput_degrade(self) -> None:
+        """耗时明显上升或吞吐量下降时保持上限。"""
+        clock = FakeClock()
+        statistics = RateLimitStatistics()
+        controller = build_controller(clock, statistics, max_limit=8)
+
+        complete_window(controller, clock, latency=1.0)
+        complete_window(controller, clock, latency=3.0)
+        assert controller.limit == 3
+        assert controller.reason == controller.REASON_LATENCY_RISING
+
+        complete_window(controller, clock, latency=1.0, interval=2.0)
+        assert controller.limit == 3
+        assert controller.reason == controller.REASON_THROUGHPUT_FALLING
+
+        statistics.record_throttled_response()
+        complete_window(controller, clock, latency=1.0)
+        assert controller.limit == 1
+
+    async def test_slot_waits_for_capacity(self) -> None:
+        """在途评估达到上限时，新的评估等待名额释放。"""
+        controller = AdaptiveConcurrencyController(
+            initial_limit=2, window=100, statistics=RateLimitStatistics()
+        )
+        release = asyncio.Event()
+        entered: List[int] = []
+
+        async def evaluate(index: int) -> None:
+            async with controller.slot():
+                entered.append(index)
+                await release.wait()
+
+        tasks = [asyncio.create_task(evaluate(index)) for index in range(3)]
+        await asyncio.sleep(0.01)
+
+        assert entered == [0, 1]
+        assert controller.in_flight == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert entered == [0, 1, 2]
+        assert controller.in_flight == 0
+
+
+async def test_rate_limit_handler_records_throttled_responses() -> None:
+    """限流装饰器只把服务端 429 响应计入限流统计，异常照常抛出。"""
+
+    @rate_limit_handler
+    async def request(status: int) -> None:
+        raise ClientResponseError(MagicMock(), (), status=status)
+
+    before: int = rate_limit_statistics.throttled_responses
+    with pytest.raises(ClientResponseError):
+        await request(429)
+    with pytest.raises(ClientResponseError):
+        await request(500)
+
+    assert rate_limit_statistics.throttled_responses == before + 1
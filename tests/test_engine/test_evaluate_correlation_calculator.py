@@ -0,0 +1,814 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alphapower.constants import CorrelationCalcType, RefreshPolicy, Region
+from alphapower.engine.evaluate.base_evaluate_stages import (
+    CorrelationLocalEvaluateStage,
+)
+from alphapower.engine.evaluate import correlation_calculator
+from alphapower.engine.evaluate.correlation_calculator import (
+    CorrelationCalculator,
+    many_vs_all_pearson,
+    one_vs_all_pearson,
+)
+from alphapower.engine.evaluate.correlation_executor import (
+    CorrelationExecutor,
+    attach_shared_matrix,
+    take_aligned,
+)
+from alphapower.engine.evaluate.correlation_sketch import prune_pool_by_sketch
+from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
+from alphapower.engine.evaluate.pnl_cache import PnLCache
+from alphapower.entity import CorrelationStatistics, RecordSet
+
+# mypy: disable-error-code="attr-defined"
+
+
+def build_pnl_content(dates: pd.DatetimeIndex, pnl: np.ndarray) -> Dict[str, Any]:
+    """构造与平台 PnL 记录集一致的 TableView 内容。"""
+    return {
+        "schema": {
+            "name": "pnl",
+            "title": "PnL",
+            "properties": [
+                {"name": "date", "title": "Date", "type": "date"},
+                {"name": "pnl", "title": "PnL", "type": "amount"},
+            ],
+        },
+        "records": [
+            [date.strftime("%Y-%m-%d"), float(value)] for date, value in zip(dates, pnl)
+        ],
+    }
+
+
+def build_alpha(alpha_id: str, region: Region) -> Any:
+    """构造仅包含计算所需属性的 Alpha 替身对象。"""
+    return SimpleNamespace(alpha_id=alpha_id, settings=SimpleNamespace(region=region))
+
+
+@pytest.fixture(name="pnl_contents")
+def fixture_pnl_contents() -> Dict[str, Dict[str, Any]]:
+    """生成若干个日期范围不同的 Alpha PnL 内容。"""
+    rng = np.random.default_rng(42)
+    contents: Dict[str, Dict[str, Any]] = {}
+    for index, alpha_id in enumerate(["CAND001", "POOL001", "POOL002", "POOL003"]):
+        dates = pd.bdate_range("2021-01-01", periods=300 - index * 20)
+        contents[alpha_id] = build_pnl_content(
+            dates, np.cumsum(rng.normal(size=len(dates)) * 1000)
+        )
+    # 与 CAND001 几乎相同的候选，用于同批次去重
+    records = contents["CAND001"]["records"]
+    contents["CAND002"] = build_pnl_content(
+        pd.to_datetime([record[0] for record in records]),
+        np.array([record[1] for record in records]) + rng.normal(size=len(records)),
+    )
+    return contents
+
+
+@pytest.fixture(name="pnl_cache")
+def fixture_pnl_cache(tmp_path: Path) -> PnLCache:
+    """提供写入临时目录的 PnL 缓存。"""
+    return PnLCache(tmp_path / "pnl")
+
+
+def build_calculator(
+    pnl_contents: Dict[str, Dict[str, Any]],
+    pnl_cache: PnLCache,
+    pool_alpha_ids: List[str],
+    **kwargs: Any,
+) -> CorrelationCalculator:
+    """构造注入了模拟 DAL、池中包含指定 Alpha 的 CorrelationCalculator。"""
+
+    async def alpha_stream() -> AsyncGenerator[Any, None]:
+        for alpha_id in pool_alpha_ids:
+            yield build_alpha(alpha_id, Region.USA)
+
+    async def find_one_by(**kwargs: Any) -> Optional[Any]:
+        content = pnl_contents.get(kwargs["alpha_id"])
+        if content is None:
+            return None
+        return SimpleNamespace(
+            content=content, content_hash=RecordSet.compute_content_hash(content)
+        )
+
+    async def find_content_hashes(
+        alpha_ids: List[str], **kwargs: Any
+    ) -> Dict[str, Optional[str]]:
+        return {
+            alpha_id: RecordSet.compute_content_hash(pnl_contents[alpha_id])
+            for alpha_id in alpha_ids
+            if alpha_id in pnl_contents
+        }
+
+    record_set_dal = MagicMock()
+    record_set_dal.find_one_by = AsyncMock(side_effect=find_one_by)
+    record_set_dal.find_content_hashes = AsyncMock(side_effect=find_content_hashes)
+
+    return CorrelationCalculator(
+        client=MagicMock(),
+        alpha_stream=alpha_stream(),
+        alpha_dal=MagicMock(),
+        record_set_dal=record_set_dal,
+        correlation_dal=AsyncMock(),
+        pnl_cache=pnl_cache,
+        **kwargs,
+    )
+
+
+@pytest.fixture(name="calculator")
+def fixture_calculator(
+    pnl_contents: Dict[str, Dict[str, Any]],
+    pnl_cache: PnLCache,
+) -> CorrelationCalculator:
+    """提供注入了模拟 DAL 的 CorrelationCalculator 实例。"""
+    return build_calculator(pnl_contents, pnl_cache, ["POOL001", "POOL002", "POOL003"])
+
+
+class FakeCorrelationStatisticsDAL:
+    """以字典模拟持久化的相关性充分统计量数据访问层。"""
+
+    def __init__(self) -> None:
+        self.entities: Dict[Any, CorrelationStatistics] = {}
+
+    async def find_by_alpha(
+        self, alpha_id: str, other_alpha_ids: List[str]
+    ) -> Dict[str, CorrelationStatistics]:
+        return {
+            other_alpha_id: self.entities[tuple(sorted((alpha_id, other_alpha_id)))]
+            for other_alpha_id in other_alpha_ids
+            if tuple(sorted((alpha_id, other_alpha_id))) in self.entities
+        }
+
+    async def find_among(
+        self, alpha_ids: List[str]
+    ) -> Dict[Any, CorrelationStatistics]:
+        return {
+            key: entity
+            for key, entity in self.entities.items()
+            if key[0] in alpha_ids and key[1] in alpha_ids
+        }
+
+    async def bulk_create(
+        self, entities: List[CorrelationStatistics]
+    ) -> List[CorrelationStatistics]:
+        for entity in entities:
+            self.entities[(entity.alpha_id_a, entity.alpha_id_b)] = entity
+        return entities
+
+    async def update_all(
+        self, entities: List[CorrelationStatistics]
+    ) -> List[CorrelationStatistics]:
+        return entities
+
+
+class TestOneVsAllPearson:
+    """测试向量化的一对多皮尔逊相关系数计算。"""
+
+    def test_matches_pandas_corrwith(self) -> None:
+        """包含缺失值时结果应与 pandas corrwith 一致。"""
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=200)
+        matrix = rng.normal(size=(200, 5)) + x[:, None] * np.arange(5)
+        matrix[rng.random(size=matrix.shape) < 0.1] = np.nan
+        x[rng.random(size=x.shape) < 0.05] = np.nan
+
+        expected: List[float] = [
+            pd.Series(x).corr(pd.Series(matrix[:, col])) for col in range(5)
+        ]
+
+        np.testing.assert_allclose(one_vs_all_pearson(x, matrix), expected)
+
+    def test_insufficient_samples_is_nan(self) -> None:
+        """有效样本不足或方差为 0 时返回 NaN。"""
+        x = np.array([1.0, 2.0, np.nan])
+        matrix = np.array([[np.nan, 1.0], [np.nan, 1.0], [3.0, 1.0]])
+
+        result = one_vs_all_pearson(x, matrix)
+
+        assert np.isnan(result).all()
+
+
+class TestManyVsAllPearson:
+    """测试基于矩阵乘法的多对多皮尔逊相关系数计算。"""
+
+    def test_matches_one_vs_all(self) -> None:
+        """每一行结果应与逐个候选调用 one_vs_all_pearson 一致。"""
+        rng = np.random.default_rng(1)
+        base = rng.normal(size=(250, 1))
+        candidates = rng.normal(size=(250, 3)) + base
+        matrix = rng.normal(size=(250, 6)) + base * np.arange(6)
+        candidates[rng.random(size=candidates.shape) < 0.1] = np.nan
+        matrix[rng.random(size=matrix.shape) < 0.1] = np.nan
+
+        result = many_vs_all_pearson(candidates, matrix)
+
+        assert result.shape == (3, 6)
+        for row in range(3):
+            np.testing.assert_allclose(
+                result[row], one_vs_all_pearson(candidates[:, row], matrix)
+            )
+
+    def test_insufficient_samples_is_nan(self) -> None:
+        """有效样本不足或方差为 0 时返回 NaN。"""
+        candidates = np.array([[1.0], [2.0], [np.nan]])
+        matrix = np.array([[np.nan, 1.0], [np.nan, 1.0], [3.0, 1.0]])
+
+        result = many_vs_all_pearson(candidates, matrix)
+
+        assert np.isnan(result).all()
+
+
+@pytest.mark.asyncio
+class TestPnLCache:
+    """测试 PnL 本地二进制缓存的读写与失效。"""
+
+    async def test_put_then_get_round_trip(self, pnl_cache: PnLCache) -> None:
+        """写入后按相同哈希读取应得到相同的数据。"""
+        pnl_df = pd.DataFrame(
+            {"date": ["2024-01-01", "2024-01-02"], "pnl": [1.5, float("nan")]}
+        )
+
+        await pnl_cache.put("ALPHA01", "hash-a", pnl_df)
+        cached = await pnl_cache.get("ALPHA01", "hash-a")
+
+        assert cached is not None
+        assert list(cached.columns) == ["date", "pnl"]
+        assert list(pd.to_datetime(cached["date"])) == list(
+            pd.to_datetime(pnl_df["date"])
+        )
+        np.testing.assert_array_equal(cached["pnl"].to_numpy(), [1.5, np.nan])
+
+    async def test_new_hash_invalidates_stale_entry(self, pnl_cache: PnLCache) -> None:
+        """同一 Alpha 写入新哈希后，旧哈希的缓存应被清理。"""
+        pnl_df = pd.DataFrame({"date": ["2024-01-01"], "pnl": [1.0]})
+
+        await pnl_cache.put("ALPHA01", "hash-a", pnl_df)
+        await pnl_cache.put("ALPHA01", "hash-b", pnl_df)
+
+        assert await pnl_cache.get("ALPHA01", "hash-a") is None
+        assert await pnl_cache.get("ALPHA01", "hash-b") is not None
+
+
+@pytest.mark.asyncio
+class TestCorrelationCalculator:
+    """测试 CorrelationCalculator 的区域收益矩阵与相关性计算。"""
+
+    async def test_initialize_builds_region_matrix(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """初始化后应为区域构建按日期对齐的收益矩阵。"""
+        await calculator.initialize()
+
+        matrix = calculator._region_return_matrix[Region.USA]
+        assert list(matrix.columns) == ["POOL001", "POOL002", "POOL003"]
+        assert matrix.index.is_monotonic_increasing
+
+    async def test_calculate_correlation_matches_pairwise(
+        self,
+        calculator: CorrelationCalculator,
+        pnl_contents: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """向量化结果应与逐对 corrwith 计算的结果一致。"""
+        await calculator.initialize()
+
+        result = await calculator.calculate_correlation(
+            build_alpha("CAND001", Region.USA)
+        )
+
+        def to_returns(alpha_id: str) -> pd.DataFrame:
+            records = pnl_contents[alpha_id]["records"]
+            pnl_df = pd.DataFrame(records, columns=["date", "pnl"])
+            pnl_df["date"] = pd.to_datetime(pnl_df["date"])
+            pnl_df = pnl_df.set_index("date").ffill()
+            return (pnl_df - pnl_df.shift(1)).ffill()
+
+        x_returns = to_returns("CAND001")
+        for alpha_id in ["POOL001", "POOL002", "POOL003"]:
+            expected = x_returns.corrwith(to_returns(alpha_id)).iloc[0]
+            assert result[alpha_id] == pytest.approx(expected)
+        calculator.correlation_dal.upsert_many.assert_awaited_once()
+        assert len(calculator.correlation_dal.upsert_many.await_args.args[0]) == 3
+
+    async def test_calculate_correlation_excludes_self(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """候选 Alpha 自身位于池中时不应与自己计算相关性。"""
+        await calculator.initialize()
+
+        result = await calculator.calculate_correlation(
+            build_alpha("POOL001", Region.USA)
+        )
+
+        assert "POOL001" not in result
+        assert set(result) == {"POOL002", "POOL003"}
+
+    async def test_calculate_correlation_other_region_empty(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """候选 Alpha 所在区域没有 OS Alpha 时返回空结果。"""
+        await calculator.initialize()
+
+        result = await calculator.calculate_correlation(
+            build_alpha("CAND001", Region.CHN)
+        )
+
+        assert not result
+
+    async def test_warm_read_skips_record_set_content(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """缓存命中后再次读取 PnL 不应加载 RecordSet 内容。"""
+        await calculator.initialize()
+        calculator.record_set_dal.find_one_by.reset_mock()
+
+        pnl_df = await calculator._retrieve_pnl_from_local("POOL001")
+
+        assert pnl_df is not None
+        calculator.record_set_dal.find_one_by.assert_not_awaited()
+
+    async def test_warm_initialize_queries_content_hashes_once(
+        self,
+        pnl_contents: Dict[str, Dict[str, Any]],
+        pnl_cache: PnLCache,
+    ) -> None:
+        """缓存已预热时初始化只批量查询一次内容哈希，不逐个查询或加载记录集。"""
+        pool_alpha_ids = ["POOL001", "POOL002", "POOL003"]
+        await build_calculator(pnl_contents, pnl_cache, pool_alpha_ids).initialize()
+
+        calculator = build_calculator(pnl_contents, pnl_cache, pool_alpha_ids)
+        await calculator.initialize()
+
+        assert calculator.record_set_dal.find_content_hashes.await_count == 1
+        calculator.record_set_dal.find_one_by.assert_not_awaited()
+
+    async def test_calculate_correlation_many_matches_single(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """批量结果应与逐个计算一致，并返回候选之间的相关性。"""
+        await calculator.initialize()
+        candidates = [
+            build_alpha("CAND001", Region.USA),
+            build_alpha("CAND002", Region.USA),
+            build_alpha("POOL001", Region.USA),
+        ]
+
+        pool_result, peer_result = await calculator.calculate_correlation_many(
+            candidates
+        )
+
+        for candidate in candidates:
+            expected = await calculator.calculate_correlation(candidate)
+            assert pool_result[candidate.alpha_id] == pytest.approx(expected)
+        assert "POOL001" not in pool_result["POOL001"]
+        assert set(peer_result["CAND001"]) == {"CAND002", "POOL001"}
+        assert peer_result["CAND001"]["CAND002"] > 0.99
+
+    async def test_calculate_correlation_many_skips_missing_pnl(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """缺少 PnL 数据的候选应被跳过而不影响其他候选。"""
+        await calculator.initialize()
+        calculator._retrieve_pnl_from_platform = AsyncMock(return_value=None)
+
+        pool_result, _ = await calculator.calculate_correlation_many(
+            [build_alpha("CAND001", Region.USA), build_alpha("MISSING", Region.USA)]
+        )
+
+        assert set(pool_result) == {"CAND001"}
+
+
+@pytest.mark.asyncio
+class TestCorrelationLocalEvaluateStage:
+    """测试本地相关性评估阶段的批量路径。"""
+
+    async def test_rejects_near_duplicate_in_batch(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """同批次中与已通过 Alpha 高度相关的候选应被拒绝。"""
+        await calculator.initialize()
+        stage = CorrelationLocalEvaluateStage(
+            next_stage=None, correlation_calculator=calculator
+        )
+        candidates = [
+            build_alpha("CAND001", Region.USA),
+            build_alpha("CAND002", Region.USA),
+        ]
+        calculator.calculate_correlation = AsyncMock()  # type: ignore[method-assign]
+
+        await stage.prepare_batch(candidates, RefreshPolicy.USE_EXISTING)
+        results = [
+            await stage._evaluate_stage(
+                candidate,
+                RefreshPolicy.USE_EXISTING,
+                SimpleNamespace(self_correlation=0.0),  # type: ignore[arg-type]
+            )
+            for candidate in candidates
+        ]
+
+        assert results == [True, False]
+        calculator.calculate_correlation.assert_not_awaited()
+
+    async def test_skips_alphas_rejected_upstream(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """被上游阶段拒绝的 Alpha 不参与批量计算，批次结束后状态被释放。"""
+        await calculator.initialize()
+        stage = CorrelationLocalEvaluateStage(
+            next_stage=None, correlation_calculator=calculator
+        )
+        rejected_alpha_ids = {"CAND001"}
+
+        class RejectStage(AbstractEvaluateStage):
+            """拒绝指定 Alpha 的上游阶段。"""
+
+            async def _evaluate_stage(
+                self,
+                alpha: Any,
+                policy: RefreshPolicy,
+                record: Any,
+                **kwargs: Any,
+            ) -> bool:
+                return alpha.alpha_id not in rejected_alpha_ids
+
+        chain = RejectStage(next_stage=stage)
+        candidates = [
+            build_alpha("CAND001", Region.USA),
+            build_alpha("CAND002", Region.USA),
+        ]
+        calculate_many = AsyncMock(wraps=calculator.calculate_correlation_many)
+        calculator.calculate_correlation_many = calculate_many  # type: ignore[method-assign]
+
+        await chain.prepare_batch(candidates, RefreshPolicy.USE_EXISTING)
+        results = []
+        for candidate in candidates:
+            _, passed = await chain.evaluate(
+                candidate,
+                RefreshPolicy.USE_EXISTING,
+                SimpleNamespace(self_correlation=0.0),  # type: ignore[arg-type]
+            )
+            await chain.finish_alpha(candidate)
+            results.append(passed)
+
+        # CAND001 被上游拒绝，不再作为 CAND002 的同批次重复项
+        assert results == [False, True]
+        calculate_many.assert_awaited_once()
+        assert [alpha.alpha_id for alpha in calculate_many.await_args.args[0]] == [
+            "CAND002"
+        ]
+        assert not stage._batches
+
+
+@pytest.mark.asyncio
+class TestCorrelationStatistics:
+    """测试基于充分统计量的增量相关性更新。"""
+
+    async def test_initial_statistics_match_full_calculation(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """首次累加得到的相关系数应与全量计算一致。"""
+        calculator.correlation_statistics_dal = FakeCorrelationStatisticsDAL()  # type: ignore[assignment]
+        await calculator.initialize()
+        pool_ids = ["POOL001", "POOL002", "POOL003"]
+
+        result = await calculator.update_correlation_statistics("CAND001", pool_ids)
+        expected = await calculator.calculate_correlation(
+            build_alpha("CAND001", Region.USA)
+        )
+
+        assert result == pytest.approx(expected)
+
+    async def test_new_statistics_keep_smaller_alpha_on_a_side(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """新建统计量时 a 侧总是字典序较小的 Alpha，sum_a 对应该 Alpha 的收益。"""
+        statistics_dal = FakeCorrelationStatisticsDAL()
+        calculator.correlation_statistics_dal = statistics_dal  # type: ignore[assignment]
+
+        await calculator.update_correlation_statistics("POOL002", ["POOL001"])
+
+        statistics = statistics_dal.entities[("POOL001", "POOL002")]
+        updater = await calculator._statistics_updater()
+        returns_map = await updater.load_returns_map(["POOL001", "POOL002"])
+        start = pd.Timestamp(statistics.start_date)
+        end = pd.Timestamp(statistics.end_date)
+        returns_a = returns_map["POOL001"][0].loc[start:end]
+        returns_b = returns_map["POOL002"][0].reindex(returns_a.index)
+        valid = returns_a.notna() & returns_b.notna()
+
+        assert (statistics.alpha_id_a, statistics.alpha_id_b) == ("POOL001", "POOL002")
+        assert statistics.count == int(valid.sum())
+        assert statistics.sum_a == pytest.approx(returns_a[valid].sum())
+        assert statistics.sum_bb == pytest.approx((returns_b[valid] ** 2).sum())
+
+    async def test_refresh_pool_statistics_writes_correlations(
+        self, calculator: CorrelationCalculator
+    ) -> None:
+        """刷新因子池统计量得到的相关系数应写入相关性表。"""
+        calculator.correlation_statistics_dal = FakeCorrelationStatisticsDAL()  # type: ignore[assignment]
+        await calculator.initialize()
+
+        pairs = await calculator.refresh_pool_statistics(Region.USA)
+
+        rows = [
+            row
+            for call in calculator.correlation_dal.upsert_many.await_args_list
+            for row in call.args[0]
+        ]
+        assert pairs == 3
+        assert {(row[0], row[1]) for row in rows} == {
+            ("POOL001", "POOL002"),
+            ("POOL001", "POOL003"),
+            ("POOL002", "POOL003"),
+        }
+        assert {row[3] for row in rows} == {CorrelationCalcType.LOCAL}
+
+    async def test_incremental_update_matches_rebuild(
+        self,
+        calculator: CorrelationCalculator,
+        pnl_contents: Dict[str, Dict[str, Any]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """窗口滑动后增量更新的结果应与重新累加一致。"""
+        monkeypatch.setattr(
+            correlation_calculator, "CORRELATION_WINDOW", pd.DateOffset(months=6)
+        )
+        statistics_dal = FakeCorrelationStatisticsDAL()
+        calculator.correlation_statistics_dal = statistics_dal  # type: ignore[assignment]
+        full_records = {
+            alpha_id: content["records"] for alpha_id, content in pnl_contents.items()
+        }
+        for alpha_id in ["CAND001", "POOL001"]:
+            pnl_contents[alpha_id] = dict(
+                pnl_contents[alpha_id], records=full_records[alpha_id][:-30]
+            )
+        await calculator.update_correlation_statistics("CAND001", ["POOL001"])
+        stale_end = statistics_dal.entities[("CAND001", "POOL001")].end_date
+
+        for alpha_id in ["CAND001", "POOL001"]:
+            pnl_contents[alpha_id] = dict(
+                pnl_contents[alpha_id], records=full_records[alpha_id]
+            )
+        incremental = await calculator.update_correlation_statistics(
+            "CAND001", ["POOL001"]
+        )
+        statistics = statistics_dal.entities[("CAND001", "POOL001")]
+        incremental_count = statistics.count
+        rebuilt = await calculator.update_correlation_statistics(
+            "CAND001", ["POOL001"], force_rebuild=True
+        )
+
+        assert statistics.end_date > stale_end
+        assert incremental["POOL001"] == pytest.approx(rebuilt["POOL001"])
+        assert incremental_count == statistics.count
+
+    async def test_refresh_pool_statistics_incremental_matches_rebuild(
+        self,
+        pnl_contents: Dict[str, Dict[str, Any]],
+        pnl_cache: PnLCache,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """因子池窗口滑动后，基于区域收益矩阵的增量刷新应与重新累加一致。"""
+        monkeypatch.setattr(
+            correlation_calculator, "CORRELATION_WINDOW", pd.DateOffset(months=6)
+        )
+        pool_ids = ["POOL001", "POOL002", "POOL003"]
+        statistics_dal = FakeCorrelationStatisticsDAL()
+        full_records = {
+            alpha_id: content["records"] for alpha_id, content in pnl_contents.items()
+        }
+
+        async def refresh(force_rebuild: bool = False) -> Dict[Any, float]:
+            calculator = build_calculator(pnl_contents, pnl_cache, pool_ids)
+            calculator.correlation_statistics_dal = statistics_dal  # type: ignore[assignment]
+            await calculator.refresh_pool_statistics(
+                Region.USA, force_rebuild=force_rebuild
+            )
+            return {
+                (row[0], row[1]): row[2]
+                for call in calculator.correlation_dal.upsert_many.await_args_list
+                for row in call.args[0]
+            }
+
+        for alpha_id in pool_ids:
+            pnl_contents[alpha_id] = dict(
+                pnl_contents[alpha_id], records=full_records[alpha_id][:-30]
+            )
+        await refresh()
+        stale_end = statistics_dal.entities[("POOL001", "POOL002")].end_date
+
+        for alpha_id in pool_ids:
+            pnl_contents[alpha_id] = dict(
+                pnl_contents[alpha_id], records=full_records[alpha_id]
+            )
+        incremental = await refresh()
+        incremental_counts = {
+            key: entity.count for key, entity in statistics_dal.entities.items()
+        }
+        rebuilt = await refresh(force_rebuild=True)
+
+        assert len(statistics_dal.entities) == 3
+        assert statistics_dal.entities[("POOL001", "POOL002")].end_date > stale_end
+        assert incremental == pytest.approx(rebuilt)
+        assert incremental_counts == {
+            key: entity.count for key, entity in statistics_dal.entities.items()
+        }
+
+
+class TestSketchPruning:
+    """测试基于随机投影草图的自相关剪枝模式。"""
+
+    @pytest.fixture(name="large_pool_contents")
+    def fixture_large_pool_contents(self) -> Dict[str, Dict[str, Any]]:
+        """生成 200 个独立的池中 Alpha 以及一个与候选 Alpha 高度相关的池中 Alpha。"""
+        rng = np.random.default_rng(7)
+        dates = pd.bdate_range("2021-01-01", periods=400)
+        contents: Dict[str, Dict[str, Any]] = {}
+        for index in range(200):
+            contents[f"POOL{index:03d}"] = build_pnl_content(
+                dates, np.cumsum(rng.normal(size=len(dates)) * 1000)
+            )
+        candidate_returns = rng.normal(size=len(dates)) * 1000
+        contents["CAND001"] = build_pnl_content(dates, np.cumsum(candidate_returns))
+        contents["POOLDUP"] = build_pnl_content(
+            dates,
+            np.cumsum(candidate_returns + rng.normal(size=len(dates)) * 300),
+        )
+        return contents
+
+    async def test_pruned_max_matches_exact(
+        self,
+        large_pool_contents: Dict[str, Dict[str, Any]],
+        pnl_cache: PnLCache,
+    ) -> None:
+        """剪枝后只精确计算少量 Alpha，且最大自相关与全量计算一致。"""
+        pool_alpha_ids = [
+            alpha_id for alpha_id in large_pool_contents if alpha_id != "CAND001"
+        ]
+        exact_calculator = build_calculator(
+            large_pool_contents, pnl_cache, pool_alpha_ids
+        )
+        sketch_calculator = build_calculator(
+            large_pool_contents,
+            pnl_cache,
+            pool_alpha_ids,
+            sketch_dim=64,
+            sketch_top_k=8,
+        )
+        await exact_calculator.initialize()
+        await sketch_calculator.initialize()
+
+        exact = await exact_calculator.calculate_correlation(
+            build_alpha("CAND001", Region.USA)
+        )
+        pruned, max_is_exact = await sketch_calculator.calculate_correlation_pruned(
+            build_alpha("CAND001", Region.USA)
+        )
+
+        assert len(exact) == len(pool_alpha_ids)
+        assert max_is_exact
+        assert "POOLDUP" in pruned
+        assert len(pruned) < len(pool_alpha_ids) * 0.25
+        assert max(pruned.values()) == pytest.approx(max(exact.values()))
+        assert pruned["POOLDUP"] == pytest.approx(exact["POOLDUP"])
+
+    async def test_undecided_pruning_falls_back_to_exact(
+        self,
+        large_pool_contents: Dict[str, Dict[str, Any]],
+        pnl_cache: PnLCache,
+    ) -> None:
+        """草图误差上界超过阈值且筛选结果未超过上界时，回退到全量精确计算。"""
+        del large_pool_contents["POOLDUP"]
+        pool_alpha_ids = [
+            alpha_id for alpha_id in large_pool_contents if alpha_id != "CAND001"
+        ]
+        sketch_calculator = build_calculator(
+            large_pool_contents,
+            pnl_cache,
+            pool_alpha_ids,
+            sketch_dim=16,
+            sketch_top_k=4,
+        )
+        await sketch_calculator.initialize()
+
+        pruned, max_is_exact = await sketch_calculator.calculate_correlation_pruned(
+            build_alpha("CAND001", Region.USA)
+        )
+        exact = await sketch_calculator.calculate_correlation(
+            build_alpha("CAND001", Region.USA)
+        )
+
+        assert max_is_exact
+        assert pruned == pytest.approx(exact)
+
+    async def test_low_coverage_falls_back_to_exact(
+        self,
+        calculator: CorrelationCalculator,
+    ) -> None:
+        """候选 Alpha 日期与区域矩阵重叠不足时回退到全量计算。"""
+        calculator.sketch_dim = 16
+        calculator.sketch_top_k = 1
+        await calculator.initialize()
+        matrix = calculator._region_return_matrix[Region.USA]
+        x_returns = pd.Series(
+            np.ones(100),
+            index=pd.bdate_range(matrix.index[-1] + pd.Timedelta(days=1), periods=100),
+        )
+
+        selected = await prune_pool_by_sketch(
+            "CAND001",
+            x_returns,
+            matrix,
+            calculator._region_sketch[Region.USA],
+            calculator.sketch_margin,
+            calculator.sketch_top_k,
+        )
+
+        assert selected is None
+
+
+class TestProcessPoolExecution:
+    """测试在进程池中执行相关系数计算。"""
+
+    async def test_process_pool_matches_inline(
+        self,
+        pnl_contents: Dict[str, Dict[str, Any]],
+        pnl_cache: PnLCache,
+    ) -> None:
+        """进程池读取共享矩阵计算的结果应与事件循环内计算的结果一致。"""
+        pool_alpha_ids = ["POOL001", "POOL002", "POOL003"]
+        inline_calculator = build_calculator(
+            pnl_contents, pnl_cache, pool_alpha_ids, process_workers=0
+        )
+        pooled_calculator = build_calculator(
+            pnl_contents, pnl_cache, pool_alpha_ids, process_workers=2
+        )
+        await inline_calculator.initialize()
+        await pooled_calculator.initialize()
+        candidates = [
+            build_alpha("CAND001", Region.USA),
+            build_alpha("POOL002", Region.USA),
+        ]
+
+        try:
+            for alpha in candidates:
+                expected = await inline_calculator.calculate_correlation(alpha)
+                result = await pooled_calculator.calculate_correlation(alpha)
+                assert result.keys() == expected.keys()
+                for alpha_id, corr in expected.items():
+                    assert result[alpha_id] == pytest.approx(corr)
+
+            expected_many = await inline_calculator.calculate_correlation_many(
+                candidates
+            )
+            result_many = await pooled_calculator.calculate_correlation_many(candidates)
+            for expected_map, result_map in zip(expected_many, result_many):
+                assert result_map.keys() == expected_map.keys()
+                for alpha_id, correlations in expected_map.items():
+                    assert result_map[alpha_id] == pytest.approx(correlations)
+        finally:
+            await pooled_calculator.close()
+
+    async def test_context_manager_releases_shared_matrices(
+        self,
+        pnl_contents: Dict[str, Dict[str, Any]],
+        pnl_cache: PnLCache,
+    ) -> None:
+        """作为异步上下文管理器使用时，退出后关闭进程池并删除共享矩阵文件。"""
+        async with build_calculator(
+            pnl_contents, pnl_cache, ["POOL001", "POOL002"], process_workers=1
+        ) as calculator:
+            await calculator.initialize()
+            matrix_paths = list(calculator._region_matrix_path.values())
+            assert matrix_paths
+            assert all(Path(path).exists() for path in matrix_paths)
+
+        assert calculator.correlation_executor is None
+        assert not any(Path(path).exists() for path in matrix_paths)
+
+    async def test_publish_replaces_stale_matrix(self) -> None:
+        """同一个键重新发布后旧文件被删除，工作进程读到的是新矩阵。"""
+        executor = CorrelationExecutor(max_workers=1)
+        try:
+            first_path = executor.publish("USA", np.zeros((3, 2)))
+            second_path = executor.publish("USA", np.ones((3, 2)))
+
+            assert not Path(first_path).exists()
+            np.testing.assert_array_equal(
+                attach_shared_matrix(second_path), np.ones((3, 2))
+            )
+            np.testing.assert_array_equal(
+                take_aligned(
+                    attach_shared_matrix(second_path),
+                    np.array([2, -1]),
+                    np.array([1]),
+                ),
+                np.array([[1.0], [np.nan]]),
+            )
+        finally:
+            await executor.close()
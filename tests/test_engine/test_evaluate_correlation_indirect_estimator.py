@@ -0,0 +1,121 @@
+from math import sqrt
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Dict, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from alphapower.constants import CorrelationCalcType
+from alphapower.engine.evaluate.correlation_indirect_estimator import (
+    CorrelationIndirectEstimator,
+)
+
+# mypy: disable-error-code="attr-defined"
+
+PROD_ALPHA_IDS: List[str] = ["PROD001", "PROD002", "PROD003"]
+
+
+def build_correlation(alpha_id_a: str, alpha_id_b: str, correlation: float) -> Any:
+    """构造仅包含查询所需属性的 Correlation 替身对象。"""
+    return SimpleNamespace(
+        alpha_id_a=alpha_id_a, alpha_id_b=alpha_id_b, correlation=correlation
+    )
+
+
+@pytest.fixture(name="correlation_dal")
+def fixture_correlation_dal() -> MagicMock:
+    """提供返回固定 PLATFORM 相关性记录的模拟数据访问层。"""
+    rows: List[Any] = [
+        build_correlation("OTHER001", "PROD001", 0.3),
+        build_correlation("PROD001", "PROD002", 0.5),
+        build_correlation("PROD003", "ZOTHER01", 0.2),
+    ]
+
+    async def find_by(in_: Dict[str, List[str]], **kwargs: Any) -> List[Any]:
+        assert kwargs == {"calc_type": CorrelationCalcType.PLATFORM}
+        ((column, alpha_ids),) = in_.items()
+        return [row for row in rows if getattr(row, column) in alpha_ids]
+
+    correlation_dal = MagicMock()
+    correlation_dal.find_by = AsyncMock(side_effect=find_by)
+    return correlation_dal
+
+
+@pytest.fixture(name="estimator")
+def fixture_estimator(correlation_dal: MagicMock) -> CorrelationIndirectEstimator:
+    """提供注入了模拟计算器与数据访问层的估计器。"""
+
+    async def prod_alpha_stream() -> AsyncGenerator[Any, None]:
+        for alpha_id in PROD_ALPHA_IDS:
+            yield SimpleNamespace(alpha_id=alpha_id)
+
+    corr_calculator = MagicMock()
+    corr_calculator.calculate_correlation = AsyncMock(
+        return_value={"PROD001": 0.6, "PROD003": -0.4}
+    )
+    return CorrelationIndirectEstimator(
+        alpha_dal=MagicMock(),
+        correlation_dal=correlation_dal,
+        prod_alpha_stream=prod_alpha_stream(),
+        corr_calculator=corr_calculator,
+    )
+
+
+def upper_bound(rho_ab: float, rho_bc: float) -> float:
+    """标量版本的严格上界公式。"""
+    return sqrt((1 - rho_ab**2) * (1 - rho_bc**2)) + abs(rho_ab * rho_bc)
+
+
+class TestCorrelationIndirectEstimator:
+    """测试生产环境相关性映射的缓存与上界估计。"""
+
+    async def test_prod_map_only_contains_prod_alphas(
+        self, estimator: CorrelationIndirectEstimator
+    ) -> None:
+        """映射只包含生产环境 Alpha，取各自最大的相关性。"""
+        prod_map = await estimator.get_prod_correlations()
+
+        assert prod_map == {"PROD001": 0.5, "PROD002": 0.5, "PROD003": 0.2}
+
+    async def test_repeated_estimates_reuse_cached_map(
+        self,
+        estimator: CorrelationIndirectEstimator,
+        correlation_dal: MagicMock,
+    ) -> None:
+        """多次预测只查询一次数据库，且结果与逐个计算的最大上界一致。"""
+        first = await estimator.estimate_correlation(SimpleNamespace(alpha_id="A"))
+        second = await estimator.estimate_correlation(SimpleNamespace(alpha_id="B"))
+
+        expected = max(upper_bound(0.6, 0.5), upper_bound(-0.4, 0.2))
+        assert first == pytest.approx(expected)
+        assert second == pytest.approx(expected)
+        assert correlation_dal.find_by.await_count == 2
+
+    async def test_invalidate_and_ttl_trigger_reload(
+        self,
+        estimator: CorrelationIndirectEstimator,
+        correlation_dal: MagicMock,
+    ) -> None:
+        """调用 invalidate 或缓存过期后重新查询，生产环境 Alpha 流仍然可用。"""
+        await estimator.get_prod_correlations()
+        estimator.invalidate()
+        prod_map = await estimator.get_prod_correlations()
+
+        assert correlation_dal.find_by.await_count == 4
+        assert set(prod_map) == set(PROD_ALPHA_IDS)
+
+        estimator.cache_ttl = 0.0
+        await estimator.get_prod_correlations()
+        assert correlation_dal.find_by.await_count == 6
+
+    async def test_calculator_stream_replays_prod_alphas(
+        self, estimator: CorrelationIndirectEstimator
+    ) -> None:
+        """估计器读取过生产环境 Alpha 流后，计算器仍能得到完整的 Alpha 列表。"""
+        await estimator.get_prod_correlations()
+
+        replayed = [
+            alpha.alpha_id async for alpha in estimator.corr_calculator.alpha_stream
+        ]
+
+        assert replayed == PROD_ALPHA_IDS
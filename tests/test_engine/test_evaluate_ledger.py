@@ -0,0 +1,193 @@
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from alphapower.constants import RefreshPolicy
+from alphapower.dal.evaluate import EvaluateLedgerDAL, EvaluateRecordDAL
+from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
+from alphapower.entity import Alpha, EvaluateRecord
+from tests.mocks.mock_evaluate_stage import NoopEvaluator, mock_alpha_fetcher
+
+# pylint: disable=W0613
+
+
+class RecordingStage(AbstractEvaluateStage):
+    """记录被评估的 Alpha，可以指定在哪些 Alpha 上抛出或捕获异常的评估阶段。"""
+
+    def __init__(
+        self,
+        threshold: float,
+        failing: Set[str],
+        erroring: Optional[Set[str]] = None,
+    ) -> None:
+        super().__init__(None)
+        self.threshold: float = threshold
+        self.failing: Set[str] = failing
+        self.erroring: Set[str] = erroring or set()
+        self.evaluated: List[str] = []
+        self.closed: bool = False
+
+    def _stage_config(self) -> Dict[str, Any]:
+        return {"threshold": self.threshold}
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        self.evaluated.append(alpha.alpha_id)
+        if alpha.alpha_id in self.failing:
+            raise RuntimeError("模拟评估中断")
+        if alpha.alpha_id in self.erroring:
+            # 模拟阶段捕获超时异常后返回失败
+            self._report_error()
+            return False
+        return True
+
+    async def _close_stage(self) -> None:
+        self.closed = True
+
+
+async def run_evaluation(
+    session: AsyncSession,
+    stage: RecordingStage,
+    alphas: List[Alpha],
+    policy: RefreshPolicy = RefreshPolicy.USE_EXISTING,
+) -> List[str]:
+    """使用评估台账评估一组 Alpha，返回通过的 Alpha ID。"""
+    async with NoopEvaluator(
+        fetcher=mock_alpha_fetcher(alphas),
+        evaluate_stage_chain=stage,
+        evaluate_record_dal=EvaluateRecordDAL(session),
+        ledger_dal=EvaluateLedgerDAL(session),
+    ) as evaluator:
+        return [
+            alpha.alpha_id
+            async for alpha in evaluator.evaluate_many(policy=policy, concurrency=2)
+        ]
+
+
+def build_alphas(count: int) -> List[Alpha]:
+    """构造使用随机 ID 的 Alpha，测试数据库跨运行保留台账。"""
+    prefix: str = f"RESUME_{uuid4().hex[:8]}"
+    return [
+        Alpha(alpha_id=f"{prefix}_{index}", date_modified=datetime(2025, 4, 1))
+        for index in range(count)
+    ]
+
+
+class TestEvaluateLedger:
+    """测试基于评估台账的增量、可续跑评估。"""
+
+    async def test_interrupted_run_resumes_unfinished_alphas(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """出错未完成的 Alpha 在下一次运行时重新评估，已完成的 Alpha 被跳过。"""
+        alphas = build_alphas(3)
+        first_stage = RecordingStage(0.7, failing={alphas[2].alpha_id})
+
+        passed = await run_evaluation(evaluate_session, first_stage, alphas)
+
+        assert sorted(passed) == [alphas[0].alpha_id, alphas[1].alpha_id]
+        assert len(first_stage.evaluated) == 3
+        # 退出评估器上下文时关闭责任链
+        assert first_stage.closed
+
+        second_stage = RecordingStage(0.7, failing=set())
+        passed = await run_evaluation(evaluate_session, second_stage, alphas)
+
+        assert passed == [alphas[2].alpha_id]
+        assert second_stage.evaluated == [alphas[2].alpha_id]
+
+    async def test_evaluator_is_reusable_across_runs(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """同一个评估器多次调用 evaluate_many，责任链只在 close 时关闭。"""
+        batches = [build_alphas(2), build_alphas(2)]
+        fetched: List[List[Alpha]] = list(batches)
+
+        async def fetch_alphas(**kwargs: Any) -> AsyncGenerator[Alpha, None]:
+            for alpha in fetched.pop(0):
+                yield alpha
+
+        fetcher = MagicMock()
+        fetcher.fetch_alphas = fetch_alphas
+        fetcher.total_alpha_count = AsyncMock(return_value=2)
+        stage = RecordingStage(0.7, failing=set())
+        evaluator = NoopEvaluator(
+            fetcher=fetcher,
+            evaluate_stage_chain=stage,
+            evaluate_record_dal=EvaluateRecordDAL(evaluate_session),
+            ledger_dal=EvaluateLedgerDAL(evaluate_session),
+        )
+
+        for batch in batches:
+            passed = [
+                alpha.alpha_id
+                async for alpha in evaluator.evaluate_many(
+                    policy=RefreshPolicy.USE_EXISTING, concurrency=2
+                )
+            ]
+            assert sorted(passed) == sorted(alpha.alpha_id for alpha in batch)
+            assert not stage.closed
+
+        await evaluator.close()
+
+        assert stage.closed
+        assert len(stage.evaluated) == 4
+
+    async def test_changed_inputs_invalidate_verdicts(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """Alpha 被修改或阶段链配置变化时，之前的结论不再有效。"""
+        alphas = build_alphas(2)
+        await run_evaluation(evaluate_session, RecordingStage(0.7, set()), alphas)
+
+        alphas[0].date_modified = datetime(2025, 4, 2)
+        stage = RecordingStage(0.7, set())
+        await run_evaluation(evaluate_session, stage, alphas)
+        assert stage.evaluated == [alphas[0].alpha_id]
+
+        stage = RecordingStage(0.5, set())
+        await run_evaluation(evaluate_session, stage, alphas)
+        assert sorted(stage.evaluated) == [alpha.alpha_id for alpha in alphas]
+
+    async def test_stage_errors_are_not_settled(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """阶段捕获异常后返回的失败不记入台账，下一次运行时重新评估。"""
+        alphas = build_alphas(2)
+        first_stage = RecordingStage(0.7, set(), erroring={alphas[1].alpha_id})
+
+        passed = await run_evaluation(evaluate_session, first_stage, alphas)
+        assert passed == [alphas[0].alpha_id]
+
+        second_stage = RecordingStage(0.7, set())
+        passed = await run_evaluation(evaluate_session, second_stage, alphas)
+
+        assert passed == [alphas[1].alpha_id]
+        assert second_stage.evaluated == [alphas[1].alpha_id]
+
+    async def test_force_refresh_reevaluates_settled_alphas(
+        self, evaluate_session: AsyncSession
+    ) -> None:
+        """强制刷新的运行不跳过台账中已有结论的 Alpha。"""
+        alphas = build_alphas(2)
+        await run_evaluation(
+            evaluate_session,
+            RecordingStage(0.7, set()),
+            alphas,
+            RefreshPolicy.FORCE_REFRESH,
+        )
+
+        stage = RecordingStage(0.7, set())
+        await run_evaluation(
+            evaluate_session, stage, alphas, RefreshPolicy.FORCE_REFRESH
+        )
+
+        assert sorted(stage.evaluated) == [alpha.alpha_id for alpha in alphas]
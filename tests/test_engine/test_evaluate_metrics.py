@@ -0,0 +1,178 @@
+"""测试评估运行的指标汇总。"""
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from alphapower.constants import RefreshPolicy
+from alphapower.engine.evaluate.base_evaluate_stages import ParallelEvaluateStage
+from alphapower.engine.evaluate.evaluate_metrics import EvaluateMetrics
+from alphapower.engine.evaluate.evaluate_stage_abc import AbstractEvaluateStage
+from alphapower.engine.evaluate.stage_statistics import StageStatistics
+from alphapower.entity import Alpha, EvaluateRecord
+from tests.mocks.mock_evaluate_stage import (
+    NoopEvaluator,
+    mock_alpha_fetcher,
+    run_stage,
+)
+
+# pylint: disable=W0212, W0613
+
+
+class ResultStage(AbstractEvaluateStage):
+    """返回固定结果或抛出异常的评估阶段。"""
+
+    def __init__(
+        self,
+        passed: bool = True,
+        error: Optional[Exception] = None,
+        next_stage: Optional[AbstractEvaluateStage] = None,
+    ) -> None:
+        super().__init__(next_stage)
+        self.passed: bool = passed
+        self.error: Optional[Exception] = error
+
+    async def _evaluate_stage(
+        self,
+        alpha: Alpha,
+        policy: RefreshPolicy,
+        record: EvaluateRecord,
+        **kwargs: Any,
+    ) -> bool:
+        if self.error:
+            raise self.error
+        return self.passed
+
+
+class FailingStage(ResultStage):
+    """总是未通过的评估阶段。"""
+
+    def __init__(self, next_stage: Optional[AbstractEvaluateStage] = None) -> None:
+        super().__init__(passed=False, next_stage=next_stage)
+
+
+class ErrorStage(ResultStage):
+    """总是抛出异常的评估阶段。"""
+
+    def __init__(self, next_stage: Optional[AbstractEvaluateStage] = None) -> None:
+        super().__init__(error=RuntimeError("平台错误"), next_stage=next_stage)
+
+
+class TestEvaluateMetrics:
+    """测试阶段耗时、结果与检查操作的记录。"""
+
+    async def test_records_stage_outcomes_through_chain(self) -> None:
+        """挂载到责任链后，组合阶段的子阶段和后续阶段都记录结果。"""
+        metrics = EvaluateMetrics()
+        chain = ParallelEvaluateStage(
+            next_stage=FailingStage(),
+            branches=[ResultStage()],
+        )
+        chain.attach_metrics(metrics)
+
+        assert not await run_stage(chain)
+        assert not await run_stage(chain)
+
+        error_stage = ErrorStage()
+        error_stage.attach_metrics(metrics)
+        with pytest.raises(RuntimeError):
+            await run_stage(error_stage)
+
+        snapshot: Dict[str, Any] = json.loads(metrics.to_json())
+        stages: Dict[str, Any] = snapshot["stages"]
+        assert stages["ParallelEvaluateStage"]["passed"] == 2
+        assert stages["ResultStage"]["passed"] == 2
+        assert stages["FailingStage"]["failed"] == 2
+        assert stages["ErrorStage"]["errors"] == 1
+        assert sum(stages["ResultStage"]["latency_histogram"].values()) == 2
+
+        metrics.reset()
+        assert metrics.snapshot()["stages"] == {}
+
+    async def test_records_check_actions(self) -> None:
+        """按阶段统计检查操作的决定。"""
+        metrics = EvaluateMetrics()
+        stage = ResultStage()
+        stage.attach_metrics(metrics)
+        existing: Any = SimpleNamespace()
+
+        for policy, record in (
+            (RefreshPolicy.FORCE_REFRESH, existing),
+            (RefreshPolicy.REFRESH_ASYNC_IF_MISSING, existing),
+            (RefreshPolicy.REFRESH_ASYNC_IF_MISSING, existing),
+            (RefreshPolicy.USE_EXISTING, None),
+        ):
+            await stage._determine_check_action(policy, record, "ALPHA001", "测试")
+
+        assert dict(metrics.check_actions["ResultStage"]) == {
+            "REFRESH": 1,
+            "USE_EXISTING": 2,
+            "FAIL_MISSING": 1,
+        }
+
+    async def test_exports_periodically(self) -> None:
+        """按间隔调用导出函数，直到被取消。"""
+        metrics = EvaluateMetrics()
+        metrics.record_evaluation(True, 0.2)
+        exported: List[Dict[str, Any]] = []
+
+        async def exporter(snapshot: Dict[str, Any]) -> None:
+            exported.append(snapshot)
+
+        task = asyncio.create_task(metrics.export_periodically(0.01, exporter))
+        await asyncio.sleep(0.035)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert len(exported) >= 2
+        assert exported[-1]["evaluations"]["passed"] == 1
+
+    async def test_evaluate_many_dumps_summary(self, tmp_path: Path) -> None:
+        """evaluate_many 结束时写入 JSON 指标汇总，包含整体评估与各阶段统计。"""
+        alphas: List[Any] = [
+            SimpleNamespace(alpha_id=f"ALPHA00{index}") for index in range(3)
+        ]
+        summary_path: Path = tmp_path / "metrics.json"
+        evaluator = NoopEvaluator(
+            fetcher=mock_alpha_fetcher(alphas),
+            evaluate_stage_chain=ResultStage(next_stage=FailingStage()),
+            evaluate_record_dal=MagicMock(),
+            metrics_summary_path=str(summary_path),
+        )
+
+        passed = [
+            alpha
+            async for alpha in evaluator.evaluate_many(
+                policy=RefreshPolicy.USE_EXISTING, concurrency=2
+            )
+        ]
+
+        assert not passed
+        summary: Dict[str, Any] = json.loads(summary_path.read_text("utf-8"))
+        assert summary["evaluations"]["failed"] == 3
+        assert summary["stages"]["ResultStage"]["passed"] == 3
+        assert summary["stages"]["FailingStage"]["failed"] == 3
+        assert evaluator.metrics.snapshot()["evaluations"]["count"] == 3
+
+
+class TestStageStatistics:
+    """测试阶段统计的结果计数与耗时直方图。"""
+
+    def test_counts_and_histogram(self) -> None:
+        """异常计入 errors，不计入通过与未通过；耗时落入对应的桶。"""
+        statistics = StageStatistics()
+        statistics.record(True, 0.005)
+        statistics.record(False, 0.3)
+        statistics.record(True, 120.0, error=True)
+
+        assert (statistics.passed, statistics.failed, statistics.errors) == (1, 1, 1)
+        histogram: Dict[str, int] = statistics.latency_histogram()
+        assert histogram["le_0.01"] == 1
+        assert histogram["le_0.5"] == 1
+        assert histogram["gt_60.0"] == 1
+        assert sum(histogram.values()) == 3
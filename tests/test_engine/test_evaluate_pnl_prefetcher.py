@@ -0,0 +1,133 @@
+import asyncio
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+import pytest
+
+from alphapower.client import TableView
+from alphapower.engine.evaluate.pnl_cache import PnLCache
+from alphapower.engine.evaluate.pnl_prefetcher import PnLPrefetcher
+
+# mypy: disable-error-code="attr-defined"
+
+
+def build_table_view(alpha_id: str) -> TableView:
+    """构造与平台 PnL 记录集一致的 TableView。"""
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    return TableView.model_validate(
+        {
+            "schema": {
+                "name": "pnl",
+                "title": "PnL",
+                "properties": [
+                    {"name": "date", "title": "Date", "type": "date"},
+                    {"name": "pnl", "title": "PnL", "type": "amount"},
+                ],
+            },
+            "records": [
+                [date.strftime("%Y-%m-%d"), float(index + len(alpha_id))]
+                for index, date in enumerate(dates)
+            ],
+        }
+    )
+
+
+class FakeClient:
+    """记录并发数的模拟客户端，FAIL 开头的 Alpha 返回空记录集。"""
+
+    def __init__(self) -> None:
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.polls: List[str] = []
+
+    async def __aenter__(self) -> "FakeClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    async def alpha_fetch_record_set_pnl(
+        self, alpha_id: str
+    ) -> Tuple[bool, Optional[TableView], float, Any]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.polls.append(alpha_id)
+            # 每个 Alpha 第一次轮询时尚未生成
+            if self.polls.count(alpha_id) == 1:
+                return False, None, 0.0, None
+            if alpha_id.startswith("FAIL"):
+                return True, None, 0.0, None
+            return True, build_table_view(alpha_id), 0.0, None
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(name="client")
+def fixture_client() -> FakeClient:
+    """提供模拟客户端。"""
+    return FakeClient()
+
+
+@pytest.fixture(name="record_set_dal")
+def fixture_record_set_dal() -> MagicMock:
+    """提供模拟的 RecordSet 数据访问层。"""
+    record_set_dal = MagicMock()
+    record_set_dal.find_by = AsyncMock(return_value=[])
+    record_set_dal.bulk_create = AsyncMock()
+    record_set_dal.update_all = AsyncMock()
+    record_set_dal.session.commit = AsyncMock()
+    return record_set_dal
+
+
+@pytest.mark.asyncio
+class TestPnLPrefetcher:
+    """测试 PnL 并发预取器。"""
+
+    async def test_prefetch_respects_concurrency_and_flushes_in_batches(
+        self, client: FakeClient, record_set_dal: MagicMock, tmp_path: Path
+    ) -> None:
+        """并发数不超过上限，且按批次写入数据库与本地缓存。"""
+        pnl_cache = PnLCache(tmp_path / "pnl")
+        prefetcher = PnLPrefetcher(
+            client=client,  # type: ignore[arg-type]
+            record_set_dal=record_set_dal,
+            pnl_cache=pnl_cache,
+            concurrency=3,
+            flush_size=4,
+        )
+        alpha_ids = [f"ALPHA{index:02d}" for index in range(10)]
+
+        fetched = await prefetcher.prefetch(alpha_ids)
+
+        assert sorted(fetched) == alpha_ids
+        assert 1 < client.max_in_flight <= 3
+        assert record_set_dal.session.commit.await_count == 3
+        created = [
+            record_set
+            for call in record_set_dal.bulk_create.await_args_list
+            for record_set in call.args[0]
+        ]
+        assert sorted(record_set.alpha_id for record_set in created) == alpha_ids
+        assert all(
+            pnl_cache.contains(record_set.alpha_id, record_set.content_hash)
+            for record_set in created
+        )
+
+    async def test_prefetch_skips_failed_alphas(
+        self, client: FakeClient, record_set_dal: MagicMock
+    ) -> None:
+        """单个 Alpha 失败不应中断整批预取。"""
+        prefetcher = PnLPrefetcher(
+            client=client,  # type: ignore[arg-type]
+            record_set_dal=record_set_dal,
+            concurrency=2,
+        )
+
+        fetched = await prefetcher.prefetch(["ALPHA01", "FAIL01", "ALPHA02"])
+
+        assert sorted(fetched) == ["ALPHA01", "ALPHA02"]
+        record_set_dal.session.commit.assert_awaited_once()
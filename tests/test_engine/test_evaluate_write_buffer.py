@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+from alphapower.engine.evaluate.evaluate_write_buffer import EvaluateWriteBuffer
+from alphapower.entity import EvaluateRecord
+
+# mypy: disable-error-code="attr-defined"
+
+
+@pytest.fixture(name="session")
+def fixture_session() -> MagicMock:
+    """提供按调用顺序记录写入操作的模拟会话。"""
+    operations: List[Any] = []
+    session = MagicMock()
+    session.operations = operations
+    session.add = MagicMock(side_effect=lambda entity: operations.append(entity))
+    session.merge = AsyncMock(side_effect=operations.append)
+    session.execute = AsyncMock(side_effect=operations.append)
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+class TestEvaluateWriteBuffer:
+    """测试评估结果写后缓冲区。"""
+
+    async def test_flushes_in_order_when_size_reached(self, session: MagicMock) -> None:
+        """达到批量大小时按入队顺序在一个事务中提交。"""
+        buffer = EvaluateWriteBuffer(session, flush_size=3, flush_interval=0)
+        statement = delete(EvaluateRecord).where(EvaluateRecord.alpha_id == "ALPHA001")
+
+        await buffer.execute(statement)
+        await buffer.add("record")
+        session.commit.assert_not_awaited()
+        await buffer.merge("record_set")
+
+        assert session.operations == [statement, "record", "record_set"]
+        session.commit.assert_awaited_once()
+        assert len(buffer) == 0
+
+    async def test_flushes_after_interval(self, session: MagicMock) -> None:
+        """未达到批量大小的记录在间隔到期后提交。"""
+        buffer = EvaluateWriteBuffer(session, flush_size=100, flush_interval=0.05)
+
+        await buffer.add("record")
+        await asyncio.sleep(0.2)
+
+        session.commit.assert_awaited_once()
+        assert len(buffer) == 0
+        await buffer.close()
+        session.commit.assert_awaited_once()
+
+    async def test_flushes_remaining_on_cancellation(self, session: MagicMock) -> None:
+        """使用缓冲区的任务被取消时，退出上下文仍会写入剩余记录。"""
+        started = asyncio.Event()
+
+        async def evaluate() -> None:
+            async with EvaluateWriteBuffer(session, flush_interval=60) as buffer:
+                await buffer.add("record")
+                started.set()
+                await asyncio.sleep(60)
+
+        task = asyncio.create_task(evaluate())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert session.operations == ["record"]
+        session.commit.assert_awaited_once()
+
+    async def test_isolates_failed_operation(self, session: MagicMock) -> None:
+        """批量提交失败时逐条重试，只保留失败的操作并在关闭时报告。"""
+
+        def add(entity: Any) -> None:
+            if entity == "bad_record":
+                raise IntegrityError("INSERT", None, Exception("constraint failed"))
+            session.operations.append(entity)
+
+        session.add = MagicMock(side_effect=add)
+        buffer = EvaluateWriteBuffer(session, flush_size=3, flush_interval=0)
+
+        await buffer.add("record")
+        await buffer.add("bad_record")
+        # 触发提交的调用方不承担其他操作的失败
+        await buffer.add("other_record")
+
+        assert session.operations == ["record", "record", "other_record"]
+        assert session.rollback.await_count == 2
+        assert session.commit.await_count == 2
+        assert [kind for kind, _, _ in buffer.failed_operations] == [buffer.ADD]
+        assert len(buffer) == 0
+
+        with pytest.raises(RuntimeError, match="bad_record") as exc_info:
+            await buffer.close()
+        assert isinstance(exc_info.value.__cause__, IntegrityError)
+        assert not buffer.failed_operations
+        await buffer.close()
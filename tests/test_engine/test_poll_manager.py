@@ -0,0 +1,140 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import pytest
+
+from alphapower.client import PollManager
+
+PollFunction = Callable[[], Awaitable[Tuple[bool, Optional[float], str]]]
+
+
+def build_poll(name: str, retry_afters: List[float], calls: List[str]) -> PollFunction:
+    """构造依次返回给定 Retry-After，之后返回完成结果的轮询函数。"""
+    remaining: List[float] = list(retry_afters)
+
+    async def poll() -> Tuple[bool, Optional[float], str]:
+        calls.append(name)
+        if remaining:
+            return False, remaining.pop(0), ""
+        return True, None, f"{name}-done"
+
+    return poll
+
+
+class TestPollManager:
+    """测试集中轮询管理器。"""
+
+    async def test_polls_in_due_order_and_resolves_callers(self) -> None:
+        """按 Retry-After 到期顺序轮询，每个调用方得到自己的结果。"""
+        manager = PollManager()
+        calls: List[str] = []
+
+        results = await asyncio.gather(
+            manager.poll(build_poll("slow", [0.05], calls), key="slow"),
+            manager.poll(build_poll("fast", [0.01, 0.01], calls), key="fast"),
+            manager.poll(
+                build_poll("delayed", [], calls), initial_delay=0.03, key="delayed"
+            ),
+        )
+
+        assert results == ["slow-done", "fast-done", "delayed-done"]
+        assert calls == ["slow", "fast", "fast", "fast", "delayed", "slow"]
+        assert manager.polls == 6
+        await manager.close()
+
+    async def test_limits_concurrent_polls(self) -> None:
+        """同时进行的轮询数量不超过上限。"""
+        manager = PollManager(max_concurrent_polls=2)
+        in_flight: int = 0
+        peak: int = 0
+
+        async def poll() -> Tuple[bool, Optional[float], int]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True, None, peak
+
+        await asyncio.gather(*(manager.poll(poll) for _ in range(6)))
+
+        assert peak == 2
+        await manager.close()
+
+    async def test_timeout_and_errors_propagate(self) -> None:
+        """超时抛出 TimeoutError，轮询函数的异常传递给调用方。"""
+        manager = PollManager()
+        calls: List[str] = []
+
+        with pytest.raises(TimeoutError):
+            await manager.poll(
+                build_poll("stuck", [0.02] * 10, calls), timeout=0.05, key="stuck"
+            )
+        assert 1 < len(calls) < 10
+
+        async def failing() -> Tuple[bool, Optional[float], str]:
+            raise RuntimeError("平台错误")
+
+        with pytest.raises(RuntimeError):
+            await manager.poll(failing)
+        await manager.close()
+
+    async def test_hung_poll_is_requeued_and_frees_slot(self) -> None:
+        """挂起的单次轮询超时后释放并发名额并重新排队，只有总超时到期才失败。"""
+        manager = PollManager(max_concurrent_polls=1, poll_timeout=0.05)
+        calls: List[str] = []
+        attempts: int = 0
+
+        async def hung_once() -> Tuple[bool, Optional[float], str]:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                await asyncio.sleep(10)
+            return True, None, "hung-done"
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                manager.poll(hung_once, key="hung"),
+                manager.poll(build_poll("next", [], calls), initial_delay=0.01),
+            ),
+            timeout=1.0,
+        )
+        assert results == ["hung-done", "next-done"]
+        assert attempts == 2
+
+        async def hung() -> Tuple[bool, Optional[float], str]:
+            calls.append("hung")
+            await asyncio.sleep(10)
+            return True, None, "hung-done"
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(
+                manager.poll(hung, timeout=0.12, key="deadline"), timeout=1.0
+            )
+        assert calls.count("hung") > 1
+
+        manager.poll_timeout = None
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(
+                manager.poll(hung, timeout=0.05, key="deadline"), timeout=1.0
+            )
+        await manager.close()
+
+    async def test_cancelled_caller_is_dropped(self) -> None:
+        """调用方被取消后不再轮询其任务。"""
+        manager = PollManager()
+        calls: List[str] = []
+
+        waiter = asyncio.create_task(
+            manager.poll(build_poll("cancelled", [0.01] * 100, calls))
+        )
+        await asyncio.sleep(0.03)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        polled: int = len(calls)
+
+        assert await manager.poll(build_poll("next", [], calls)) == "next-done"
+        await asyncio.sleep(0.03)
+        assert calls.count("cancelled") == polled
+        await manager.close()
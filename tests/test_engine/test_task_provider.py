@@ -1,23 +1,25 @@
 """测试DatabaseTaskProvider类的功能模块。
 
 本模块包含对DatabaseTaskProvider类的单元测试，重点测试其fetch_tasks方法在各种情况下的行为：
-- 从数据库正常获取任务
+- 从数据库认领待处理任务
 - 当数据库中没有符合条件的任务时的行为
 - 使用不存在的优先级获取任务的情况
 - fetch_tasks方法抛出异常时的错误处理
+- 多个任务提供者以租约共享同一个任务库
 
-这些测试使用pytest异步测试框架和模拟(mock)来隔离测试环境。
+认领语义直接在测试数据库上验证，每个测试使用独立的优先级，避免与其他测试的数据混淆。
 """
 
-from typing import AsyncGenerator, List, Optional
+from datetime import datetime
+from typing import List, Optional
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
 
-from alphapower.client import SimulationSettingsView
 from alphapower.constants import (
+    AlphaType,
+    Database,
     Delay,
     InstrumentType,
     Neutralization,
@@ -27,112 +29,102 @@ from alphapower.constants import (
     UnitHandling,
     Universe,
 )
-from alphapower.engine.simulation.task.core import create_simulation_tasks
 from alphapower.engine.simulation.task.provider import DatabaseTaskProvider
 from alphapower.entity import SimulationTask, SimulationTaskStatus
 from alphapower.internal.db_session import get_db_session
 
 
-@pytest.fixture(name="session")
-async def fixture_session() -> AsyncGenerator[AsyncSession, None]:
+async def create_pending_tasks(prefix: str, priority: int, count: int) -> List[int]:
     """
-    Fixture for creating a database session.
+    创建一组待处理任务并提交，返回按创建顺序排列的任务 id。
+
+    Args:
+        prefix: 任务签名与表达式的前缀
+        priority: 任务优先级
+        count: 任务数量
     """
+    tasks: List[SimulationTask] = [
+        SimulationTask(
+            type=AlphaType.REGULAR,
+            signature=f"{prefix}_SIG_{i}",
+            settings_group_key=f"{prefix}_GROUP",
+            status=SimulationTaskStatus.PENDING,
+            priority=priority,
+            regular=f"{prefix.lower()}_task_{i}",
+            instrument_type=InstrumentType.EQUITY,
+            region=Region.USA,
+            universe=Universe.TOP3000,
+            delay=Delay.ONE,
+            neutralization=Neutralization.MARKET,
+            pasteurization=Switch.ON,
+            unit_handling=UnitHandling.VERIFY,
+            max_trade=Switch.OFF,
+            language=RegularLanguage.FASTEXPR,
+            visualization=False,
+        )
+        for i in range(count)
+    ]
     async with get_db_session(Database.SIMULATION) as session:
-        yield session
+        session.add_all(tasks)
+        await session.flush()
+        return [task.id for task in tasks]
 
 
-@pytest.mark.asyncio
-async def test_fetch_tasks(session: AsyncSession) -> None:
+async def delete_tasks(task_ids: List[int]) -> None:
     """
-    测试从数据库中获取任务的功能。
-
-    该测试验证fetch_tasks方法能够正确地从数据库中获取任务，并检查返回的任务属性是否符合预期。
+    删除测试创建的任务。
 
     Args:
-        session: 异步数据库会话对象
+        task_ids: 任务 id 列表
     """
-    # 准备测试数据
-    regular = ["task1", "task2"]
-    settings = [
-        SimulationSettingsView.model_construct(
-            region=Region.USA.name,
-            delay=Delay.ONE.value,
-            language=RegularLanguage.EXPRESSION.value,
-            instrument_type=InstrumentType.EQUITY.value,
-            universe=Universe.TOP1000.value,
-            neutralization=Neutralization.INDUSTRY.value,
-            pasteurization=Switch.ON.value,
-            unit_handling=UnitHandling.VERIFY.value,
-            max_trade=Switch.OFF.value,
-            decay=10,
-            truncation=0.5,
-            visualization=False,
-            test_period="2020-01-01:2021-01-01",
-        ),
-        SimulationSettingsView.model_construct(
-            region=Region.CHN.name,
-            delay=Delay.ONE.value,
-            language=RegularLanguage.EXPRESSION.value,
-            instrument_type=InstrumentType.EQUITY.value,
-            universe=Universe.TOP2000U.value,
-            neutralization=Neutralization.INDUSTRY.value,
-            pasteurization=Switch.ON.value,
-            unit_handling=UnitHandling.VERIFY.value,
-            max_trade=Switch.OFF.value,
-            decay=10,
-            truncation=0.5,
-            visualization=False,
-            test_period="2020-01-01:2021-01-01",
-        ),
-    ]
-    priority = [1, 1]
-    tags_list: List[Optional[List[str]]] = [
-        ["tag1", "tag2"],
-        ["tag3", "tag4"],
-    ]
+    async with get_db_session(Database.SIMULATION) as session:
+        await session.execute(
+            delete(SimulationTask).where(SimulationTask.id.in_(task_ids))
+        )
 
-    # 向数据库插入测试数据
-    await create_simulation_tasks(session, regular, settings, priority, tags_list)
-    await session.commit()
 
-    # 初始化 DatabaseTaskProvider
-    provider = DatabaseTaskProvider(session=session)
+@pytest.mark.asyncio
+async def test_fetch_tasks() -> None:
+    """
+    测试从数据库中认领任务的功能。
 
-    # 调用 fetch_tasks 方法
-    tasks = await provider.fetch_tasks(count=2, priority=1)
+    该测试验证fetch_tasks方法按 id 顺序认领指定优先级的待处理任务，认领到的任务
+    标记为已调度并写入租约，且不会被再次认领。
+    """
+    fetch_priority: int = 8881
+    task_ids = await create_pending_tasks("FETCH", fetch_priority, 2)
+    provider = DatabaseTaskProvider(owner="fetch-test", lease_seconds=60)
+
+    try:
+        tasks = await provider.fetch_tasks(count=2, priority=fetch_priority)
 
-    # 验证返回值
-    assert len(tasks) == 2
-    assert tasks[0].regular == "task1"
-    assert tasks[1].regular == "task2"
+        # 验证返回值
+        assert [task.id for task in tasks] == task_ids
+        assert [task.regular for task in tasks] == ["fetch_task_0", "fetch_task_1"]
 
-    # 验证任务状态和其他属性
-    for i, task in enumerate(tasks):
-        assert task.status == SimulationTaskStatus.PENDING
-        assert task.priority == 1
-        assert task.region.name == settings[i].region
-        assert task.delay.value == settings[i].delay
-        assert task.language.name == settings[i].language
-        assert task.instrument_type.name == settings[i].instrument_type
+        # 验证任务已被认领
+        for task in tasks:
+            assert task.status == SimulationTaskStatus.SCHEDULED
+            assert task.lease_owner == "fetch-test"
+            assert task.lease_expires_at is not None
+            assert task.lease_expires_at > datetime.now()
+            assert task.priority == fetch_priority
 
-    # 清理测试数据
-    await session.execute(text(f"DELETE FROM {SimulationTask.__tablename__}"))
-    await session.commit()
+        # 已认领的任务不会被再次认领
+        assert not await provider.fetch_tasks(count=2, priority=fetch_priority)
+    finally:
+        await provider.stop()
+        await delete_tasks(task_ids)
 
 
 @pytest.mark.asyncio
-async def test_fetch_tasks_no_results(session: AsyncSession) -> None:
+async def test_fetch_tasks_no_results() -> None:
     """
     测试从数据库中获取任务的功能，当没有符合条件的任务时。
 
     该测试验证当数据库中没有符合条件的任务时，fetch_tasks方法应当返回空列表。
-
-    Args:
-        session: 异步数据库会话对象
     """
-    # 初始化 DatabaseTaskProvider
-    provider = DatabaseTaskProvider(session=session)
+    provider = DatabaseTaskProvider(owner="fetch-test", lease_seconds=60)
 
     # 调用 fetch_tasks 方法，期望无结果
     tasks = await provider.fetch_tasks(count=2, priority=10000000)
@@ -142,53 +134,27 @@ async def test_fetch_tasks_no_results(session: AsyncSession) -> None:
 
 
 @pytest.mark.asyncio
-async def test_fetch_tasks_invalid_priority(session: AsyncSession) -> None:
+async def test_fetch_tasks_invalid_priority() -> None:
     """测试使用不存在的优先级获取任务的情况。
 
-    该测试验证当请求的优先级在数据库中不存在时，fetch_tasks方法应当返回空列表。
-
-    Args:
-        session: 异步数据库会话对象
+    该测试验证当请求的优先级在数据库中不存在时，fetch_tasks方法应当返回空列表，
+    且不会认领其他优先级的任务。
     """
-    regular = ["task1"]
-    settings = [
-        SimulationSettingsView.model_construct(
-            region=Region.USA.name,
-            delay=Delay.ONE.value,
-            language=RegularLanguage.FASTEXPR.value,
-            instrument_type=InstrumentType.EQUITY.value,
-            universe=Universe.TOP1000.value,
-            neutralization=Neutralization.INDUSTRY.value,
-            pasteurization=Switch.ON.value,
-            unit_handling=UnitHandling.VERIFY.value,
-            max_trade=Switch.OFF.value,
-            decay=10,
-            truncation=0.5,
-            visualization=False,
-            test_period="2020-01-01:2021-01-01",
-        )
-    ]
-    priority = [1]
-    tags_list: List[Optional[List[str]]] = [
-        ["tag1", "tag2"],
-    ]
-
-    # 向数据库插入测试数据
-    await create_simulation_tasks(session, regular, settings, priority, tags_list)
-    await session.commit()
-
-    # 初始化 DatabaseTaskProvider
-    provider = DatabaseTaskProvider(session=session)
+    existing_priority: int = 8882
+    task_ids = await create_pending_tasks("PRIORITY", existing_priority, 1)
+    provider = DatabaseTaskProvider(owner="fetch-test", lease_seconds=60)
 
-    # 调用 fetch_tasks 方法，使用不存在的优先级
-    tasks = await provider.fetch_tasks(count=1, priority=99)
+    try:
+        # 调用 fetch_tasks 方法，使用不存在的优先级
+        tasks = await provider.fetch_tasks(count=1, priority=existing_priority + 1)
+        assert len(tasks) == 0
 
-    # 验证返回值为空
-    assert len(tasks) == 0
-
-    # 清理测试数据
-    await session.execute(text(f"DELETE FROM {SimulationTask.__tablename__}"))
-    await session.commit()
+        # 原优先级的任务仍然可以被认领
+        claimed = await provider.fetch_tasks(count=1, priority=existing_priority)
+        assert [task.id for task in claimed] == task_ids
+    finally:
+        await provider.stop()
+        await delete_tasks(task_ids)
 
 
 @pytest.mark.asyncio
@@ -210,8 +176,67 @@ async def test_fetch_tasks_exception(
         Exception: 期望抛出包含"Database error"信息的异常
     """
     # 模拟异常情况
-    provider = DatabaseTaskProvider(session=AsyncMock())
+    provider = DatabaseTaskProvider(owner="fetch-test")
 
     # 验证异常抛出
     with pytest.raises(Exception, match="Database error"):
         await provider.fetch_tasks(count=1, priority=1)
+
+
+@pytest.mark.asyncio
+async def test_providers_share_queue_by_leases() -> None:
+    """测试多个任务提供者以租约共享同一个任务库。
+
+    两个认领者拿到的任务互不重复；续约同步更新任务对象上的租约到期时间；
+    停止时释放尚未开始运行的任务。
+    """
+    lease_priority: int = 9999
+    async with get_db_session(Database.SIMULATION) as session:
+        session.add_all(
+            [
+                SimulationTask(
+                    type=AlphaType.REGULAR,
+                    signature=f"LEASE_PROVIDER_SIG_{i}",
+                    settings_group_key="LEASE_PROVIDER_GROUP",
+                    status=SimulationTaskStatus.PENDING,
+                    priority=lease_priority,
+                    regular=f"lease_task_{i}",
+                    instrument_type=InstrumentType.EQUITY,
+                    region=Region.USA,
+                    universe=Universe.TOP3000,
+                    delay=Delay.ONE,
+                    neutralization=Neutralization.MARKET,
+                    pasteurization=Switch.ON,
+                    unit_handling=UnitHandling.VERIFY,
+                    max_trade=Switch.OFF,
+                    language=RegularLanguage.FASTEXPR,
+                    visualization=False,
+                )
+                for i in range(4)
+            ]
+        )
+
+    first = DatabaseTaskProvider(owner="pool-1", lease_seconds=60)
+    second = DatabaseTaskProvider(owner="pool-2", lease_seconds=60)
+    first_tasks = await first.fetch_tasks(count=2, priority=lease_priority)
+    second_tasks = await second.fetch_tasks(count=5, priority=lease_priority)
+
+    assert len(first_tasks) == 2
+    assert len(second_tasks) == 2
+    assert not {task.id for task in first_tasks} & {task.id for task in second_tasks}
+    assert all(task.lease_owner == "pool-2" for task in second_tasks)
+
+    # 续约后任务对象上的租约到期时间同步更新
+    previous_expiry: Optional[datetime] = first_tasks[0].lease_expires_at
+    assert previous_expiry is not None
+    assert await first.renew_leases() == 2
+    current_expiry: Optional[datetime] = first_tasks[0].lease_expires_at
+    assert current_expiry is not None and current_expiry >= previous_expiry
+
+    # 停止后释放的任务可以被其他认领者获取
+    await first.stop()
+    reclaimed = await second.fetch_tasks(count=5, priority=lease_priority)
+    assert sorted(task.id for task in reclaimed) == sorted(
+        task.id for task in first_tasks
+    )
+    await second.stop()
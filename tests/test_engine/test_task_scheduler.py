@@ -3,7 +3,10 @@
 """
 
 import asyncio
-from typing import List, Optional
+import random
+import runpy
+from pathlib import Path
+from typing import Any, List, Optional
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -29,6 +32,21 @@ from alphapower.entity import SimulationTask, SimulationTaskStatus
 from alphapower.internal.db_session import get_db_session
 from tests.mocks.mock_task_worker import MockWorker
 
+BENCHMARK_PATH: Path = (
+    Path(__file__).resolve().parents[2] / "benchmarks" / "scheduler_benchmark.py"
+)
+
+
+def build_task(group_key: str, priority: int, **kwargs: Any) -> MagicMock:
+    """构造待调度的任务替身。"""
+    return MagicMock(
+        spec=SimulationTask,
+        settings_group_key=group_key,
+        priority=priority,
+        status=SimulationTaskStatus.PENDING,
+        **kwargs,
+    )
+
 
 @pytest.mark.asyncio
 async def test_add_task() -> None:
@@ -141,6 +159,108 @@ async def test_schedule_batch_tasks() -> None:
         )
 
 
+@pytest.mark.asyncio
+async def test_remove_task() -> None:
+    tasks = [build_task("group_1", priority) for priority in (10, 20, 30)]
+    scheduler = PriorityScheduler(tasks=tasks)
+
+    scheduler.remove_task(tasks[2])  # 移除堆顶
+    scheduler.remove_task(tasks[0])  # 移除堆中间的任务
+
+    assert len(scheduler) == 1
+    assert scheduler.settings_group_map == {"group_1": [tasks[1]]}
+    with pytest.raises(ValueError):
+        scheduler.remove_task(tasks[0])
+
+    assert await scheduler.schedule(batch_size=3) == [tasks[1]]
+    assert not await scheduler.has_tasks()
+
+
+@pytest.mark.asyncio
+async def test_schedule_order_matches_sorted_tasks() -> None:
+    rng = random.Random(42)
+    tasks = [
+        build_task(f"group_{rng.randrange(4)}", rng.randrange(5), id=index)
+        for index in range(200)
+    ]
+    scheduler = PriorityScheduler(tasks=tasks[:100])
+    scheduler.add_tasks(tasks[100:])
+    removed = set(rng.sample(range(200), 50))
+    for index in removed:
+        scheduler.remove_task(tasks[index])
+
+    scheduled: List[SimulationTask] = []
+    while await scheduler.has_tasks():
+        scheduled.extend(await scheduler.schedule(batch_size=1))
+
+    # 优先级相同时先加入的任务先调度
+    expected = sorted(
+        (task for task in tasks if task.id not in removed),
+        key=lambda task: (-task.priority, task.id),
+    )
+    assert scheduled == expected
+
+
+@pytest.mark.asyncio
+async def test_virtual_time_aging() -> None:
+    waiting = build_task("group_1", 0)
+    scheduler = PriorityScheduler(
+        tasks=[waiting, build_task("group_2", 1)], low_priority_threshold=2
+    )
+
+    # 每次调度后加入一个优先级更高的任务，等待的低优先级任务逐渐老化
+    assert (await scheduler.schedule())[0].priority == 1
+    scheduler.add_tasks([build_task("group_2", 1)])
+    assert scheduler.effective_priority(waiting) == 0.5
+    assert (await scheduler.schedule())[0].priority == 1
+    scheduler.add_tasks([build_task("group_2", 1)])
+
+    # 有效优先级相同时先入队的任务先调度，任务本身的优先级不被修改
+    assert await scheduler.schedule() == [waiting]
+    assert waiting.priority == 0
+    assert scheduler.virtual_time == 3
+
+
+@pytest.mark.asyncio
+async def test_requeue_keeps_virtual_deadline() -> None:
+    waiting = build_task("group_1", 0)
+    scheduler = PriorityScheduler(tasks=[waiting], low_priority_threshold=2)
+    for _ in range(2):
+        scheduler.add_tasks([build_task("group_2", 1)])
+        await scheduler.schedule()
+
+    # 等待的任务被调度后未执行又放回，期间加入了一个优先级更高的新任务
+    assert await scheduler.schedule() == [waiting]
+    scheduler.add_tasks([build_task("group_2", 1)])
+    scheduler.requeue_tasks([waiting])
+
+    # 放回的任务沿用原来的虚拟截止时间，已积累的老化使其排在新任务之前
+    assert scheduler.effective_priority(waiting) == 1.5
+    assert await scheduler.schedule() == [waiting]
+
+
+@pytest.mark.asyncio
+async def test_release_drops_virtual_deadline() -> None:
+    # 任务对象不需要支持弱引用，保留的虚拟截止时间以任务 ID 为键
+    waiting = build_task("group_1", 0, id=1)
+    scheduler = PriorityScheduler(tasks=[waiting], low_priority_threshold=2)
+    scheduler.add_tasks([build_task("group_2", 1, id=2)])
+    for _ in range(2):
+        await scheduler.schedule()
+
+    # 执行结束后释放的任务再次加入时按新任务计算虚拟截止时间
+    scheduler.release_tasks([waiting])
+    scheduler.requeue_tasks([waiting])
+    assert scheduler.effective_priority(waiting) == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_benchmark_smoke() -> None:
+    # 基准测试的任务替身使用 __slots__，不支持弱引用
+    benchmark = runpy.run_path(str(BENCHMARK_PATH))
+    await benchmark["benchmark_scheduler"](1_000)
+
+
 @pytest.mark.asyncio
 async def test_schedule_with_database_task_provider() -> None:
     """
@@ -29,7 +29,8 @@
 """
 
 import asyncio
-from typing import AsyncGenerator, Callable, List
+import itertools
+from typing import AsyncGenerator, Callable, List, Optional
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -39,6 +40,7 @@ from alphapower.client import (
     AuthenticationView,
     MultiSimulationResultView,
     SimulationSettingsView,
+    SingleSimulationPayload,
     SingleSimulationResultView,
     WorldQuantClient,
 )
@@ -55,6 +57,7 @@ from alphapower.constants import (
     Switch,
     UnitHandling,
     Universe,
+    UserRole,
 )
 from alphapower.engine.simulation.task.core import create_simulation_task
 from alphapower.engine.simulation.task.scheduler import PriorityScheduler
@@ -655,3 +658,185 @@ async def test_handle_multi_task_completion_with_partial_failures(
     mock_consultant_client.get_multi_simulation_child_result.assert_any_call(
         child_progress_id="child_id_1"
     )
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_cancels_platform_simulation(
+    mock_user_client: MagicMock,
+) -> None:
+    """
+    测试写回运行中状态时发现租约已丢失，工作者取消平台模拟且不再轮询进度。
+    """
+    worker: Worker = Worker(client=mock_user_client)
+    setattr(worker, "_user_role", UserRole.USER)
+    task = SimulationTask(
+        id=1,
+        type=AlphaType.REGULAR,
+        status=SimulationTaskStatus.SCHEDULED,
+        regular="rank(-returns)",
+        signature="test_signature",
+        settings_group_key="test_group",
+        region=Region.USA,
+        delay=Delay.ONE,
+        instrument_type=InstrumentType.EQUITY,
+        universe=Universe.TOP500,
+        neutralization=Neutralization.INDUSTRY,
+        pasteurization=Switch.ON,
+        unit_handling=UnitHandling.VERIFY,
+        max_trade=Switch.OFF,
+        language=RegularLanguage.EXPRESSION,
+        visualization=False,
+        lease_owner="pool-stale",
+    )
+    mock_user_client.simulation_create_single = AsyncMock(
+        return_value=(True, "progress_lost", 0.0)
+    )
+    mock_user_client.simulation_get_progress_single = AsyncMock()
+    mock_user_client.simulation_delete = AsyncMock(return_value=True)
+    # 租约已被其他工作者接管，所有写回都被租约屏障拒绝
+    write_back: AsyncMock = AsyncMock(side_effect=list)
+    setattr(worker, "_write_back_tasks", write_back)
+
+    await getattr(worker, "_process_single_simulation_task")(
+        task, payload=MagicMock(spec=SingleSimulationPayload)
+    )
+
+    mock_user_client.simulation_delete.assert_awaited_once_with(
+        progress_id="progress_lost"
+    )
+    mock_user_client.simulation_get_progress_single.assert_not_awaited()
+    assert task.status == SimulationTaskStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_multi_task_completion_skips_lost_tasks(
+    consultant_worker: Worker,
+) -> None:
+    """
+    测试多任务完成时跳过已失去租约的任务，只处理仍持有租约的子任务结果。
+    """
+    owned: MagicMock = MagicMock(spec=SimulationTask, id=1, type=AlphaType.REGULAR)
+    lost: MagicMock = MagicMock(spec=SimulationTask, id=2, type=AlphaType.REGULAR)
+    result = MultiSimulationResultView(
+        children=["child_id_0", "child_id_1"],
+        type=AlphaType.REGULAR.value,
+        status=SimulationTaskStatus.COMPLETE.value,
+    )
+    handled: List[int] = []
+
+    async def handle_completion(
+        task: SimulationTask, result: SingleSimulationResultView
+    ) -> None:
+        handled.append(task.id)
+
+    setattr(consultant_worker, "_dry_run", True)
+    setattr(consultant_worker, "_handle_task_completion", handle_completion)
+    await getattr(consultant_worker, "_handle_multi_task_completion")(
+        [owned, lost], result, lost_tasks=[lost]
+    )
+    await asyncio.gather(*getattr(consultant_worker, "_post_handler_futures"))
+
+    assert handled == [1]
+
+
+@pytest.mark.asyncio
+async def test_multiplexed_worker_keeps_slots_busy(
+    mock_user_client: WorldQuantClient,
+) -> None:
+    """
+    测试多槽位工作者同时保持多个模拟在途，槽位空出后立即补位。
+    """
+    worker: Worker = Worker(client=mock_user_client, dry_run=True, concurrency=3)
+    setattr(worker, "_user_role", UserRole.USER)
+
+    task_ids = itertools.count()
+
+    def next_batch(batch_size: int) -> List[SimulationTask]:
+        task: MagicMock = MagicMock(spec=SimulationTask)
+        task.id = next(task_ids)
+        return [task]
+
+    mock_scheduler: AsyncMock = AsyncMock(spec=PriorityScheduler)
+    mock_scheduler.schedule.side_effect = next_batch
+    await worker.set_scheduler(mock_scheduler)
+
+    in_flight: int = 0
+    peak: int = 0
+    processed: List[int] = []
+    current_task_counts: List[int] = []
+
+    async def process(
+        task: SimulationTask, payload: Optional[SingleSimulationPayload] = None
+    ) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        current_task_counts.append(len(await worker.get_current_tasks()))
+        await asyncio.sleep(0.02 * (task.id % 3 + 1))
+        in_flight -= 1
+        processed.append(task.id)
+        if len(processed) >= 9:
+            setattr(worker, "_shutdown_flag", True)
+
+    setattr(worker, "_process_single_simulation_task", process)
+    await asyncio.wait_for(getattr(worker, "_do_work")(), timeout=5)
+
+    assert peak == 3
+    assert len(processed) >= 9
+    assert max(current_task_counts) == 3
+    assert not await worker.get_current_tasks()
+
+
+@pytest.mark.asyncio
+async def test_worker_prefetches_next_batch(
+    mock_user_client: WorldQuantClient,
+) -> None:
+    """
+    测试工作者在当前批次执行期间准备下一批任务，退出时把未处理的预取任务放回调度器。
+    """
+    worker: Worker = Worker(client=mock_user_client, dry_run=True)
+    setattr(worker, "_user_role", UserRole.USER)
+    task_ids = itertools.count()
+    # fetched[n] 在第 n 批任务从调度器取出时置位
+    fetched: List[asyncio.Event] = [asyncio.Event() for _ in range(5)]
+
+    def next_batch(batch_size: int) -> List[SimulationTask]:
+        # 已通过租约认领的任务无需写回调度状态，不访问数据库
+        task: MagicMock = MagicMock(
+            spec=SimulationTask,
+            status=SimulationTaskStatus.SCHEDULED,
+            lease_owner="pool-test",
+        )
+        task.id = next(task_ids)
+        fetched[task.id].set()
+        return [task]
+
+    mock_scheduler: MagicMock = MagicMock(spec=PriorityScheduler)
+    mock_scheduler.schedule = AsyncMock(side_effect=next_batch)
+    await worker.set_scheduler(mock_scheduler)
+
+    processed: List[int] = []
+
+    async def process(
+        task: SimulationTask, payload: Optional[SingleSimulationPayload] = None
+    ) -> None:
+        # 当前批次结束前，下一批已经从调度器取出；未预取时等待超时
+        await asyncio.wait_for(fetched[task.id + 1].wait(), timeout=1)
+        processed.append(task.id)
+        if len(processed) >= 3:
+            setattr(worker, "_shutdown_flag", True)
+
+    setattr(worker, "_process_single_simulation_task", process)
+    await asyncio.wait_for(getattr(worker, "_do_work")(), timeout=5)
+
+    assert processed == [0, 1, 2]
+    assert mock_scheduler.schedule.await_count == 4
+    mock_scheduler.add_tasks.assert_not_called()
+    returned: List[SimulationTask] = mock_scheduler.requeue_tasks.call_args.args[0]
+    assert [task.id for task in returned] == [3]
+    # 执行结束的任务通知调度器释放，放回的任务不释放
+    released: List[List[int]] = [
+        [task.id for task in call.args[0]]
+        for call in mock_scheduler.release_tasks.call_args_list
+    ]
+    assert released == [[0], [1], [2]]
@@ -9,10 +9,23 @@
 
 import asyncio
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from typing import Any, AsyncGenerator, List
+from typing import Any, AsyncGenerator, List, Optional
 
 import pytest
-from sqlalchemy import Integer, Result, String, select
+from sqlalchemy import (
+    DateTime,
+    Index,
+    Integer,
+    Result,
+    String,
+    UniqueConstraint,
+    create_engine,
+    desc,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -23,6 +36,7 @@ from alphapower.internal.db_session import (
     get_db_session,
     register_db,
     release_all_db_engines,
+    upgrade_schema,
 )
 from alphapower.settings import DatabaseConfig, settings
 
@@ -337,3 +351,136 @@ async def test_session_isolation(
                 select(TestModel).where(TestModel.name == "隔离测试1")
             )
             assert result.first() is None, "自动回滚应生效，数据不应存在"
+
+
+def test_upgrade_schema_adds_missing_columns_and_indexes() -> None:
+    """测试为已存在的表补齐新增的列和索引，且可以重复执行。"""
+
+    class UpgradeBase(DeclarativeBase):
+        """升级后的模型基类。"""
+
+    class UpgradedModel(UpgradeBase):
+        """新增了可为空的列和索引的模型。"""
+
+        __tablename__ = "upgraded_model"
+        __table_args__ = (Index("ix_upgraded_model_owner", "owner"),)
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String(50), nullable=False)
+        owner: Mapped[str] = mapped_column(String, nullable=True)
+        expires_at: Mapped[Any] = mapped_column(DateTime, nullable=True)
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # 旧版本的表结构
+        connection.execute(
+            text("CREATE TABLE upgraded_model (id INTEGER PRIMARY KEY, name VARCHAR)")
+        )
+        connection.execute(text("INSERT INTO upgraded_model (name) VALUES ('old')"))
+
+        applied: List[str] = upgrade_schema(connection, UpgradeBase.metadata)
+        assert applied == [
+            "添加列 upgraded_model.owner",
+            "添加列 upgraded_model.expires_at",
+            "创建索引 ix_upgraded_model_owner",
+        ]
+        assert not upgrade_schema(connection, UpgradeBase.metadata)
+
+        inspector = inspect(connection)
+        columns = {column["name"] for column in inspector.get_columns("upgraded_model")}
+        assert {"owner", "expires_at"} <= columns
+        assert connection.execute(
+            text("SELECT name, owner FROM upgraded_model")
+        ).all() == [("old", None)]
+
+
+def test_upgrade_schema_drops_obsolete_indexes() -> None:
+    """测试删除表 info 中列出的已被取代的索引，且可以重复执行。"""
+
+    class ObsoleteBase(DeclarativeBase):
+        """升级后的模型基类。"""
+
+    class ReindexedModel(ObsoleteBase):
+        """以新索引取代旧索引的模型。"""
+
+        __tablename__ = "reindexed_model"
+        __table_args__ = (
+            Index("ix_reindexed_model_name_desc", desc("name")),
+            {"info": {"obsolete_indexes": ("ix_reindexed_model_name",)}},
+        )
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String, nullable=False)
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE reindexed_model (id INTEGER PRIMARY KEY, name VARCHAR)")
+        )
+        connection.execute(
+            text("CREATE INDEX ix_reindexed_model_name ON reindexed_model (name)")
+        )
+
+        applied: List[str] = upgrade_schema(connection, ObsoleteBase.metadata)
+        assert applied == [
+            "删除索引 ix_reindexed_model_name",
+            "创建索引 ix_reindexed_model_name_desc",
+        ]
+        assert not upgrade_schema(connection, ObsoleteBase.metadata)
+
+        indexes = {
+            index["name"] for index in inspect(connection).get_indexes("reindexed_model")
+        }
+        assert indexes == {"ix_reindexed_model_name_desc"}
+
+
+def test_upgrade_schema_reports_duplicates_instead_of_deleting() -> None:
+    """测试补齐唯一约束时遇到重复行只报告不删除，清理后再次升级才创建索引。"""
+
+    class UniqueBase(DeclarativeBase):
+        """升级后的模型基类。"""
+
+    class PairModel(UniqueBase):
+        """新增了唯一约束的模型。"""
+
+        __tablename__ = "pair_model"
+        __table_args__ = (UniqueConstraint("a", "b", name="_pair_model_a_b_uc"),)
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        a: Mapped[str] = mapped_column(String, nullable=False)
+        b: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+        value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE pair_model (id INTEGER PRIMARY KEY, "
+                "a VARCHAR NOT NULL, b VARCHAR, value INTEGER NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO pair_model (a, b, value) VALUES "
+                "('x', 'y', 1), ('x', 'y', 2), ('x', 'z', 3), ('x', NULL, 4), "
+                "('x', NULL, 5)"
+            )
+        )
+
+        # 存在重复行时不删除任何数据，也不创建索引
+        assert not upgrade_schema(connection, UniqueBase.metadata)
+        assert connection.execute(text("SELECT COUNT(*) FROM pair_model")).scalar() == 5
+        assert "_pair_model_a_b_uc" not in {
+            index["name"] for index in inspect(connection).get_indexes("pair_model")
+        }
+
+        # 显式清理重复行后再次升级补齐索引，NULL 行不视为重复
+        connection.execute(text("DELETE FROM pair_model WHERE value = 1"))
+        assert upgrade_schema(connection, UniqueBase.metadata) == [
+            "创建唯一索引 _pair_model_a_b_uc"
+        ]
+        assert not upgrade_schema(connection, UniqueBase.metadata)
+        with pytest.raises(IntegrityError):
+            connection.execute(
+                text("INSERT INTO pair_model (a, b, value) VALUES ('x', 'y', 6)")
+            )